@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Dynamic Configuration Benchmark
+
+Measures the per-request cost of the ephemeral agent copy made for every
+request when a dynamic config callback is set. The copy-on-write copy used
+by AgentBase is compared with deep-copying all configuration up front, which
+is how ephemeral copies used to be made.
+
+For each approach the script reports the time per request and the memory
+allocated per request (allocations and bytes, measured with tracemalloc),
+both for a callback that changes nothing and for one that only sets global
+data, the common case.
+
+Usage:
+    python examples/dynamic_config_benchmark.py [--requests N]
+"""
+
+import copy
+import time
+import argparse
+import tracemalloc
+
+from signalwire_agents import AgentBase
+
+
+def build_agent() -> AgentBase:
+    """Create an agent with a realistic amount of configuration"""
+    agent = AgentBase("benchmark", suppress_logs=True)
+    for i in range(10):
+        agent.prompt_add_section(f"Section {i}", f"Body of section {i}",
+                                 bullets=[f"Point {j}" for j in range(5)])
+    agent.add_hints([f"hint {i}" for i in range(50)])
+    agent.add_language("English", "en-US", "rime.spore")
+    agent.add_pronunciation("API", "A P I")
+    agent.set_params({"temperature": 0.3, "end_of_speech_timeout": 500})
+    agent.set_global_data({"company": "Example", "faq": {f"q{i}": f"a{i}" for i in range(100)}})
+    agent.add_skill("datetime")
+    agent.add_skill("math")
+    return agent
+
+
+def deepcopy_ephemeral(agent: AgentBase) -> AgentBase:
+    """Make an ephemeral copy by deep-copying all configuration up front"""
+    ephemeral = agent._create_ephemeral_copy()
+    for name in agent._COPY_ON_WRITE_FIELDS:
+        if name in agent.__dict__:
+            setattr(ephemeral, name, copy.deepcopy(agent.__dict__[name]))
+    ephemeral._shared_with_base = {}
+    return ephemeral
+
+
+def no_change(agent: AgentBase):
+    pass
+
+
+def set_global_data(agent: AgentBase):
+    agent.update_global_data({"caller_tier": "gold"})
+
+
+def measure(agent: AgentBase, make_copy, callback, requests: int):
+    """Return (microseconds, allocations, bytes) per request"""
+    # Warm up caches and lazily created state
+    for _ in range(10):
+        callback(make_copy(agent))
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        callback(make_copy(agent))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    keep = []
+    for _ in range(requests):
+        ephemeral = make_copy(agent)
+        callback(ephemeral)
+        keep.append(ephemeral)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    allocations = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    size = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    return elapsed / requests * 1e6, allocations / requests, size / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ephemeral agent copies")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per measurement")
+    args = parser.parse_args()
+
+    agent = build_agent()
+    print(f"{'callback':<18}{'copy':<16}{'us/request':>12}{'allocs/request':>16}{'bytes/request':>15}")
+    for callback in (no_change, set_global_data):
+        for label, make_copy in (("deepcopy", deepcopy_ephemeral),
+                                 ("copy-on-write", AgentBase._create_ephemeral_copy)):
+            micros, allocations, size = measure(agent, make_copy, callback, args.requests)
+            print(f"{callback.__name__:<18}{label:<16}{micros:>12.1f}{allocations:>16.1f}{size:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
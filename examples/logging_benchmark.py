@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Logging Overhead Benchmark
+
+Measures the time the agent spends on a SWAIG function request at INFO
+level, where the debug messages logged along the way are not output. The
+SDK's logger only formats messages for enabled levels, and the request
+body, arguments and result are only serialized for debug messages that are
+actually logged. For comparison, the same requests are made with a logger
+formatting every message up front, as the SDK used to.
+
+Requests are sent to the agent's ASGI app in-process, so the numbers
+exclude network and HTTP server overhead.
+
+Usage:
+    python examples/logging_benchmark.py [--requests N]
+"""
+
+import os
+import json
+import time
+import base64
+import asyncio
+import argparse
+import logging
+
+from signalwire_agents import AgentBase
+from signalwire_agents.core.function_result import SwaigFunctionResult
+from signalwire_agents.core.logging_config import BoundStructuredLoggerWrapper
+
+
+class EagerLoggerWrapper(BoundStructuredLoggerWrapper):
+    """Formats every message, including lazy values, before checking the level"""
+
+    def _emit(self, level: int, message: str, kwargs) -> None:
+        formatted = self._format_structured_message(message, **kwargs)
+        self._logger.log(level, formatted)
+
+    def debug(self, message: str, **kwargs) -> None:
+        self._emit(logging.DEBUG, message, kwargs)
+
+    def info(self, message: str, **kwargs) -> None:
+        self._emit(logging.INFO, message, kwargs)
+
+    def bind(self, **kwargs) -> 'EagerLoggerWrapper':
+        return EagerLoggerWrapper(self._logger, {**self._bound_data, **kwargs})
+
+
+def build_agent() -> AgentBase:
+    """Create an agent with a function to call"""
+    agent = AgentBase("benchmark", basic_auth=("user", "pass"), suppress_logs=True)
+
+    @agent.tool(name="get_order", description="Look up an order",
+                parameters={"order_id": {"type": "string", "description": "Order ID"}})
+    def get_order(args, raw_data):
+        return SwaigFunctionResult(f"Order {args['order_id']} has shipped")
+
+    return agent
+
+
+def swaig_request_body() -> bytes:
+    """A SWAIG request with the call data the platform sends"""
+    return json.dumps({
+        "function": "get_order",
+        "call_id": "benchmark-call",
+        "argument": {"parsed": [{"order_id": "12345"}], "raw": "{\"order_id\": \"12345\"}"},
+        "global_data": {f"key_{i}": f"value {i}" for i in range(100)},
+        "call_log": [{"role": "user", "content": f"message {i}"} for i in range(50)],
+    }).encode()
+
+
+async def call(app, body: bytes) -> None:
+    """Send one SWAIG request to the app"""
+    auth = base64.b64encode(b"user:pass")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/swaig", "raw_path": b"/swaig",
+        "query_string": b"", "root_path": "", "server": ("localhost", 3000),
+        "client": ("127.0.0.1", 50000),
+        "headers": [(b"host", b"localhost"), (b"content-type", b"application/json"),
+                    (b"authorization", b"Basic " + auth)],
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    assert status == [200], status
+
+
+async def measure(app, body: bytes, requests: int) -> float:
+    """Return microseconds per request"""
+    for _ in range(20):
+        await call(app, body)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, body)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logging overhead of SWAIG requests")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per measurement")
+    args = parser.parse_args()
+
+    agent = build_agent()
+    app = agent.get_app()
+
+    # Log at INFO level, discarding the output
+    root_logger = logging.getLogger()
+    root_logger.handlers = [logging.StreamHandler(open(os.devnull, "w"))]
+    root_logger.setLevel(logging.INFO)
+
+    body = swaig_request_body()
+    level_gated_log = agent.log
+
+    print(f"{'logger':<16}{'us/request':>12}")
+    for label, log in (("eager", EagerLoggerWrapper(level_gated_log._logger, level_gated_log._bound_data)),
+                       ("level-gated", level_gated_log)):
+        agent.log = log
+        micros = asyncio.run(measure(app, body, args.requests))
+        print(f"{label:<16}{micros:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
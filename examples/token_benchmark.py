@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+SWAIG Token Benchmark
+
+Measures tokens/second for minting and validating the security tokens of an
+agent with 50 secure functions, as done for every SWML render and every
+function call. The SessionManager's cached keyed HMAC, compact token layout
+and batch API (one pass for all of a call's functions) are compared with
+the previous implementation, which re-keyed the HMAC and built a text token
+for every function.
+
+Usage:
+    python examples/token_benchmark.py [--calls N] [--functions N]
+"""
+
+import time
+import hmac
+import base64
+import hashlib
+import secrets
+import argparse
+
+from signalwire_agents import AgentBase
+from signalwire_agents.core.function_result import SwaigFunctionResult
+from signalwire_agents.core.security.session_manager import SessionManager
+
+
+class LegacySessionManager(SessionManager):
+    """The previous token implementation, for comparison"""
+
+    def generate_token(self, function_name: str, call_id: str) -> str:
+        expiry = int(time.time()) + self.token_expiry_secs
+        nonce = secrets.token_hex(4)
+        message = f"{call_id}:{function_name}:{expiry}:{nonce}"
+        signature = hmac.new(self.secret_key.encode(), message.encode(), hashlib.sha256).hexdigest()[:16]
+        token = f"{call_id}.{function_name}.{expiry}.{nonce}.{signature}"
+        return base64.urlsafe_b64encode(token.encode()).decode()
+
+    def validate_token(self, call_id: str, function_name: str, token: str) -> bool:
+        parts = base64.urlsafe_b64decode(token.encode()).decode().split('.')
+        if len(parts) != 5:
+            return False
+        token_call_id, token_function, token_expiry, token_nonce, token_signature = parts
+        if token_function != function_name or int(token_expiry) < time.time():
+            return False
+        message = f"{token_call_id}:{token_function}:{token_expiry}:{token_nonce}"
+        expected = hmac.new(self.secret_key.encode(), message.encode(), hashlib.sha256).hexdigest()[:16]
+        return token_signature == expected and token_call_id == call_id
+
+
+def build_agent(functions: int) -> AgentBase:
+    """Create an agent with the given number of secure functions"""
+    agent = AgentBase("benchmark", suppress_logs=True)
+    agent.prompt_add_section("Role", "You are a helpful assistant.")
+    for i in range(functions):
+        agent.define_tool(f"function_{i}", f"Function {i}", {},
+                          lambda args, raw_data: SwaigFunctionResult("ok"), secure=True)
+    return agent
+
+
+def tokens_per_second(mint, calls: int, functions: int, repeat: int = 5) -> float:
+    """Return tokens/second for minting a call's tokens calls times (best of repeat runs)"""
+    for i in range(10):
+        mint(f"warmup-{i}")
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(calls):
+            mint(f"call-{i}")
+        best = min(best, time.perf_counter() - start)
+    return calls * functions / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SWAIG token minting and validation")
+    parser.add_argument("--calls", type=int, default=500, help="Calls per measurement")
+    parser.add_argument("--functions", type=int, default=50, help="Secure functions of the agent")
+    args = parser.parse_args()
+
+    names = [f"function_{i}" for i in range(args.functions)]
+    secret = secrets.token_hex(32)
+    legacy = LegacySessionManager(secret_key=secret)
+    manager = SessionManager(secret_key=secret)
+
+    legacy_tokens = [legacy.generate_token(name, "call-1") for name in names]
+    tokens = list(manager.generate_tokens(names, "call-1").values())
+
+    cases = [
+        ("mint", "previous", lambda call_id: [legacy.generate_token(name, call_id) for name in names]),
+        ("mint", "per function", lambda call_id: [manager.generate_token(name, call_id) for name in names]),
+        ("mint", "batch", lambda call_id: manager.generate_tokens(names, call_id)),
+        ("validate", "previous", lambda call_id: [legacy.validate_token("call-1", name, token)
+                                                  for name, token in zip(names, legacy_tokens)]),
+        ("validate", "cached HMAC", lambda call_id: [manager.validate_token("call-1", name, token)
+                                                     for name, token in zip(names, tokens)]),
+    ]
+
+    print(f"{'operation':<10}{'implementation':<16}{'tokens/s':>12}")
+    for operation, label, function in cases:
+        print(f"{operation:<10}{label:<16}{tokens_per_second(function, args.calls, args.functions):>12,.0f}")
+
+    # Minting as part of rendering the agent's SWML for a call
+    agent = build_agent(args.functions)
+    renders = max(1, args.calls // 10)
+    for label, session_manager in (("previous", legacy), ("batch", manager)):
+        agent._session_manager = session_manager
+        if session_manager is legacy:
+            # The previous render minted one token at a time
+            agent._session_manager.create_tool_tokens = lambda names, call_id: {
+                name: legacy.generate_token(name, call_id) for name in names}
+        rate = tokens_per_second(lambda call_id: agent._render_swml(call_id), renders, args.functions)
+        print(f"{'render':<10}{label:<16}{rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Schema Validation Benchmark
+
+Measures the per-call cost of validating SWAIG function arguments and SWML
+verb configs against their JSON Schemas. The precompiled validators used by
+SWAIGFunction and SchemaUtils are compared with compiling the schema for
+every call, with a verb config SchemaUtils has already validated, and with
+the "off" validation mode (the production fast path).
+
+Usage:
+    python examples/validation_benchmark.py [--calls N]
+"""
+
+import json
+import time
+import argparse
+
+from signalwire_agents import AgentBase
+from signalwire_agents.core.swaig_function import SWAIGFunction
+from signalwire_agents.utils.schema_utils import compile_validator
+
+
+TOOL_PARAMETERS = {
+    "city": {"type": "string", "description": "City name"},
+    "days": {"type": "integer", "minimum": 1, "maximum": 14, "description": "Days to forecast"},
+    "unit": {"type": "string", "enum": ["celsius", "fahrenheit"], "description": "Temperature unit"},
+}
+TOOL_ARGS = {"city": "Paris", "days": 3, "unit": "celsius"}
+
+
+def per_call(function, calls: int) -> float:
+    """Return microseconds per call of function"""
+    for _ in range(10):
+        function()
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark schema validation")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    func = SWAIGFunction("get_forecast", lambda args, raw_data: None, "Get the forecast",
+                         parameters=TOOL_PARAMETERS, required=["city"])
+    schema = func._ensure_parameter_structure()
+
+    agent = AgentBase("benchmark", suppress_logs=True)
+    agent.prompt_add_section("Role", "You are a helpful assistant.")
+    agent.add_skill("datetime")
+    agent.add_hints([f"hint {i}" for i in range(20)])
+    agent.set_params({"temperature": 0.3, "end_of_speech_timeout": 500})
+    schema_utils = agent.schema_utils
+    document = json.loads(agent._build_swml("benchmark-call"))
+    ai_config = next(verb["ai"] for verb in document["sections"]["main"] if "ai" in verb)
+    ai_schema = dict(schema_utils.verbs["ai"]["definition"], **{"$defs": schema_utils.schema["$defs"]})
+
+    cases = [
+        ("tool args", "compile per call", lambda: compile_validator(schema)(TOOL_ARGS)),
+        ("tool args", "precompiled", lambda: func.get_arg_errors(TOOL_ARGS)),
+        ("answer verb", "precompiled", lambda: schema_utils.get_verb_validator("answer")({"answer": {}})),
+        ("ai verb", "compile per call", lambda: compile_validator(ai_schema)({"ai": ai_config})),
+        ("ai verb", "precompiled", lambda: schema_utils.get_verb_validator("ai")({"ai": ai_config})),
+        ("ai verb", "same config again", lambda: schema_utils.validate_verb("ai", ai_config)),
+    ]
+
+    print(f"{'validating':<14}{'validator':<20}{'us/call':>10}")
+    for label, validator, function in cases:
+        print(f"{label:<14}{validator:<20}{per_call(function, args.calls):>10.1f}")
+
+    # The production fast path, as used when rendering SWML and calling functions
+    schema_utils.validation_mode = "off"
+    off_cases = [
+        ("tool args", lambda: agent._check_function_args(func, TOOL_ARGS)),
+        ("answer verb", lambda: schema_utils.validate_verb("answer", {})),
+        ("ai verb", lambda: schema_utils.validate_verb("ai", ai_config)),
+    ]
+    for label, function in off_cases:
+        print(f"{label:<14}{'off':<20}{per_call(function, args.calls):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
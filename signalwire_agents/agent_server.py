@@ -13,7 +13,7 @@ AgentServer - Class for hosting multiple SignalWire AI Agents in a single server
 
 import os
 import re
-from typing import Dict, Any, Optional, List, Tuple, Callable
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterator
 
 try:
     from fastapi import FastAPI, Request, Response
@@ -26,6 +26,9 @@ except ImportError:
 from signalwire_agents.core.agent_base import AgentBase
 from signalwire_agents.core.swml_service import SWMLService
 from signalwire_agents.core.logging_config import get_logger, get_execution_mode
+from signalwire_agents.core.prefork_server import (
+    PreforkServer, resolve_workers, resolve_worker_shutdown_timeout
+)
 
 
 class AgentServer:
@@ -42,7 +45,8 @@ class AgentServer:
         server.run()
     """
     
-    def __init__(self, host: str = "0.0.0.0", port: int = 3000, log_level: str = "info"):
+    def __init__(self, host: str = "0.0.0.0", port: int = 3000, log_level: str = "info",
+                 workers: Optional[int] = None, config_file: Optional[str] = None):
         """
         Initialize a new agent server
         
@@ -50,6 +54,9 @@ class AgentServer:
             host: Host to bind the server to
             port: Port to bind the server to
             log_level: Logging level (debug, info, warning, error, critical)
+            workers: Number of worker processes (default: service.workers in the
+                     config file, SWML_WORKERS, or 1)
+            config_file: Optional path to a config file with a "service" section
         """
         self.host = host
         self.port = port
@@ -57,6 +64,13 @@ class AgentServer:
         
         self.logger = get_logger("AgentServer")
         
+        # Multi-process serving; an explicit worker count overrides the config
+        self._config_file = config_file
+        self._explicit_workers = workers
+        service_config = AgentBase._load_service_config(config_file, "agent_server")
+        self.workers = resolve_workers(workers, service_config)
+        self.worker_shutdown_timeout = resolve_worker_shutdown_timeout(service_config)
+        
         # Create FastAPI app
         self.app = FastAPI(
             title="SignalWire AI Agents",
@@ -68,6 +82,12 @@ class AgentServer:
         # Keep track of registered agents
         self.agents: Dict[str, AgentBase] = {}
         
+        # Dispatch table for the catch-all route and serverless modes, rebuilt
+        # on register/unregister: route without slashes -> (agent, sub-path handlers)
+        self._route_table: Dict[str, Tuple[AgentBase, Dict[str, Callable]]] = {}
+        # Distinct route depths (in path segments), deepest first
+        self._route_depths: List[int] = []
+        
         # Keep track of SIP routing configuration
         self._sip_routing_enabled = False
         self._sip_route = None
@@ -100,6 +120,7 @@ class AgentServer:
             
         # Store the agent
         self.agents[route] = agent
+        self._rebuild_route_table()
         
         # Get the router and register it using the standard approach
         # The agent's router already handles both trailing slash versions properly
@@ -268,10 +289,63 @@ class AgentServer:
         # FastAPI doesn't support unregistering routes, so we'll just track it ourselves
         # and rebuild the app if needed
         del self.agents[route]
+        self._rebuild_route_table()
         
         self.logger.info(f"Unregistered agent at route '{route}'")
         return True
     
+    def _rebuild_route_table(self) -> None:
+        """
+        Rebuild the dispatch table from the registered agents
+        
+        Each route maps to its agent and the agent's handlers bound by
+        sub-path, so dispatching a request costs a few dict lookups however
+        many agents are registered.
+        """
+        route_table = {}
+        for route, agent in self.agents.items():
+            handlers = {
+                "": agent._handle_root_request,
+                "debug": agent._handle_debug_request,
+                "swaig": lambda request, agent=agent: agent._handle_swaig_request(request, Response()),
+                "post_prompt": agent._handle_post_prompt_request,
+                "check_for_input": agent._handle_check_for_input_request,
+            }
+            route_table[route.strip("/")] = (agent, handlers)
+        
+        # Swap in complete tables so requests in flight never see a partial one
+        self._route_depths = sorted({len(key.split("/")) if key else 0 for key in route_table}, reverse=True)
+        self._route_table = route_table
+    
+    def _match_routes(self, path: str) -> Iterator[Tuple[AgentBase, Dict[str, Callable], str]]:
+        """
+        Find the registered agents a request path could be for
+        
+        Args:
+            path: Request path, with or without leading and trailing slashes
+            
+        Yields:
+            (agent, sub-path handlers, sub-path) for each registered route that is
+            a prefix of the path, longest route first. The sub-path is the rest of
+            the path without slashes at either end.
+        """
+        path = path.strip("/")
+        parts = path.split("/")
+        route_table = self._route_table
+        for depth in self._route_depths:
+            if depth > len(parts):
+                continue
+            if depth == 0:
+                # An agent at the server root only handles the root itself
+                if not path and "" in route_table:
+                    agent, handlers = route_table[""]
+                    yield agent, handlers, ""
+                continue
+            entry = route_table.get("/".join(parts[:depth]))
+            if entry is not None:
+                agent, handlers = entry
+                yield agent, handlers, "/".join(parts[depth:]).strip("/")
+    
     def get_agents(self) -> List[Tuple[str, AgentBase]]:
         """
         Get all registered agents
@@ -348,10 +422,8 @@ class AgentServer:
             return self._format_cgi_response(response, status="404 Not Found")
         
         # Find matching agent using same logic as server
-        for route, agent in self.agents.items():
-            route_clean = route.lstrip("/")
-            
-            if path_info == route_clean:
+        for agent, _, relative_path in self._match_routes(path_info):
+            if not relative_path:
                 # Request to agent root - return SWML
                 try:
                     swml = agent._render_swml()
@@ -360,10 +432,8 @@ class AgentServer:
                     error_response = {"error": f"Failed to generate SWML: {str(e)}"}
                     return self._format_cgi_response(error_response, status="500 Internal Server Error")
                     
-            elif path_info.startswith(route_clean + "/"):
+            else:
                 # Request to agent sub-path
-                relative_path = path_info[len(route_clean):].lstrip("/")
-                
                 if relative_path == "swaig":
                     # SWAIG function call - parse stdin for POST data
                     try:
@@ -434,10 +504,8 @@ class AgentServer:
             }
         
         # Find matching agent
-        for route, agent in self.agents.items():
-            route_clean = route.lstrip("/")
-            
-            if path == route_clean:
+        for agent, _, relative_path in self._match_routes(path):
+            if not relative_path:
                 # Request to agent root - return SWML
                 try:
                     swml = agent._render_swml()
@@ -453,10 +521,8 @@ class AgentServer:
                         "body": json.dumps({"error": f"Failed to generate SWML: {str(e)}"})
                     }
                     
-            elif path.startswith(route_clean + "/"):
+            else:
                 # Request to agent sub-path
-                relative_path = path[len(route_clean):].lstrip("/")
-                
                 if relative_path == "swaig" or relative_path.startswith("swaig/"):
                     # SWAIG function call
                     try:
@@ -540,38 +606,17 @@ class AgentServer:
         async def handle_all_routes(request: Request, full_path: str):
             """Handle requests that don't match registered routes (e.g. /matti instead of /matti/)"""
             # Check if this path maps to one of our registered agents
-            for route, agent in self.agents.items():
-                # Check for exact match with registered route
-                if full_path == route.lstrip("/"):
-                    # This is a request to an agent's root without trailing slash
+            for agent, handlers, sub_path in self._match_routes(full_path):
+                # Route to appropriate handler based on path
+                handler = handlers.get(sub_path)
+                if handler is not None:
+                    return await handler(request)
+                
+                # Check for custom routing callbacks (registered as "/<path>")
+                callback_path = f"/{sub_path}"
+                if callback_path in getattr(agent, '_routing_callbacks', {}):
+                    request.state.callback_path = callback_path
                     return await agent._handle_root_request(request)
-                elif full_path.startswith(route.lstrip("/") + "/"):
-                    # This is a request to an agent's sub-path
-                    relative_path = full_path[len(route.lstrip("/")):]
-                    relative_path = relative_path.lstrip("/")
-                    
-                    # Route to appropriate handler based on path
-                    if not relative_path or relative_path == "/":
-                        return await agent._handle_root_request(request)
-                    
-                    clean_path = relative_path.rstrip("/")
-                    if clean_path == "debug":
-                        return await agent._handle_debug_request(request)
-                    elif clean_path == "swaig":
-                        from fastapi import Response
-                        return await agent._handle_swaig_request(request, Response())
-                    elif clean_path == "post_prompt":
-                        return await agent._handle_post_prompt_request(request)
-                    elif clean_path == "check_for_input":
-                        return await agent._handle_check_for_input_request(request)
-                    
-                    # Check for custom routing callbacks
-                    if hasattr(agent, '_routing_callbacks'):
-                        for callback_path, callback_fn in agent._routing_callbacks.items():
-                            cb_path_clean = callback_path.strip("/")
-                            if clean_path == cb_path_clean:
-                                request.state.callback_path = callback_path
-                                return await agent._handle_root_request(request)
             
             # No matching agent found
             return {"error": "Not Found"}
@@ -616,23 +661,29 @@ class AgentServer:
             self.logger.info(f"Basic Auth: {username}:{password}")
         
         # Start the server with or without SSL
+        uvicorn_options = {"log_level": self.log_level}
         if ssl_enabled and ssl_cert_path and ssl_key_path:
             self.logger.info(f"Starting with SSL - cert: {ssl_cert_path}, key: {ssl_key_path}")
-            uvicorn.run(
-                self.app,
-                host=host,
-                port=port,
-                log_level=self.log_level,
-                ssl_certfile=ssl_cert_path,
-                ssl_keyfile=ssl_key_path
-            )
+            uvicorn_options.update(ssl_certfile=ssl_cert_path, ssl_keyfile=ssl_key_path)
+        
+        if self.workers > 1:
+            # Workers are forked after the agents are registered, so they share
+            # each agent's session token secret
+            self.logger.info(f"Starting {self.workers} worker processes")
+            PreforkServer(
+                self.app, host, port, self.workers,
+                shutdown_timeout=self.worker_shutdown_timeout,
+                on_reload=self._reload_workers,
+                **uvicorn_options
+            ).run()
         else:
-            uvicorn.run(
-                self.app,
-                host=host,
-                port=port,
-                log_level=self.log_level
-            )
+            uvicorn.run(self.app, host=host, port=port, **uvicorn_options)
+    
+    def _reload_workers(self) -> int:
+        """Re-read the worker count from the config file on a SIGHUP reload"""
+        service_config = AgentBase._load_service_config(self._config_file, "agent_server")
+        self.workers = resolve_workers(self._explicit_workers, service_config)
+        return self.workers
 
     def register_global_routing_callback(self, callback_fn: Callable[[Request, Dict[str, Any]], Optional[str]], 
                                         path: str) -> None:
@@ -66,6 +66,9 @@ Examples:
   sw-search ./docs \\
     --chunking-strategy qa
 
+  # Update an existing index, only reprocessing new and changed files
+  sw-search ./docs --output docs.swsearch --update
+
   # Full configuration example
   sw-search ./docs ./examples README.md \\
     --output ./knowledge.swsearch \\
@@ -86,6 +89,11 @@ Examples:
   sw-search search ./docs.swsearch "API reference" --count 3 --verbose
   sw-search search ./docs.swsearch "configuration" --tags documentation --json
 
+  # Approximate nearest neighbour index for large corpora
+  sw-search ./docs --ann-index ivf
+  sw-search benchmark ./docs.swsearch --k 10 --nprobe 1,4,16
+  sw-search search ./docs.swsearch "how to create an agent" --nprobe 8
+
   # Search via remote API
   sw-search remote http://localhost:8001 "how to create an agent" --index-name docs
   sw-search remote localhost:8001 "API reference" --index-name docs --count 3 --verbose
@@ -139,6 +147,18 @@ Examples:
         help='Overwrite existing collection (pgvector backend only)'
     )
     
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        help='Update an existing index, only reprocessing new and changed files and removing deleted ones'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume an interrupted build from its .partial file (sqlite backend only)'
+    )
+    
     parser.add_argument(
         '--chunking-strategy',
         choices=['sentence', 'sliding', 'paragraph', 'page', 'semantic', 'topic', 'qa'],
@@ -201,6 +221,34 @@ Examples:
         help='Comma-separated tags to add to all chunks'
     )
     
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=32,
+        help='Number of chunks encoded per embedding model call (default: 32)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of processes used to extract and chunk files, 0 for all CPUs (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--nlp-batch-size',
+        type=int,
+        default=64,
+        help='Number of chunks POS tagged and lemmatized per NLP batch (default: 64)'
+    )
+    
+    parser.add_argument(
+        '--nlp-processes',
+        type=int,
+        default=1,
+        help='Number of processes spaCy uses for document preprocessing (spacy backend only, default: 1)'
+    )
+    
     parser.add_argument(
         '--index-nlp-backend',
         choices=['nltk', 'spacy'],
@@ -227,6 +275,12 @@ Examples:
         help='Similarity threshold for semantic chunking (default: 0.5)'
     )
     
+    parser.add_argument(
+        '--reencode-semantic-chunks',
+        action='store_true',
+        help='Encode each semantic chunk instead of pooling the sentence embeddings computed for chunking'
+    )
+    
     parser.add_argument(
         '--topic-threshold',
         type=float,
@@ -234,6 +288,31 @@ Examples:
         help='Similarity threshold for topic chunking (default: 0.3)'
     )
     
+    parser.add_argument(
+        '--ann-index',
+        choices=['ivf'],
+        help='Build an approximate nearest neighbour index for faster vector search on large indexes (sqlite backend only)'
+    )
+    
+    parser.add_argument(
+        '--pgvector-index',
+        choices=['ivfflat', 'hnsw'],
+        default=None,
+        help='Embedding index for pgvector collections; hnsw is more accurate and needs pgvector 0.5+ (default: the collection\'s current index, or ivfflat)'
+    )
+    
+    parser.add_argument(
+        '--ann-lists',
+        type=int,
+        help='Number of IVF lists (default: square root of chunk count)'
+    )
+    
+    parser.add_argument(
+        '--ann-nprobe',
+        type=int,
+        help='Default IVF lists searched per query; higher improves recall, lower is faster (default: lists / 10)'
+    )
+    
     args = parser.parse_args()
     
     # Validate sources
@@ -291,12 +370,18 @@ Examples:
         else:
             print(f"  Collection name: {args.output}")
             print(f"  Connection: {args.connection_string}")
+            print(f"  Vector index: {args.pgvector_index or 'current, or ivfflat'}")
         print(f"  File types (for directories): {file_types}")
         print(f"  Exclude patterns: {exclude_patterns}")
         print(f"  Languages: {languages}")
         print(f"  Model: {args.model}")
         print(f"  Chunking strategy: {args.chunking_strategy}")
         print(f"  Index NLP backend: {args.index_nlp_backend}")
+        print(f"  Embedding batch size: {args.batch_size}")
+        print(f"  Workers: {args.workers}")
+        print(f"  NLP batch size: {args.nlp_batch_size}")
+        if args.index_nlp_backend == 'spacy':
+            print(f"  NLP processes: {args.nlp_processes}")
         
         if args.chunking_strategy == 'sentence':
             print(f"  Max sentences per chunk: {args.max_sentences_per_chunk}")
@@ -311,12 +396,16 @@ Examples:
             print(f"  Chunking by pages")
         elif args.chunking_strategy == 'semantic':
             print(f"  Semantic chunking (similarity threshold: {args.semantic_threshold})")
+            if args.reencode_semantic_chunks:
+                print(f"  Re-encoding semantic chunks instead of pooling sentence embeddings")
         elif args.chunking_strategy == 'topic':
             print(f"  Topic-based chunking (similarity threshold: {args.topic_threshold})")
         elif args.chunking_strategy == 'qa':
             print(f"  QA-optimized chunking")
         
         print(f"  Tags: {tags}")
+        if args.ann_index:
+            print(f"  ANN index: {args.ann_index} (lists: {args.ann_lists or 'auto'}, nprobe: {args.ann_nprobe or 'auto'})")
         print()
     
     try:
@@ -334,7 +423,16 @@ Examples:
             semantic_threshold=args.semantic_threshold,
             topic_threshold=args.topic_threshold,
             backend=args.backend,
-            connection_string=args.connection_string
+            connection_string=args.connection_string,
+            ann_index=args.ann_index,
+            ann_lists=args.ann_lists,
+            ann_nprobe=args.ann_nprobe,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            nlp_batch_size=args.nlp_batch_size,
+            nlp_processes=args.nlp_processes,
+            pool_sentence_embeddings=not args.reencode_semantic_chunks,
+            pgvector_index=args.pgvector_index
         )
         
         # Build index with multiple sources
@@ -345,7 +443,9 @@ Examples:
             exclude_patterns=exclude_patterns,
             languages=languages,
             tags=tags,
-            overwrite=args.overwrite if args.backend == 'pgvector' else False
+            overwrite=args.overwrite if args.backend == 'pgvector' else False,
+            update=args.update,
+            resume=args.resume
         )
         
         # Validate if requested
@@ -434,6 +534,9 @@ def search_command():
     parser.add_argument('--verbose', action='store_true', help='Show detailed information')
     parser.add_argument('--json', action='store_true', help='Output results as JSON')
     parser.add_argument('--no-content', action='store_true', help='Hide content in results (show only metadata)')
+    parser.add_argument('--nprobe', type=int, help='IVF lists to search when the index has an ANN index (default: value stored in the index)')
+    parser.add_argument('--exact', action='store_true', help='Ignore any ANN index and use exact vector search')
+    parser.add_argument('--ef-search', type=int, help='HNSW candidate list size for pgvector collections with an HNSW index (default: 40)')
     
     args = parser.parse_args()
     
@@ -464,10 +567,11 @@ def search_command():
                 print(f"Connecting to pgvector collection: {args.index_source}")
         
         if args.backend == 'sqlite':
-            engine = SearchEngine(backend='sqlite', index_path=args.index_source)
+            engine = SearchEngine(backend='sqlite', index_path=args.index_source,
+                                use_ann=not args.exact, ann_nprobe=args.nprobe)
         else:
             engine = SearchEngine(backend='pgvector', connection_string=args.connection_string,
-                                collection_name=args.index_source)
+                                collection_name=args.index_source, ef_search=args.ef_search)
         
         # Get index stats
         stats = engine.get_stats()
@@ -478,7 +582,8 @@ def search_command():
             print()
         
         # Preprocess query
-        enhanced = preprocess_query(args.query, vector=True, query_nlp_backend=args.query_nlp_backend)
+        enhanced = preprocess_query(args.query, vector=True, query_nlp_backend=args.query_nlp_backend,
+                                    model_name=engine.model_name)
         
         # Parse tags if provided
         tags = [tag.strip() for tag in args.tags.split(',')] if args.tags else None
@@ -558,6 +663,55 @@ def search_command():
             traceback.print_exc()
         sys.exit(1)
 
+def benchmark_command():
+    """Measure ANN recall and latency against exact search"""
+    parser = argparse.ArgumentParser(description='Benchmark ANN recall@k against exact vector search for a .swsearch index')
+    parser.add_argument('index_file', help='Path to .swsearch file built with --ann-index')
+    parser.add_argument('--k', type=int, default=10, help='Number of neighbours compared for recall@k (default: 10)')
+    parser.add_argument('--nprobe', help='Comma-separated nprobe values to test (default: powers of two up to the list count)')
+    parser.add_argument('--queries', type=int, default=100, help='Number of queries sampled from the index (default: 100)')
+    parser.add_argument('--json', action='store_true', help='Output results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show detailed information')
+    
+    args = parser.parse_args()
+    
+    if not Path(args.index_file).exists():
+        print(f"Error: Index file does not exist: {args.index_file}")
+        sys.exit(1)
+    
+    try:
+        try:
+            from signalwire_agents.search.search_engine import SearchEngine
+            from signalwire_agents.search.ann_index import benchmark_recall
+        except ImportError as e:
+            print(f"Error: Search functionality not available. Install with: pip install signalwire-agents[search]")
+            print(f"Details: {e}")
+            sys.exit(1)
+        
+        nprobe_values = [int(n.strip()) for n in args.nprobe.split(',')] if args.nprobe else None
+        
+        engine = SearchEngine(backend='sqlite', index_path=args.index_file)
+        results = benchmark_recall(engine, k=args.k, nprobe_values=nprobe_values, num_queries=args.queries)
+        
+        if args.json:
+            import json
+            print(json.dumps(results, indent=2))
+            return
+        
+        vectors = engine.vector_count()
+        print(f"Recall@{args.k} over {min(args.queries, vectors)} queries "
+              f"({vectors} vectors, {engine.config.get('ann_nlist')} lists):")
+        print(f"{'nprobe':>8}  {'recall':>8}  {'latency':>10}  {'scanned':>8}")
+        for row in results:
+            print(f"{row['nprobe']:>8}  {row['recall']:>8.3f}  {row['latency_ms']:>8.3f}ms  {row['scanned']:>7.1%}")
+        
+    except Exception as e:
+        print(f"Error benchmarking index: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
 def remote_command():
     """Search via remote API endpoint"""
     parser = argparse.ArgumentParser(description='Search via remote API endpoint')
@@ -703,8 +857,10 @@ def console_entry_point():
                  [--max-sentences-per-chunk MAX_SENTENCES_PER_CHUNK] [--chunk-size CHUNK_SIZE]
                  [--overlap-size OVERLAP_SIZE] [--split-newlines SPLIT_NEWLINES] [--file-types FILE_TYPES]
                  [--exclude EXCLUDE] [--languages LANGUAGES] [--model MODEL] [--tags TAGS]
-                 [--index-nlp-backend {nltk,spacy}] [--verbose] [--validate]
-                 [--semantic-threshold SEMANTIC_THRESHOLD] [--topic-threshold TOPIC_THRESHOLD]
+                 [--batch-size BATCH_SIZE] [--workers WORKERS] [--nlp-batch-size NLP_BATCH_SIZE]
+                 [--nlp-processes NLP_PROCESSES] [--update] [--resume] [--index-nlp-backend {nltk,spacy}] [--verbose] [--validate]
+                 [--semantic-threshold SEMANTIC_THRESHOLD] [--reencode-semantic-chunks] [--topic-threshold TOPIC_THRESHOLD]
+                 [--ann-index {ivf}] [--pgvector-index {ivfflat,hnsw}] [--ann-lists ANN_LISTS] [--ann-nprobe ANN_NPROBE]
                  sources [sources ...]
 
 Build local search index from documents
@@ -732,14 +888,32 @@ options:
                         Comma-separated language codes (default: en)
   --model MODEL         Sentence transformer model name (default: sentence-transformers/all-mpnet-base-v2)
   --tags TAGS           Comma-separated tags to add to all chunks
+  --batch-size BATCH_SIZE
+                        Number of chunks encoded per embedding model call (default: 32)
+  --workers WORKERS     Number of processes used to extract and chunk files, 0 for all CPUs (default: 1)
+  --nlp-batch-size NLP_BATCH_SIZE
+                        Number of chunks POS tagged and lemmatized per NLP batch (default: 64)
+  --nlp-processes NLP_PROCESSES
+                        Number of processes spaCy uses for document preprocessing (spacy backend only, default: 1)
+  --update              Update an existing index, only reprocessing new and changed files and removing deleted ones
+  --resume              Resume an interrupted build from its .partial file (sqlite backend only)
   --index-nlp-backend {nltk,spacy}
                         NLP backend for document processing: nltk (fast, default) or spacy (better quality, slower)
   --verbose             Enable verbose output
   --validate            Validate the created index after building
   --semantic-threshold SEMANTIC_THRESHOLD
                         Similarity threshold for semantic chunking (default: 0.5)
+  --reencode-semantic-chunks
+                        Encode each semantic chunk instead of pooling the sentence embeddings computed for chunking
   --topic-threshold TOPIC_THRESHOLD
                         Similarity threshold for topic chunking (default: 0.3)
+  --ann-index {ivf}     Build an approximate nearest neighbour index for faster vector search on large indexes (sqlite backend only)
+  --pgvector-index {ivfflat,hnsw}
+                        Embedding index for pgvector collections; hnsw is more accurate and needs pgvector 0.5+ (default: the collection's current index, or ivfflat)
+  --ann-lists ANN_LISTS
+                        Number of IVF lists (default: square root of chunk count)
+  --ann-nprobe ANN_NPROBE
+                        Default IVF lists searched per query; higher improves recall, lower is faster (default: lists / 10)
 
 Examples:
   # Basic usage with directory (defaults to sentence chunking with 5 sentences per chunk)
@@ -790,6 +964,9 @@ Examples:
   sw-search ./docs \\
     --chunking-strategy qa
 
+  # Update an existing index, only reprocessing new and changed files
+  sw-search ./docs --output docs.swsearch --update
+
   # Full configuration example
   sw-search ./docs ./examples README.md \\
     --output ./knowledge.swsearch \\
@@ -810,6 +987,11 @@ Examples:
   sw-search search ./docs.swsearch "API reference" --count 3 --verbose
   sw-search search ./docs.swsearch "configuration" --tags documentation --json
 
+  # Approximate nearest neighbour index for large corpora
+  sw-search ./docs --ann-index ivf
+  sw-search benchmark ./docs.swsearch --k 10 --nprobe 1,4,16
+  sw-search search ./docs.swsearch "how to create an agent" --nprobe 8
+
   # Search via remote API
   sw-search remote http://localhost:8001 "how to create an agent" --index-name docs
   sw-search remote localhost:8001 "API reference" --index-name docs --count 3 --verbose
@@ -828,6 +1010,11 @@ Examples:
             sys.argv.pop(1)
             search_command()
             return
+        elif sys.argv[1] == 'benchmark':
+            # Remove 'benchmark' from argv and call benchmark_command
+            sys.argv.pop(1)
+            benchmark_command()
+            return
         elif sys.argv[1] == 'remote':
             # Remove 'remote' from argv and call remote_command
             sys.argv.pop(1)
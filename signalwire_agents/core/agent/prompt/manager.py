@@ -84,6 +84,7 @@ class PromptManager:
             self._contexts = contexts
         else:
             raise ValueError("contexts must be a dictionary or a ContextBuilder object")
+        self.agent._bump_config_version()
         
         logger.debug(f"Defined contexts: {self._contexts}")
     
@@ -96,6 +97,7 @@ class PromptManager:
         """
         self._validate_prompt_mode_exclusivity()
         self._prompt_text = text
+        self.agent._bump_config_version()
         logger.debug(f"Set prompt text: {text[:100]}...")
     
     def set_post_prompt(self, text: str) -> None:
@@ -106,6 +108,7 @@ class PromptManager:
             text: Post-prompt text
         """
         self._post_prompt_text = text
+        self.agent._bump_config_version()
         logger.debug(f"Set post-prompt text: {text[:100]}...")
     
     def set_prompt_pom(self, pom: List[Dict[str, Any]]) -> None:
@@ -120,6 +123,7 @@ class PromptManager:
         """
         if self.agent._use_pom:
             self.agent.pom = pom
+            self.agent._bump_config_version()
         else:
             raise ValueError("use_pom must be True to use set_prompt_pom")
     
@@ -145,6 +149,8 @@ class PromptManager:
         """
         self._validate_prompt_mode_exclusivity()
         if self.agent._use_pom and self.agent.pom:
+            pom = self.agent._writable('pom')
+            
             # Create parameters for add_section based on what's supported
             kwargs = {}
             
@@ -155,15 +161,15 @@ class PromptManager:
                 kwargs['bullets'] = bullets
             
             # Add optional parameters if they look supported
-            if hasattr(self.agent.pom, 'add_section'):
-                sig = inspect.signature(self.agent.pom.add_section)
+            if hasattr(pom, 'add_section'):
+                sig = inspect.signature(pom.add_section)
                 if 'numbered' in sig.parameters:
                     kwargs['numbered'] = numbered
                 if 'numberedBullets' in sig.parameters:
                     kwargs['numberedBullets'] = numbered_bullets
             
             # Create the section
-            section = self.agent.pom.add_section(**kwargs)
+            section = pom.add_section(**kwargs)
             
             # Now add subsections if provided, by calling add_subsection on the section
             if subsections:
@@ -192,12 +198,14 @@ class PromptManager:
             bullets: Optional list of bullet points to add
         """
         if self.agent._use_pom and self.agent.pom:
+            pom = self.agent._writable('pom')
+            
             # Find the section first
-            section = self.agent.pom.find_section(title)
+            section = pom.find_section(title)
             
             if section is None:
                 # Section doesn't exist, create it
-                section = self.agent.pom.add_section(title=title)
+                section = pom.add_section(title=title)
             
             # Add content to the section
             if body:
@@ -233,19 +241,21 @@ class PromptManager:
             bullets: Optional list of bullet points
         """
         if self.agent._use_pom and self.agent.pom:
+            pom = self.agent._writable('pom')
+            
             # First find or create the parent section
             parent_section = None
             
             # Try to find the parent section by title
-            if hasattr(self.agent.pom, 'sections'):
-                for section in self.agent.pom.sections:
+            if hasattr(pom, 'sections'):
+                for section in pom.sections:
                     if hasattr(section, 'title') and section.title == parent_title:
                         parent_section = section
                         break
             
             # If parent section not found, create it
             if not parent_section:
-                parent_section = self.agent.pom.add_section(title=parent_title)
+                parent_section = pom.add_section(title=parent_title)
             
             # Now call add_subsection on the parent section object, not on POM
             parent_section.add_subsection(
@@ -42,6 +42,8 @@ class ToolRegistry:
         fillers: Optional[Dict[str, List[str]]] = None,
         webhook_url: Optional[str] = None,
         required: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
         **swaig_fields
     ) -> None:
         """
@@ -51,11 +53,13 @@ class ToolRegistry:
             name: Function name (must be unique)
             description: Function description for the AI
             parameters: JSON Schema of parameters
-            handler: Function to call when invoked
+            handler: Function or coroutine function to call when invoked
             secure: Whether to require token validation
             fillers: Optional dict mapping language codes to arrays of filler phrases
             webhook_url: Optional external webhook URL to use instead of local handling
             required: Optional list of required parameter names
+            timeout: Optional seconds a call may take before it fails
+            max_concurrency: Optional limit on calls of this tool running at once
             **swaig_fields: Additional SWAIG fields to include in function definition
             
         Raises:
@@ -73,8 +77,11 @@ class ToolRegistry:
             fillers=fillers,
             webhook_url=webhook_url,
             required=required,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
             **swaig_fields
         )
+        self.agent._bump_config_version()
         
         logger.debug(f"Defined tool: {name}")
     
@@ -98,6 +105,7 @@ class ToolRegistry:
         # Store the raw function dictionary for data_map tools
         # These don't have handlers since they execute on SignalWire's server
         self._swaig_functions[function_name] = function_dict
+        self.agent._bump_config_version()
         
         # Debug logging using the module logger with proper format
         logger.debug(f"Registered SWAIG function in registry: {function_name} (registry_id={id(self)}, agent_id={id(self.agent) if hasattr(self, 'agent') else None}, total_functions={len(self._swaig_functions)})")
@@ -195,6 +203,7 @@ class ToolRegistry:
         """
         if name in self._swaig_functions:
             del self._swaig_functions[name]
+            self.agent._bump_config_version()
             logger.debug(f"Removed function: {name}")
             return True
         return False
\ No newline at end of file
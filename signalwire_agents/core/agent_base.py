@@ -46,9 +46,11 @@ except ImportError:
 
 from signalwire_agents.core.pom_builder import PomBuilder
 from signalwire_agents.core.swaig_function import SWAIGFunction
+from signalwire_agents.core.tool_executor import ToolExecutor
 from signalwire_agents.core.function_result import SwaigFunctionResult
 from signalwire_agents.core.swml_renderer import SwmlRenderer
 from signalwire_agents.core.security.session_manager import SessionManager
+from signalwire_agents.core.prefork_server import resolve_workers, resolve_worker_shutdown_timeout
 from signalwire_agents.core.swml_service import SWMLService
 from signalwire_agents.core.swml_handler import AIVerbHandler
 from signalwire_agents.core.skill_manager import SkillManager
@@ -104,6 +106,10 @@ class AgentBase(
     # Subclasses can define this to declaratively set prompt sections
     PROMPT_SECTIONS = None
     
+    # Bumped by every configuration change; invalidates the cached SWML skeleton
+    _config_version = 0
+    _swml_cache = None
+    
     def __init__(
         self,
         name: str,
@@ -124,7 +130,10 @@ class AgentBase(
                 suppress_logs: bool = False,
         enable_post_prompt_override: bool = False,
         check_for_input_override: bool = False,
-        config_file: Optional[str] = None
+        config_file: Optional[str] = None,
+        tool_max_workers: Optional[int] = None,
+        tool_timeout: Optional[float] = None,
+        schema_validation: Optional[str] = None
     ):
         """
         Initialize a new agent
@@ -149,6 +158,14 @@ class AgentBase(
             enable_post_prompt_override: Whether to enable post-prompt override
             check_for_input_override: Whether to enable check-for-input override
             config_file: Optional path to configuration file
+            tool_max_workers: Threads available to synchronous SWAIG function
+                              handlers (default: min(32, CPU count + 4))
+            tool_timeout: Default seconds a SWAIG function call may take before
+                          it fails (default: no limit)
+            schema_validation: How SWML verbs and SWAIG function arguments are
+                               validated: "off" skips validation, "warn" logs
+                               violations and "strict" rejects them
+                               (default: SWML_SCHEMA_VALIDATION or "warn")
         """
         # Import SWMLService here to avoid circular imports
         from signalwire_agents.core.swml_service import SWMLService
@@ -173,7 +190,8 @@ class AgentBase(
             port=final_port,
             basic_auth=basic_auth,
             schema_path=schema_path,
-            config_file=config_file
+            config_file=config_file,
+            schema_validation=schema_validation or service_config.get('schema_validation')
         )
         
         # Log the schema path if found and not suppressing logs
@@ -212,8 +230,17 @@ class AgentBase(
         
         # Initialize tool registry (separate from SWMLService verb registry)
         
-        # Initialize session manager
-        self._session_manager = SessionManager(token_expiry_secs=token_expiry_secs)
+        # Initialize session manager; a configured secret lets separate processes
+        # (e.g. server workers) validate each other's tokens
+        self._session_manager = SessionManager(
+            token_expiry_secs=token_expiry_secs,
+            secret_key=service_config.get('session_secret') or os.environ.get('SWML_SESSION_SECRET')
+        )
+        
+        # Multi-process serving (service.workers / SWML_WORKERS)
+        self._config_file = config_file
+        self._workers = resolve_workers(None, service_config)
+        self._worker_shutdown_timeout = resolve_worker_shutdown_timeout(service_config)
         
         # URL override variables
         self._web_hook_url_override = None
@@ -232,6 +259,12 @@ class AgentBase(
         self._prompt_manager = PromptManager(self)
         self._tool_registry = ToolRegistry(self)
         
+        # Runs SWAIG handlers off the event loop; shared with ephemeral copies
+        self._tool_executor = ToolExecutor(
+            max_workers=tool_max_workers or service_config.get('tool_max_workers'),
+            default_timeout=tool_timeout or service_config.get('tool_timeout')
+        )
+        
         # Process declarative PROMPT_SECTIONS if defined in subclass
         self._process_prompt_sections()
         
@@ -499,6 +532,7 @@ class AgentBase(
             Self for method chaining
         """
         self._web_hook_url_override = url
+        self._bump_config_version()
         return self
     
     def set_post_prompt_url(self, url: str) -> 'AgentBase':
@@ -512,6 +546,7 @@ class AgentBase(
             Self for method chaining
         """
         self._post_prompt_url_override = url
+        self._bump_config_version()
         return self
     
     def add_swaig_query_params(self, params: Dict[str, str]) -> 'AgentBase':
@@ -537,7 +572,7 @@ class AgentBase(
                     agent.add_swaig_query_params({'tier': 'premium'})
         """
         if params and isinstance(params, dict):
-            self._swaig_query_params.update(params)
+            self._writable('_swaig_query_params').update(params)
         return self
     
     def clear_swaig_query_params(self) -> 'AgentBase':
@@ -548,6 +583,7 @@ class AgentBase(
             Self for method chaining
         """
         self._swaig_query_params = {}
+        self._bump_config_version()
         return self
     
     def _render_swml(self, call_id: str = None, modifications: Optional[dict] = None) -> str:
@@ -605,8 +641,101 @@ class AgentBase(
             # Clear the special markers so they don't affect rendering
             modifications = None
         
-        # Reset the document to a clean state
-        agent_to_use.reset_document()
+        # Generate a call ID if needed
+        if call_id is None:
+            call_id = agent_to_use._session_manager.create_session()
+        
+        # Static agents only differ per call in their tokens
+        if agent_to_use is self and not modifications and self._can_cache_swml():
+            return self._render_cached_swml(call_id)
+        
+        return agent_to_use._build_swml(call_id, modifications)
+    
+    def _can_cache_swml(self) -> bool:
+        """
+        Check whether this agent's SWML can be served from the cached skeleton
+        
+        Agents computing their prompt or tools on the fly, and agents using a
+        contexts builder (which can change without the agent knowing), are
+        always rendered in full.
+        
+        Returns:
+            True if the cached skeleton can be used
+        """
+        cls = type(self)
+        return (
+            self._contexts_builder is None
+            and cls.get_prompt is PromptMixin.get_prompt
+            and cls.get_post_prompt is PromptMixin.get_post_prompt
+            and cls.define_tools is ToolMixin.define_tools
+        )
+    
+    def _bump_config_version(self) -> None:
+        """Record a configuration change so the next render rebuilds the SWML"""
+        self._config_version += 1
+    
+    def _render_cached_swml(self, call_id: str) -> str:
+        """
+        Render SWML from a cached skeleton, filling in this call's tokens
+        
+        The skeleton is the serialized document rendered with a placeholder in
+        place of each token. It is rebuilt when the configuration version, the
+        proxy URL base or the execution mode changes.
+        
+        Args:
+            call_id: Call ID the tokens are bound to
+            
+        Returns:
+            SWML document as a string
+        """
+        key = (self._config_version, self._current_proxy_url_base(), get_execution_mode())
+        cache = self._swml_cache
+        if cache is None or cache[0] != key:
+            nonce = uuid.uuid4().hex
+            slots = {}
+            
+            def placeholder(tool_name: str) -> str:
+                slot = f"swmltoken{nonce}x{len(slots)}"
+                slots[slot] = tool_name
+                return slot
+            
+            skeleton = self._build_swml(call_id, token_factory=placeholder)
+            cache = self._swml_cache = (key, skeleton, slots, re.compile(f"swmltoken{nonce}x[0-9]+"))
+            self.log.debug("swml_skeleton_cached", config_version=key[0], token_slots=len(slots))
+        
+        _, skeleton, slots, pattern = cache
+        if not slots:
+            return skeleton
+        
+        tool_tokens = self._create_tool_tokens(slots.values(), call_id)
+        tokens = {slot: tool_tokens.get(tool_name) for slot, tool_name in slots.items()}
+        if not all(tokens.values()):
+            # A failed token drops the parameter from its URL, which the skeleton can't express
+            return self._build_swml(call_id)
+        return pattern.sub(lambda match: tokens[match.group(0)], skeleton)
+    
+    def _build_swml(self, call_id: str, modifications: Optional[dict] = None,
+                    token_factory: Optional[Callable[[str], str]] = None) -> str:
+        """
+        Build and render the complete SWML document
+        
+        Args:
+            call_id: Call ID for session-specific tokens
+            modifications: Optional dict of modifications to apply to the SWML
+            token_factory: Optional function returning the token for a tool name
+                           (default: a real token bound to call_id)
+            
+        Returns:
+            SWML document as a string
+        """
+        agent_to_use = self
+        real_tokens = token_factory is None
+        if token_factory is None:
+            def token_factory(tool_name: str) -> str:
+                return self._create_tool_token(tool_name=tool_name, call_id=call_id)
+        
+        # Build into a document of our own so concurrent renders don't interfere
+        document = agent_to_use.new_document()
         
         # Get prompt
         prompt = agent_to_use.get_prompt()
@@ -615,10 +744,6 @@ class AgentBase(
         # Get post-prompt
         post_prompt = agent_to_use.get_post_prompt()
         
-        # Generate a call ID if needed
-        if call_id is None:
-            call_id = agent_to_use._session_manager.create_session()
-            
         # Start with any SWAIG query params that were set
         query_params = agent_to_use._swaig_query_params.copy() if agent_to_use._swaig_query_params else {}
         
@@ -678,7 +803,7 @@ class AgentBase(
                 # Check if it's secure and get token for secure functions when we have a call_id
                 token = None
                 if func.secure and call_id:
-                    token = agent_to_use._create_tool_token(tool_name=name, call_id=call_id)
+                    token = token_factory(name)
                     
                 # Prepare function entry
                 function_entry = {
@@ -720,13 +845,10 @@ class AgentBase(
             # Create a token for post_prompt if we have a call_id
             # Start with SWAIG query params
             query_params = agent_to_use._swaig_query_params.copy() if agent_to_use._swaig_query_params else {}
-            if call_id and hasattr(agent_to_use, '_session_manager'):
-                try:
-                    token = agent_to_use._session_manager.create_tool_token("post_prompt", call_id)
-                    if token:
-                        query_params["__token"] = token  # Use __token to avoid collision
-                except Exception as e:
-                    agent_to_use.log.error("post_prompt_token_creation_error", error=str(e))
+            if call_id:
+                token = token_factory("post_prompt")
+                if token:
+                    query_params["__token"] = token  # Use __token to avoid collision
             
             # Build the URL with the token (if any)
             post_prompt_url = agent_to_use._build_webhook_url("post_prompt", query_params)
@@ -736,11 +858,11 @@ class AgentBase(
                 post_prompt_url = agent_to_use._post_prompt_url_override
                 
         # Add answer verb with auto-answer enabled
-        agent_to_use.add_verb("answer", {})
+        document.add_verb("answer", {})
         
         # Add recording if enabled
         if agent_to_use._record_call:
-            agent_to_use.add_verb("record_call", {
+            document.add_verb("record_call", {
                 "format": agent_to_use._record_format,
                 "stereo": agent_to_use._record_stereo
             })
@@ -870,7 +992,7 @@ class AgentBase(
             ai_config["global_data"] = agent_to_use._global_data
         
         # Add the AI verb to the document
-        agent_to_use.add_verb("ai", ai_config)
+        document.add_verb("ai", ai_config)
         
         # Apply any modifications from the callback to agent state
         if modifications and isinstance(modifications, dict):
@@ -886,20 +1008,24 @@ class AgentBase(
                     ai_config[key] = value
             
             # Clear and rebuild the document with the modified AI config
-            agent_to_use.reset_document()
-            agent_to_use.add_verb("answer", {})
+            document = agent_to_use.new_document()
+            document.add_verb("answer", {})
             
             # Add recording if enabled
             if agent_to_use._record_call:
-                agent_to_use.add_verb("record_call", {
+                document.add_verb("record_call", {
                     "format": agent_to_use._record_format,
                     "stereo": agent_to_use._record_stereo
                 })
             
-            agent_to_use.add_verb("ai", ai_config)
+            document.add_verb("ai", ai_config)
+        
+        # Keep the last real document available through get_document()
+        if real_tokens:
+            agent_to_use._current_document = document.to_dict()
         
         # Return the rendered document as a string
-        return agent_to_use.render_document()
+        return document.render()
     
     def _build_webhook_url(self, endpoint: str, query_params: Optional[Dict[str, str]] = None) -> str:
         """
@@ -973,6 +1099,38 @@ class AgentBase(
                         
         return None
     
+    # Configuration containers an ephemeral copy shares with its base agent until
+    # it first modifies them (see _writable)
+    _COPY_ON_WRITE_FIELDS = (
+        '_params', '_hints', '_languages', '_pronounce', '_global_data',
+        '_function_includes', 'native_functions', '_swaig_query_params',
+        '_prompt_llm_params', '_post_prompt_llm_params', '_internal_fillers', 'pom'
+    )
+    
+    def _writable(self, name: str) -> Any:
+        """
+        Get a configuration container for in-place modification
+        
+        On an ephemeral copy, a container still shared with the base agent is
+        deep-copied on first modification, so the base agent is never changed.
+        On a regular agent the container is returned as is.
+        
+        Args:
+            name: Attribute name, one of _COPY_ON_WRITE_FIELDS
+            
+        Returns:
+            The container, owned by this agent
+        """
+        self._bump_config_version()
+        value = getattr(self, name)
+        shared = self.__dict__.get('_shared_with_base')
+        if shared and shared.get(name) is value:
+            import copy
+            value = copy.deepcopy(value)
+            setattr(self, name, value)
+            del shared[name]
+        return value
+    
     def _create_ephemeral_copy(self):
         """
         Create a lightweight copy of this agent for ephemeral configuration.
@@ -981,48 +1139,34 @@ class AgentBase(
         configuration for SWML generation. Used when dynamic configuration callbacks
         need to modify the agent without affecting the persistent state.
         
+        Configuration containers are shared copy-on-write: the copy reads the base
+        agent's containers until it modifies one, and only that one is copied.
+        Loaded skills are shared rather than set up again.
+        
         Returns:
             A lightweight copy of the agent suitable for ephemeral modifications
         """
-        import copy
-        
         # Create a new instance of the same class
         cls = self.__class__
         ephemeral_agent = cls.__new__(cls)
         
         # Copy all attributes as shallow references first
-        for key, value in self.__dict__.items():
-            setattr(ephemeral_agent, key, value)
-        
-        # Deep copy only the configuration that affects SWML generation
-        # These are the parts that dynamic config might modify
-        ephemeral_agent._params = copy.deepcopy(self._params)
-        ephemeral_agent._hints = copy.deepcopy(self._hints)
-        ephemeral_agent._languages = copy.deepcopy(self._languages)
-        ephemeral_agent._pronounce = copy.deepcopy(self._pronounce)
-        ephemeral_agent._global_data = copy.deepcopy(self._global_data)
-        ephemeral_agent._function_includes = copy.deepcopy(self._function_includes)
-        
-        # Deep copy the POM object if it exists to prevent sharing prompt sections
-        if hasattr(self, 'pom') and self.pom:
-            ephemeral_agent.pom = copy.deepcopy(self.pom)
-        # Handle native_functions which might be stored as an attribute or property
-        if hasattr(self, '_native_functions'):
-            ephemeral_agent._native_functions = copy.deepcopy(self._native_functions)
-        elif hasattr(self, 'native_functions'):
-            ephemeral_agent.native_functions = copy.deepcopy(self.native_functions)
-        ephemeral_agent._swaig_query_params = copy.deepcopy(self._swaig_query_params)
+        ephemeral_agent.__dict__.update(self.__dict__)
+        
+        # Containers that dynamic config might modify are copied on first write
+        ephemeral_agent._shared_with_base = {
+            name: self.__dict__[name]
+            for name in self._COPY_ON_WRITE_FIELDS
+            if self.__dict__.get(name) is not None
+        }
         
         # Create new manager instances that point to the ephemeral agent
         # This breaks the circular reference and allows independent modification
-        from signalwire_agents.core.agent.prompt.manager import PromptManager
-        from signalwire_agents.core.agent.tools.registry import ToolRegistry
-        
-        # Create new prompt manager for the ephemeral agent
         ephemeral_agent._prompt_manager = PromptManager(ephemeral_agent)
-        # Copy the prompt sections data
-        if hasattr(self._prompt_manager, '_sections'):
-            ephemeral_agent._prompt_manager._sections = copy.deepcopy(self._prompt_manager._sections)
+        # Carry over the prompt text and contexts (POM sections live in the shared pom)
+        for attr in ('_prompt_text', '_post_prompt_text', '_contexts'):
+            if hasattr(self._prompt_manager, attr):
+                setattr(ephemeral_agent._prompt_manager, attr, getattr(self._prompt_manager, attr))
         
         # Create new tool registry for the ephemeral agent
         ephemeral_agent._tool_registry = ToolRegistry(ephemeral_agent)
@@ -1035,23 +1179,14 @@ class AgentBase(
         
         # Create a new skill manager for the ephemeral agent
         # This is important because skills register tools with the agent's registry
-        from signalwire_agents.core.skill_manager import SkillManager
         ephemeral_agent.skill_manager = SkillManager(ephemeral_agent)
         
-        # Copy any already loaded skills from the original agent
-        # This ensures skills loaded during __init__ are available in the ephemeral agent
-        if hasattr(self.skill_manager, 'loaded_skills'):
-            for skill_key, skill_instance in self.skill_manager.loaded_skills.items():
-                # Re-load the skill in the ephemeral agent's context
-                # We need to get the skill name and params from the existing instance
-                skill_name = skill_instance.SKILL_NAME
-                skill_params = getattr(skill_instance, 'params', {})
-                try:
-                    ephemeral_agent.skill_manager.load_skill(skill_name, type(skill_instance), skill_params)
-                except Exception as e:
-                    self.log.warning("failed_to_copy_skill_to_ephemeral", 
-                                   skill_name=skill_name, 
-                                   error=str(e))
+        # Skills loaded by the base agent have already registered their tools, hints,
+        # global data and prompt sections, all of which the copy inherits, so their
+        # instances are shared instead of being set up again for every request
+        loaded_skills = getattr(self.skill_manager, 'loaded_skills', None)
+        if isinstance(loaded_skills, dict):
+            ephemeral_agent.skill_manager.inherit_skills(loaded_skills)
         
         # Re-bind the tool decorator method to the new instance
         ephemeral_agent.tool = ephemeral_agent._tool_decorator
@@ -18,17 +18,56 @@ The StructuredLoggerWrapper provides backward compatibility with existing
 structured logging calls (e.g., log.info("message", key=value)) while using
 standard Python logging underneath. This allows the entire codebase to work
 without changes while providing centralized logging control.
+
+Messages are only formatted for enabled levels. Values that are expensive to
+compute just for a log message (such as serializing a request body) can be
+wrapped with lazy() so they are only computed when the message is logged:
+
+    log.debug("request_body", body=lazy(json.dumps, body))
 """
 
 import logging
 import os
 import sys
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Callable
 
 # Global flag to ensure configuration only happens once
 _logging_configured = False
 
 
+class LazyValue:
+    """
+    A log value computed only when the message is formatted
+    """
+    
+    __slots__ = ('_func', '_args', '_kwargs')
+    
+    def __init__(self, func: Callable, *args, **kwargs):
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+    
+    def __str__(self) -> str:
+        return str(self._func(*self._args, **self._kwargs))
+    
+    __repr__ = __str__
+
+
+def lazy(func: Callable, *args, **kwargs) -> LazyValue:
+    """
+    Defer computing a log value until the message is actually logged
+    
+    Args:
+        func: Function computing the value
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+        
+    Returns:
+        LazyValue to pass as a structured logging keyword argument
+    """
+    return LazyValue(func, *args, **kwargs)
+
+
 class StructuredLoggerWrapper:
     """
     A wrapper that provides structured logging interface while using standard Python logging
@@ -61,30 +100,32 @@ class StructuredLoggerWrapper:
         else:
             return message
     
+    # Messages are only formatted when their level is enabled
+    
     def debug(self, message: str, **kwargs) -> None:
         """Log debug message with optional structured data"""
-        formatted = self._format_structured_message(message, **kwargs)
-        self._logger.debug(formatted)
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(self._format_structured_message(message, **kwargs))
     
     def info(self, message: str, **kwargs) -> None:
         """Log info message with optional structured data"""
-        formatted = self._format_structured_message(message, **kwargs)
-        self._logger.info(formatted)
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(self._format_structured_message(message, **kwargs))
     
     def warning(self, message: str, **kwargs) -> None:
         """Log warning message with optional structured data"""
-        formatted = self._format_structured_message(message, **kwargs)
-        self._logger.warning(formatted)
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(self._format_structured_message(message, **kwargs))
     
     def error(self, message: str, **kwargs) -> None:
         """Log error message with optional structured data"""
-        formatted = self._format_structured_message(message, **kwargs)
-        self._logger.error(formatted)
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._logger.error(self._format_structured_message(message, **kwargs))
     
     def critical(self, message: str, **kwargs) -> None:
         """Log critical message with optional structured data"""
-        formatted = self._format_structured_message(message, **kwargs)
-        self._logger.critical(formatted)
+        if self._logger.isEnabledFor(logging.CRITICAL):
+            self._logger.critical(self._format_structured_message(message, **kwargs))
     
     # Also support the 'warn' alias
     warn = warning
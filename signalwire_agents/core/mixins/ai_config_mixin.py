@@ -26,7 +26,7 @@ class AIConfigMixin:
             Self for method chaining
         """
         if isinstance(hint, str) and hint:
-            self._hints.append(hint)
+            self._writable('_hints').append(hint)
         return self
 
     def add_hints(self, hints: List[str]) -> 'AgentBase':
@@ -42,7 +42,7 @@ class AIConfigMixin:
         if hints and isinstance(hints, list):
             for hint in hints:
                 if isinstance(hint, str) and hint:
-                    self._hints.append(hint)
+                    self._writable('_hints').append(hint)
         return self
 
     def add_pattern_hint(self, 
@@ -63,7 +63,7 @@ class AIConfigMixin:
             Self for method chaining
         """
         if hint and pattern and replace:
-            self._hints.append({
+            self._writable('_hints').append({
                 "hint": hint,
                 "pattern": pattern,
                 "replace": replace,
@@ -143,7 +143,7 @@ class AIConfigMixin:
             fillers = speech_fillers or function_fillers
             language["fillers"] = fillers
         
-        self._languages.append(language)
+        self._writable('_languages').append(language)
         return self
 
     def set_languages(self, languages: List[Dict[str, Any]]) -> 'AgentBase':
@@ -158,6 +158,7 @@ class AIConfigMixin:
         """
         if languages and isinstance(languages, list):
             self._languages = languages
+            self._bump_config_version()
         return self
 
     def add_pronunciation(self, 
@@ -183,7 +184,7 @@ class AIConfigMixin:
             if ignore_case:
                 rule["ignore_case"] = True
             
-            self._pronounce.append(rule)
+            self._writable('_pronounce').append(rule)
         return self
 
     def set_pronunciations(self, pronunciations: List[Dict[str, Any]]) -> 'AgentBase':
@@ -198,6 +199,7 @@ class AIConfigMixin:
         """
         if pronunciations and isinstance(pronunciations, list):
             self._pronounce = pronunciations
+            self._bump_config_version()
         return self
 
     def set_param(self, key: str, value: Any) -> 'AgentBase':
@@ -212,7 +214,7 @@ class AIConfigMixin:
             Self for method chaining
         """
         if key:
-            self._params[key] = value
+            self._writable('_params')[key] = value
         return self
 
     def set_params(self, params: Dict[str, Any]) -> 'AgentBase':
@@ -226,7 +228,7 @@ class AIConfigMixin:
             Self for method chaining
         """
         if params and isinstance(params, dict):
-            self._params.update(params)
+            self._writable('_params').update(params)
         return self
 
     def set_global_data(self, data: Dict[str, Any]) -> 'AgentBase':
@@ -241,6 +243,7 @@ class AIConfigMixin:
         """
         if data and isinstance(data, dict):
             self._global_data = data
+            self._bump_config_version()
         return self
 
     def update_global_data(self, data: Dict[str, Any]) -> 'AgentBase':
@@ -254,7 +257,7 @@ class AIConfigMixin:
             Self for method chaining
         """
         if data and isinstance(data, dict):
-            self._global_data.update(data)
+            self._writable('_global_data').update(data)
         return self
 
     def set_native_functions(self, function_names: List[str]) -> 'AgentBase':
@@ -269,6 +272,7 @@ class AIConfigMixin:
         """
         if function_names and isinstance(function_names, list):
             self.native_functions = [name for name in function_names if isinstance(name, str)]
+            self._bump_config_version()
         return self
 
     def set_internal_fillers(self, internal_fillers: Dict[str, Dict[str, List[str]]]) -> 'AgentBase':
@@ -300,7 +304,7 @@ class AIConfigMixin:
         if internal_fillers and isinstance(internal_fillers, dict):
             if not hasattr(self, '_internal_fillers'):
                 self._internal_fillers = {}
-            self._internal_fillers.update(internal_fillers)
+            self._writable('_internal_fillers').update(internal_fillers)
         return self
 
     def add_internal_filler(self, function_name: str, language_code: str, fillers: List[str]) -> 'AgentBase':
@@ -322,10 +326,11 @@ class AIConfigMixin:
             if not hasattr(self, '_internal_fillers'):
                 self._internal_fillers = {}
             
-            if function_name not in self._internal_fillers:
-                self._internal_fillers[function_name] = {}
+            internal_fillers = self._writable('_internal_fillers')
+            if function_name not in internal_fillers:
+                internal_fillers[function_name] = {}
                 
-            self._internal_fillers[function_name][language_code] = fillers
+            internal_fillers[function_name][language_code] = fillers
         return self
 
     def add_function_include(self, url: str, functions: List[str], meta_data: Optional[Dict[str, Any]] = None) -> 'AgentBase':
@@ -348,7 +353,7 @@ class AIConfigMixin:
             if meta_data and isinstance(meta_data, dict):
                 include["meta_data"] = meta_data
             
-            self._function_includes.append(include)
+            self._writable('_function_includes').append(include)
         return self
 
     def set_function_includes(self, includes: List[Dict[str, Any]]) -> 'AgentBase':
@@ -370,6 +375,7 @@ class AIConfigMixin:
                         valid_includes.append(include)
             
             self._function_includes = valid_includes
+            self._bump_config_version()
         return self
     
     def set_prompt_llm_params(
@@ -409,31 +415,31 @@ class AIConfigMixin:
         if temperature is not None:
             if not 0.0 <= temperature <= 1.5:
                 raise ValueError("temperature must be between 0.0 and 1.5")
-            self._prompt_llm_params['temperature'] = temperature
+            self._writable('_prompt_llm_params')['temperature'] = temperature
         
         # Validate and set top_p
         if top_p is not None:
             if not 0.0 <= top_p <= 1.0:
                 raise ValueError("top_p must be between 0.0 and 1.0")
-            self._prompt_llm_params['top_p'] = top_p
+            self._writable('_prompt_llm_params')['top_p'] = top_p
         
         # Validate and set barge_confidence
         if barge_confidence is not None:
             if not 0.0 <= barge_confidence <= 1.0:
                 raise ValueError("barge_confidence must be between 0.0 and 1.0")
-            self._prompt_llm_params['barge_confidence'] = barge_confidence
+            self._writable('_prompt_llm_params')['barge_confidence'] = barge_confidence
         
         # Validate and set presence_penalty
         if presence_penalty is not None:
             if not -2.0 <= presence_penalty <= 2.0:
                 raise ValueError("presence_penalty must be between -2.0 and 2.0")
-            self._prompt_llm_params['presence_penalty'] = presence_penalty
+            self._writable('_prompt_llm_params')['presence_penalty'] = presence_penalty
         
         # Validate and set frequency_penalty
         if frequency_penalty is not None:
             if not -2.0 <= frequency_penalty <= 2.0:
                 raise ValueError("frequency_penalty must be between -2.0 and 2.0")
-            self._prompt_llm_params['frequency_penalty'] = frequency_penalty
+            self._writable('_prompt_llm_params')['frequency_penalty'] = frequency_penalty
         
         return self
     
@@ -470,24 +476,24 @@ class AIConfigMixin:
         if temperature is not None:
             if not 0.0 <= temperature <= 1.5:
                 raise ValueError("temperature must be between 0.0 and 1.5")
-            self._post_prompt_llm_params['temperature'] = temperature
+            self._writable('_post_prompt_llm_params')['temperature'] = temperature
         
         # Validate and set top_p
         if top_p is not None:
             if not 0.0 <= top_p <= 1.0:
                 raise ValueError("top_p must be between 0.0 and 1.0")
-            self._post_prompt_llm_params['top_p'] = top_p
+            self._writable('_post_prompt_llm_params')['top_p'] = top_p
         
         # Validate and set presence_penalty
         if presence_penalty is not None:
             if not -2.0 <= presence_penalty <= 2.0:
                 raise ValueError("presence_penalty must be between -2.0 and 2.0")
-            self._post_prompt_llm_params['presence_penalty'] = presence_penalty
+            self._writable('_post_prompt_llm_params')['presence_penalty'] = presence_penalty
         
         # Validate and set frequency_penalty
         if frequency_penalty is not None:
             if not -2.0 <= frequency_penalty <= 2.0:
                 raise ValueError("frequency_penalty must be between -2.0 and 2.0")
-            self._post_prompt_llm_params['frequency_penalty'] = frequency_penalty
+            self._writable('_post_prompt_llm_params')['frequency_penalty'] = frequency_penalty
         
         return self
\ No newline at end of file
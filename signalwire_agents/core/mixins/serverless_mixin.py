@@ -12,7 +12,7 @@ import json
 import sys
 from typing import Optional, Dict, Any
 
-from signalwire_agents.core.logging_config import get_execution_mode
+from signalwire_agents.core.logging_config import get_execution_mode, lazy
 from signalwire_agents.core.function_result import SwaigFunctionResult
 
 
@@ -208,7 +208,7 @@ class ServerlessMixin:
                 if call_id:
                     raw_data["call_id"] = call_id
             
-            req_log.debug("executing_function", args=json.dumps(args))
+            req_log.debug("executing_function", args=lazy(json.dumps, args))
             
             # Call the function using the existing on_function_call method
             result = self.on_function_call(function_name, args, raw_data)
@@ -222,7 +222,7 @@ class ServerlessMixin:
                 result_dict = {"response": str(result)}
             
             req_log.info("serverless_function_executed_successfully")
-            req_log.debug("function_result", result=json.dumps(result_dict))
+            req_log.debug("function_result", result=lazy(json.dumps, result_dict))
             return result_dict
             
         except Exception as e:
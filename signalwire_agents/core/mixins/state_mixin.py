@@ -7,7 +7,7 @@ Licensed under the MIT License.
 See LICENSE file in the project root for full license information.
 """
 
-from typing import Callable
+from typing import Callable, Dict, Iterable
 
 from signalwire_agents.core.function_result import SwaigFunctionResult
 
@@ -40,6 +40,27 @@ class StateMixin:
             self.log.error("token_creation_error", error=str(e), tool=tool_name, call_id=call_id)
             return ""
     
+    def _create_tool_tokens(self, tool_names: Iterable[str], call_id: str) -> Dict[str, str]:
+        """
+        Create the secure tokens for several tools of a call in one pass
+        
+        Args:
+            tool_names: Names of the tools
+            call_id: Call ID for this session
+            
+        Returns:
+            Dictionary mapping each tool name to its token (empty on failure)
+        """
+        try:
+            if not hasattr(self, '_session_manager'):
+                self.log.error("no_session_manager")
+                return {}
+            
+            return self._session_manager.create_tool_tokens(tool_names, call_id)
+        except Exception as e:
+            self.log.error("token_creation_error", error=str(e), call_id=call_id)
+            return {}
+    
     def validate_tool_token(self, function_name: str, token: str, call_id: str) -> bool:
         """
         Validate a tool token
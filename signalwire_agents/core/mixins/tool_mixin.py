@@ -9,9 +9,12 @@ See LICENSE file in the project root for full license information.
 
 from typing import Dict, Any, List, Optional, Callable
 import json
+import asyncio
 
 from signalwire_agents.core.swaig_function import SWAIGFunction
 from signalwire_agents.core.function_result import SwaigFunctionResult
+from signalwire_agents.core.tool_executor import resolve_result
+from signalwire_agents.core.logging_config import lazy
 from signalwire_agents.core.agent.tools.decorator import ToolDecorator
 
 
@@ -30,6 +33,8 @@ class ToolMixin:
         fillers: Optional[Dict[str, List[str]]] = None,
         webhook_url: Optional[str] = None,
         required: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
         **swaig_fields
     ) -> 'AgentBase':
         """
@@ -39,11 +44,13 @@ class ToolMixin:
             name: Function name (must be unique)
             description: Function description for the AI
             parameters: JSON Schema of parameters
-            handler: Function to call when invoked
+            handler: Function or coroutine function to call when invoked
             secure: Whether to require token validation
             fillers: Optional dict mapping language codes to arrays of filler phrases
             webhook_url: Optional external webhook URL to use instead of local handling
             required: Optional list of required parameter names
+            timeout: Optional seconds a call may take before it fails
+            max_concurrency: Optional limit on calls of this tool running at once
             **swaig_fields: Additional SWAIG fields to include in function definition
             
         Returns:
@@ -58,6 +65,8 @@ class ToolMixin:
             fillers=fillers,
             webhook_url=webhook_url,
             required=required,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
             **swaig_fields
         )
         return self
@@ -150,9 +159,14 @@ class ToolMixin:
             # External webhook functions should be called directly by SignalWire, not locally
             return {"response": f"External webhook function '{name}' should be executed by SignalWire at {func.webhook_url}, not locally"}
         
+        invalid = self._check_function_args(func, args)
+        if invalid is not None:
+            return invalid
+        
         # Call the handler for regular SWAIG functions
         try:
-            result = func.handler(args, raw_data)
+            # Coroutine handlers are run to completion when called synchronously
+            result = resolve_result(func.handler(args, raw_data))
             if result is None:
                 # If the handler returns None, create a default response
                 result = SwaigFunctionResult("Function executed successfully")
@@ -161,6 +175,84 @@ class ToolMixin:
             # If the handler raises an exception, return an error response
             return {"response": f"Error executing function '{name}': {str(e)}"}
     
+    async def on_function_call_async(self, name: str, args: Dict[str, Any], raw_data: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Invoke a SWAIG function from the web server without blocking its event loop
+        
+        Coroutine handlers are awaited directly. Regular handlers, and agents that
+        override on_function_call, run on the agent's tool thread pool. The tool's
+        timeout and max_concurrency settings apply either way.
+        
+        Args:
+            name: Function name
+            args: Function arguments
+            raw_data: Raw request data
+            
+        Returns:
+            Function result
+        """
+        func = self._tool_registry._swaig_functions.get(name)
+        if not isinstance(func, SWAIGFunction):
+            # Unknown and data_map functions only produce an error response
+            return self.on_function_call(name, args, raw_data)
+        
+        # Subclasses (or instances) replacing on_function_call keep full control of dispatch
+        overridden = getattr(self.on_function_call, '__func__', None) is not ToolMixin.on_function_call
+        native = func.is_async and not func.webhook_url and not overridden
+        
+        if native:
+            invalid = self._check_function_args(func, args)
+            if invalid is not None:
+                return invalid
+            
+            async def call():
+                result = await func.handler(args, raw_data)
+                if result is None:
+                    result = SwaigFunctionResult("Function executed successfully")
+                return result
+        else:
+            def call():
+                return self.on_function_call(name, args, raw_data)
+        
+        try:
+            return await self._tool_executor.run(
+                name, call, is_async=native,
+                timeout=func.timeout, max_concurrency=func.max_concurrency
+            )
+        except asyncio.TimeoutError:
+            self.log.warning("function_timeout", function=name)
+            return {"response": f"Error executing function '{name}': timed out"}
+        except Exception as e:
+            return {"response": f"Error executing function '{name}': {str(e)}"}
+    
+    
+    def _check_function_args(self, func: SWAIGFunction, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Validate a SWAIG function call's arguments against its parameter schema
+        
+        Follows the schema validation mode: nothing is checked when it is "off",
+        invalid arguments are logged when it is "warn", and rejected before the
+        handler runs when it is "strict".
+        
+        Args:
+            func: The function being called
+            args: Function arguments
+            
+        Returns:
+            An error response if the call must be rejected, None otherwise
+        """
+        mode = self.schema_utils.validation_mode if self.schema_utils else "off"
+        if mode == "off":
+            return None
+        
+        errors = func.get_arg_errors(args if args is not None else {})
+        if not errors:
+            return None
+        
+        self.log.warning("invalid_function_args", function=func.name, errors=errors, mode=mode)
+        if mode == "strict":
+            return {"response": f"Invalid arguments for function '{func.name}': {'; '.join(errors)}"}
+        return None
     
     def _execute_swaig_function(self, function_name: str, args: Optional[Dict[str, Any]] = None, call_id: Optional[str] = None, raw_data: Optional[Dict[str, Any]] = None):
         """
@@ -208,7 +300,7 @@ class ToolMixin:
                 if call_id:
                     raw_data["call_id"] = call_id
             
-            req_log.debug("executing_function", args=json.dumps(args))
+            req_log.debug("executing_function", args=lazy(json.dumps, args))
             
             # Call the function using the existing on_function_call method
             result = self.on_function_call(function_name, args, raw_data)
@@ -222,7 +314,7 @@ class ToolMixin:
                 result_dict = {"response": str(result)}
             
             req_log.info("serverless_function_executed_successfully")
-            req_log.debug("function_result", result=json.dumps(result_dict))
+            req_log.debug("function_result", result=lazy(json.dumps, result_dict))
             return result_dict
             
         except Exception as e:
@@ -18,8 +18,12 @@ from urllib.parse import urlparse, urlunparse
 from fastapi import FastAPI, APIRouter, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from signalwire_agents.core.logging_config import get_execution_mode
+from signalwire_agents.core.logging_config import get_execution_mode, lazy
 from signalwire_agents.core.function_result import SwaigFunctionResult
+from signalwire_agents.core.swml_service import request_scoped
+from signalwire_agents.core.prefork_server import (
+    PreforkServer, resolve_workers, DEFAULT_WORKER_SHUTDOWN_TIMEOUT
+)
 
 
 class WebMixin:
@@ -135,13 +139,18 @@ class WebMixin:
         
         return router
 
-    def serve(self, host: Optional[str] = None, port: Optional[int] = None) -> None:
+    def serve(self, host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None) -> None:
         """
         Start a web server for this agent
         
+        With more than one worker, the agent is served by pre-forked worker
+        processes sharing the listening socket (see PreforkServer).
+        
         Args:
             host: Optional host to override the default
             port: Optional port to override the default
+            workers: Optional number of worker processes (default: service.workers
+                     in the config file, SWML_WORKERS, or 1)
         """
         import uvicorn
         
@@ -269,17 +278,28 @@ class WebMixin:
         print(f"Basic Auth: {username}:{password} (source: {source})")
         
         # Check if SSL is enabled and start uvicorn accordingly
+        ssl_options = {}
         if getattr(self, 'ssl_enabled', False) and getattr(self, 'ssl_cert_path', None) and getattr(self, 'ssl_key_path', None):
             self.log.info("starting_with_ssl", cert=self.ssl_cert_path, key=self.ssl_key_path)
-            uvicorn.run(
-                self._app,
-                host=host,
-                port=port,
-                ssl_certfile=self.ssl_cert_path,
-                ssl_keyfile=self.ssl_key_path
-            )
+            ssl_options = {"ssl_certfile": self.ssl_cert_path, "ssl_keyfile": self.ssl_key_path}
+        
+        explicit_workers = workers
+        workers = workers or getattr(self, '_workers', 1)
+        if workers > 1:
+            def reload_workers():
+                # Pick up a changed worker count from the config file, unless
+                # one was passed to serve()
+                service_config = self._load_service_config(getattr(self, '_config_file', None), self.name)
+                return resolve_workers(explicit_workers, service_config)
+            
+            PreforkServer(
+                self._app, host, port, workers,
+                shutdown_timeout=getattr(self, '_worker_shutdown_timeout', DEFAULT_WORKER_SHUTDOWN_TIMEOUT),
+                on_reload=reload_workers,
+                **ssl_options
+            ).run()
         else:
-            uvicorn.run(self._app, host=host, port=port)
+            uvicorn.run(self._app, host=host, port=port, **ssl_options)
 
     def run(self, event=None, context=None, force_mode=None, host: Optional[str] = None, port: Optional[int] = None):
         """
@@ -397,58 +417,14 @@ class WebMixin:
                 
                 self.log.info("callback_endpoint_registered", path=callback_path)
     
+    @request_scoped
     async def _handle_root_request(self, request: Request):
         """Handle GET/POST requests to the root endpoint"""
-        # Debug logging to understand the state before any changes
+        # The request's proxy URL (if any) is in scope for rendering, so mixing
+        # direct and proxied access works without sharing state between requests
         self.log.debug("_handle_root_request entry",
-                      proxy_url_base=getattr(self, '_proxy_url_base', None),
-                      proxy_url_base_from_env=getattr(self, '_proxy_url_base_from_env', False),
-                      env_var=os.environ.get('SWML_PROXY_URL_BASE'))
-        
-        # Always detect proxy from current request headers - this allows mixing direct and proxied access
-        # Check for proxy headers
-        forwarded_host = request.headers.get("X-Forwarded-Host")
-        forwarded_proto = request.headers.get("X-Forwarded-Proto", "http")
-        
-        if forwarded_host:
-            # Only update proxy URL if it wasn't set from environment
-            if not getattr(self, '_proxy_url_base_from_env', False):
-                # Set proxy_url_base on both self and super() to ensure it's shared
-                self._proxy_url_base = f"{forwarded_proto}://{forwarded_host}"
-                self._current_request = request  # Store current request for get_full_url
-                if hasattr(super(), '_proxy_url_base'):
-                    # Ensure parent class has the same proxy URL
-                    super()._proxy_url_base = self._proxy_url_base
-                
-                self.log.debug("proxy_detected_for_request", proxy_url_base=self._proxy_url_base, 
-                             source="X-Forwarded headers")
-            else:
-                self.log.debug("proxy headers present but keeping env proxy URL",
-                             forwarded_proto=forwarded_proto,
-                             forwarded_host=forwarded_host,
-                             keeping_proxy_url=self._proxy_url_base,
-                             source="environment variable")
-        else:
-            # No proxy headers - only clear proxy URL if it wasn't set from environment
-            if not getattr(self, '_proxy_url_base_from_env', False):
-                self.log.debug("No proxy headers found, clearing proxy URL",
-                             proxy_url_base_from_env=getattr(self, '_proxy_url_base_from_env', False))
-                self._proxy_url_base = None
-                if hasattr(super(), '_proxy_url_base'):
-                    super()._proxy_url_base = None
-            else:
-                self.log.debug("No proxy headers found, but keeping env proxy URL",
-                             proxy_url_base=getattr(self, '_proxy_url_base', None),
-                             proxy_url_base_from_env=True)
-            self._current_request = request  # Store current request for get_full_url
-            
-            # Try the parent class detection method if it exists
-            if hasattr(super(), '_detect_proxy_from_request'):
-                # Call the parent's detection method
-                super()._detect_proxy_from_request(request)
-                # Copy the result to our class if found
-                if hasattr(super(), '_proxy_url_base') and getattr(super(), '_proxy_url_base', None):
-                    self._proxy_url_base = super()._proxy_url_base
+                      proxy_url_base=self._current_proxy_url_base(),
+                      proxy_url_base_from_env=getattr(self, '_proxy_url_base_from_env', False))
         
         # Check if this is a callback path request
         callback_path = getattr(request.state, "callback_path", None)
@@ -482,7 +458,7 @@ class WebMixin:
                 if raw_body:
                     try:
                         body = await request.json()
-                        req_log.debug("request_body_received", body_size=len(str(body)))
+                        req_log.debug("request_body_received", body_size=lazy(lambda: len(str(body))))
                         if body:
                             req_log.debug("request_body")
                     except Exception as e:
@@ -549,6 +525,7 @@ class WebMixin:
                 media_type="application/json"
             )
     
+    @request_scoped
     async def _handle_debug_request(self, request: Request):
         """Handle GET/POST requests to the debug endpoint"""
         req_log = self.log.bind(
@@ -577,7 +554,7 @@ class WebMixin:
             if request.method == "POST":
                 try:
                     body = await request.json()
-                    req_log.debug("request_body_received", body_size=len(str(body)))
+                    req_log.debug("request_body_received", body_size=lazy(lambda: len(str(body))))
                     call_id = body.get("call_id")
                 except Exception as e:
                     req_log.warning("error_parsing_request_body", error=str(e))
@@ -617,6 +594,7 @@ class WebMixin:
                 media_type="application/json"
             )
     
+    @request_scoped
     async def _handle_swaig_request(self, request: Request, response: Response):
         """Handle GET/POST requests to the SWAIG endpoint"""
         req_log = self.log.bind(
@@ -653,9 +631,9 @@ class WebMixin:
             # For POST requests, process SWAIG function calls
             try:
                 body = await request.json()
-                req_log.debug("request_body_received", body_size=len(str(body)))
+                req_log.debug("request_body_received", body_size=lazy(lambda: len(str(body))))
                 if body:
-                    req_log.debug("request_body", body=json.dumps(body))
+                    req_log.debug("request_body", body=lazy(json.dumps, body))
             except Exception as e:
                 req_log.error("error_parsing_request_body", error=str(e))
                 body = {}
@@ -679,11 +657,11 @@ class WebMixin:
             if "argument" in body and isinstance(body["argument"], dict):
                 if "parsed" in body["argument"] and isinstance(body["argument"]["parsed"], list) and body["argument"]["parsed"]:
                     args = body["argument"]["parsed"][0]
-                    req_log.debug("parsed_arguments", args=json.dumps(args))
+                    req_log.debug("parsed_arguments", args=lazy(json.dumps, args))
                 elif "raw" in body["argument"]:
                     try:
                         args = json.loads(body["argument"]["raw"])
-                        req_log.debug("raw_arguments_parsed", args=json.dumps(args))
+                        req_log.debug("raw_arguments_parsed", args=lazy(json.dumps, args))
                     except Exception as e:
                         req_log.error("error_parsing_raw_arguments", error=str(e), raw=body["argument"]["raw"])
             
@@ -709,7 +687,7 @@ class WebMixin:
                         req_log.warning("token_invalid")
                         if hasattr(self._session_manager, 'debug_token'):
                             debug_info = self._session_manager.debug_token(token)
-                            req_log.debug("token_debug", debug=json.dumps(debug_info))
+                            req_log.debug("token_debug", debug=lazy(json.dumps, debug_info))
             
             # Check if we need to use an ephemeral agent for dynamic configuration
             agent_to_use = self
@@ -733,7 +711,8 @@ class WebMixin:
             
             # Call the function
             try:
-                result = agent_to_use.on_function_call(function_name, args, body)
+                # Handlers run off the event loop so a slow tool doesn't stall other calls
+                result = await agent_to_use.on_function_call_async(function_name, args, body)
                 
                 # Convert result to dict if needed
                 if isinstance(result, SwaigFunctionResult):
@@ -744,7 +723,7 @@ class WebMixin:
                     result_dict = {"response": str(result)}
                 
                 req_log.info("function_executed_successfully")
-                req_log.debug("function_result", result=json.dumps(result_dict))
+                req_log.debug("function_result", result=lazy(json.dumps, result_dict))
                 return result_dict
             except Exception as e:
                 req_log.error("function_execution_error", error=str(e))
@@ -758,6 +737,7 @@ class WebMixin:
                 media_type="application/json"
             )
 
+    @request_scoped
     async def _handle_post_prompt_request(self, request: Request):
         """Handle GET/POST requests to the post_prompt endpoint"""
         req_log = self.log.bind(
@@ -820,7 +800,7 @@ class WebMixin:
                             # Debug information for token validation issues
                             if hasattr(self._session_manager, 'debug_token'):
                                 debug_info = self._session_manager.debug_token(token)
-                                req_log.debug("token_debug", debug=json.dumps(debug_info))
+                                req_log.debug("token_debug", debug=lazy(json.dumps, debug_info))
                     except Exception as e:
                         req_log.error("token_validation_error", error=str(e))
                         
@@ -845,7 +825,7 @@ class WebMixin:
                 
                 # Only log if not suppressed
                 if not getattr(self, '_suppress_logs', False):
-                    req_log.debug("request_body_received", body_size=len(str(body)))
+                    req_log.debug("request_body_received", body_size=lazy(lambda: len(str(body))))
                     # Log the raw body directly (let the logger handle the JSON encoding)
                     req_log.info("post_prompt_body", body=body)
             except Exception as e:
@@ -895,6 +875,7 @@ class WebMixin:
                 media_type="application/json"
             )
     
+    @request_scoped
     async def _handle_check_for_input_request(self, request: Request):
         """Handle GET/POST requests to the check_for_input endpoint"""
         req_log = self.log.bind(
@@ -922,7 +903,7 @@ class WebMixin:
             if request.method == "POST":
                 try:
                     body = await request.json()
-                    req_log.debug("request_body_received", body_size=len(str(body)))
+                    req_log.debug("request_body_received", body_size=lazy(lambda: len(str(body))))
                     conversation_id = body.get("conversation_id")
                 except Exception as e:
                     req_log.error("error_parsing_request_body", error=str(e))
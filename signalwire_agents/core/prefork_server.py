@@ -0,0 +1,288 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Pre-fork multi-process server for agents
+
+The parent process builds the app (with its agents) and binds the listening
+socket, then forks worker processes that each serve the app with uvicorn on
+the shared socket. Workers inherit the preloaded agents, including their
+session token secrets, so a token minted by one worker validates on another.
+"""
+
+import os
+import time
+import signal
+import socket
+from typing import Any, Callable, Dict, Optional
+
+from signalwire_agents.core.logging_config import get_logger
+
+logger = get_logger("prefork_server")
+
+# Environment variables for the multi-process mode (config file: service.workers,
+# service.worker_shutdown_timeout)
+WORKERS_ENV_VAR = 'SWML_WORKERS'
+WORKER_SHUTDOWN_TIMEOUT_ENV_VAR = 'SWML_WORKER_SHUTDOWN_TIMEOUT'
+DEFAULT_WORKER_SHUTDOWN_TIMEOUT = 30.0
+
+# Workers exiting sooner than this after starting are respawned with a delay
+_MIN_WORKER_LIFETIME = 1.0
+
+
+def resolve_workers(workers: Optional[int] = None, service_config: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Resolve the number of worker processes
+
+    Args:
+        workers: Explicit number of workers, taking precedence
+        service_config: Service section of the config file
+
+    Returns:
+        Number of workers (1 means a single process, without forking)
+    """
+    if workers is None and service_config:
+        workers = service_config.get('workers')
+    if workers is None:
+        workers = os.environ.get(WORKERS_ENV_VAR)
+    try:
+        return max(1, int(workers)) if workers is not None else 1
+    except (TypeError, ValueError):
+        logger.warning("invalid_worker_count", workers=workers)
+        return 1
+
+
+def resolve_worker_shutdown_timeout(service_config: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Resolve the seconds workers get to finish in-flight requests when stopped
+
+    Args:
+        service_config: Service section of the config file
+
+    Returns:
+        Timeout in seconds
+    """
+    timeout = (service_config or {}).get('worker_shutdown_timeout')
+    if timeout is None:
+        timeout = os.environ.get(WORKER_SHUTDOWN_TIMEOUT_ENV_VAR, DEFAULT_WORKER_SHUTDOWN_TIMEOUT)
+    try:
+        return float(timeout)
+    except (TypeError, ValueError):
+        logger.warning("invalid_worker_shutdown_timeout", timeout=timeout)
+        return DEFAULT_WORKER_SHUTDOWN_TIMEOUT
+
+
+class PreforkServer:
+    """
+    Serve an ASGI app from several worker processes sharing one listening socket
+
+    Signals sent to the parent process:
+        SIGTERM, SIGINT: stop the workers gracefully and exit
+        SIGHUP: graceful reload - call on_reload, start a new set of workers,
+                then gracefully stop the old ones. Workers are forked from the
+                parent, so code changes still need a restart.
+
+    Workers that exit unexpectedly are replaced.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        host: str,
+        port: int,
+        workers: int,
+        shutdown_timeout: float = DEFAULT_WORKER_SHUTDOWN_TIMEOUT,
+        on_reload: Optional[Callable[[], Optional[int]]] = None,
+        **uvicorn_options
+    ):
+        """
+        Initialize the server
+
+        Args:
+            app: ASGI app to serve, built before the workers are forked
+            host: Host to bind to
+            port: Port to bind to
+            workers: Number of worker processes
+            shutdown_timeout: Seconds workers get to finish in-flight requests when stopped
+            on_reload: Optional callback run in the parent on SIGHUP, before new
+                       workers are started; may return a new number of workers
+            **uvicorn_options: Additional uvicorn.Config options (log_level, ssl_certfile, ...)
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.shutdown_timeout = shutdown_timeout
+        self.on_reload = on_reload
+        self.uvicorn_options = uvicorn_options
+
+        self._socket: Optional[socket.socket] = None
+        # Worker pid -> start time, for the current and retiring generations
+        self._workers: Dict[int, float] = {}
+        self._retiring: Dict[int, float] = {}
+        self._stopping = False
+        self._reload_requested = False
+
+    def bind(self) -> socket.socket:
+        """
+        Bind the listening socket shared by the workers
+
+        Returns:
+            The listening socket
+        """
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self._socket = sock
+        return sock
+
+    def run(self) -> None:
+        """Start the workers and supervise them until stopped"""
+        if not hasattr(os, "fork"):
+            # No fork (Windows): serve from this process
+            logger.warning("prefork_unavailable", workers=self.workers)
+            import uvicorn
+            uvicorn.run(self.app, host=self.host, port=self.port, **self.uvicorn_options)
+            return
+
+        if self._socket is None:
+            self.bind()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        logger.info("prefork_server_starting", host=self.host, port=self.port, workers=self.workers,
+                    pid=os.getpid())
+        try:
+            self._spawn_workers()
+            while not self._stopping:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._reload()
+                self._reap_workers()
+                time.sleep(0.1)
+        finally:
+            self._stop_workers()
+            self._socket.close()
+            logger.info("prefork_server_stopped")
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame) -> None:
+        self._reload_requested = True
+
+    def _spawn_workers(self) -> None:
+        """Start workers until the current generation is complete"""
+        while len(self._workers) < self.workers and not self._stopping:
+            pid = os.fork()
+            if pid == 0:
+                self._run_worker()
+            self._workers[pid] = time.monotonic()
+            logger.debug("worker_started", pid=pid)
+
+    def _run_worker(self) -> None:
+        """Serve the app in a forked worker; never returns"""
+        exit_code = 0
+        try:
+            # uvicorn installs its own handlers for graceful shutdown
+            for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                signal.signal(signum, signal.SIG_DFL)
+
+            import uvicorn
+            config = uvicorn.Config(self.app, timeout_graceful_shutdown=self.shutdown_timeout,
+                                    **self.uvicorn_options)
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except BaseException as e:
+            logger.error("worker_failed", pid=os.getpid(), error=str(e))
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _reap_workers(self) -> None:
+        """Collect exited workers and replace unexpected exits"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+
+            if pid in self._retiring:
+                del self._retiring[pid]
+                logger.debug("worker_retired", pid=pid)
+                continue
+
+            started = self._workers.pop(pid, None)
+            if started is None:
+                continue
+            logger.warning("worker_exited", pid=pid, status=status)
+            if time.monotonic() - started < _MIN_WORKER_LIFETIME:
+                # Don't fork in a tight loop when workers fail at startup
+                time.sleep(_MIN_WORKER_LIFETIME)
+
+        self._spawn_workers()
+
+    def _reload(self) -> None:
+        """Replace all workers without refusing connections"""
+        logger.info("prefork_server_reloading")
+        if self.on_reload is not None:
+            try:
+                workers = self.on_reload()
+                if workers:
+                    self.workers = workers
+            except Exception as e:
+                logger.error("reload_callback_failed", error=str(e))
+
+        # New workers share the socket with the old ones until those finish
+        old_workers = self._workers
+        self._workers = {}
+        self._spawn_workers()
+        for pid in old_workers:
+            self._signal_worker(pid, signal.SIGTERM)
+        self._retiring.update(old_workers)
+
+    def _stop_workers(self) -> None:
+        """Gracefully stop all workers, killing those that don't finish in time"""
+        pids = set(self._workers) | set(self._retiring)
+        for pid in pids:
+            self._signal_worker(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.shutdown_timeout + 5
+        while pids and time.monotonic() < deadline:
+            for pid in list(pids):
+                try:
+                    done, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    done = pid
+                if done:
+                    pids.discard(pid)
+            time.sleep(0.05)
+
+        for pid in pids:
+            logger.warning("worker_killed", pid=pid)
+            self._signal_worker(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._workers.clear()
+        self._retiring.clear()
+
+    @staticmethod
+    def _signal_worker(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
@@ -11,8 +11,10 @@ See LICENSE file in the project root for full license information.
 Session manager for handling call sessions and security tokens
 """
 
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Optional, Tuple, Iterable
+import os
 import secrets
+import struct
 import time
 import hmac
 import hashlib
@@ -20,6 +22,28 @@ import base64
 from datetime import datetime, timedelta
 
 
+# Compact token layout, base64url encoded without padding:
+#   version (1) | expiry (4) | nonce (4) | call_id length (2) | function length (2)
+#   | call_id | function | signature (16)
+# The signature is the truncated HMAC-SHA256 of everything before it.
+TOKEN_VERSION = 1
+_TOKEN_HEADER = struct.Struct(">BI4sHH")
+_SIGNATURE_SIZE = 16
+_NONCE_SIZE = 4
+
+_HMAC_BLOCK_SIZE = 64
+_IPAD = bytes(x ^ 0x36 for x in range(256))
+_OPAD = bytes(x ^ 0x5C for x in range(256))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(token: str) -> bytes:
+    return base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+
+
 class SessionManager:
     """
     Manages security tokens for function calls
@@ -40,6 +64,23 @@ class SessionManager:
         # Use provided secret key or generate a secure one
         self.secret_key = secret_key or secrets.token_hex(32)
     
+    @property
+    def secret_key(self) -> str:
+        """Secret key for signing tokens"""
+        return self._secret_key
+    
+    @secret_key.setter
+    def secret_key(self, secret_key: str) -> None:
+        self._secret_key = secret_key
+        # HMAC-SHA256 with the keyed inner and outer hash states precomputed
+        # (RFC 2104), copied for every token instead of re-keying from scratch
+        key = secret_key.encode()
+        if len(key) > _HMAC_BLOCK_SIZE:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(_HMAC_BLOCK_SIZE, b"\0")
+        self._inner = hashlib.sha256(key.translate(_IPAD))
+        self._outer = hashlib.sha256(key.translate(_OPAD))
+    
     def create_session(self, call_id: Optional[str] = None) -> str:
         """
         Create a new session ID if one isn't provided
@@ -56,6 +97,16 @@ class SessionManager:
         
         return call_id
     
+    def _hmac(self, message: bytes) -> bytes:
+        inner = self._inner.copy()
+        inner.update(message)
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+    
+    def _sign(self, message: bytes) -> bytes:
+        return self._hmac(message)[:_SIGNATURE_SIZE]
+    
     def generate_token(self, function_name: str, call_id: str) -> str:
         """
         Generate a secure self-contained token for a function call
@@ -67,25 +118,36 @@ class SessionManager:
         Returns:
             A secure token
         """
-        # Create token parts
-        expiry = int(time.time()) + self.token_expiry_secs
-        nonce = secrets.token_hex(4)
-        
-        # Create the message to sign
-        message = f"{call_id}:{function_name}:{expiry}:{nonce}"
+        return self.generate_tokens([function_name], call_id)[function_name]
+    
+    def generate_tokens(self, function_names: Iterable[str], call_id: str) -> Dict[str, str]:
+        """
+        Generate the tokens for several functions of a call in one pass
         
-        # Sign the message
-        signature = hmac.new(
-            self.secret_key.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()[:16]  # Use first 16 chars of signature for shorter tokens
+        The expiry and encoded call ID are shared, and the nonces come from a
+        single random read.
         
-        # Combine all parts into the token
-        token = f"{call_id}.{function_name}.{expiry}.{nonce}.{signature}"
+        Args:
+            function_names: Names of the functions to generate tokens for
+            call_id: Call session ID
+            
+        Returns:
+            Dictionary mapping each function name to its token
+        """
+        names = list(dict.fromkeys(function_names))
+        expiry = int(time.time()) + self.token_expiry_secs
+        call_id_bytes = (call_id or "").encode()
+        nonces = os.urandom(_NONCE_SIZE * len(names))
         
-        # Base64 encode for URL safety
-        return base64.urlsafe_b64encode(token.encode()).decode()
+        tokens = {}
+        for i, function_name in enumerate(names):
+            function_bytes = function_name.encode()
+            message = _TOKEN_HEADER.pack(
+                TOKEN_VERSION, expiry, nonces[i * _NONCE_SIZE:(i + 1) * _NONCE_SIZE],
+                len(call_id_bytes), len(function_bytes)
+            ) + call_id_bytes + function_bytes
+            tokens[function_name] = _b64encode(message + self._sign(message))
+        return tokens
     
     # Alias for generate_token to maintain backward compatibility
     def create_tool_token(self, function_name: str, call_id: str) -> str:
@@ -101,6 +163,38 @@ class SessionManager:
         """
         return self.generate_token(function_name, call_id)
     
+    def create_tool_tokens(self, function_names: Iterable[str], call_id: str) -> Dict[str, str]:
+        """
+        Alias for generate_tokens, matching create_tool_token
+        
+        Args:
+            function_names: Names of the functions to generate tokens for
+            call_id: Call session ID
+            
+        Returns:
+            Dictionary mapping each function name to its token
+        """
+        return self.generate_tokens(function_names, call_id)
+    
+    def _parse_token(self, token: str) -> Optional[Tuple[str, str, int, bytes, bytes, bytes]]:
+        """
+        Split a token into its parts
+        
+        Returns:
+            (call_id, function_name, expiry, nonce, signature, signed message),
+            or None if the token is malformed
+        """
+        data = _b64decode(token)
+        if len(data) < _TOKEN_HEADER.size + _SIGNATURE_SIZE or data[0] != TOKEN_VERSION:
+            return None
+        _, expiry, nonce, call_id_len, function_len = _TOKEN_HEADER.unpack_from(data)
+        message_end = _TOKEN_HEADER.size + call_id_len + function_len
+        if len(data) != message_end + _SIGNATURE_SIZE:
+            return None
+        call_id = data[_TOKEN_HEADER.size:_TOKEN_HEADER.size + call_id_len].decode()
+        function_name = data[_TOKEN_HEADER.size + call_id_len:message_end].decode()
+        return call_id, function_name, expiry, nonce, data[message_end:], data[:message_end]
+    
     def validate_token(self, call_id: str, function_name: str, token: str) -> bool:
         """
         Validate a function call token
@@ -114,51 +208,52 @@ class SessionManager:
             True if valid, False otherwise
         """
         try:
-            # Decode the token
-            decoded_token = base64.urlsafe_b64decode(token.encode()).decode()
+            data = _b64decode(token)
+            if len(data) < _TOKEN_HEADER.size + _SIGNATURE_SIZE or data[0] != TOKEN_VERSION:
+                return self._validate_legacy_token(call_id, function_name, token)
+            _, expiry, _, call_id_len, function_len = _TOKEN_HEADER.unpack_from(data)
+            message_end = len(data) - _SIGNATURE_SIZE
+            if _TOKEN_HEADER.size + call_id_len + function_len != message_end:
+                return False
             
-            # Split the token parts
-            parts = decoded_token.split('.')
-            if len(parts) != 5:
+            # Verify the signature first, in constant time
+            if not hmac.compare_digest(data[message_end:], self._sign(data[:message_end])):
                 return False
-                
-            token_call_id, token_function, token_expiry, token_nonce, token_signature = parts
             
             # Special case: if call_id is None or empty, use the call_id from the token
             # This helps with scenarios where the call_id isn't provided in the request
-            if not call_id:
-                call_id = token_call_id
-            
-            # Verify the function matches
-            if token_function != function_name:
-                return False
-                
-            # Check if the token has expired
-            expiry = int(token_expiry)
-            if expiry < time.time():
-                return False
-                
-            # Recreate the message and verify the signature
-            message = f"{token_call_id}:{token_function}:{token_expiry}:{token_nonce}"
-            expected_signature = hmac.new(
-                self.secret_key.encode(),
-                message.encode(),
-                hashlib.sha256
-            ).hexdigest()[:16]
-            
-            if token_signature != expected_signature:
-                return False
-                
-            # Finally, verify the call_id matches unless we're in special case
-            # This check is done last to ensure the token is otherwise valid
-            if token_call_id != call_id:
-                return False
-                
-            return True
+            call_id_end = _TOKEN_HEADER.size + call_id_len
+            return (
+                data[call_id_end:message_end] == function_name.encode()
+                and expiry >= time.time()
+                and (not call_id or data[_TOKEN_HEADER.size:call_id_end] == call_id.encode())
+            )
         except Exception:
             # Any exception during validation means the token is invalid
             return False
     
+    def _validate_legacy_token(self, call_id: str, function_name: str, token: str) -> bool:
+        """
+        Validate a token in the previous text format (call_id.function.expiry.nonce.signature)
+        
+        Keeps tokens minted before an upgrade valid until they expire.
+        """
+        decoded_token = base64.urlsafe_b64decode(token.encode()).decode()
+        parts = decoded_token.split('.')
+        if len(parts) != 5:
+            return False
+        token_call_id, token_function, token_expiry, token_nonce, token_signature = parts
+        
+        message = f"{token_call_id}:{token_function}:{token_expiry}:{token_nonce}"
+        if not hmac.compare_digest(token_signature, self._hmac(message.encode()).hex()[:16]):
+            return False
+        
+        return (
+            token_function == function_name
+            and int(token_expiry) >= time.time()
+            and (not call_id or token_call_id == call_id)
+        )
+    
     # Alias for validate_token to maintain backward compatibility
     def validate_tool_token(self, function_name: str, token: str, call_id: str) -> bool:
         """
@@ -215,19 +310,21 @@ class SessionManager:
             Dictionary with token components and analysis
         """
         try:
-            # Decode the token
-            decoded_token = base64.urlsafe_b64decode(token.encode()).decode()
-            
-            # Split the token parts
-            parts = decoded_token.split('.')
-            if len(parts) != 5:
-                return {
-                    "valid_format": False,
-                    "parts_count": len(parts),
-                    "decoded": decoded_token
-                }
-                
-            token_call_id, token_function, token_expiry, token_nonce, token_signature = parts
+            parts = self._parse_token(token)
+            if parts is None:
+                # Previous text format
+                decoded_token = base64.urlsafe_b64decode(token.encode()).decode()
+                parts = decoded_token.split('.')
+                if len(parts) != 5:
+                    return {
+                        "valid_format": False,
+                        "parts_count": len(parts),
+                        "decoded": decoded_token
+                    }
+                token_call_id, token_function, token_expiry, token_nonce, token_signature = parts
+            else:
+                token_call_id, token_function, expiry, nonce, signature, _ = parts
+                token_expiry, token_nonce, token_signature = str(expiry), nonce.hex(), signature.hex()
             
             # Check expiration
             current_time = int(time.time())
@@ -17,7 +17,23 @@ class SkillManager:
     def __init__(self, agent):
         self.agent = agent
         self.loaded_skills: Dict[str, SkillBase] = {}
+        # Instance keys of skills shared from another agent (see inherit_skills)
+        self._inherited_skills: set = set()
         self.logger = get_logger("skill_manager")
+    
+    def inherit_skills(self, loaded_skills: Dict[str, SkillBase]):
+        """
+        Share skills already loaded and set up by another agent
+        
+        Used for ephemeral agent copies, which inherit the base agent's tools,
+        hints and prompt sections. Loading an inherited skill again succeeds
+        without setting it up a second time.
+        
+        Args:
+            loaded_skills: Loaded skills of the other agent, by instance key
+        """
+        self.loaded_skills.update(loaded_skills)
+        self._inherited_skills.update(loaded_skills)
         
     def load_skill(self, skill_name: str, skill_class: Type[SkillBase] = None, params: Optional[Dict[str, Any]] = None) -> tuple[bool, str]:
         """
@@ -98,6 +114,10 @@ class SkillManager:
             instance_key = skill_instance.get_instance_key()
             
             # Check if this instance is already loaded
+            if instance_key in self._inherited_skills:
+                self.logger.debug(f"Skill instance '{instance_key}' already available from the base agent")
+                return True, ""
+            
             if instance_key in self.loaded_skills:
                 # For single-instance skills, this is an error
                 if not skill_instance.SUPPORTS_MULTIPLE_INSTANCES:
@@ -196,6 +216,13 @@ class SkillManager:
             self.logger.warning(f"Skill '{skill_identifier}' is not loaded")
             return False
             
+        if instance_key in self._inherited_skills:
+            # The base agent still uses the shared instance; only drop it here
+            del self.loaded_skills[instance_key]
+            self._inherited_skills.discard(instance_key)
+            self.logger.info(f"Removed inherited skill instance '{instance_key}'")
+            return True
+            
         try:
             skill_instance.cleanup()
             del self.loaded_skills[instance_key]
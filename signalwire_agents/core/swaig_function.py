@@ -17,6 +17,8 @@ import logging
 
 # Import here to avoid circular imports
 from signalwire_agents.core.function_result import SwaigFunctionResult
+from signalwire_agents.core.tool_executor import resolve_result
+from signalwire_agents.utils.schema_utils import compile_validator
 
 class SWAIGFunction:
     """
@@ -32,6 +34,8 @@ class SWAIGFunction:
         fillers: Optional[Dict[str, List[str]]] = None,
         webhook_url: Optional[str] = None,
         required: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
         **extra_swaig_fields
     ):
         """
@@ -46,7 +50,13 @@ class SWAIGFunction:
             fillers: Optional dictionary of filler phrases by language code
             webhook_url: Optional external webhook URL to use instead of local handling
             required: Optional list of required parameter names
+            timeout: Optional seconds a call may take when invoked through the web server
+            max_concurrency: Optional limit on calls of this function running at once
             **extra_swaig_fields: Additional SWAIG fields to include in function definition
+        
+        The handler may be a regular function or a coroutine function. Coroutine
+        handlers are awaited on the server's event loop; regular handlers run on
+        the agent's tool thread pool.
         """
         self.name = name
         self.handler = handler
@@ -56,11 +66,19 @@ class SWAIGFunction:
         self.fillers = fillers
         self.webhook_url = webhook_url
         self.required = required or []
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
         self.extra_swaig_fields = extra_swaig_fields
         
+        # Coroutine handlers are awaited instead of being run on a thread
+        self.is_async = inspect.iscoroutinefunction(handler)
+        
         # Mark as external if webhook_url is provided
         self.is_external = webhook_url is not None
         
+        # Compiled on first validation; parameters are not expected to change afterwards
+        self._arg_validator = None
+        
     def _ensure_parameter_structure(self) -> Dict:
         """
         Ensure the parameters are correctly structured for SWML
@@ -110,7 +128,7 @@ class SWAIGFunction:
                 raw_data = {}  # Provide an empty dict as fallback
 
             # Call the handler with both args and raw_data
-            result = self.handler(args, raw_data)
+            result = resolve_result(self.handler(args, raw_data))
                 
             # Handle different result types - everything must end up as a SwaigFunctionResult
             if isinstance(result, SwaigFunctionResult):
@@ -134,6 +152,23 @@ class SWAIGFunction:
                 "Sorry, I couldn't complete that action. Please try again or contact support if the issue persists."
             ).to_dict()
         
+    def get_arg_errors(self, args: Dict[str, Any]) -> List[str]:
+        """
+        Check the arguments against the parameter schema
+        
+        The parameter schema is compiled into a validator on first use and
+        reused for every later call.
+        
+        Args:
+            args: Arguments to validate
+            
+        Returns:
+            List of error messages, empty if the arguments are valid
+        """
+        if self._arg_validator is None:
+            self._arg_validator = compile_validator(self._ensure_parameter_structure())
+        return self._arg_validator(args)
+        
     def validate_args(self, args: Dict[str, Any]) -> bool:
         """
         Validate the arguments against the parameter schema
@@ -144,8 +179,7 @@ class SWAIGFunction:
         Returns:
             True if valid, False otherwise
         """
-        # TODO: Implement JSON Schema validation
-        return True
+        return not self.get_arg_errors(args)
         
     def to_swaig(self, base_url: str, token: Optional[str] = None, call_id: Optional[str] = None, include_auth: bool = True) -> Dict[str, Any]:
         """
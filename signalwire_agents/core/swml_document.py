@@ -0,0 +1,128 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+SWML document under construction
+"""
+
+import json
+from typing import Dict, Any, Optional, Union
+
+
+class SWMLDocument:
+    """
+    A SWML document being built, validated against a service's verb schema
+
+    Each render builds into its own SWMLDocument, so a service can render
+    documents for concurrent requests without them sharing state. The
+    service is only read, for its verb handlers, schema and logger.
+    """
+
+    def __init__(self, service, document: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the document
+
+        Args:
+            service: SWMLService providing verb validation
+            document: Optional existing document dict to add to (default: a new empty document)
+        """
+        self.service = service
+        self.document = document if document is not None else service._create_empty_document()
+
+    def add_section(self, section_name: str) -> bool:
+        """
+        Add a new section to the document
+
+        Args:
+            section_name: Name of the section to add
+
+        Returns:
+            True if the section was added, False if it already exists
+        """
+        if section_name in self.document["sections"]:
+            return False
+
+        self.document["sections"][section_name] = []
+        return True
+
+    def add_verb(self, verb_name: str, config: Union[Dict[str, Any], int]) -> bool:
+        """
+        Add a verb to the main section
+
+        Args:
+            verb_name: The name of the verb to add
+            config: Configuration for the verb or direct value for certain verbs (e.g., sleep)
+
+        Returns:
+            True if the verb was added successfully, False otherwise
+        """
+        return self.add_verb_to_section("main", verb_name, config)
+
+    def add_verb_to_section(self, section_name: str, verb_name: str, config: Union[Dict[str, Any], int]) -> bool:
+        """
+        Add a verb to a specific section, creating the section if needed
+
+        Args:
+            section_name: Name of the section to add to
+            verb_name: The name of the verb to add
+            config: Configuration for the verb or direct value for certain verbs (e.g., sleep)
+
+        Returns:
+            True if the verb was added successfully, False otherwise
+        """
+        # Make sure the section exists
+        if section_name not in self.document["sections"]:
+            self.add_section(section_name)
+
+        # Special case for verbs that take direct values (like sleep)
+        if verb_name == "sleep" and isinstance(config, int):
+            # Sleep verb takes a direct integer value
+            self.document["sections"][section_name].append({verb_name: config})
+            return True
+
+        # Ensure config is a dictionary for other verbs
+        if not isinstance(config, dict):
+            self.service.log.warning("invalid_config_type", verb=verb_name, section=section_name,
+                                     expected="dict", got=type(config).__name__)
+            return False
+
+        # Check if we have a specialized handler for this verb
+        if self.service.verb_registry.has_handler(verb_name):
+            handler = self.service.verb_registry.get_handler(verb_name)
+            is_valid, errors = handler.validate_config(config)
+        else:
+            # Use schema-based validation for standard verbs
+            is_valid, errors = self.service.schema_utils.validate_verb(verb_name, config)
+
+        if not is_valid:
+            # Log validation errors
+            self.service.log.warning("verb_validation_error", verb=verb_name, section=section_name, errors=errors)
+            return False
+
+        # Add the verb to the section
+        self.document["sections"][section_name].append({verb_name: config})
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the document
+
+        Returns:
+            The SWML document as a dictionary
+        """
+        return self.document
+
+    def render(self) -> str:
+        """
+        Render the document as a JSON string
+
+        Returns:
+            The SWML document as a JSON string
+        """
+        return json.dumps(self.document)
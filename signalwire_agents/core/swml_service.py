@@ -21,6 +21,9 @@ import base64
 import logging
 import sys
 import types
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Dict, List, Any, Optional, Union, Callable, Tuple, Type
 from urllib.parse import urlparse
 
@@ -42,8 +45,77 @@ except ImportError:
 
 from signalwire_agents.utils.schema_utils import SchemaUtils
 from signalwire_agents.core.swml_handler import VerbHandlerRegistry, SWMLVerbHandler
+from signalwire_agents.core.swml_document import SWMLDocument
 from signalwire_agents.core.security_config import SecurityConfig
 
+# Public base URL of the request being handled, when it came through a proxy.
+# Scoped to the request so concurrent requests never see each other's URL.
+_request_proxy_url_base: ContextVar[Optional[str]] = ContextVar('swml_request_proxy_url_base', default=None)
+
+
+def request_scoped(handler: Callable) -> Callable:
+    """
+    Decorator running an async request handler with the request's proxy URL in scope
+    
+    The handler must be a method taking the request as its first argument.
+    """
+    @functools.wraps(handler)
+    async def wrapper(self, request, *args, **kwargs):
+        with self._request_url_scope(request):
+            return await handler(self, request, *args, **kwargs)
+    return wrapper
+
+
+# Verb methods for verbs only found through __getattr__, shared by all services
+_verb_methods: Dict[str, Callable] = {}
+
+
+def _make_verb_method(verb_name: str, verb_properties: Optional[Dict[str, Any]] = None) -> Callable:
+    """
+    Create the method adding a SWML verb to a service's current document
+    
+    Args:
+        verb_name: Name of the verb
+        verb_properties: Optional schema properties of the verb, for the docstring
+        
+    Returns:
+        Function to install as a method
+    """
+    # Handle sleep verb specially since it takes an integer directly
+    if verb_name == "sleep":
+        def sleep_method(self, duration=None, **kwargs):
+            """
+            Add the sleep verb to the document.
+            
+            Args:
+                duration: The amount of time to sleep in milliseconds
+            """
+            self.log.debug("executing_sleep_verb", duration=duration)
+            # Sleep verb takes a direct integer parameter in SWML
+            if duration is not None:
+                return self.add_verb("sleep", duration)
+            elif kwargs:
+                # Try to get the value from kwargs
+                return self.add_verb("sleep", next(iter(kwargs.values())))
+            else:
+                raise TypeError("sleep() missing required argument: 'duration'")
+        return sleep_method
+    
+    def verb_method(self, **kwargs):
+        self.log.debug("executing_verb_method", verb=verb_name, kwargs_count=len(kwargs))
+        config = {}
+        for key, value in kwargs.items():
+            if value is not None:
+                config[key] = value
+        return self.add_verb(verb_name, config)
+    
+    verb_method.__name__ = verb_name
+    if verb_properties and "description" in verb_properties:
+        verb_method.__doc__ = f"Add the {verb_name} verb to the document.\n\n{verb_properties['description']}"
+    else:
+        verb_method.__doc__ = f"Add the {verb_name} verb to the document."
+    return verb_method
+
 
 class SWMLService:
     """
@@ -67,7 +139,8 @@ class SWMLService:
         port: int = 3000,
         basic_auth: Optional[Tuple[str, str]] = None,
         schema_path: Optional[str] = None,
-        config_file: Optional[str] = None
+        config_file: Optional[str] = None,
+        schema_validation: Optional[str] = None
     ):
         """
         Initialize a new SWML service
@@ -80,6 +153,9 @@ class SWMLService:
             basic_auth: Optional (username, password) tuple for basic auth
             schema_path: Optional path to the schema file
             config_file: Optional path to configuration file
+            schema_validation: How verbs (and, for agents, SWAIG function arguments)
+                               are validated: "off", "warn" or "strict"
+                               (default: SWML_SCHEMA_VALIDATION or "warn")
         """
         self.name = name
         self.route = route.rstrip("/")  # Ensure no trailing slash
@@ -126,7 +202,7 @@ class SWMLService:
                 self.log.warning("schema_not_found")
         
         # Initialize schema utils
-        self.schema_utils = SchemaUtils(schema_path)
+        self.schema_utils = SchemaUtils(schema_path, validation_mode=schema_validation)
         
         # Initialize verb handler registry
         self.verb_registry = VerbHandlerRegistry()
@@ -139,10 +215,7 @@ class SWMLService:
         # Initialize SWML document state
         self._current_document = self._create_empty_document()
         
-        # Dictionary to cache dynamically created methods (instance level cache)
-        self._verb_methods_cache = {}
-        
-        # Create auto-vivified methods for all verbs
+        # Create auto-vivified methods for all verbs (once per class)
         self._create_verb_methods()
         
         # Initialize routing callbacks dictionary (path -> callback)
@@ -150,85 +223,33 @@ class SWMLService:
     
     def _create_verb_methods(self) -> None:
         """
-        Create auto-vivified methods for all verbs at initialization time
-        """
-        self.log.debug("creating_verb_methods")
+        Create auto-vivified methods for all verbs in the schema
         
+        The methods are created once per class and schema, as class attributes,
+        so every instance shares them. Verbs that already have a method are
+        left alone.
+        """
         # Get all verb names from the schema
         if not self.schema_utils:
             self.log.warning("no_schema_utils_available")
             return
-            
+        
+        cls = type(self)
+        verbs = self.schema_utils.verbs
+        if cls.__dict__.get('_verb_methods_schema') is verbs:
+            return
+        
         verb_names = self.schema_utils.get_all_verb_names()
-        self.log.debug("found_verbs_in_schema", count=len(verb_names))
+        self.log.debug("creating_verb_methods", count=len(verb_names))
         
         # Create a method for each verb
         for verb_name in verb_names:
-            # Skip verbs that already have specific methods
-            if hasattr(self, verb_name):
-                self.log.debug("skipping_verb_has_method", verb=verb_name)
+            # Skip verbs that already have specific methods (or were created for a base class)
+            if hasattr(cls, verb_name):
                 continue
-            
-            # Handle sleep verb specially since it takes an integer directly
-            if verb_name == "sleep":
-                def sleep_method(self_instance, duration=None, **kwargs):
-                    """
-                    Add the sleep verb to the document.
-                    
-                    Args:
-                        duration: The amount of time to sleep in milliseconds
-                    """
-                    self.log.debug("executing_sleep_verb", duration=duration)
-                    # Sleep verb takes a direct integer parameter in SWML
-                    if duration is not None:
-                        return self_instance.add_verb("sleep", duration)
-                    elif kwargs:
-                        # Try to get the value from kwargs
-                        return self_instance.add_verb("sleep", next(iter(kwargs.values())))
-                    else:
-                        raise TypeError("sleep() missing required argument: 'duration'")
-                
-                # Set it as an attribute of self
-                setattr(self, verb_name, types.MethodType(sleep_method, self))
-                
-                # Also cache it for later
-                self._verb_methods_cache[verb_name] = sleep_method
-                
-                self.log.debug("created_special_method", verb=verb_name)
-                continue
-                
-            # Generate the method implementation for normal verbs
-            def make_verb_method(name):
-                def verb_method(self_instance, **kwargs):
-                    """
-                    Dynamically generated method for SWML verb
-                    """
-                    self.log.debug("executing_verb_method", verb=name, kwargs_count=len(kwargs))
-                    config = {}
-                    for key, value in kwargs.items():
-                        if value is not None:
-                            config[key] = value
-                    return self_instance.add_verb(name, config)
-                
-                # Add docstring to the method
-                verb_properties = self.schema_utils.get_verb_properties(name)
-                if "description" in verb_properties:
-                    verb_method.__doc__ = f"Add the {name} verb to the document.\n\n{verb_properties['description']}"
-                else:
-                    verb_method.__doc__ = f"Add the {name} verb to the document."
-                
-                return verb_method
-            
-            # Create the method with closure over the verb name
-            method = make_verb_method(verb_name)
-            
-            # Set it as an attribute of self
-            setattr(self, verb_name, types.MethodType(method, self))
-            
-            # Also cache it for later
-            self._verb_methods_cache[verb_name] = method
-            
-            self.log.debug("created_verb_method", verb=verb_name)
+            setattr(cls, verb_name, _make_verb_method(verb_name, self.schema_utils.get_verb_properties(verb_name)))
+        
+        cls._verb_methods_schema = verbs
     
     def __getattr__(self, name: str) -> Any:
         """
@@ -236,95 +257,32 @@ class SWMLService:
         
         This method is called when an attribute lookup fails through the normal
         mechanisms. It checks if the attribute name corresponds to a SWML verb
-        defined in the schema, and if so, dynamically creates a method for that verb.
+        defined in the schema, and if so, returns a method for that verb.
         
         Args:
             name: The name of the attribute being accessed
             
         Returns:
-            The dynamically created verb method if name is a valid SWML verb,
+            The verb method bound to this instance if name is a valid SWML verb,
             otherwise raises AttributeError
             
         Raises:
             AttributeError: If name is not a valid SWML verb
         """
-        self.log.debug("getattr_called", attribute=name)
-        
-        # Simple version to match our test script
-        # First check if this is a valid SWML verb
-        if not self.schema_utils:
+        # Guard against lookups before __init__ has set up the schema
+        schema_utils = self.__dict__.get('schema_utils')
+        if not schema_utils:
             msg = f"'{self.__class__.__name__}' object has no attribute '{name}' (no schema available)"
-            self.log.debug("getattr_no_schema", attribute=name)
             raise AttributeError(msg)
-            
-        verb_names = self.schema_utils.get_all_verb_names()
         
-        if name in verb_names:
-            self.log.debug("getattr_valid_verb", verb=name)
-            
-            # Check if we already have this method in the cache
-            if not hasattr(self, '_verb_methods_cache'):
-                self._verb_methods_cache = {}
-                
-            if name in self._verb_methods_cache:
-                self.log.debug("getattr_cached_method", verb=name)
-                return types.MethodType(self._verb_methods_cache[name], self)
-            
-            # Handle sleep verb specially since it takes an integer directly
-            if name == "sleep":
-                def sleep_method(self_instance, duration=None, **kwargs):
-                    """
-                    Add the sleep verb to the document.
-                    
-                    Args:
-                        duration: The amount of time to sleep in milliseconds
-                    """
-                    self.log.debug("executing_sleep_method", duration=duration)
-                    # Sleep verb takes a direct integer parameter in SWML
-                    if duration is not None:
-                        return self_instance.add_verb("sleep", duration)
-                    elif kwargs:
-                        # Try to get the value from kwargs
-                        return self_instance.add_verb("sleep", next(iter(kwargs.values())))
-                    else:
-                        raise TypeError("sleep() missing required argument: 'duration'")
-                
-                # Cache the method for future use
-                self.log.debug("caching_sleep_method", verb=name)
-                self._verb_methods_cache[name] = sleep_method
-                
-                # Return the bound method
-                return types.MethodType(sleep_method, self)
-            
-            # Generate the method implementation for normal verbs
-            def verb_method(self_instance, **kwargs):
-                """
-                Dynamically generated method for SWML verb
-                """
-                self.log.debug("executing_dynamic_verb", verb=name, kwargs_count=len(kwargs))
-                config = {}
-                for key, value in kwargs.items():
-                    if value is not None:
-                        config[key] = value
-                return self_instance.add_verb(name, config)
-            
-            # Add docstring to the method
-            verb_properties = self.schema_utils.get_verb_properties(name)
-            if "description" in verb_properties:
-                verb_method.__doc__ = f"Add the {name} verb to the document.\n\n{verb_properties['description']}"
-            else:
-                verb_method.__doc__ = f"Add the {name} verb to the document."
-            
-            # Cache the method for future use
-            self.log.debug("caching_verb_method", verb=name)
-            self._verb_methods_cache[name] = verb_method
-            
-            # Return the bound method
-            return types.MethodType(verb_method, self)
+        if name in schema_utils.verbs:
+            method = _verb_methods.get(name)
+            if method is None:
+                method = _verb_methods.setdefault(name, _make_verb_method(name, schema_utils.get_verb_properties(name)))
+            return types.MethodType(method, self)
         
         # Not a valid verb
         msg = f"'{self.__class__.__name__}' object has no attribute '{name}'"
-        self.log.debug("getattr_invalid_attribute", attribute=name, error=msg)
         raise AttributeError(msg)
     
     def _find_schema_path(self) -> Optional[str]:
@@ -404,6 +362,18 @@ class SWMLService:
         """
         self._current_document = self._create_empty_document()
     
+    def new_document(self) -> SWMLDocument:
+        """
+        Create a new, empty document to build into
+        
+        Unlike the current document, a new document is not shared, so it can
+        be built while other requests render concurrently.
+        
+        Returns:
+            SWMLDocument validated against this service's verbs
+        """
+        return SWMLDocument(self)
+    
     def add_verb(self, verb_name: str, config: Union[Dict[str, Any], int]) -> bool:
         """
         Add a verb to the main section of the current document
@@ -415,36 +385,7 @@ class SWMLService:
         Returns:
             True if the verb was added successfully, False otherwise
         """
-        # Special case for verbs that take direct values (like sleep)
-        if verb_name == "sleep" and isinstance(config, int):
-            # Sleep verb takes a direct integer value
-            verb_obj = {verb_name: config}
-            self._current_document["sections"]["main"].append(verb_obj)
-            return True
-            
-        # Ensure config is a dictionary for other verbs
-        if not isinstance(config, dict):
-            self.log.warning(f"invalid_config_type", verb=verb_name, 
-                            expected="dict", got=type(config).__name__)
-            return False
-        
-        # Check if we have a specialized handler for this verb
-        if self.verb_registry.has_handler(verb_name):
-            handler = self.verb_registry.get_handler(verb_name)
-            is_valid, errors = handler.validate_config(config)
-        else:
-            # Use schema-based validation for standard verbs
-            is_valid, errors = self.schema_utils.validate_verb(verb_name, config)
-        
-        if not is_valid:
-            # Log validation errors
-            self.log.warning(f"verb_validation_error", verb=verb_name, errors=errors)
-            return False
-        
-        # Add the verb to the main section
-        verb_obj = {verb_name: config}
-        self._current_document["sections"]["main"].append(verb_obj)
-        return True
+        return SWMLDocument(self, self._current_document).add_verb(verb_name, config)
     
     def add_section(self, section_name: str) -> bool:
         """
@@ -456,11 +397,7 @@ class SWMLService:
         Returns:
             True if the section was added, False if it already exists
         """
-        if section_name in self._current_document["sections"]:
-            return False
-        
-        self._current_document["sections"][section_name] = []
-        return True
+        return SWMLDocument(self, self._current_document).add_section(section_name)
     
     def add_verb_to_section(self, section_name: str, verb_name: str, config: Union[Dict[str, Any], int]) -> bool:
         """
@@ -474,40 +411,7 @@ class SWMLService:
         Returns:
             True if the verb was added successfully, False otherwise
         """
-        # Make sure the section exists
-        if section_name not in self._current_document["sections"]:
-            self.add_section(section_name)
-        
-        # Special case for verbs that take direct values (like sleep)
-        if verb_name == "sleep" and isinstance(config, int):
-            # Sleep verb takes a direct integer value
-            verb_obj = {verb_name: config}
-            self._current_document["sections"][section_name].append(verb_obj)
-            return True
-            
-        # Ensure config is a dictionary for other verbs
-        if not isinstance(config, dict):
-            self.log.warning(f"invalid_config_type", verb=verb_name, section=section_name,
-                            expected="dict", got=type(config).__name__)
-            return False
-        
-        # Check if we have a specialized handler for this verb
-        if self.verb_registry.has_handler(verb_name):
-            handler = self.verb_registry.get_handler(verb_name)
-            is_valid, errors = handler.validate_config(config)
-        else:
-            # Use schema-based validation for standard verbs
-            is_valid, errors = self.schema_utils.validate_verb(verb_name, config)
-        
-        if not is_valid:
-            # Log validation errors
-            self.log.warning(f"verb_validation_error", verb=verb_name, section=section_name, errors=errors)
-            return False
-        
-        # Add the verb to the section
-        verb_obj = {verb_name: config}
-        self._current_document["sections"][section_name].append(verb_obj)
-        return True
+        return SWMLDocument(self, self._current_document).add_verb_to_section(section_name, verb_name, config)
     
     def get_document(self) -> Dict[str, Any]:
         """
@@ -962,8 +866,9 @@ class SWMLService:
                       caller=inspect.stack()[1].function if len(inspect.stack()) > 1 else "unknown")
         
         # Check if we have proxy information from a request
-        if hasattr(self, '_proxy_url_base') and self._proxy_url_base:
-            base = self._proxy_url_base.rstrip('/')
+        proxy_url_base = self._current_proxy_url_base()
+        if proxy_url_base:
+            base = proxy_url_base.rstrip('/')
             self.log.debug("Using proxy URL base", proxy_url_base=base)
 
             # Add auth credentials if requested
@@ -1079,28 +984,25 @@ class SWMLService:
         # Use the central URL building method
         return self._build_full_url(endpoint=endpoint, include_auth=True, query_params=query_params) 
 
-    def _detect_proxy_from_request(self, request: Request) -> None:
+    def _proxy_url_from_request(self, request: Request) -> Optional[str]:
         """
-        Detect if we're behind a proxy by examining request headers
-        and auto-configure proxy_url_base if needed
+        Work out the public base URL of a request that came through a proxy
+        
+        Only reads the request; nothing is stored on the service.
         
         Args:
             request: FastAPI Request object
-        """
-        # If SWML_PROXY_URL_BASE was already set (e.g., from environment), don't override it
-        if self._proxy_url_base:
-            return
             
+        Returns:
+            Base URL (protocol://host) or None if no proxy was detected
+        """
         # First check for standard X-Forwarded headers (used by most proxies including ngrok)
         forwarded_host = request.headers.get("X-Forwarded-Host")
         forwarded_proto = request.headers.get("X-Forwarded-Proto", "http")
         
         if forwarded_host:
             # Direct X-Forwarded-* headers - most common case
-            self._proxy_url_base = f"{forwarded_proto}://{forwarded_host}"
-            self.log.info("proxy_auto_detected", proxy_url_base=self._proxy_url_base, 
-                        source="X-Forwarded headers")
-            return
+            return f"{forwarded_proto}://{forwarded_host}"
             
         # If no standard headers, check other proxy detection methods
         
@@ -1117,10 +1019,7 @@ class SWMLService:
                 if host_part:
                     host = host_part.split('=', 1)[1].strip('"')
                     proto = proto_part.split('=', 1)[1].strip('"') if proto_part else "http"
-                    self._proxy_url_base = f"{proto}://{host}"
-                    self.log.info("proxy_auto_detected", proxy_url_base=self._proxy_url_base,
-                                source="Forwarded header")
-                    return
+                    return f"{proto}://{host}"
             except Exception as e:
                 self.log.warning("forwarded_header_parse_error", error=str(e))
         
@@ -1130,11 +1029,7 @@ class SWMLService:
         ):
             # This is likely a transparent proxy - extract base URL
             parsed = urlparse(str(request.url))
-            base_url = f"{parsed.scheme}://{parsed.netloc}"
-            self._proxy_url_base = base_url
-            self.log.info("proxy_auto_detected", proxy_url_base=base_url,
-                        source="request URL (transparent proxy)")
-            return
+            return f"{parsed.scheme}://{parsed.netloc}"
         
         # Check for other common proxy setups
         original_host = request.headers.get("X-Original-Host") or request.headers.get("Host")
@@ -1146,10 +1041,7 @@ class SWMLService:
             # If host doesn't look like local server or doesn't contain our port
             if not any(h in original_host for h in local_hosts) and local_port not in original_host:
                 proto = "https" if request.url.scheme == "https" else "http"
-                self._proxy_url_base = f"{proto}://{original_host}"
-                self.log.info("proxy_auto_detected", proxy_url_base=self._proxy_url_base,
-                            source="Host header")
-                return
+                return f"{proto}://{original_host}"
         
         # If forward_for header exists, we're likely behind a proxy but couldn't determine the URL
         forwarded_for = request.headers.get("X-Forwarded-For")
@@ -1158,11 +1050,66 @@ class SWMLService:
                           client_ip=forwarded_for,
                           message="Proxy detected via X-Forwarded-For header but could not determine public URL")
             
+        return None
+    
+    def _detect_proxy_from_request(self, request: Request) -> None:
+        """
+        Detect if we're behind a proxy by examining request headers
+        and auto-configure proxy_url_base if needed
+        
+        Args:
+            request: FastAPI Request object
+        """
+        # If SWML_PROXY_URL_BASE was already set (e.g., from environment), don't override it
+        if self._proxy_url_base:
+            return
+        
+        proxy_url_base = self._proxy_url_from_request(request)
+        if proxy_url_base:
+            self._proxy_url_base = proxy_url_base
+            self.log.info("proxy_auto_detected", proxy_url_base=proxy_url_base)
+            return
+            
         # No proxy detected, or unable to determine the public URL
         if self._proxy_debug:
             self.log.info("proxy_detection_failed", 
                         message="Could not auto-detect proxy. If you are behind a proxy, set SWML_PROXY_URL_BASE manually.")
     
+    @contextmanager
+    def _request_url_scope(self, request: Request):
+        """
+        Make the request's proxy URL the base for URLs built while handling it
+        
+        A proxy URL set in the environment always takes precedence.
+        
+        Args:
+            request: FastAPI Request object
+        """
+        proxy_url_base = None
+        if not getattr(self, '_proxy_url_base_from_env', False):
+            proxy_url_base = self._proxy_url_from_request(request)
+            if proxy_url_base:
+                self.log.debug("proxy_detected_for_request", proxy_url_base=proxy_url_base)
+        token = _request_proxy_url_base.set(proxy_url_base)
+        try:
+            yield
+        finally:
+            _request_proxy_url_base.reset(token)
+    
+    def _current_proxy_url_base(self) -> Optional[str]:
+        """
+        Get the proxy base URL to build URLs with
+        
+        Returns:
+            The environment's proxy URL if set, otherwise the proxy URL of the
+            request being handled, otherwise any manually set proxy URL
+        """
+        if not getattr(self, '_proxy_url_base_from_env', False):
+            request_proxy_url_base = _request_proxy_url_base.get()
+            if request_proxy_url_base:
+                return request_proxy_url_base
+        return getattr(self, '_proxy_url_base', None)
+    
     def manual_set_proxy_url(self, proxy_url: str) -> None:
         """
         Manually set the proxy URL base for webhook callbacks
@@ -0,0 +1,189 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""Execution of SWAIG function handlers off the event loop."""
+
+import os
+import asyncio
+import inspect
+import threading
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Same default as concurrent.futures.ThreadPoolExecutor
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def run_awaitable_sync(awaitable: Awaitable) -> Any:
+    """
+    Run an awaitable to completion from synchronous code
+
+    Used when a coroutine handler is invoked outside the web server (CGI,
+    Lambda, or direct calls). If the calling thread already runs an event
+    loop, the awaitable runs on a fresh loop in a helper thread.
+
+    Args:
+        awaitable: Coroutine or other awaitable
+
+    Returns:
+        The awaitable's result
+    """
+    async def wrapper():
+        return await awaitable
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(wrapper())
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = asyncio.run(wrapper())
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, name='swaig-coroutine')
+    thread.start()
+    thread.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['result']
+
+
+def resolve_result(result: Any) -> Any:
+    """Wait for a handler result if it is awaitable, otherwise return it unchanged"""
+    if inspect.isawaitable(result):
+        return run_awaitable_sync(result)
+    return result
+
+
+class ToolExecutor:
+    """
+    Runs SWAIG function handlers without blocking the event loop
+
+    Coroutine handlers are awaited on the event loop. Synchronous handlers
+    run on a bounded thread pool shared by an agent and its ephemeral
+    copies, in a copy of the caller's context so request-scoped state such
+    as the proxy URL is visible to them. Each tool can limit how many of its
+    calls run at once and how long a call may take.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout: Optional[float] = None):
+        """
+        Initialize the executor
+
+        Args:
+            max_workers: Threads available to synchronous handlers
+                         (default: min(32, CPU count + 4))
+            default_timeout: Seconds a call may take unless the tool sets
+                             its own timeout (default: no limit)
+        """
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        self.default_timeout = default_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Semaphores per tool name and limit, created inside the event loop
+        # that uses them; keyed on the limit too, so redefining a tool (or
+        # changing it in an ephemeral copy) with a new limit takes effect
+        self._limits: Dict[Tuple[str, int], asyncio.Semaphore] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the thread pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='swaig')
+            return self._executor
+
+    def _get_limit(self, name: str, max_concurrency: Optional[int]) -> Optional[asyncio.Semaphore]:
+        """Get the semaphore bounding concurrent calls of a tool"""
+        if not max_concurrency:
+            return None
+        key = (name, max_concurrency)
+        with self._lock:
+            limit = self._limits.get(key)
+            if limit is None:
+                limit = self._limits[key] = asyncio.Semaphore(max_concurrency)
+            return limit
+
+    async def run(self, name: str, call: Callable[[], Any], is_async: bool = False,
+                  timeout: Optional[float] = None, max_concurrency: Optional[int] = None) -> Any:
+        """
+        Run one tool call
+
+        Args:
+            name: Tool name, used for the concurrency limit
+            call: Function taking no arguments that performs the call; for
+                  coroutine handlers it must return an awaitable
+            is_async: Await ``call()`` on the event loop instead of running
+                      it on the thread pool
+            timeout: Seconds the call may take, including time waiting for a
+                     concurrency slot (default: the executor's default timeout)
+            max_concurrency: Most calls of this tool running at once
+
+        Returns:
+            The call's result
+
+        Raises:
+            asyncio.TimeoutError: If the call doesn't finish in time. A
+                synchronous handler keeps running on its thread, holding its
+                concurrency slot until it returns; its result is discarded
+        """
+        timeout = timeout if timeout is not None else self.default_timeout
+        limit = self._get_limit(name, max_concurrency)
+
+        async def limited():
+            if limit is not None:
+                await limit.acquire()
+            release = limit is not None
+            try:
+                if is_async:
+                    return await call()
+                loop = asyncio.get_running_loop()
+                context = contextvars.copy_context()
+                future = self._get_executor().submit(context.run, call)
+                if release:
+                    # The thread can't be stopped, so the slot is only freed
+                    # when the handler returns, not when the caller stops waiting
+                    future.add_done_callback(lambda _: self._release_threadsafe(loop, limit))
+                    release = False
+                result = await asyncio.wrap_future(future)
+                # A sync wrapper may still hand back an awaitable
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            finally:
+                if release:
+                    limit.release()
+
+        if timeout:
+            return await asyncio.wait_for(limited(), timeout)
+        return await limited()
+
+    @staticmethod
+    def _release_threadsafe(loop: asyncio.AbstractEventLoop, limit: asyncio.Semaphore):
+        """Release a tool's semaphore from the thread a handler ran on"""
+        try:
+            loop.call_soon_threadsafe(limit.release)
+        except RuntimeError:
+            # The event loop is closed; nothing waits on the semaphore anymore
+            pass
+
+    def shutdown(self, wait: bool = False):
+        """Release the thread pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,419 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+import math
+import sqlite3
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NDArray = np.ndarray
+except ImportError:
+    np = None
+    NDArray = Any
+
+logger = logging.getLogger(__name__)
+
+# Supported approximate nearest neighbour index types
+ANN_INDEX_TYPES = ['ivf']
+
+# Rows scored at a time when assigning vectors to lists, bounds peak memory
+_ASSIGN_BATCH_SIZE = 8192
+
+# Training sample size per list for k-means
+_TRAINING_POINTS_PER_LIST = 256
+
+
+def default_nlist(num_vectors: int) -> int:
+    """Get a reasonable number of IVF lists for a collection size"""
+    return max(1, int(round(math.sqrt(num_vectors))))
+
+
+def default_nprobe(nlist: int) -> int:
+    """Get a default number of lists to probe per query"""
+    return max(1, int(round(nlist / 10)))
+
+
+def _normalize(matrix: NDArray) -> NDArray:
+    """L2-normalize rows, leaving zero rows as zero"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _assign(vectors: NDArray, centroids: NDArray) -> NDArray:
+    """Assign each (normalized) vector to its most similar centroid"""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _ASSIGN_BATCH_SIZE):
+        batch = vectors[start:start + _ASSIGN_BATCH_SIZE]
+        assignments[start:start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return assignments
+
+
+def train_ivf(vectors: NDArray, nlist: int, iterations: int = 20,
+              seed: int = 42) -> Dict[str, NDArray]:
+    """
+    Train an inverted file (IVF) index with spherical k-means
+
+    Args:
+        vectors: Embedding matrix (n x dim), normalized or not
+        nlist: Number of lists (clusters)
+        iterations: k-means iterations
+        seed: Random seed, so the same corpus always produces the same index
+
+    Returns:
+        Dict with 'centroids' (nlist x dim, normalized) and 'assignments'
+        (list id per input row)
+    """
+    if np is None:
+        raise ImportError("numpy is required to build an ANN index")
+
+    vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+    n = len(vectors)
+    if n == 0:
+        raise ValueError("Cannot train an ANN index without vectors")
+    nlist = max(1, min(nlist, n))
+
+    rng = np.random.default_rng(seed)
+
+    # Train on a sample, then assign everything
+    sample_size = min(n, nlist * _TRAINING_POINTS_PER_LIST)
+    sample = vectors[rng.choice(n, size=sample_size, replace=False)] if sample_size < n else vectors
+
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # Reseed empty lists with the points furthest from their centroid
+            similarity = np.einsum('ij,ij->i', sample, centroids[labels])
+            furthest = np.argsort(similarity)[:len(empty)]
+            sums[empty] = sample[furthest]
+
+        new_centroids = _normalize(sums)
+        if np.allclose(new_centroids, centroids, atol=1e-6):
+            centroids = new_centroids
+            break
+        centroids = new_centroids
+
+    return {
+        'centroids': centroids.astype(np.float32),
+        'assignments': _assign(vectors, centroids)
+    }
+
+
+def build_ann_index(conn: sqlite3.Connection, index_type: str = 'ivf',
+                    nlist: Optional[int] = None, nprobe: Optional[int] = None,
+                    verbose: bool = False) -> Dict[str, Any]:
+    """
+    Build an ANN index over the chunks of a .swsearch database
+
+    The index is stored in the same file as the ann_centroids and
+    ann_assignments tables plus 'ann_*' config entries. Any existing ANN
+    index is replaced.
+
+    Args:
+        conn: Open connection to the .swsearch database
+        index_type: ANN index type (only 'ivf' is supported)
+        nlist: Number of IVF lists (default: sqrt of chunk count)
+        nprobe: Default lists probed per query (default: nlist / 10)
+        verbose: Print progress information
+
+    Returns:
+        Dict describing the built index
+    """
+    if np is None:
+        raise ImportError("numpy is required to build an ANN index")
+    if index_type not in ANN_INDEX_TYPES:
+        raise ValueError(f"Invalid ANN index type '{index_type}'. Must be one of: {', '.join(ANN_INDEX_TYPES)}")
+
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT id, embedding FROM chunks
+        WHERE embedding IS NOT NULL AND embedding != ''
+        ORDER BY id
+    ''')
+    ids = []
+    blobs = []
+    dim = None
+    for chunk_id, blob in cursor.fetchall():
+        # Same validation as SearchEngine, so lists cover the rows it scores
+        if not blob or len(blob) % 4:
+            continue
+        if dim is None:
+            dim = len(blob) // 4
+        if len(blob) != dim * 4:
+            continue
+        ids.append(chunk_id)
+        blobs.append(blob)
+
+    drop_ann_index(conn)
+    if not ids:
+        return {'type': index_type, 'nlist': 0, 'nprobe': 0, 'vectors': 0}
+
+    vectors = np.frombuffer(b''.join(blobs), dtype=np.float32).reshape(len(ids), dim)
+    nlist = max(1, min(nlist or default_nlist(len(ids)), len(ids)))
+    nprobe = max(1, min(nprobe or default_nprobe(nlist), nlist))
+
+    if verbose:
+        print(f"Building IVF index: {len(ids)} vectors, {nlist} lists")
+
+    start = time.time()
+    trained = train_ivf(vectors, nlist)
+
+    cursor.execute('''
+        CREATE TABLE ann_centroids (
+            list_id INTEGER PRIMARY KEY,
+            centroid BLOB NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE ann_assignments (
+            chunk_id INTEGER PRIMARY KEY,
+            list_id INTEGER NOT NULL
+        )
+    ''')
+    cursor.executemany(
+        'INSERT INTO ann_centroids (list_id, centroid) VALUES (?, ?)',
+        ((i, centroid.tobytes()) for i, centroid in enumerate(trained['centroids']))
+    )
+    cursor.executemany(
+        'INSERT INTO ann_assignments (chunk_id, list_id) VALUES (?, ?)',
+        zip(ids, (int(a) for a in trained['assignments']))
+    )
+    cursor.execute('CREATE INDEX idx_ann_assignments_list ON ann_assignments(list_id)')
+
+    for key, value in (('ann_index', index_type), ('ann_nlist', str(nlist)), ('ann_nprobe', str(nprobe))):
+        cursor.execute('INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)', (key, value))
+
+    if verbose:
+        print(f"IVF index built in {time.time() - start:.1f}s (default nprobe: {nprobe})")
+
+    return {'type': index_type, 'nlist': nlist, 'nprobe': nprobe, 'vectors': len(ids)}
+
+
+def assign_ann_index(conn: sqlite3.Connection) -> int:
+    """
+    Add chunks missing from the ANN index to its existing lists
+
+    Chunks without an assignment are put in the list of their most similar
+    centroid, so an index can follow incremental updates without being
+    retrained. Embeddings that don't match the centroid dimension are left
+    unassigned (and so are always scored).
+
+    Args:
+        conn: Open connection to a .swsearch database with an ANN index
+
+    Returns:
+        Number of chunks assigned
+    """
+    if np is None:
+        raise ImportError("numpy is required to update an ANN index")
+
+    cursor = conn.cursor()
+    cursor.execute('SELECT centroid FROM ann_centroids ORDER BY list_id')
+    centroid_rows = cursor.fetchall()
+    if not centroid_rows:
+        return 0
+    centroids = np.frombuffer(b''.join(row[0] for row in centroid_rows), dtype=np.float32)
+    centroids = centroids.reshape(len(centroid_rows), -1)
+    dim = centroids.shape[1]
+
+    cursor.execute('''
+        SELECT c.id, c.embedding FROM chunks c
+        LEFT JOIN ann_assignments a ON a.chunk_id = c.id
+        WHERE a.chunk_id IS NULL AND length(c.embedding) = ?
+        ORDER BY c.id
+    ''', (dim * 4,))
+    rows = cursor.fetchall()
+    if not rows:
+        return 0
+
+    vectors = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), dim)
+    cursor.executemany(
+        'INSERT INTO ann_assignments (chunk_id, list_id) VALUES (?, ?)',
+        zip((row[0] for row in rows), (int(a) for a in _assign(_normalize(vectors), centroids)))
+    )
+    return len(rows)
+
+
+def drop_ann_index(conn: sqlite3.Connection):
+    """Remove any ANN index from a .swsearch database"""
+    cursor = conn.cursor()
+    cursor.execute('DROP TABLE IF EXISTS ann_centroids')
+    cursor.execute('DROP TABLE IF EXISTS ann_assignments')
+    cursor.execute("DELETE FROM config WHERE key IN ('ann_index', 'ann_nlist', 'ann_nprobe')")
+
+
+class IVFIndex:
+    """In-memory inverted file index over a search engine's embedding matrix"""
+
+    def __init__(self, centroids: NDArray, lists: List[NDArray], unassigned: NDArray,
+                 default_nprobe: int):
+        """
+        Initialize the index
+
+        Args:
+            centroids: Normalized centroid matrix (nlist x dim)
+            lists: Row positions (into the embedding matrix) belonging to each list
+            unassigned: Row positions not covered by any list; always scored
+            default_nprobe: Lists probed per query when not overridden
+        """
+        self.centroids = centroids
+        self.lists = lists
+        self.unassigned = unassigned
+        self.nlist = len(lists)
+        self.default_nprobe = max(1, min(default_nprobe, self.nlist))
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, chunk_ids: NDArray,
+             config: Dict[str, str]) -> Optional['IVFIndex']:
+        """
+        Load the IVF index stored in a .swsearch database
+
+        Args:
+            conn: Open connection to the .swsearch database
+            chunk_ids: Chunk id of each row of the embedding matrix (sorted)
+            config: Index configuration
+
+        Returns:
+            IVFIndex, or None if the database has no usable IVF index
+        """
+        if config.get('ann_index') != 'ivf' or len(chunk_ids) == 0:
+            return None
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute('SELECT list_id, centroid FROM ann_centroids ORDER BY list_id')
+            centroid_rows = cursor.fetchall()
+            cursor.execute('SELECT chunk_id, list_id FROM ann_assignments')
+            assignment_rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"ANN index configured but not readable, using exact search: {e}")
+            return None
+
+        if not centroid_rows:
+            return None
+
+        nlist = len(centroid_rows)
+        centroids = np.frombuffer(b''.join(row[1] for row in centroid_rows), dtype=np.float32)
+        centroids = centroids.reshape(nlist, -1)
+
+        # Map chunk ids to matrix rows; rows without an assignment (e.g. chunks
+        # added after the index was trained) are always scored
+        list_of_row = np.full(len(chunk_ids), -1, dtype=np.int64)
+        if assignment_rows:
+            assignments = np.asarray(assignment_rows, dtype=np.int64)
+            rows = np.clip(np.searchsorted(chunk_ids, assignments[:, 0]), 0, len(chunk_ids) - 1)
+            valid = chunk_ids[rows] == assignments[:, 0]
+            list_of_row[rows[valid]] = assignments[valid, 1]
+
+        order = np.argsort(list_of_row, kind='stable')
+        sorted_lists = list_of_row[order]
+        unassigned = order[sorted_lists < 0]
+        bounds = np.searchsorted(sorted_lists, np.arange(nlist + 1))
+        lists = [order[bounds[i]:bounds[i + 1]] for i in range(nlist)]
+
+        nprobe = int(config.get('ann_nprobe') or default_nprobe(nlist))
+        return cls(centroids, lists, unassigned, nprobe)
+
+    def candidates(self, query: NDArray, nprobe: Optional[int] = None) -> NDArray:
+        """
+        Get the matrix rows to score for a normalized query
+
+        Args:
+            query: Normalized query vector
+            nprobe: Lists to probe (higher = better recall, slower)
+
+        Returns:
+            Array of row positions into the embedding matrix
+        """
+        nprobe = max(1, min(nprobe or self.default_nprobe, self.nlist))
+        centroid_scores = self.centroids @ query
+        if nprobe < self.nlist:
+            probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        else:
+            probe = np.arange(self.nlist)
+        return np.concatenate([self.lists[i] for i in probe] + [self.unassigned])
+
+
+def benchmark_recall(engine, k: int = 10, nprobe_values: Optional[Sequence[int]] = None,
+                     num_queries: int = 100, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Measure ANN recall@k and latency against exact search
+
+    Queries are sampled from the index's own chunk embeddings, so no
+    embedding model is needed.
+
+    Args:
+        engine: SearchEngine (sqlite backend) over an index with an ANN index
+        k: Number of neighbours compared
+        nprobe_values: nprobe settings to evaluate (default: powers of two up to nlist)
+        num_queries: Number of sampled queries
+        seed: Random seed for query sampling
+
+    Returns:
+        List of dicts with nprobe, recall, mean latency (ms) and the fraction
+        of vectors scored, one per nprobe value; the first entry is exact search
+    """
+    ids, matrix = engine.embedding_matrix()
+    ann = engine.ann_structure()
+    if ann is None:
+        raise ValueError("Index has no ANN index. Build it with: sw-search <sources> --ann-index ivf")
+    if matrix is None or len(ids) == 0:
+        raise ValueError("Index has no embeddings")
+
+    if not nprobe_values:
+        nprobe_values = []
+        value = 1
+        while value < ann.nlist:
+            nprobe_values.append(value)
+            value *= 2
+        nprobe_values.append(ann.nlist)
+
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(len(ids), size=min(num_queries, len(ids)), replace=False)
+    queries = np.asarray(matrix[sample], dtype=np.float32)
+    k = min(k, len(ids))
+
+    def exact_top(query):
+        scores = matrix @ query
+        return set(np.argpartition(-scores, k - 1)[:k].tolist())
+
+    start = time.perf_counter()
+    truth = [exact_top(q) for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    results = [{'nprobe': 'exact', 'recall': 1.0, 'latency_ms': exact_ms, 'scanned': 1.0}]
+    for nprobe in nprobe_values:
+        hits = 0
+        scanned = 0
+        start = time.perf_counter()
+        for query, expected in zip(queries, truth):
+            rows = ann.candidates(query, nprobe)
+            scores = matrix[rows] @ query
+            top_k = min(k, len(rows))
+            if top_k:
+                top = rows[np.argpartition(-scores, top_k - 1)[:top_k]]
+                hits += len(expected.intersection(top.tolist()))
+            scanned += len(rows)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        results.append({
+            'nprobe': nprobe,
+            'recall': hits / (k * len(queries)),
+            'latency_ms': elapsed_ms,
+            'scanned': scanned / (len(queries) * len(ids))
+        })
+    return results
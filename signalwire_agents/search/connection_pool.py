@@ -0,0 +1,160 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+import os
+import sqlite3
+import threading
+import weakref
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Page cache tuning for read-only index connections
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024   # bytes of the index mapped into memory
+DEFAULT_CACHE_SIZE_KB = 32 * 1024       # page cache per connection
+# Prepared statements kept per connection; queries use constant SQL so they are reused
+STATEMENT_CACHE_SIZE = 64
+
+
+class SQLiteConnectionPool:
+    """
+    Per-thread pool of read-only connections to a .swsearch index
+
+    Each thread gets its own connection, opened on first use and kept while
+    the thread is alive, so queries don't pay connection setup, schema
+    parsing or a cold page cache. Connections of threads that have exited
+    are closed the next time a connection is opened. Connections are opened
+    with the ``mode=ro`` URI parameter, so a missing index is an error
+    rather than a new empty file. If the index file is replaced (for
+    example by a rebuild), connections are reopened on their next use.
+    """
+
+    def __init__(self, index_path: str, immutable: bool = False,
+                 mmap_size: int = DEFAULT_MMAP_SIZE, cache_size_kb: int = DEFAULT_CACHE_SIZE_KB):
+        """
+        Initialize the pool
+
+        Args:
+            index_path: Path to the .swsearch file
+            immutable: Open with ``immutable=1``, which skips all locking and
+                       change detection. Only safe when nothing writes to the
+                       index while it is being served
+            mmap_size: Bytes of the index to memory-map (0 disables mmap)
+            cache_size_kb: Page cache size per connection in KiB
+        """
+        self.index_path = index_path
+        self.immutable = immutable
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # All open connections keyed by thread ident, with a reference to the
+        # owning thread, so close() can reach those of other threads and
+        # connections of exited threads can be reaped
+        self._connections: Dict[int, Tuple[weakref.ref, sqlite3.Connection]] = {}
+
+    def _uri(self) -> str:
+        """Build the read-only URI for the index"""
+        uri = f"{Path(self.index_path).absolute().as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def file_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the current index file, to notice when it is replaced"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and tune a new read-only connection"""
+        conn = sqlite3.connect(self._uri(), uri=True, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        try:
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it if needed
+
+        Returns:
+            Read-only sqlite3 connection owned by the calling thread
+
+        Raises:
+            sqlite3.Error: If the index can't be opened
+        """
+        signature = self.file_signature()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if signature == self._local.signature:
+                return conn
+            logger.info(f"Index file {self.index_path} changed, reopening connection")
+            self._discard(conn)
+
+        self._reap()
+        conn = self._open()
+        self._local.conn = conn
+        self._local.signature = signature
+        thread = threading.current_thread()
+        with self._lock:
+            self._connections[thread.ident] = (weakref.ref(thread), conn)
+        return conn
+
+    def _reap(self):
+        """Close the connections of threads that have exited"""
+        with self._lock:
+            dead = []
+            for ident, (thread_ref, conn) in list(self._connections.items()):
+                thread = thread_ref()
+                if thread is None or not thread.is_alive():
+                    dead.append(conn)
+                    del self._connections[ident]
+        for conn in dead:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _discard(self, conn: sqlite3.Connection):
+        """Close the calling thread's connection and forget it"""
+        with self._lock:
+            self._connections.pop(threading.get_ident(), None)
+        self._local.conn = None
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """Close every pooled connection"""
+        with self._lock:
+            connections = [conn for _, conn in self._connections.values()]
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        # Other threads see a closed connection and reopen it on next use
+        self._local = threading.local()
+
+    def __len__(self) -> int:
+        """Number of open connections"""
+        with self._lock:
+            return len(self._connections)
@@ -11,9 +11,14 @@ import re
 import hashlib
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Document processing imports
 try:
     import pdfplumber
@@ -68,6 +73,7 @@ except ImportError:
     magic = None
 
 from .query_processor import preprocess_document_content
+from .embedding_models import DEFAULT_MODEL_NAME, get_embedding_model
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +90,10 @@ class DocumentProcessor:
         index_nlp_backend: str = 'nltk',
         verbose: bool = False,
         semantic_threshold: float = 0.5,
-        topic_threshold: float = 0.3
+        topic_threshold: float = 0.3,
+        model_name: Optional[str] = None,
+        model_loader: Optional[Callable[[], Any]] = None,
+        pool_sentence_embeddings: bool = True
     ):
         """
         Initialize document processor
@@ -99,6 +108,12 @@ class DocumentProcessor:
             verbose: Whether to enable verbose logging (default: False)
             semantic_threshold: Similarity threshold for semantic chunking (default: 0.5)
             topic_threshold: Similarity threshold for topic chunking (default: 0.3)
+            model_name: Sentence transformer model used by semantic chunking; should
+                        match the index's model (default: all-mpnet-base-v2)
+            model_loader: Optional callable returning an already loaded model to use
+                          instead of the shared model registry (e.g. the index builder's)
+            pool_sentence_embeddings: Store the mean of each semantic chunk's sentence
+                                      embeddings as the chunk's 'embedding' (default: True)
         """
         self.chunking_strategy = chunking_strategy
         self.max_sentences_per_chunk = max_sentences_per_chunk
@@ -107,6 +122,9 @@ class DocumentProcessor:
         self.split_newlines = split_newlines
         self.semantic_threshold = semantic_threshold
         self.topic_threshold = topic_threshold
+        self.model_name = model_name or DEFAULT_MODEL_NAME
+        self.model_loader = model_loader
+        self.pool_sentence_embeddings = pool_sentence_embeddings
         
         # Legacy support for old character-based chunking
         self.chunk_overlap = chunk_overlap
@@ -783,7 +801,14 @@ class DocumentProcessor:
         return chunks
     
     def _chunk_by_semantic(self, content: str, filename: str, file_type: str) -> List[Dict[str, Any]]:
-        """Chunk based on semantic similarity between sentences"""
+        """
+        Chunk based on semantic similarity between sentences
+        
+        Sentences are encoded once; a new chunk starts wherever the similarity
+        of adjacent sentences drops below the threshold. Unless disabled, each
+        chunk's 'embedding' is set to its pooled sentence embeddings so the
+        index builder doesn't need to encode the chunk again.
+        """
         if isinstance(content, list):
             content = '\n'.join(content)
         
@@ -800,58 +825,85 @@ class DocumentProcessor:
         
         # Generate embeddings for sentences (using the same model as the index)
         try:
-            from sentence_transformers import SentenceTransformer
-            from sklearn.metrics.pairwise import cosine_similarity
-            import numpy as np
-            
-            model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')
-            embeddings = model.encode(sentences, show_progress_bar=False)
-            
-            # Calculate similarity between adjacent sentences
-            similarities = []
-            for i in range(len(embeddings) - 1):
-                sim = cosine_similarity([embeddings[i]], [embeddings[i + 1]])[0][0]
-                similarities.append(sim)
-            
-            # Find split points where similarity drops below threshold
-            split_points = [0]
-            for i, sim in enumerate(similarities):
-                if sim < self.semantic_threshold:
-                    split_points.append(i + 1)
-            split_points.append(len(sentences))
-            
-            # Create chunks
-            chunks = []
-            for i in range(len(split_points) - 1):
-                start_idx = split_points[i]
-                end_idx = split_points[i + 1]
-                chunk_sentences = sentences[start_idx:end_idx]
-                
-                # Ensure minimum chunk size
-                if len(chunk_sentences) < 2 and i > 0:
-                    # Merge with previous chunk
-                    chunks[-1]['content'] += ' ' + ' '.join(chunk_sentences)
-                    continue
-                    
-                chunk_content = ' '.join(chunk_sentences)
-                chunks.append(self._create_chunk(
-                    content=chunk_content,
-                    filename=filename,
-                    section=f"Semantic Section {i+1}",
-                    metadata={
-                        'chunk_method': 'semantic',
-                        'chunk_index': i,
-                        'semantic_threshold': self.semantic_threshold,
-                        'sentence_count': len(chunk_sentences)
-                    }
-                ))
-            
-            return chunks if chunks else [self._create_chunk(content, filename, "Section 1",
-                                                           metadata={'chunk_method': 'semantic', 'chunk_index': 0})]
-            
+            embeddings = self._encode_sentences(sentences)
         except ImportError:
             # Fallback to sentence-based chunking
             return self._chunk_by_sentences(content, filename, file_type)
+        
+        # Cosine similarity of every adjacent pair of (normalized) sentences at once
+        similarities = np.einsum('ij,ij->i', embeddings[:-1], embeddings[1:])
+        
+        # Find split points where similarity drops below threshold
+        split_points = [0] + [int(i) + 1 for i in np.flatnonzero(similarities < self.semantic_threshold)]
+        split_points.append(len(sentences))
+        
+        # Group sentences, merging single-sentence groups into the previous one
+        groups = []
+        for i in range(len(split_points) - 1):
+            start_idx = split_points[i]
+            end_idx = split_points[i + 1]
+            
+            # Ensure minimum chunk size
+            if end_idx - start_idx < 2 and groups:
+                groups[-1][2] = end_idx
+                continue
+            groups.append([i, start_idx, end_idx])
+        
+        chunks = []
+        for i, start_idx, end_idx in groups:
+            chunk_sentences = sentences[start_idx:end_idx]
+            chunk = self._create_chunk(
+                content=' '.join(chunk_sentences),
+                filename=filename,
+                section=f"Semantic Section {i+1}",
+                metadata={
+                    'chunk_method': 'semantic',
+                    'chunk_index': i,
+                    'semantic_threshold': self.semantic_threshold,
+                    'sentence_count': len(chunk_sentences)
+                }
+            )
+            if self.pool_sentence_embeddings:
+                chunk['embedding'] = self._pool_embeddings(embeddings[start_idx:end_idx])
+            chunks.append(chunk)
+        
+        return chunks if chunks else [self._create_chunk(content, filename, "Section 1",
+                                                       metadata={'chunk_method': 'semantic', 'chunk_index': 0})]
+
+    def _get_embedding_model(self):
+        """Get the sentence transformer model, loading it on first use"""
+        if self.model_loader is not None:
+            return self.model_loader()
+        return get_embedding_model(self.model_name)
+
+    def _encode_sentences(self, sentences: List[str]):
+        """
+        Encode sentences in one model call
+        
+        Args:
+            sentences: Sentences to encode
+            
+        Returns:
+            L2-normalized float32 matrix with one row per sentence
+            
+        Raises:
+            ImportError: If sentence-transformers or numpy is not installed
+        """
+        if np is None:
+            raise ImportError("numpy is required for semantic chunking")
+        model = self._get_embedding_model()
+        embeddings = np.asarray(model.encode(sentences, show_progress_bar=False), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    def _pool_embeddings(self, embeddings) -> bytes:
+        """Mean-pool normalized sentence embeddings into a normalized chunk embedding (float32 bytes)"""
+        pooled = embeddings.mean(axis=0)
+        norm = np.linalg.norm(pooled)
+        if norm > 0:
+            pooled = pooled / norm
+        return pooled.astype(np.float32).tobytes()
 
     def _chunk_by_topics(self, content: str, filename: str, file_type: str) -> List[Dict[str, Any]]:
         """Chunk based on topic changes using keyword analysis"""
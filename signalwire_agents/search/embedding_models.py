@@ -0,0 +1,286 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+import os
+import time
+import queue
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = 'sentence-transformers/all-mpnet-base-v2'
+
+# Maximum number of sentence transformer models kept resident at once
+MAX_MODELS_ENV_VAR = 'SIGNALWIRE_SEARCH_MAX_MODELS'
+DEFAULT_MAX_MODELS = 2
+
+# Most query texts encoded by a single model call when batching concurrent queries
+DEFAULT_MAX_BATCH_SIZE = 32
+
+
+class EmbeddingModelRegistry:
+    """
+    Process-wide, thread-safe cache of sentence transformer models
+
+    Models are loaded lazily on first use and shared by every caller that asks
+    for the same model name. The number of resident models is bounded; the
+    least recently used model is evicted when the bound is exceeded.
+    """
+
+    def __init__(self, max_models: Optional[int] = None):
+        """
+        Initialize the registry
+
+        Args:
+            max_models: Maximum number of resident models (default: from
+                        SIGNALWIRE_SEARCH_MAX_MODELS or 2)
+        """
+        if max_models is None:
+            try:
+                max_models = int(os.environ.get(MAX_MODELS_ENV_VAR, DEFAULT_MAX_MODELS))
+            except ValueError:
+                max_models = DEFAULT_MAX_MODELS
+        self.max_models = max(1, max_models)
+        self._models: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-model locks so two threads never load the same model twice,
+        # while loads of different models don't block each other
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def get_model(self, model_name: Optional[str] = None):
+        """
+        Get a loaded model, loading it on first use
+
+        Args:
+            model_name: Sentence transformer model name (default: all-mpnet-base-v2)
+
+        Returns:
+            SentenceTransformer instance
+
+        Raises:
+            ImportError: If sentence-transformers is not installed
+        """
+        model_name = model_name or DEFAULT_MODEL_NAME
+
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is not None:
+                self._models.move_to_end(model_name)
+                return model
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+
+        with load_lock:
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                model = self._models.get(model_name)
+                if model is not None:
+                    self._models.move_to_end(model_name)
+                    return model
+
+            model = self._load(model_name)
+
+            with self._lock:
+                self._models[model_name] = model
+                self._models.move_to_end(model_name)
+                while len(self._models) > self.max_models:
+                    evicted_name, _ = self._models.popitem(last=False)
+                    logger.info(f"Evicted embedding model from cache: {evicted_name}")
+            return model
+
+    def _load(self, model_name: str):
+        """Load a model from disk or the model hub"""
+        from sentence_transformers import SentenceTransformer
+
+        logger.info(f"Loading embedding model: {model_name}")
+        return SentenceTransformer(model_name)
+
+    def warm_up(self, model_names: Iterable[Optional[str]]) -> List[str]:
+        """
+        Load models ahead of the first query
+
+        Args:
+            model_names: Model names to load
+
+        Returns:
+            List of model names that were loaded successfully
+        """
+        loaded = []
+        for model_name in dict.fromkeys(name or DEFAULT_MODEL_NAME for name in model_names):
+            try:
+                self.get_model(model_name)
+                loaded.append(model_name)
+            except Exception as e:
+                logger.warning(f"Could not warm up embedding model '{model_name}': {e}")
+        return loaded
+
+    def is_loaded(self, model_name: Optional[str] = None) -> bool:
+        """Check whether a model is currently resident"""
+        with self._lock:
+            return (model_name or DEFAULT_MODEL_NAME) in self._models
+
+    def loaded_models(self) -> List[str]:
+        """Get resident model names, least recently used first"""
+        with self._lock:
+            return list(self._models.keys())
+
+    def clear(self):
+        """Drop all resident models"""
+        with self._lock:
+            self._models.clear()
+            self._load_locks.clear()
+
+
+_registry = EmbeddingModelRegistry()
+
+
+def get_model_registry() -> EmbeddingModelRegistry:
+    """Get the process-wide embedding model registry"""
+    return _registry
+
+
+def get_embedding_model(model_name: Optional[str] = None):
+    """Get a shared embedding model from the process-wide registry"""
+    return _registry.get_model(model_name)
+
+
+def warm_up_models(model_names: Iterable[Optional[str]]) -> List[str]:
+    """Preload embedding models into the process-wide registry"""
+    return _registry.warm_up(model_names)
+
+
+class _EncodeRequest:
+    """A text waiting to be encoded by an EmbeddingBatcher"""
+
+    __slots__ = ('text', 'embedding', 'error', 'done')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.embedding = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class EmbeddingBatcher:
+    """
+    Combines concurrent single-text encodes into batched model calls
+
+    Callers block in encode() while one worker thread per model encodes
+    queued texts together. Texts that arrive while a batch is being
+    encoded form the next batch, so an idle service encodes a lone query
+    immediately and a busy one makes one model call per batch rather than
+    one per query.
+    """
+
+    def __init__(self, model_name: Optional[str] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait: float = 0.0,
+                 registry: Optional[EmbeddingModelRegistry] = None):
+        """
+        Initialize the batcher
+
+        Args:
+            model_name: Sentence transformer model name (default: all-mpnet-base-v2)
+            max_batch_size: Most texts encoded by one model call
+            max_wait: Seconds to wait for more texts before encoding a batch
+                      that isn't full (0 encodes whatever is already queued)
+            registry: Model registry (default: the process-wide registry)
+        """
+        self.model_name = model_name or DEFAULT_MODEL_NAME
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self.registry = registry or _registry
+        self.batches = 0
+        self.encoded = 0
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def encode(self, text: str, timeout: Optional[float] = None):
+        """
+        Encode one text as part of the next batch
+
+        Args:
+            text: Text to embed
+            timeout: Seconds to wait for the embedding (default: no limit)
+
+        Returns:
+            numpy array embedding, as returned by model.encode
+
+        Raises:
+            TimeoutError: If the embedding isn't ready within the timeout
+            ImportError: If sentence-transformers is not installed
+        """
+        request = _EncodeRequest(text)
+        self._ensure_worker()
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError(f"Encoding with {self.model_name} timed out")
+        if request.error is not None:
+            raise request.error
+        return request.embedding
+
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[_EncodeRequest]:
+        """Wait for a text, then collect others queued up to the batch size"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop"""
+        while True:
+            self._encode_batch(self._next_batch())
+
+    def _encode_batch(self, batch: List[_EncodeRequest]):
+        """Encode a batch and hand each caller its embedding"""
+        try:
+            model = self.registry.get_model(self.model_name)
+            embeddings = model.encode([request.text for request in batch],
+                                      batch_size=len(batch), show_progress_bar=False)
+            for request, embedding in zip(batch, embeddings):
+                request.embedding = embedding
+            self.batches += 1
+            self.encoded += len(batch)
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.done.set()
+
+
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(model_name: Optional[str] = None) -> EmbeddingBatcher:
+    """Get the process-wide encode batcher for a model"""
+    model_name = model_name or DEFAULT_MODEL_NAME
+    with _batchers_lock:
+        batcher = _batchers.get(model_name)
+        if batcher is None:
+            batcher = _batchers[model_name] = EmbeddingBatcher(model_name)
+        return batcher
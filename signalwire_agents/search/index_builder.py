@@ -12,10 +12,15 @@ import sqlite3
 import json
 import hashlib
 import logging
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import fnmatch
+import itertools
 
 try:
     import numpy as np
@@ -28,10 +33,28 @@ except ImportError:
     SentenceTransformer = None
 
 from .document_processor import DocumentProcessor
-from .query_processor import preprocess_document_content
+from .query_processor import preprocess_document_content, preprocess_documents, DEFAULT_PREPROCESS_BATCH_SIZE
+from .ann_index import ANN_INDEX_TYPES, assign_ann_index, build_ann_index
+from .search_engine import remove_embedding_sidecar
 
 logger = logging.getLogger(__name__)
 
+# Per-process builder used by worker processes of a parallel build
+_worker_builder = None
+
+
+def _init_worker(settings: Dict[str, Any]):
+    """Create the builder used by this worker process"""
+    global _worker_builder
+    _worker_builder = IndexBuilder(**settings)
+
+
+def _process_file_in_worker(file_path: Path, sources: List[Path],
+                            tags: Optional[List[str]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Extract, chunk and preprocess one file in a worker process"""
+    return _worker_builder._process_source_file(file_path, sources, tags, preprocess=True)
+
+
 class IndexBuilder:
     """Build searchable indexes from document directories"""
     
@@ -48,7 +71,17 @@ class IndexBuilder:
         semantic_threshold: float = 0.5,
         topic_threshold: float = 0.3,
         backend: str = 'sqlite',
-        connection_string: Optional[str] = None
+        connection_string: Optional[str] = None,
+        ann_index: Optional[str] = None,
+        ann_lists: Optional[int] = None,
+        ann_nprobe: Optional[int] = None,
+        batch_size: int = 32,
+        workers: int = 1,
+        write_batch_size: int = 1000,
+        nlp_batch_size: int = DEFAULT_PREPROCESS_BATCH_SIZE,
+        nlp_processes: int = 1,
+        pool_sentence_embeddings: bool = True,
+        pgvector_index: Optional[str] = None
     ):
         """
         Initialize the index builder
@@ -66,6 +99,24 @@ class IndexBuilder:
             topic_threshold: Similarity threshold for topic chunking (default: 0.3)
             backend: Storage backend ('sqlite' or 'pgvector') (default: 'sqlite')
             connection_string: PostgreSQL connection string for pgvector backend
+            ann_index: Approximate nearest neighbour index to build ('ivf'), or None
+                       for exact search only (sqlite backend only)
+            ann_lists: Number of IVF lists (default: square root of chunk count)
+            ann_nprobe: Default IVF lists probed per query (default: lists / 10)
+            batch_size: Number of chunks encoded per model call (default: 32)
+            workers: Number of processes used to extract, chunk and preprocess
+                     files; 0 uses all CPUs (default: 1, no worker processes)
+            write_batch_size: Chunks embedded and written to the SQLite index per
+                              transaction; bounds memory use (default: 1000)
+            nlp_batch_size: Chunks POS tagged and lemmatized per NLP batch (default: 64)
+            nlp_processes: Processes spaCy's nlp.pipe uses for preprocessing
+                           (spaCy backend only; default: 1)
+            pool_sentence_embeddings: For semantic strategy - embed chunks by pooling the
+                                      sentence embeddings computed for chunking instead
+                                      of encoding each chunk again (default: True)
+            pgvector_index: Embedding index of pgvector collections, 'ivfflat' or
+                            'hnsw' (needs pgvector 0.5+) (default: the collection's
+                            current index, or 'ivfflat' for a new collection)
         """
         self.model_name = model_name
         self.chunking_strategy = chunking_strategy
@@ -79,6 +130,16 @@ class IndexBuilder:
         self.topic_threshold = topic_threshold
         self.backend = backend
         self.connection_string = connection_string
+        self.ann_index = ann_index
+        self.ann_lists = ann_lists
+        self.ann_nprobe = ann_nprobe
+        self.batch_size = max(1, batch_size)
+        self.workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        self.write_batch_size = max(1, write_batch_size)
+        self.nlp_batch_size = max(1, nlp_batch_size)
+        self.nlp_processes = max(1, nlp_processes)
+        self.pool_sentence_embeddings = pool_sentence_embeddings
+        self.pgvector_index = pgvector_index
         self.model = None
         
         # Validate backend
@@ -88,6 +149,17 @@ class IndexBuilder:
         if self.backend == 'pgvector' and not self.connection_string:
             raise ValueError("connection_string is required for pgvector backend")
         
+        # Validate ANN index
+        if self.ann_index is not None and self.ann_index not in ANN_INDEX_TYPES:
+            raise ValueError(f"Invalid ann_index '{self.ann_index}'. Must be one of: {', '.join(ANN_INDEX_TYPES)}")
+        
+        if self.pgvector_index not in (None, 'ivfflat', 'hnsw'):
+            raise ValueError(f"Invalid pgvector_index '{self.pgvector_index}'. Must be 'ivfflat' or 'hnsw'")
+        
+        if self.ann_index and self.backend == 'pgvector':
+            logger.warning("ann_index is ignored for pgvector backend, which has its own vector indexes")
+            self.ann_index = None
+        
         # Validate NLP backend
         if self.index_nlp_backend not in ['nltk', 'spacy']:
             logger.warning(f"Invalid index_nlp_backend '{self.index_nlp_backend}', using 'nltk'")
@@ -102,9 +174,17 @@ class IndexBuilder:
             index_nlp_backend=self.index_nlp_backend,
             verbose=self.verbose,
             semantic_threshold=self.semantic_threshold,
-            topic_threshold=self.topic_threshold
+            topic_threshold=self.topic_threshold,
+            model_name=self.model_name,
+            model_loader=self._get_model,
+            pool_sentence_embeddings=self.pool_sentence_embeddings
         )
     
+    def _get_model(self):
+        """Get the embedding model, loading it on first use (shared with semantic chunking)"""
+        self._load_model()
+        return self.model
+    
     def _load_model(self):
         """Load embedding model (lazy loading)"""
         if self.model is None:
@@ -123,10 +203,15 @@ class IndexBuilder:
     def build_index_from_sources(self, sources: List[Path], output_file: str, 
                                 file_types: List[str], exclude_patterns: Optional[List[str]] = None,
                                 languages: List[str] = None, tags: Optional[List[str]] = None,
-                                overwrite: bool = False):
+                                overwrite: bool = False, update: bool = False,
+                                resume: bool = False):
         """
         Build complete search index from multiple sources (files and directories)
         
+        SQLite indexes are built in a '<output_file>.partial' file that chunks
+        are streamed into as they are embedded, and renamed to output_file
+        when complete.
+        
         Args:
             sources: List of Path objects (files and/or directories)
             output_file: Output .swsearch file path
@@ -134,6 +219,10 @@ class IndexBuilder:
             exclude_patterns: Glob patterns to exclude
             languages: List of languages to support
             tags: Global tags to add to all chunks
+            overwrite: Drop an existing pgvector collection first
+            update: Only reprocess new and changed files of an existing index,
+                    and remove chunks of files that no longer exist
+            resume: Continue an interrupted SQLite build from its partial file
         """
         
         # Discover files from all sources
@@ -145,23 +234,74 @@ class IndexBuilder:
             print("No files found to process. Check your sources, file types and exclude patterns.")
             return
         
+        build_settings = self._build_settings(tags)
+        target_file = output_file
+        stored_records = None
+        if update:
+            stored_records = self._load_file_records(output_file, build_settings)
+            if stored_records is None:
+                print("No compatible index to update, building a full index")
+        
+        if stored_records is None and self.backend == 'sqlite':
+            # Full builds go to a partial file that is only renamed once complete
+            target_file = self._partial_path(output_file)
+            if resume:
+                stored_records = self._load_file_records(target_file, build_settings)
+                if stored_records is not None:
+                    print(f"Resuming build: {len(stored_records)} files already indexed")
+            if stored_records is None:
+                self._remove_database(target_file)
+        
+        # Work out which files need (re)processing from their content hashes
+        files, file_records = self._fingerprint_files(files, sources, stored_records)
+        removed = sorted(set(stored_records) - set(file_records)) if stored_records is not None else []
+        
+        if stored_records is not None and target_file == output_file:
+            if self.verbose or (not files and not removed):
+                print(f"Update: {len(files)} new or changed files, {len(removed)} removed files, "
+                      f"{len(file_records) - len(files)} unchanged files")
+            if not files and not removed and file_records == stored_records:
+                print("Index is up to date")
+                return
+        
+        # Chunks of changed and removed files are replaced when updating or resuming
+        replace_files = []
+        if stored_records is not None:
+            replace_files = [self._relative_filename(f, sources) for f in files] + removed
+        
+        if self.backend == 'sqlite':
+            sources_info = [str(s) for s in sources]
+            total = self._build_sqlite_index(target_file, files, sources, tags, file_records,
+                                             replace_files, languages or ['en'], sources_info,
+                                             file_types, build_settings,
+                                             incremental=target_file == output_file and stored_records is not None)
+            if total is None:
+                print("No chunks created from documents. Check file contents and processing.")
+                return
+            
+            # Search engines rewrite the embedding sidecar from the new index
+            remove_embedding_sidecar(output_file)
+            if target_file != output_file:
+                self._remove_database(output_file)
+                os.replace(target_file, output_file)
+                if self.verbose:
+                    print(f"Index created: {output_file}")
+            elif self.verbose:
+                print(f"Index updated: {output_file}")
+            
+            if self.verbose:
+                print(f"Total chunks: {total}")
+            return
+        
         # Process documents
         chunks = []
-        for file_path in files:
-            try:
-                # For individual files, use the file's parent as the base directory
-                # For files from directories, use the original source directory
-                base_dir = self._get_base_directory_for_file(file_path, sources)
-                file_chunks = self._process_file(file_path, base_dir, tags)
-                chunks.extend(file_chunks)
-                if self.verbose:
-                    print(f"Processed {file_path}: {len(file_chunks)} chunks")
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-                if self.verbose:
-                    print(f"Error processing {file_path}: {e}")
+        for file_path, file_chunks, error in self._iter_processed_files(files, sources, tags):
+            chunks.extend(file_chunks)
+            if error is not None:
+                # No record, so the file is retried by the next update
+                file_records.pop(self._relative_filename(file_path, sources), None)
         
-        if not chunks:
+        if not chunks and stored_records is None:
             print("No chunks created from documents. Check file contents and processing.")
             return
         
@@ -169,11 +309,389 @@ class IndexBuilder:
             print(f"Created {len(chunks)} total chunks")
         
         # Generate embeddings
-        self._load_model()
-        if self.verbose:
-            print("Generating embeddings...")
+        if chunks:
+            self._load_model()
+            if self.verbose:
+                print("Generating embeddings...")
+            
+            self._embed_chunks(chunks)
+        
+        # Use pgvector backend
+        self._store_chunks_pgvector(chunks, output_file, languages or ['en'],
+                                    overwrite and stored_records is None,
+                                    file_records=file_records,
+                                    replace_files=replace_files if stored_records is not None else None,
+                                    build_settings=build_settings)
+
+    def _build_sqlite_index(self, index_file: str, files: List[Path], sources: List[Path],
+                            tags: Optional[List[str]], file_records: Dict[str, Dict[str, Any]],
+                            replace_files: List[str], languages: List[str],
+                            sources_info: List[str], file_types: List[str],
+                            build_settings: Dict[str, Any],
+                            incremental: bool = False) -> Optional[int]:
+        """
+        Stream processed files into a SQLite index
+        
+        Chunks are embedded and written in transactions of about
+        write_batch_size chunks, so memory use doesn't grow with the corpus.
+        A file's record is committed together with its last chunks, which
+        makes each transaction a checkpoint an interrupted build can resume
+        from. FTS population, secondary indexes and the ANN index are built
+        once at the end, except that incremental updates keep the full-text
+        index and chunk_tags in sync with each transaction instead.
+        
+        Args:
+            index_file: SQLite file to write, created if missing
+            files: Files to process
+            sources: Original source paths
+            tags: Global tags to add to all chunks
+            file_records: Records of all current source files keyed by filename
+            replace_files: Filenames whose existing chunks are deleted first
+            languages: List of supported languages
+            sources_info: Source paths stored in the config
+            file_types: File types stored in the config
+            build_settings: Settings stored in the config
+            incremental: Whether index_file is a finished index being updated
+            
+        Returns:
+            Total number of chunks in the index, or None if a new index would
+            have been empty (nothing is written then)
+        """
+        created = not os.path.exists(index_file)
+        conn = self._open_database(index_file, languages, sources_info, file_types, build_settings)
+        
+        try:
+            if incremental:
+                self._backfill_chunk_tags(conn)
+            if replace_files:
+                self._write_chunks(conn, [], {}, replace_files, incremental=incremental)
+            
+            pending = []
+            pending_records = {}
+            processed = 0
+            for file_path, file_chunks, error in self._iter_processed_files(files, sources, tags):
+                pending.extend(file_chunks)
+                filename = self._relative_filename(file_path, sources)
+                # Files that failed get no record, so they're retried next time
+                if error is None and filename in file_records:
+                    pending_records[filename] = file_records[filename]
+                
+                if len(pending) >= self.write_batch_size:
+                    processed += self._flush_chunks(conn, pending, pending_records, incremental)
+                    pending = []
+                    pending_records = {}
+            
+            # Also refresh records of unchanged files whose mtime moved; files
+            # processed in this run only have a record if they succeeded
+            processed_files = {self._relative_filename(f, sources) for f in files}
+            unchanged = {name: record for name, record in file_records.items()
+                         if name not in processed_files}
+            processed += self._flush_chunks(conn, pending, {**unchanged, **pending_records}, incremental)
+            
+            if self.verbose:
+                print(f"Created {processed} new chunks")
+            
+            total = conn.execute('SELECT COUNT(*) FROM chunks').fetchone()[0]
+            if total == 0 and created:
+                conn.close()
+                self._remove_database(index_file)
+                return None
+            
+            self._finalize_database(conn, created, incremental=incremental)
+            return total
+        finally:
+            conn.close()
+    
+    def _flush_chunks(self, conn: sqlite3.Connection, chunks: List[Dict[str, Any]],
+                      file_records: Dict[str, Dict[str, Any]], incremental: bool = False) -> int:
+        """Embed a batch of chunks and write it to the index in one transaction"""
+        if chunks:
+            self._load_model()
+            if self.verbose:
+                print(f"Generating embeddings for {len(chunks)} chunks...")
+            self._embed_chunks(chunks)
+        
+        self._write_chunks(conn, chunks, file_records, incremental=incremental)
+        return len(chunks)
+    
+    def _partial_path(self, output_file: str) -> str:
+        """Get the path an index is built at before being moved into place"""
+        return f"{output_file}.partial"
+    
+    def _remove_database(self, index_file: str):
+        """Remove a SQLite file along with any WAL files"""
+        for path in (index_file, f"{index_file}-wal", f"{index_file}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _build_settings(self, tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get the settings that determine chunk content and embeddings
+        
+        An index can only be updated incrementally if it was built with the
+        same settings; otherwise unchanged files would keep stale chunks.
+        """
+        settings = {
+            'model_name': self.model_name,
+            'chunking_strategy': self.chunking_strategy,
+            'max_sentences_per_chunk': self.max_sentences_per_chunk,
+            'chunk_size': self.chunk_size,
+            'chunk_overlap': self.chunk_overlap,
+            'split_newlines': self.split_newlines,
+            'index_nlp_backend': self.index_nlp_backend,
+            'semantic_threshold': self.semantic_threshold,
+            'topic_threshold': self.topic_threshold,
+            'tags': tags or []
+        }
+        if self.chunking_strategy == 'semantic':
+            # Only semantic chunking pools sentence embeddings
+            settings['pool_sentence_embeddings'] = self.pool_sentence_embeddings
+        return settings
+    
+    def _relative_filename(self, file_path: Path, sources: List[Path]) -> str:
+        """Get the filename a file's chunks are stored under"""
+        return str(file_path.relative_to(self._get_base_directory_for_file(file_path, sources)))
+    
+    def _hash_file(self, file_path: Path) -> str:
+        """Compute the SHA-256 hash of a file's content"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _fingerprint_files(self, files: List[Path], sources: List[Path],
+                           stored_records: Optional[Dict[str, Dict[str, Any]]] = None
+                           ) -> Tuple[List[Path], Dict[str, Dict[str, Any]]]:
+        """
+        Record content hash, mtime and size of each file and find the files to process
+        
+        Files whose mtime and size match the stored record are assumed
+        unchanged without being read; others are hashed and only processed
+        if the hash differs.
+        
+        Args:
+            files: Discovered files
+            sources: Original source paths
+            stored_records: File records of the index being updated, if any
+            
+        Returns:
+            Tuple of (files to process, file records keyed by filename)
+        """
+        stored_records = stored_records or {}
+        to_process = []
+        file_records = {}
+        
+        for file_path in files:
+            filename = self._relative_filename(file_path, sources)
+            try:
+                stat = file_path.stat()
+                previous = stored_records.get(filename)
+                if previous and previous['mtime'] == stat.st_mtime and previous['size'] == stat.st_size:
+                    file_records[filename] = previous
+                    continue
+                content_hash = self._hash_file(file_path)
+            except OSError as e:
+                # Leave it to processing to report the error; without a record
+                # the file is retried on the next update
+                logger.warning(f"Could not fingerprint {file_path}: {e}")
+                to_process.append(file_path)
+                continue
+            
+            file_records[filename] = {
+                'content_hash': content_hash,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size
+            }
+            if not previous or previous['content_hash'] != content_hash:
+                to_process.append(file_path)
+        
+        return to_process, file_records
+    
+    def _load_file_records(self, output_file: str,
+                           build_settings: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Load the file records of an existing index for an incremental update
+        
+        Args:
+            output_file: Index file path or pgvector collection name
+            build_settings: Settings of the current build
+            
+        Returns:
+            File records keyed by filename, or None if there is no index built
+            with the same settings to update
+        """
+        if self.backend != 'sqlite':
+            from .pgvector_backend import PgVectorBackend
+            
+            collection_name = self._pgvector_collection_name(output_file)
+            backend = PgVectorBackend(self.connection_string)
+            try:
+                if collection_name not in backend.list_collections():
+                    return None
+                metadata = backend.get_stats(collection_name)['config'].get('metadata') or {}
+                if metadata.get('build_settings') != build_settings:
+                    return None
+                return backend.get_file_records(collection_name)
+            finally:
+                backend.close()
+        
+        if not os.path.exists(output_file):
+            return None
+        
+        conn = sqlite3.connect(output_file)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM config WHERE key = 'build_settings'")
+            row = cursor.fetchone()
+            if not row or json.loads(row[0]) != build_settings:
+                return None
+            cursor.execute('SELECT filename, content_hash, mtime, size FROM files')
+            return {
+                filename: {'content_hash': content_hash, 'mtime': mtime, 'size': size}
+                for filename, content_hash, mtime, size in cursor.fetchall()
+            }
+        except sqlite3.Error as e:
+            # Indexes built before file tracking can't be updated
+            logger.info(f"Cannot update {output_file} incrementally: {e}")
+            return None
+        finally:
+            conn.close()
+
+    def _process_source_file(self, file_path: Path, sources: List[Path],
+                             tags: Optional[List[str]] = None,
+                             preprocess: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Extract and chunk one file, isolating any failure to that file
         
+        Args:
+            file_path: File to process
+            sources: Original source paths, used to compute relative filenames
+            tags: Global tags to add to all chunks
+            preprocess: Also run search preprocessing on each chunk
+            
+        Returns:
+            Tuple of (chunks, error message or None)
+        """
+        try:
+            # For individual files, use the file's parent as the base directory
+            # For files from directories, use the original source directory
+            base_dir = self._get_base_directory_for_file(file_path, sources)
+            file_chunks = self._process_file(file_path, base_dir, tags)
+            if preprocess:
+                self._preprocess_chunks(file_chunks)
+            if self.verbose:
+                print(f"Processed {file_path}: {len(file_chunks)} chunks")
+            return file_chunks, None
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            if self.verbose:
+                print(f"Error processing {file_path}: {e}")
+            return [], str(e)
+    
+    def _worker_settings(self) -> Dict[str, Any]:
+        """Get the constructor arguments needed to rebuild this builder in a worker process"""
+        return {
+            'model_name': self.model_name,
+            'chunking_strategy': self.chunking_strategy,
+            'max_sentences_per_chunk': self.max_sentences_per_chunk,
+            'chunk_size': self.chunk_size,
+            'chunk_overlap': self.chunk_overlap,
+            'split_newlines': self.split_newlines,
+            'index_nlp_backend': self.index_nlp_backend,
+            'verbose': self.verbose,
+            'semantic_threshold': self.semantic_threshold,
+            'topic_threshold': self.topic_threshold,
+            'nlp_batch_size': self.nlp_batch_size,
+            'nlp_processes': self.nlp_processes,
+            'pool_sentence_embeddings': self.pool_sentence_embeddings
+        }
+    
+    def _iter_processed_files(self, files: List[Path], sources: List[Path],
+                              tags: Optional[List[str]] = None
+                              ) -> Iterator[Tuple[Path, List[Dict[str, Any]], Optional[str]]]:
+        """
+        Extract and chunk files, yielding each file's chunks in file order
+        
+        With more than one worker, files are extracted, chunked and
+        preprocessed in a pool of worker processes. Only a few files per
+        worker are in flight at a time, so results don't pile up in memory
+        ahead of the consumer, and the output is identical to a serial
+        build. A file that fails only loses its own chunks; if the pool
+        itself dies, the remaining files are processed in this process.
+        
+        Args:
+            files: Files to process
+            sources: Original source paths
+            tags: Global tags to add to all chunks
+            
+        Yields:
+            Tuples of (file path, chunks, error message or None)
+        """
+        done = 0
+        workers = min(self.workers, len(files))
+        if workers > 1:
+            if self.verbose:
+                print(f"Processing {len(files)} files with {workers} worker processes")
+            
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self._worker_settings(),)) as executor:
+                    in_flight = deque()
+                    remaining = iter(files)
+                    for file_path in itertools.islice(remaining, workers * 2):
+                        in_flight.append((file_path, executor.submit(_process_file_in_worker,
+                                                                     file_path, sources, tags)))
+                    while in_flight:
+                        file_path, future = in_flight.popleft()
+                        file_chunks, error = future.result()
+                        next_file = next(remaining, None)
+                        if next_file is not None:
+                            in_flight.append((next_file, executor.submit(_process_file_in_worker,
+                                                                         next_file, sources, tags)))
+                        done += 1
+                        yield file_path, file_chunks, error
+            except BrokenProcessPool as e:
+                logger.error(f"Worker pool failed after {done} files, processing the rest serially: {e}")
+        
+        for file_path in files[done:]:
+            file_chunks, error = self._process_source_file(file_path, sources, tags, preprocess=workers > 1)
+            yield file_path, file_chunks, error
+    
+    def _preprocess_chunks(self, chunks: List[Dict[str, Any]]):
+        """
+        Run search preprocessing on chunks that haven't been preprocessed yet
+        
+        Chunks are preprocessed in bulk per language (see preprocess_documents),
+        falling back to one chunk at a time if a batch fails. Sets
+        'processed_content' and 'keywords' on each chunk.
+        
+        Args:
+            chunks: Chunks to preprocess, updated in place
+        """
+        by_language = {}
         for i, chunk in enumerate(chunks):
+            if 'processed_content' not in chunk:
+                by_language.setdefault(chunk.get('language', 'en'), []).append(i)
+        
+        for language, indexes in by_language.items():
+            try:
+                processed_stream = preprocess_documents(
+                    (chunks[i]['content'] for i in indexes),
+                    language=language,
+                    index_nlp_backend=self.index_nlp_backend,
+                    batch_size=self.nlp_batch_size,
+                    n_process=self.nlp_processes
+                )
+                for i, processed in zip(indexes, processed_stream):
+                    chunks[i]['processed_content'] = processed['enhanced_text']
+                    chunks[i]['keywords'] = processed.get('keywords', [])
+            except Exception as e:
+                logger.error(f"Error preprocessing {len(indexes)} chunks in bulk, retrying individually: {e}")
+        
+        for i, chunk in enumerate(chunks):
+            if 'processed_content' in chunk:
+                continue
             try:
                 # Preprocess content for better search
                 processed = preprocess_document_content(
@@ -181,43 +699,83 @@ class IndexBuilder:
                     language=chunk.get('language', 'en'),
                     index_nlp_backend=self.index_nlp_backend
                 )
-                
                 chunk['processed_content'] = processed['enhanced_text']
                 chunk['keywords'] = processed.get('keywords', [])
-                
-                # Generate embedding (suppress progress bar)
-                embedding = self.model.encode(processed['enhanced_text'], show_progress_bar=False)
-                chunk['embedding'] = embedding.tobytes()
-                
-                if self.verbose and (i + 1) % 50 == 0:
-                    progress_pct = ((i + 1) / len(chunks)) * 100
-                    print(f"Generated embeddings: {i + 1}/{len(chunks)} chunks ({progress_pct:.1f}%)")
-                    
             except Exception as e:
                 logger.error(f"Error processing chunk {i}: {e}")
                 # Use original content as fallback
                 chunk['processed_content'] = chunk['content']
                 chunk['keywords'] = []
-                # Create zero embedding as fallback
-                if np:
-                    embedding = np.zeros(768, dtype=np.float32)
-                    chunk['embedding'] = embedding.tobytes()
-                else:
-                    chunk['embedding'] = b''
+    
+    def _embed_chunks(self, chunks: List[Dict[str, Any]]):
+        """
+        Preprocess chunks and generate their embeddings in batches
         
-        # Store chunks based on backend
-        if self.backend == 'sqlite':
-            # Create SQLite database
-            sources_info = [str(s) for s in sources]
-            self._create_database(output_file, chunks, languages or ['en'], sources_info, file_types)
+        Chunks are encoded in batches of similar length so the model pads
+        as little as possible. Sets 'processed_content', 'keywords' and
+        'embedding' (float32 bytes) on each chunk. Chunks that already have
+        an embedding (pooled sentence embeddings from semantic chunking)
+        are not encoded again.
+        
+        Args:
+            chunks: Chunks to embed, updated in place
+        """
+        self._preprocess_chunks(chunks)
+        
+        embedding_dim = None
+        pending = []
+        for i, chunk in enumerate(chunks):
+            if chunk.get('embedding'):
+                if np is not None and embedding_dim is None:
+                    embedding_dim = len(np.frombuffer(chunk['embedding'], dtype=np.float32))
+            else:
+                pending.append(i)
+        
+        # Sort by text length so each batch holds similarly sized inputs
+        order = sorted(pending, key=lambda i: len(chunks[i]['processed_content']))
+        failed = []
+        done = 0
+        
+        for batch_start in range(0, len(order), self.batch_size):
+            batch = order[batch_start:batch_start + self.batch_size]
+            texts = [chunks[i]['processed_content'] for i in batch]
+            
+            try:
+                # Generate embeddings (suppress progress bar)
+                embeddings = self.model.encode(texts, batch_size=self.batch_size, show_progress_bar=False)
+                embeddings = [embeddings[j] for j in range(len(batch))]
+            except Exception as e:
+                logger.error(f"Error embedding batch of {len(batch)} chunks, retrying individually: {e}")
+                embeddings = []
+                for i, text in zip(batch, texts):
+                    try:
+                        embeddings.append(self.model.encode(text, show_progress_bar=False))
+                    except Exception as chunk_error:
+                        logger.error(f"Error processing chunk {i}: {chunk_error}")
+                        embeddings.append(None)
             
+            for i, embedding in zip(batch, embeddings):
+                if embedding is None:
+                    failed.append(i)
+                    continue
+                if np is not None:
+                    embedding = np.asarray(embedding, dtype=np.float32)
+                    embedding_dim = embedding_dim or embedding.shape[-1]
+                chunks[i]['embedding'] = embedding.tobytes()
+            
+            done += len(batch)
             if self.verbose:
-                print(f"Index created: {output_file}")
-                print(f"Total chunks: {len(chunks)}")
-        else:
-            # Use pgvector backend
-            self._store_chunks_pgvector(chunks, output_file, languages or ['en'], overwrite)
-
+                progress_pct = (done / len(order)) * 100
+                print(f"Generated embeddings: {done}/{len(order)} chunks ({progress_pct:.1f}%)")
+        
+        # Create zero embeddings as fallback, matching the model's dimension
+        for i in failed:
+            if np:
+                embedding = np.zeros(embedding_dim or 768, dtype=np.float32)
+                chunks[i]['embedding'] = embedding.tobytes()
+            else:
+                chunks[i]['embedding'] = b''
+    
     def build_index(self, source_dir: str, output_file: str, 
                    file_types: List[str], exclude_patterns: Optional[List[str]] = None,
                    languages: List[str] = None, tags: Optional[List[str]] = None):
@@ -384,95 +942,106 @@ class IndexBuilder:
     
     def _process_file(self, file_path: Path, source_dir: str, 
                      global_tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Process single file into chunks"""
-        try:
-            relative_path = str(file_path.relative_to(source_dir))
-            file_extension = file_path.suffix.lower()
-            
-            # Handle different file types appropriately
-            if file_extension == '.pdf':
-                # Use document processor for PDF extraction
-                content_result = self.doc_processor._extract_text_from_file(str(file_path))
-                if isinstance(content_result, str) and content_result.startswith('{"error"'):
-                    if self.verbose:
-                        print(f"Skipping PDF file (extraction failed): {file_path}")
-                    return []
-                content = content_result
-            elif file_extension in ['.docx', '.xlsx', '.pptx']:
-                # Use document processor for Office documents
-                content_result = self.doc_processor._extract_text_from_file(str(file_path))
-                if isinstance(content_result, str) and content_result.startswith('{"error"'):
-                    if self.verbose:
-                        print(f"Skipping office document (extraction failed): {file_path}")
-                    return []
-                content = content_result
-            elif file_extension == '.html':
-                # Use document processor for HTML
-                content_result = self.doc_processor._extract_text_from_file(str(file_path))
-                if isinstance(content_result, str) and content_result.startswith('{"error"'):
-                    if self.verbose:
-                        print(f"Skipping HTML file (extraction failed): {file_path}")
-                    return []
-                content = content_result
-            elif file_extension == '.rtf':
-                # Use document processor for RTF
-                content_result = self.doc_processor._extract_text_from_file(str(file_path))
-                if isinstance(content_result, str) and content_result.startswith('{"error"'):
-                    if self.verbose:
-                        print(f"Skipping RTF file (extraction failed): {file_path}")
-                    return []
-                content = content_result
-            else:
-                # Try to read as text file (markdown, txt, code, etc.)
+        """
+        Process single file into chunks
+        
+        Binary and empty files give no chunks. Failures to read or extract
+        a file raise, so the caller can leave the file to be retried.
+        
+        Raises:
+            ValueError: If text can't be extracted from a document
+            OSError: If the file can't be read
+        """
+        relative_path = str(file_path.relative_to(source_dir))
+        file_extension = file_path.suffix.lower()
+        
+        # Handle different file types appropriately
+        if file_extension in ['.pdf', '.docx', '.xlsx', '.pptx', '.html', '.rtf']:
+            # Use document processor for PDF, Office, HTML and RTF extraction
+            content = self.doc_processor._extract_text_from_file(str(file_path))
+            if isinstance(content, str) and content.startswith('{"error"'):
                 try:
-                    content = file_path.read_text(encoding='utf-8')
-                except UnicodeDecodeError:
-                    if self.verbose:
-                        print(f"Skipping binary file: {file_path}")
-                    return []
-            
-            # Validate content
-            if not content or (isinstance(content, str) and len(content.strip()) == 0):
+                    error = json.loads(content).get('error', content)
+                except ValueError:
+                    error = content
+                raise ValueError(f"Text extraction failed: {error}")
+        else:
+            # Try to read as text file (markdown, txt, code, etc.)
+            try:
+                content = file_path.read_text(encoding='utf-8')
+            except UnicodeDecodeError:
                 if self.verbose:
-                    print(f"Skipping empty file: {file_path}")
+                    print(f"Skipping binary file: {file_path}")
                 return []
-            
-            # Create chunks using document processor - pass content directly, not file path
-            chunks = self.doc_processor.create_chunks(
-                content=content,  # Pass the actual content, not the file path
-                filename=relative_path,
-                file_type=file_path.suffix.lstrip('.')
-            )
-            
-            # Add global tags
-            if global_tags:
-                for chunk in chunks:
-                    existing_tags = chunk.get('tags', [])
-                    if isinstance(existing_tags, str):
-                        existing_tags = [existing_tags]
-                    chunk['tags'] = existing_tags + global_tags
-            
-            return chunks
-            
-        except Exception as e:
-            logger.error(f"Error processing file {file_path}: {e}")
+        
+        # Validate content
+        if not content or (isinstance(content, str) and len(content.strip()) == 0):
+            if self.verbose:
+                print(f"Skipping empty file: {file_path}")
             return []
+        
+        # Create chunks using document processor - pass content directly, not file path
+        chunks = self.doc_processor.create_chunks(
+            content=content,  # Pass the actual content, not the file path
+            filename=relative_path,
+            file_type=file_path.suffix.lstrip('.')
+        )
+        
+        # Add global tags
+        if global_tags:
+            for chunk in chunks:
+                existing_tags = chunk.get('tags', [])
+                if isinstance(existing_tags, str):
+                    existing_tags = [existing_tags]
+                chunk['tags'] = existing_tags + global_tags
+        
+        return chunks
     
     def _create_database(self, output_file: str, chunks: List[Dict[str, Any]], 
-                        languages: List[str], sources_info: List[str], file_types: List[str]):
+                        languages: List[str], sources_info: List[str], file_types: List[str],
+                        file_records: Optional[Dict[str, Dict[str, Any]]] = None,
+                        build_settings: Optional[Dict[str, Any]] = None):
         """Create SQLite database with all data"""
         
         # Remove existing file
-        if os.path.exists(output_file):
-            os.remove(output_file)
+        self._remove_database(output_file)
         
-        conn = sqlite3.connect(output_file)
+        conn = self._open_database(output_file, languages, sources_info, file_types,
+                                   build_settings or self._build_settings())
+        try:
+            self._write_chunks(conn, chunks, file_records or {})
+            self._finalize_database(conn, created=True)
+        finally:
+            conn.close()
+    
+    def _open_database(self, index_file: str, languages: List[str], sources_info: List[str],
+                       file_types: List[str], build_settings: Dict[str, Any]) -> sqlite3.Connection:
+        """
+        Open a SQLite index for writing, creating its tables if needed
+        
+        The database is put in WAL mode for the build; secondary indexes
+        and the FTS table contents are left to _finalize_database.
+        
+        Args:
+            index_file: SQLite file path
+            languages: List of supported languages
+            sources_info: Source paths stored in the config
+            file_types: File types stored in the config
+            build_settings: Settings stored in the config
+            
+        Returns:
+            Open connection
+        """
+        conn = sqlite3.connect(index_file)
         cursor = conn.cursor()
         
         try:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            
             # Create schema
             cursor.execute('''
-                CREATE TABLE chunks (
+                CREATE TABLE IF NOT EXISTS chunks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     content TEXT NOT NULL,
                     processed_content TEXT NOT NULL,
@@ -491,7 +1060,7 @@ class IndexBuilder:
             ''')
             
             cursor.execute('''
-                CREATE VIRTUAL TABLE chunks_fts USING fts5(
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
                     processed_content,
                     keywords,
                     content='chunks',
@@ -500,7 +1069,7 @@ class IndexBuilder:
             ''')
             
             cursor.execute('''
-                CREATE TABLE synonyms (
+                CREATE TABLE IF NOT EXISTS synonyms (
                     word TEXT,
                     pos_tag TEXT,
                     synonyms TEXT,
@@ -510,80 +1079,280 @@ class IndexBuilder:
             ''')
             
             cursor.execute('''
-                CREATE TABLE config (
+                CREATE TABLE IF NOT EXISTS config (
                     key TEXT PRIMARY KEY,
                     value TEXT
                 )
             ''')
             
-            # Create indexes for performance
-            cursor.execute('CREATE INDEX idx_chunks_filename ON chunks(filename)')
-            cursor.execute('CREATE INDEX idx_chunks_language ON chunks(language)')
-            cursor.execute('CREATE INDEX idx_chunks_tags ON chunks(tags)')
+            # Normalized chunk tags, so searches can be restricted to tagged
+            # chunks before ranking; rebuilt from chunks.tags when finalized
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS chunk_tags (
+                    tag TEXT NOT NULL,
+                    chunk_id INTEGER NOT NULL,
+                    PRIMARY KEY (tag, chunk_id)
+                ) WITHOUT ROWID
+            ''')
             
-            # Insert config
-            embedding_dimensions = 768  # Default for all-mpnet-base-v2
-            if chunks and chunks[0].get('embedding'):
-                try:
-                    if np:
-                        embedding_array = np.frombuffer(chunks[0]['embedding'], dtype=np.float32)
-                        embedding_dimensions = len(embedding_array)
-                except:
-                    pass
+            # Source file state for incremental updates
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS files (
+                    filename TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    mtime REAL,
+                    size INTEGER,
+                    indexed_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
             
+            # Insert config, keeping the values of an existing index
             config_data = {
                 'embedding_model': self.model_name,
-                'embedding_dimensions': str(embedding_dimensions),
+                'embedding_dimensions': '768',  # Default for all-mpnet-base-v2, set when finalized
                 'chunk_size': str(self.chunk_size),
                 'chunk_overlap': str(self.chunk_overlap),
                 'preprocessing_version': '1.0',
                 'languages': json.dumps(languages),
                 'created_at': datetime.now().isoformat(),
                 'sources': json.dumps(sources_info),  # Store list of sources instead of single directory
-                'file_types': json.dumps(file_types)
+                'file_types': json.dumps(file_types),
+                'build_settings': json.dumps(build_settings)
             }
             
-            for key, value in config_data.items():
-                cursor.execute('INSERT INTO config (key, value) VALUES (?, ?)', (key, value))
+            cursor.executemany('INSERT OR IGNORE INTO config (key, value) VALUES (?, ?)',
+                               list(config_data.items()))
+            conn.commit()
+            return conn
             
-            # Insert chunks
-            for chunk in chunks:
-                # Create hash for deduplication - include filename, section, and line numbers for uniqueness
-                hash_content = f"{chunk['filename']}:{chunk.get('section', '')}:{chunk.get('start_line', 0)}:{chunk.get('end_line', 0)}:{chunk['content']}"
-                chunk_hash = hashlib.sha256(hash_content.encode()).hexdigest()[:16]
-                
-                # Prepare data
-                keywords_json = json.dumps(chunk.get('keywords', []))
-                tags_json = json.dumps(chunk.get('tags', []))
-                metadata_json = json.dumps(chunk.get('metadata', {}))
-                
-                cursor.execute('''
-                    INSERT OR IGNORE INTO chunks (
-                        content, processed_content, keywords, language, embedding,
-                        filename, section, start_line, end_line, tags, metadata, chunk_hash
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    chunk['content'],
-                    chunk.get('processed_content', chunk['content']),
-                    keywords_json,
-                    chunk.get('language', 'en'),
-                    chunk.get('embedding', b''),
-                    chunk['filename'],
-                    chunk.get('section'),
-                    chunk.get('start_line'),
-                    chunk.get('end_line'),
-                    tags_json,
-                    metadata_json,
-                    chunk_hash
-                ))
+        except Exception:
+            conn.close()
+            raise
+    
+    def _write_chunks(self, conn: sqlite3.Connection, chunks: List[Dict[str, Any]],
+                      file_records: Dict[str, Dict[str, Any]], replace_files: Optional[List[str]] = None,
+                      incremental: bool = False):
+        """
+        Write a batch of chunks and their file records in a single transaction
+        
+        Args:
+            conn: Open index connection
+            chunks: Embedded chunks to insert
+            file_records: File records to insert or update
+            replace_files: Filenames whose existing chunks and records are deleted first
+            incremental: Also update the full-text index, chunk_tags and ANN
+                         assignments of the deleted and inserted chunks
+        """
+        cursor = conn.cursor()
+        
+        try:
+            if replace_files:
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_chunks_filename ON chunks(filename)')
+                if incremental:
+                    self._unindex_chunks(cursor, replace_files)
+                cursor.executemany('DELETE FROM chunks WHERE filename = ?',
+                                   [(filename,) for filename in replace_files])
+                cursor.executemany('DELETE FROM files WHERE filename = ?',
+                                   [(filename,) for filename in replace_files])
+            if incremental:
+                # Chunk ids are AUTOINCREMENT, so new chunks sort after the current ones
+                cursor.execute('SELECT COALESCE(MAX(id), 0) FROM chunks')
+                last_id = cursor.fetchone()[0]
+            self._insert_chunks(cursor, chunks)
+            if incremental:
+                self._index_new_chunks(cursor, last_id)
+            self._store_file_records(cursor, file_records)
+            conn.commit()
+            
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            cursor.close()
+    
+    def _finalize_database(self, conn: sqlite3.Connection, created: bool, incremental: bool = False):
+        """
+        Build the parts of the index that are deferred until all chunks are written
+        
+        Creates the secondary indexes, populates the full-text index and the
+        chunk_tags table, records the embedding dimensions and builds the ANN
+        index, then switches the database out of WAL mode so it is a single
+        file again. Incremental updates have already kept the full-text index
+        and chunk_tags in sync, and add their new chunks to the existing ANN
+        lists rather than retraining them.
+        
+        Args:
+            conn: Open index connection
+            created: Whether the index was created by this build
+            incremental: Whether this finishes an incremental update
+        """
+        cursor = conn.cursor()
+        
+        try:
+            # Create indexes for performance
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_chunks_filename ON chunks(filename)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_chunks_language ON chunks(language)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_chunks_tags ON chunks(tags)')
+            
+            if not incremental:
+                # Populate the external content FTS table from the chunks table
+                cursor.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('rebuild')")
+                self._rebuild_chunk_tags(cursor)
+            
+            embedding_dimensions = 768  # Default for all-mpnet-base-v2
+            cursor.execute("SELECT embedding FROM chunks WHERE length(embedding) > 0 LIMIT 1")
+            row = cursor.fetchone()
+            if row:
+                try:
+                    if np:
+                        embedding_array = np.frombuffer(row[0], dtype=np.float32)
+                        embedding_dimensions = len(embedding_array)
+                except:
+                    pass
+            cursor.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('embedding_dimensions', ?)",
+                           (str(embedding_dimensions),))
+            if not created:
+                cursor.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('updated_at', ?)",
+                               (datetime.now().isoformat(),))
+            # Identifies this build of the index, e.g. for the search engine's embedding sidecar
+            cursor.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('build_id', ?)",
+                           (uuid.uuid4().hex,))
+            
+            # Build approximate nearest neighbour index over the stored embeddings;
+            # updates keep the trained lists unless a different list count is asked for
+            cursor.execute("SELECT value FROM config WHERE key = 'ann_index'")
+            row = cursor.fetchone()
+            ann_index = self.ann_index or (row[0] if row else None)
+            if ann_index:
+                cursor.execute("SELECT value FROM config WHERE key = 'ann_nlist'")
+                nlist = cursor.fetchone()
+                if (not incremental or not row or not nlist
+                        or (self.ann_lists and str(self.ann_lists) != nlist[0])):
+                    build_ann_index(conn, ann_index, nlist=self.ann_lists,
+                                    nprobe=self.ann_nprobe, verbose=self.verbose)
+                else:
+                    assigned = assign_ann_index(conn)
+                    if self.ann_nprobe:
+                        cursor.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('ann_nprobe', ?)",
+                                       (str(max(1, min(self.ann_nprobe, int(nlist[0])))),))
+                    if self.verbose:
+                        print(f"Added {assigned} chunks to the existing IVF index")
             
             conn.commit()
             
+            # Leave WAL mode so the finished index is a single file
+            cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            cursor.execute('PRAGMA journal_mode=DELETE')
+            
         except Exception as e:
             conn.rollback()
             raise e
         finally:
-            conn.close()
+            cursor.close()
+    
+    def _rebuild_chunk_tags(self, cursor: sqlite3.Cursor):
+        """Repopulate the chunk_tags table from the tags of every chunk"""
+        cursor.execute('DELETE FROM chunk_tags')
+        self._index_chunk_tags(cursor)
+    
+    def _index_chunk_tags(self, cursor: sqlite3.Cursor, after_id: int = 0):
+        """Add the tags of chunks with an id above after_id to the chunk_tags table"""
+        reader = cursor.connection.cursor()
+        try:
+            reader.execute("SELECT id, tags FROM chunks WHERE id > ? AND tags IS NOT NULL AND tags != '[]'",
+                           (after_id,))
+            while True:
+                rows = reader.fetchmany(self.write_batch_size)
+                if not rows:
+                    break
+                cursor.executemany('INSERT OR IGNORE INTO chunk_tags (tag, chunk_id) VALUES (?, ?)', [
+                    (str(tag), chunk_id)
+                    for chunk_id, tags_json in rows
+                    for tag in json.loads(tags_json or '[]')
+                ])
+        finally:
+            reader.close()
+    
+    def _backfill_chunk_tags(self, conn: sqlite3.Connection):
+        """Populate chunk_tags of an index built before the table existed"""
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1 FROM chunk_tags LIMIT 1")
+            if cursor.fetchone() is None:
+                cursor.execute("SELECT 1 FROM chunks WHERE tags IS NOT NULL AND tags != '[]' LIMIT 1")
+                if cursor.fetchone() is not None:
+                    self._rebuild_chunk_tags(cursor)
+                    conn.commit()
+        finally:
+            cursor.close()
+    
+    def _unindex_chunks(self, cursor: sqlite3.Cursor, filenames: List[str]):
+        """Remove the chunks of files from the full-text index, chunk_tags and ANN assignments"""
+        params = [(filename,) for filename in filenames]
+        # Deleting from an external content FTS table takes the row's old values
+        cursor.executemany('''
+            INSERT INTO chunks_fts(chunks_fts, rowid, processed_content, keywords)
+            SELECT 'delete', id, processed_content, keywords FROM chunks WHERE filename = ?
+        ''', params)
+        cursor.executemany('DELETE FROM chunk_tags WHERE chunk_id IN (SELECT id FROM chunks WHERE filename = ?)',
+                           params)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ann_assignments'")
+        if cursor.fetchone():
+            cursor.executemany('DELETE FROM ann_assignments WHERE chunk_id IN '
+                               '(SELECT id FROM chunks WHERE filename = ?)', params)
+    
+    def _index_new_chunks(self, cursor: sqlite3.Cursor, after_id: int):
+        """Add chunks with an id above after_id to the full-text index and chunk_tags"""
+        cursor.execute('''
+            INSERT INTO chunks_fts(rowid, processed_content, keywords)
+            SELECT id, processed_content, keywords FROM chunks WHERE id > ?
+        ''', (after_id,))
+        self._index_chunk_tags(cursor, after_id)
+    
+    def _store_file_records(self, cursor: sqlite3.Cursor, file_records: Dict[str, Dict[str, Any]]):
+        """Insert or update source file records"""
+        cursor.executemany('''
+            INSERT OR REPLACE INTO files (filename, content_hash, mtime, size)
+            VALUES (?, ?, ?, ?)
+        ''', [
+            (filename, record['content_hash'], record['mtime'], record['size'])
+            for filename, record in file_records.items()
+        ])
+    
+    def _insert_chunks(self, cursor: sqlite3.Cursor, chunks: List[Dict[str, Any]]):
+        """Insert chunks into the chunks table"""
+        rows = []
+        for chunk in chunks:
+            # Create hash for deduplication - include filename, section, and line numbers for uniqueness
+            hash_content = f"{chunk['filename']}:{chunk.get('section', '')}:{chunk.get('start_line', 0)}:{chunk.get('end_line', 0)}:{chunk['content']}"
+            chunk_hash = hashlib.sha256(hash_content.encode()).hexdigest()[:16]
+            
+            # Prepare data
+            keywords_json = json.dumps(chunk.get('keywords', []))
+            tags_json = json.dumps(chunk.get('tags', []))
+            metadata_json = json.dumps(chunk.get('metadata', {}))
+            
+            rows.append((
+                chunk['content'],
+                chunk.get('processed_content', chunk['content']),
+                keywords_json,
+                chunk.get('language', 'en'),
+                chunk.get('embedding', b''),
+                chunk['filename'],
+                chunk.get('section'),
+                chunk.get('start_line'),
+                chunk.get('end_line'),
+                tags_json,
+                metadata_json,
+                chunk_hash
+            ))
+        
+        cursor.executemany('''
+            INSERT OR IGNORE INTO chunks (
+                content, processed_content, keywords, language, embedding,
+                filename, section, start_line, end_line, tags, metadata, chunk_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
     
     def validate_index(self, index_file: str) -> Dict[str, Any]:
         """Validate an existing search index"""
@@ -628,8 +1397,21 @@ class IndexBuilder:
         except Exception as e:
             return {"valid": False, "error": str(e)}
     
+    def _pgvector_collection_name(self, name: str) -> str:
+        """Turn an output name into a valid pgvector collection name"""
+        # Extract collection name from the provided name
+        if name.endswith('.swsearch'):
+            name = name[:-9]  # Remove .swsearch extension
+        
+        # Clean collection name for PostgreSQL
+        import re
+        return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+    
     def _store_chunks_pgvector(self, chunks: List[Dict[str, Any]], collection_name: str,
-                              languages: List[str], overwrite: bool = False):
+                              languages: List[str], overwrite: bool = False,
+                              file_records: Optional[Dict[str, Dict[str, Any]]] = None,
+                              replace_files: Optional[List[str]] = None,
+                              build_settings: Optional[Dict[str, Any]] = None):
         """
         Store chunks in pgvector backend
         
@@ -637,16 +1419,14 @@ class IndexBuilder:
             chunks: List of processed chunks
             collection_name: Name for the collection (from output_file parameter)
             languages: List of supported languages
+            overwrite: Drop the existing collection first
+            file_records: Source file records keyed by filename
+            replace_files: Filenames whose existing chunks are deleted (incremental update)
+            build_settings: Settings the collection was built with
         """
         from .pgvector_backend import PgVectorBackend
         
-        # Extract collection name from the provided name
-        if collection_name.endswith('.swsearch'):
-            collection_name = collection_name[:-9]  # Remove .swsearch extension
-        
-        # Clean collection name for PostgreSQL
-        import re
-        collection_name = re.sub(r'[^a-zA-Z0-9_]', '_', collection_name)
+        collection_name = self._pgvector_collection_name(collection_name)
         
         if self.verbose:
             print(f"Storing chunks in pgvector collection: {collection_name}")
@@ -667,8 +1447,10 @@ class IndexBuilder:
                     print(f"Dropping existing collection: {collection_name}")
                 backend.delete_collection(collection_name)
             
-            # Create schema
-            backend.create_schema(collection_name, embedding_dim)
+            # Create schema, keeping the embedding index of an existing collection
+            # unless another type was requested
+            vector_index = backend.create_schema(collection_name, embedding_dim,
+                                                 vector_index=self.pgvector_index)
             
             # Convert embeddings from bytes to numpy arrays
             for chunk in chunks:
@@ -689,12 +1471,15 @@ class IndexBuilder:
                     'max_sentences_per_chunk': self.max_sentences_per_chunk,
                     'chunk_size': self.chunk_size,
                     'chunk_overlap': self.chunk_overlap,
-                    'index_nlp_backend': self.index_nlp_backend
+                    'index_nlp_backend': self.index_nlp_backend,
+                    'vector_index': vector_index,
+                    'build_settings': build_settings or self._build_settings()
                 }
             }
             
             # Store chunks
-            backend.store_chunks(chunks, collection_name, config)
+            backend.store_chunks(chunks, collection_name, config,
+                                 replace_files=replace_files, file_records=file_records)
             
             if self.verbose:
                 stats = backend.get_stats(collection_name)
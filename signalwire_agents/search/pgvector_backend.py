@@ -7,9 +7,12 @@ Licensed under the MIT License.
 See LICENSE file in the project root for full license information.
 """
 
+import os
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from datetime import datetime
 
 try:
@@ -29,6 +32,138 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Maximum open connections per search backend (one per concurrent query)
+POOL_SIZE_ENV_VAR = 'SIGNALWIRE_SEARCH_PG_POOL_SIZE'
+DEFAULT_POOL_SIZE = 10
+
+# Approximate nearest neighbour index types for the embedding column
+VECTOR_INDEX_TYPES = ('ivfflat', 'hnsw')
+DEFAULT_HNSW_M = 16
+DEFAULT_HNSW_EF_CONSTRUCTION = 64
+DEFAULT_HNSW_EF_SEARCH = 40  # pgvector's default
+
+# Hybrid score weights, matching the SQLite backend
+DEFAULT_VECTOR_WEIGHT = 0.7
+DEFAULT_KEYWORD_WEIGHT = 0.3
+
+# Full-text search configuration of the stored tsvector column
+TEXT_SEARCH_CONFIG = 'english'
+
+
+class PgConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections with the vector type registered
+
+    Connections are opened on demand up to max_connections and kept open
+    for reuse across queries; a caller that finds every connection in use
+    waits for one to be returned. The vector type is registered once, when
+    a connection is opened. A connection is rolled back when returned, so
+    per-query settings (SET LOCAL) and failed transactions don't leak into
+    the next user, and closed or broken connections are discarded.
+    """
+    
+    def __init__(self, connection_string: str, max_connections: Optional[int] = None,
+                 min_connections: int = 1):
+        """
+        Initialize the pool
+        
+        Args:
+            connection_string: PostgreSQL connection string
+            max_connections: Maximum open connections (default: from
+                             SIGNALWIRE_SEARCH_PG_POOL_SIZE or 10)
+            min_connections: Connections opened up front
+        """
+        if max_connections is None:
+            try:
+                max_connections = int(os.environ.get(POOL_SIZE_ENV_VAR, DEFAULT_POOL_SIZE))
+            except ValueError:
+                max_connections = DEFAULT_POOL_SIZE
+        self.max_connections = max(1, max_connections)
+        self.connection_string = connection_string
+        # Every open connection is either idle here or borrowed, and the
+        # semaphore bounds the borrowed ones, so at most max_connections are open
+        self._available = threading.BoundedSemaphore(self.max_connections)
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        for _ in range(min(max(0, min_connections), self.max_connections)):
+            self._idle.append(self._open())
+    
+    def _open(self) -> Any:
+        """Open a new connection and register the vector type on it"""
+        conn = psycopg2.connect(self.connection_string)
+        try:
+            register_vector(conn)
+        except Exception:
+            conn.close()
+            raise
+        return conn
+    
+    def _checkout(self) -> Any:
+        """Take an idle connection that is still open, or open a new one"""
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._open()
+            if not conn.closed:
+                return conn
+    
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of a with block
+        
+        Yields:
+            psycopg2 connection with the pgvector type registered
+        """
+        self._available.acquire()
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._available.release()
+            raise
+        
+        discard = False
+        try:
+            yield conn
+        except Exception:
+            discard = bool(conn.closed)
+            raise
+        finally:
+            try:
+                if not conn.closed:
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        discard = True
+                discard = discard or bool(conn.closed)
+                with self._lock:
+                    keep = not discard and not self._closed
+                    if keep:
+                        self._idle.append(conn)
+                if not keep:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            finally:
+                self._available.release()
+    
+    def close(self):
+        """Close every idle connection; borrowed ones are closed when returned"""
+        with self._lock:
+            self._closed = True
+            connections, self._idle = self._idle, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
 
 class PgVectorBackend:
     """PostgreSQL pgvector backend for search indexing and retrieval"""
@@ -72,16 +207,62 @@ class PgVectorBackend:
         if self.conn is None or self.conn.closed:
             self._connect()
     
-    def create_schema(self, collection_name: str, embedding_dim: int = 768):
+    def get_vector_index(self, collection_name: str) -> Optional[str]:
+        """
+        Get the type of a collection's embedding index
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            'hnsw' or 'ivfflat', or None if the collection has no embedding index
+        """
+        self._ensure_connection()
+        
+        with self.conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT indexdef FROM pg_indexes
+                WHERE tablename = %s
+                  AND (indexdef ILIKE '%%USING hnsw%%' OR indexdef ILIKE '%%USING ivfflat%%')
+            """, (f"chunks_{collection_name}",))
+            definitions = [row[0].lower() for row in cursor.fetchall()]
+        
+        if any('using hnsw' in definition for definition in definitions):
+            return 'hnsw'
+        if definitions:
+            return 'ivfflat'
+        return None
+    
+    def create_schema(self, collection_name: str, embedding_dim: int = 768,
+                      vector_index: Optional[str] = None, hnsw_m: int = DEFAULT_HNSW_M,
+                      hnsw_ef_construction: int = DEFAULT_HNSW_EF_CONSTRUCTION) -> str:
         """
         Create database schema for a collection
         
+        Besides the chunks table, this creates a stored, generated tsvector
+        column with a GIN index for keyword search, and an ivfflat or HNSW
+        index on the embeddings. Existing collections are upgraded in place.
+        
         Args:
             collection_name: Name of the collection
             embedding_dim: Dimension of embeddings
+            vector_index: Embedding index type, 'ivfflat' or 'hnsw' (needs pgvector 0.5+);
+                          None keeps the collection's current index, or uses
+                          'ivfflat' for a new collection
+            hnsw_m: HNSW connections per node
+            hnsw_ef_construction: HNSW candidate list size while building
+            
+        Returns:
+            Embedding index type of the collection
         """
+        if vector_index is not None and vector_index not in VECTOR_INDEX_TYPES:
+            raise ValueError(f"Invalid vector_index '{vector_index}'. Must be one of: {', '.join(VECTOR_INDEX_TYPES)}")
+        
         self._ensure_connection()
         
+        if vector_index is None:
+            vector_index = self.get_vector_index(collection_name) or 'ivfflat'
+        
         with self.conn.cursor() as cursor:
             # Create extensions
             cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
@@ -103,11 +284,32 @@ class PgVectorBackend:
                 )
             """)
             
-            # Create indexes
+            # Keyword search reads a stored tsvector instead of parsing every
+            # row's content per query (added to collections created without it)
             cursor.execute(f"""
-                CREATE INDEX IF NOT EXISTS idx_{table_name}_embedding 
-                ON {table_name} USING ivfflat (embedding vector_cosine_ops)
-                WITH (lists = 100)
+                ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS content_tsv tsvector
+                GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', content)) STORED
+            """)
+            
+            # Create indexes, replacing an embedding index of the other type
+            if vector_index == 'hnsw':
+                cursor.execute(f"DROP INDEX IF EXISTS idx_{table_name}_embedding")
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table_name}_embedding_hnsw
+                    ON {table_name} USING hnsw (embedding vector_cosine_ops)
+                    WITH (m = {int(hnsw_m)}, ef_construction = {int(hnsw_ef_construction)})
+                """)
+            else:
+                cursor.execute(f"DROP INDEX IF EXISTS idx_{table_name}_embedding_hnsw")
+                cursor.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_{table_name}_embedding 
+                    ON {table_name} USING ivfflat (embedding vector_cosine_ops)
+                    WITH (lists = 100)
+                """)
+            
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table_name}_content_tsv
+                ON {table_name} USING gin (content_tsv)
             """)
             
             cursor.execute(f"""
@@ -120,6 +322,17 @@ class PgVectorBackend:
                 ON {table_name} USING gin (tags)
             """)
             
+            # Source file state for incremental updates
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table_name}_files (
+                    filename TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    mtime DOUBLE PRECISION,
+                    size BIGINT,
+                    indexed_at TIMESTAMP DEFAULT NOW()
+                )
+            """)
+            
             # Create config table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS collection_config (
@@ -135,16 +348,24 @@ class PgVectorBackend:
             
             self.conn.commit()
             logger.info(f"Created schema for collection '{collection_name}'")
+        
+        return vector_index
     
     def store_chunks(self, chunks: List[Dict[str, Any]], collection_name: str, 
-                    config: Dict[str, Any]):
+                    config: Dict[str, Any], replace_files: Optional[List[str]] = None,
+                    file_records: Optional[Dict[str, Dict[str, Any]]] = None):
         """
         Store document chunks in the database
         
+        Deleting replaced chunks, inserting new ones and recording file state
+        happen in a single transaction.
+        
         Args:
             chunks: List of processed chunks with embeddings
             collection_name: Name of the collection
             config: Configuration metadata
+            replace_files: Filenames whose existing chunks are deleted first
+            file_records: Source file records (content_hash, mtime, size) keyed by filename
         """
         self._ensure_connection()
         
@@ -188,16 +409,45 @@ class PgVectorBackend:
         
         # Batch insert chunks
         with self.conn.cursor() as cursor:
-            execute_values(
-                cursor,
-                f"""
-                INSERT INTO {table_name} 
-                (content, processed_content, embedding, filename, section, tags, metadata)
-                VALUES %s
-                """,
-                data,
-                template="(%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb)"
-            )
+            if replace_files:
+                cursor.execute(
+                    f"DELETE FROM {table_name} WHERE filename = ANY(%s)",
+                    (list(replace_files),)
+                )
+                cursor.execute(
+                    f"DELETE FROM {table_name}_files WHERE filename = ANY(%s)",
+                    (list(replace_files),)
+                )
+            
+            if data:
+                execute_values(
+                    cursor,
+                    f"""
+                    INSERT INTO {table_name} 
+                    (content, processed_content, embedding, filename, section, tags, metadata)
+                    VALUES %s
+                    """,
+                    data,
+                    template="(%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb)"
+                )
+            
+            if file_records:
+                execute_values(
+                    cursor,
+                    f"""
+                    INSERT INTO {table_name}_files (filename, content_hash, mtime, size)
+                    VALUES %s
+                    ON CONFLICT (filename) DO UPDATE SET
+                        content_hash = EXCLUDED.content_hash,
+                        mtime = EXCLUDED.mtime,
+                        size = EXCLUDED.size,
+                        indexed_at = NOW()
+                    """,
+                    [
+                        (filename, record['content_hash'], record['mtime'], record['size'])
+                        for filename, record in file_records.items()
+                    ]
+                )
             
             # Update or insert config
             cursor.execute("""
@@ -224,6 +474,32 @@ class PgVectorBackend:
             self.conn.commit()
             logger.info(f"Stored {len(chunks)} chunks in collection '{collection_name}'")
     
+    def get_file_records(self, collection_name: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get the source file records of a collection
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            Records (content_hash, mtime, size) keyed by filename, or None if
+            the collection predates file tracking
+        """
+        self._ensure_connection()
+        
+        table_name = f"chunks_{collection_name}_files"
+        
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", (table_name,))
+            if cursor.fetchone()[0] is None:
+                return None
+            
+            cursor.execute(f"SELECT filename, content_hash, mtime, size FROM {table_name}")
+            return {
+                filename: {'content_hash': content_hash, 'mtime': mtime, 'size': size}
+                for filename, content_hash, mtime, size in cursor.fetchall()
+            }
+    
     def get_stats(self, collection_name: str) -> Dict[str, Any]:
         """Get statistics for a collection"""
         self._ensure_connection()
@@ -280,6 +556,7 @@ class PgVectorBackend:
         
         with self.conn.cursor() as cursor:
             cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {table_name}_files")
             cursor.execute(
                 "DELETE FROM collection_config WHERE collection_name = %s",
                 (collection_name,)
@@ -297,13 +574,23 @@ class PgVectorBackend:
 class PgVectorSearchBackend:
     """PostgreSQL pgvector backend for search operations"""
     
-    def __init__(self, connection_string: str, collection_name: str):
+    def __init__(self, connection_string: str, collection_name: str,
+                 pool_size: Optional[int] = None, ef_search: Optional[int] = None,
+                 vector_weight: float = DEFAULT_VECTOR_WEIGHT,
+                 keyword_weight: float = DEFAULT_KEYWORD_WEIGHT):
         """
         Initialize search backend
         
         Args:
             connection_string: PostgreSQL connection string
             collection_name: Name of the collection to search
+            pool_size: Maximum pooled connections, i.e. concurrent queries
+                       (default: from SIGNALWIRE_SEARCH_PG_POOL_SIZE or 10)
+            ef_search: HNSW candidate list size per query; higher is more
+                       accurate and slower (default: 40, raised to the number
+                       of candidates a search needs)
+            vector_weight: Weight of the vector similarity in the hybrid score
+            keyword_weight: Weight of the keyword rank in the hybrid score
         """
         if not PGVECTOR_AVAILABLE:
             raise ImportError(
@@ -314,44 +601,63 @@ class PgVectorSearchBackend:
         self.connection_string = connection_string
         self.collection_name = collection_name
         self.table_name = f"chunks_{collection_name}"
-        self.conn = None
-        self._connect()
-        self.config = self._load_config()
-    
-    def _connect(self):
-        """Establish database connection"""
+        self.ef_search = ef_search
+        self.vector_weight = vector_weight
+        self.keyword_weight = keyword_weight
         try:
-            self.conn = psycopg2.connect(self.connection_string)
-            register_vector(self.conn)
+            self._pool = PgConnectionPool(connection_string, max_connections=pool_size)
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
-    
-    def _ensure_connection(self):
-        """Ensure database connection is active"""
-        if self.conn is None or self.conn.closed:
-            self._connect()
+        self.config = self._load_config()
+        self._tsvector, self._hnsw = self._inspect_table()
     
     def _load_config(self) -> Dict[str, Any]:
         """Load collection configuration"""
-        self._ensure_connection()
+        with self._pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT * FROM collection_config WHERE collection_name = %s",
+                    (self.collection_name,)
+                )
+                row = cursor.fetchone()
+                
+                if row:
+                    return {
+                        'model_name': row[1],
+                        'embedding_dimensions': row[2],
+                        'chunking_strategy': row[3],
+                        'languages': row[4],
+                        'metadata': row[6]
+                    }
+                return {}
+    
+    def _inspect_table(self) -> Tuple[str, bool]:
+        """
+        Find out how the collection's table was created
         
-        with self.conn.cursor() as cursor:
-            cursor.execute(
-                "SELECT * FROM collection_config WHERE collection_name = %s",
-                (self.collection_name,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                return {
-                    'model_name': row[1],
-                    'embedding_dimensions': row[2],
-                    'chunking_strategy': row[3],
-                    'languages': row[4],
-                    'metadata': row[6]
-                }
-            return {}
+        Returns:
+            Tuple of (tsvector column, or the equivalent expression for
+            collections created without it, whether embeddings have an HNSW index)
+        """
+        with self._pool.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = %s AND column_name = 'content_tsv'
+                """, (self.table_name,))
+                has_tsvector = cursor.fetchone() is not None
+                cursor.execute("""
+                    SELECT 1 FROM pg_indexes
+                    WHERE tablename = %s AND indexdef ILIKE '%%USING hnsw%%'
+                """, (self.table_name,))
+                has_hnsw = cursor.fetchone() is not None
+        
+        if has_tsvector:
+            return "content_tsv", has_hnsw
+        logger.info(f"Collection '{self.collection_name}' has no stored tsvector column; "
+                    f"rebuild or update it for faster keyword search")
+        return f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)", has_hnsw
     
     def search(self, query_vector: List[float], enhanced_text: str,
               count: int = 5, distance_threshold: float = 0.0,
@@ -359,6 +665,10 @@ class PgVectorSearchBackend:
         """
         Perform hybrid search (vector + keyword)
         
+        The nearest chunks by embedding and the best chunks by ts_rank
+        (count * 2 of each) are combined and ranked by their weighted score
+        in a single statement.
+        
         Args:
             query_vector: Embedding vector for the query
             enhanced_text: Processed query text for keyword search
@@ -369,146 +679,117 @@ class PgVectorSearchBackend:
         Returns:
             List of search results with scores and metadata
         """
-        self._ensure_connection()
-        
-        # Vector search
-        vector_results = self._vector_search(query_vector, count * 2, tags)
+        if hasattr(query_vector, 'tolist'):
+            query_vector = query_vector.tolist()
+        candidates = count * 2
+        tag_filter = " AND tags ?| %(tags)s" if tags else ""
         
-        # Keyword search
-        keyword_results = self._keyword_search(enhanced_text, count * 2, tags)
+        # The query vector and tsquery are inlined (not taken from a CTE) so
+        # the planner can use the embedding and GIN indexes
+        query = f"""
+            WITH vector_hits AS (
+                SELECT id, 1 - (embedding <=> %(vector)s::vector) AS vector_score
+                FROM {self.table_name}
+                WHERE embedding IS NOT NULL{tag_filter}
+                ORDER BY embedding <=> %(vector)s::vector
+                LIMIT %(candidates)s
+            ),
+            keyword_hits AS (
+                SELECT id, ts_rank({self._tsvector}, plainto_tsquery('{TEXT_SEARCH_CONFIG}', %(text)s)) AS rank
+                FROM {self.table_name}
+                WHERE {self._tsvector} @@ plainto_tsquery('{TEXT_SEARCH_CONFIG}', %(text)s){tag_filter}
+                ORDER BY rank DESC
+                LIMIT %(candidates)s
+            ),
+            scored AS (
+                SELECT id,
+                       COALESCE(v.vector_score, 0) AS vector_score,
+                       COALESCE(LEAST(1.0, k.rank / 10.0), 0) AS keyword_score,
+                       v.id IS NOT NULL AS from_vector
+                FROM vector_hits v
+                FULL OUTER JOIN keyword_hits k USING (id)
+            ),
+            ranked AS (
+                SELECT id, vector_score, keyword_score, from_vector,
+                       %(vector_weight)s * vector_score + %(keyword_weight)s * keyword_score AS score
+                FROM scored
+            )
+            SELECT c.id, c.content, c.filename, c.section, c.tags, c.metadata,
+                   r.vector_score, r.keyword_score, r.score, r.from_vector
+            FROM ranked r
+            JOIN {self.table_name} c ON c.id = r.id
+            WHERE r.score >= %(threshold)s
+            ORDER BY r.score DESC, c.id
+            LIMIT %(count)s
+        """
+        params = {
+            'vector': query_vector,
+            'text': enhanced_text,
+            'tags': tags,
+            'candidates': candidates,
+            'vector_weight': self.vector_weight,
+            'keyword_weight': self.keyword_weight,
+            'threshold': distance_threshold,
+            'count': count
+        }
         
-        # Merge and rank results
-        merged_results = self._merge_results(vector_results, keyword_results)
+        with self._pool.connection() as conn:
+            with conn.cursor() as cursor:
+                if self._hnsw:
+                    # HNSW returns at most ef_search rows per scan; the setting
+                    # only lasts for this query's transaction
+                    ef_search = max(self.ef_search or DEFAULT_HNSW_EF_SEARCH, candidates)
+                    cursor.execute("SET LOCAL hnsw.ef_search = %s", (ef_search,))
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
         
-        # Filter by distance threshold
-        filtered_results = [
-            r for r in merged_results 
-            if r['score'] >= distance_threshold
-        ]
+        results = []
+        for row in rows:
+            chunk_id, content, filename, section, tags_json, metadata_json, \
+                vector_score, keyword_score, score, from_vector = row
+            results.append({
+                'id': chunk_id,
+                'content': content,
+                'score': float(score),
+                'metadata': {
+                    'filename': filename,
+                    'section': section,
+                    'tags': tags_json if isinstance(tags_json, list) else [],
+                    **(metadata_json or {}),
+                    'search_scores': {
+                        'vector': float(vector_score),
+                        'keyword': float(keyword_score),
+                        'combined': float(score)
+                    }
+                },
+                'search_type': 'vector' if from_vector else 'keyword'
+            })
         
-        return filtered_results[:count]
-    
-    def _vector_search(self, query_vector: List[float], count: int,
-                      tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Perform vector similarity search"""
-        with self.conn.cursor() as cursor:
-            # Build query
-            query = f"""
-                SELECT id, content, filename, section, tags, metadata,
-                       1 - (embedding <=> %s::vector) as similarity
-                FROM {self.table_name}
-                WHERE embedding IS NOT NULL
-            """
-            
-            params = [query_vector]
-            
-            # Add tag filter if specified
-            if tags:
-                query += " AND tags ?| %s"
-                params.append(tags)
-            
-            query += " ORDER BY embedding <=> %s::vector LIMIT %s"
-            params.extend([query_vector, count])
-            
-            cursor.execute(query, params)
-            
-            results = []
-            for row in cursor.fetchall():
-                chunk_id, content, filename, section, tags_json, metadata_json, similarity = row
-                
-                results.append({
-                    'id': chunk_id,
-                    'content': content,
-                    'score': float(similarity),
-                    'metadata': {
-                        'filename': filename,
-                        'section': section,
-                        'tags': tags_json if isinstance(tags_json, list) else [],
-                        **metadata_json
-                    },
-                    'search_type': 'vector'
-                })
-            
-            return results
-    
-    def _keyword_search(self, enhanced_text: str, count: int,
-                       tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        """Perform full-text search"""
-        with self.conn.cursor() as cursor:
-            # Use PostgreSQL text search
-            query = f"""
-                SELECT id, content, filename, section, tags, metadata,
-                       ts_rank(to_tsvector('english', content), 
-                              plainto_tsquery('english', %s)) as rank
-                FROM {self.table_name}
-                WHERE to_tsvector('english', content) @@ plainto_tsquery('english', %s)
-            """
-            
-            params = [enhanced_text, enhanced_text]
-            
-            # Add tag filter if specified
-            if tags:
-                query += " AND tags ?| %s"
-                params.append(tags)
-            
-            query += " ORDER BY rank DESC LIMIT %s"
-            params.append(count)
-            
-            cursor.execute(query, params)
-            
-            results = []
-            for row in cursor.fetchall():
-                chunk_id, content, filename, section, tags_json, metadata_json, rank = row
-                
-                # Normalize rank to 0-1 score
-                score = min(1.0, rank / 10.0)
-                
-                results.append({
-                    'id': chunk_id,
-                    'content': content,
-                    'score': float(score),
-                    'metadata': {
-                        'filename': filename,
-                        'section': section,
-                        'tags': tags_json if isinstance(tags_json, list) else [],
-                        **metadata_json
-                    },
-                    'search_type': 'keyword'
-                })
-            
-            return results
+        return results
     
-    def _merge_results(self, vector_results: List[Dict[str, Any]], 
-                      keyword_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Merge and rank results from vector and keyword search"""
-        # Create a map to track unique results
-        results_map = {}
-        
-        # Add vector results (weighted higher)
-        for result in vector_results:
-            chunk_id = result['id']
-            if chunk_id not in results_map:
-                results_map[chunk_id] = result
-                results_map[chunk_id]['score'] *= 0.7  # Weight vector results
-            else:
-                # Combine scores if result appears in both
-                results_map[chunk_id]['score'] += result['score'] * 0.7
-        
-        # Add keyword results
-        for result in keyword_results:
-            chunk_id = result['id']
-            if chunk_id not in results_map:
-                results_map[chunk_id] = result
-                results_map[chunk_id]['score'] *= 0.3  # Weight keyword results
-            else:
-                # Combine scores if result appears in both
-                results_map[chunk_id]['score'] += result['score'] * 0.3
+    def index_version(self) -> Optional[Tuple[int, str]]:
+        """
+        Identify the current version of the collection, for invalidating cached results
         
-        # Sort by combined score
-        merged = list(results_map.values())
-        merged.sort(key=lambda x: x['score'], reverse=True)
+        Builds and updates record every indexed file with the time it was
+        indexed, so the file count and latest indexed_at change whenever the
+        collection's chunks do.
         
-        return merged
+        Returns:
+            (file count, latest indexed_at), or None if the collection has no
+            file records to derive a version from
+        """
+        try:
+            with self._pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"SELECT COUNT(*), MAX(indexed_at) FROM {self.table_name}_files")
+                    file_count, indexed_at = cursor.fetchone()
+        except Exception as e:
+            logger.debug(f"No file records for collection '{self.collection_name}': {e}")
+            return None
+        if not file_count or indexed_at is None:
+            return None
+        return int(file_count), str(indexed_at)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics for the collection"""
@@ -518,6 +799,5 @@ class PgVectorSearchBackend:
         return stats
     
     def close(self):
-        """Close database connection"""
-        if self.conn and not self.conn.closed:
-            self.conn.close()
\ No newline at end of file
+        """Close all pooled database connections"""
+        self._pool.close()
@@ -0,0 +1,218 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+import os
+import copy
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .query_processor import preprocess_query
+
+logger = logging.getLogger(__name__)
+
+# Bounds of the process-wide query caches; a size of 0 disables caching
+CACHE_SIZE_ENV_VAR = 'SIGNALWIRE_SEARCH_CACHE_SIZE'
+CACHE_TTL_ENV_VAR = 'SIGNALWIRE_SEARCH_CACHE_TTL'
+DEFAULT_CACHE_SIZE = 1000
+DEFAULT_CACHE_TTL = 300.0
+
+
+def _env_number(name: str, default, cast):
+    """Read a numeric setting from the environment"""
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with per-entry expiry and version invalidation
+
+    Entries can be stored with a version (for example the version of the
+    index the value was computed from); a lookup with a different version
+    is a miss and drops the entry. Values are copied on the way out so
+    callers can't modify what other callers will see.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_size: Maximum number of entries (default: from
+                      SIGNALWIRE_SEARCH_CACHE_SIZE or 1000; 0 disables caching)
+            ttl: Seconds an entry stays valid (default: from
+                 SIGNALWIRE_SEARCH_CACHE_TTL or 300; 0 means no expiry)
+        """
+        if max_size is None:
+            max_size = _env_number(CACHE_SIZE_ENV_VAR, DEFAULT_CACHE_SIZE, int)
+        if ttl is None:
+            ttl = _env_number(CACHE_TTL_ENV_VAR, DEFAULT_CACHE_TTL, float)
+        self.max_size = max(0, max_size)
+        self.ttl = max(0.0, ttl)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        """
+        Look up a value
+
+        Args:
+            key: Cache key
+            version: Version the value must have been stored with
+
+        Returns:
+            A copy of the cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, entry_version = entry
+                if entry_version == version and (expires_at is None or expires_at > time.monotonic()):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                # Expired or computed from another version of the index
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, version: Any = None):
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            version: Version the value was computed from
+        """
+        if self.max_size == 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(value), expires_at, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries, keeping the counters"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_preprocess_cache = QueryCache()
+_result_cache = QueryCache()
+
+
+def get_preprocess_cache() -> QueryCache:
+    """Get the process-wide cache of preprocessed queries"""
+    return _preprocess_cache
+
+
+def get_result_cache() -> QueryCache:
+    """Get the process-wide cache of search results"""
+    return _result_cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get counters of both process-wide caches"""
+    return {
+        'preprocess': _preprocess_cache.stats(),
+        'results': _result_cache.stats()
+    }
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for use in a cache key; only whitespace differences are ignored"""
+    return ' '.join(query.split())
+
+
+def result_cache_key(index: Hashable, query: str, count: int, tags: Optional[List[str]] = None,
+                     distance_threshold: float = 0.0, language: Optional[str] = None,
+                     query_nlp_backend: str = 'nltk') -> tuple:
+    """
+    Build the result cache key of a search
+
+    Args:
+        index: Name, path or other value identifying the index searched
+        query: Raw query text
+        count: Number of results requested
+        tags: Tag filter
+        distance_threshold: Minimum similarity score
+        language: Query language
+        query_nlp_backend: NLP backend used for query processing
+
+    Returns:
+        Hashable cache key
+    """
+    return (index, normalize_query(query), count, tuple(tags or ()), distance_threshold,
+            language, query_nlp_backend)
+
+
+def cached_preprocess_query(query: str, language: str = 'en', query_nlp_backend: str = 'nltk',
+                            model_name: Optional[str] = None,
+                            encode: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    """
+    Preprocess a query for search (with vector), reusing earlier results for the same query
+
+    Args:
+        query: Input query string
+        language: Language code or 'auto'
+        query_nlp_backend: NLP backend for query processing
+        model_name: Embedding model used for vectorization
+        encode: Function embedding the enhanced text (for example
+                EmbeddingBatcher.encode); by default the model is called directly
+
+    Returns:
+        Output of preprocess_query(..., vector=True); results without a
+        vector (the query couldn't be encoded) are not cached
+    """
+    key = (normalize_query(query), language, query_nlp_backend, model_name)
+    enhanced = _preprocess_cache.get(key)
+    if enhanced is not None:
+        return enhanced
+
+    if encode is None:
+        enhanced = preprocess_query(query, language=language, vector=True,
+                                    query_nlp_backend=query_nlp_backend, model_name=model_name)
+    else:
+        enhanced = preprocess_query(query, language=language, vector=False,
+                                    query_nlp_backend=query_nlp_backend, model_name=model_name)
+        try:
+            enhanced['vector'] = encode(enhanced['enhanced_text']).tolist()
+        except ImportError:
+            logger.error("sentence-transformers not available. Cannot vectorize query.")
+            enhanced['vector'] = None
+    # A failed encoding may be transient; don't turn vector search off for the TTL
+    if enhanced.get('vector') is not None:
+        _preprocess_cache.put(key, enhanced)
+    return enhanced
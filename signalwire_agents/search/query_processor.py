@@ -10,11 +10,16 @@ See LICENSE file in the project root for full license information.
 import os
 import nltk
 import re
-from typing import Dict, Any, List, Optional
+import itertools
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
 from nltk.corpus import wordnet as wn
 from nltk.stem import PorterStemmer
 import logging
 
+from .embedding_models import get_embedding_model
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -77,17 +82,21 @@ def load_spacy_model(language: str):
             _spacy_warning_shown = True
         return None
 
-def vectorize_query(query: str):
+def vectorize_query(query: str, model_name: Optional[str] = None):
     """
     Vectorize query using sentence transformers
     Returns numpy array of embeddings
+    
+    The model is taken from the process-wide embedding model registry so it
+    is only loaded once per process, not once per query.
+    
+    Args:
+        query: Text to embed
+        model_name: Embedding model name (default: all-mpnet-base-v2). Should
+                    match the 'embedding_model' the index was built with.
     """
     try:
-        from sentence_transformers import SentenceTransformer
-        import numpy as np
-        
-        # Use the same model as specified in the architecture
-        model = SentenceTransformer('sentence-transformers/all-mpnet-base-v2')
+        model = get_embedding_model(model_name)
         embedding = model.encode(query, show_progress_bar=False)
         return embedding
         
@@ -197,10 +206,227 @@ def remove_duplicate_words(input_string: str) -> str:
 
     return ' '.join(final_result)
 
+def _load_stopwords(language: str) -> Set[str]:
+    """Load the NLTK stopwords of a language, falling back to English"""
+    nltk_language = stopwords_language_map.get(language, 'english')
+    try:
+        return set(nltk.corpus.stopwords.words(nltk_language))
+    except LookupError:
+        try:
+            nltk.download('stopwords', quiet=True)
+            return set(nltk.corpus.stopwords.words(nltk_language))
+        except Exception:
+            logger.warning(f"Could not load stopwords for language '{nltk_language}', using English")
+    try:
+        return set(nltk.corpus.stopwords.words('english'))
+    except Exception as e:
+        logger.warning(f"Could not load English stopwords: {e}")
+        return set()
+
+
+# Bound of each QueryPipeline's lemma, stem and synonym caches
+DEFAULT_PIPELINE_CACHE_SIZE = 10000
+
+
+class QueryPipeline:
+    """
+    NLP resources for preprocessing text in one language with one backend
+    
+    Stopwords, the lemmatizer, the stemmer, the spaCy model and WordNet are
+    loaded once, and lemma, stem and synonym lookups are memoized in bounded
+    caches. Pipelines are shared process-wide through get_query_pipeline().
+    """
+    
+    def __init__(self, language: str = 'en', nlp_backend: str = 'nltk',
+                 cache_size: int = DEFAULT_PIPELINE_CACHE_SIZE):
+        """
+        Initialize the pipeline
+        
+        Args:
+            language: Language code ('en', 'es', etc.)
+            nlp_backend: NLP backend ('nltk' or 'spacy')
+            cache_size: Maximum entries of each lookup cache
+        """
+        self.language = language
+        self.nlp_backend = nlp_backend
+        self.stop_words = _load_stopwords(language)
+        self.lemmatizer = nltk.WordNetLemmatizer()
+        self.stemmer = PorterStemmer()
+        self.nlp = load_spacy_model(language) if nlp_backend == 'spacy' else None
+        
+        # Load WordNet now rather than on the first lookup
+        try:
+            wn.ensure_loaded()
+        except Exception as e:
+            logger.warning(f"Could not load WordNet: {e}")
+        
+        self.lemmatize = lru_cache(maxsize=cache_size)(self._lemmatize)
+        self.stem = lru_cache(maxsize=cache_size)(self.stemmer.stem)
+        self.synonyms = lru_cache(maxsize=cache_size)(self._synonyms)
+    
+    def _lemmatize(self, word: str, pos_tag: str) -> str:
+        try:
+            return self.lemmatizer.lemmatize(word, get_wordnet_pos(pos_tag)).lower()
+        except Exception:
+            # Fallback if lemmatization fails
+            return word.lower()
+    
+    @staticmethod
+    def _synonyms(word: str, pos_tag: str, max_synonyms: int) -> Tuple[str, ...]:
+        return tuple(get_synonyms(word, pos_tag, max_synonyms))
+    
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into word tokens"""
+        try:
+            return nltk.word_tokenize(text)
+        except LookupError as e:
+            # If tokenization fails, try to download punkt resources
+            logger.warning(f"NLTK tokenization failed: {e}")
+            try:
+                nltk.download('punkt', quiet=True)
+                nltk.download('punkt_tab', quiet=True)
+                return nltk.word_tokenize(text)
+            except Exception as fallback_error:
+                # If all else fails, use simple split as fallback
+                logger.warning(f"NLTK tokenization fallback failed: {fallback_error}. Using simple word splitting.")
+                return text.split()
+    
+    def remove_stopwords(self, tokens: List[str]) -> List[str]:
+        """Drop stopwords from tokens"""
+        stop_words = self.stop_words
+        return [word for word in tokens if word.lower() not in stop_words]
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """Get hit/miss counters of the lookup caches"""
+        return {name: getattr(self, name).cache_info()._asdict()
+                for name in ('lemmatize', 'stem', 'synonyms')}
+
+
+_pipelines: Dict[Tuple[str, str], QueryPipeline] = {}
+_pipelines_lock = threading.Lock()
+
+
+def get_query_pipeline(language: str = 'en', nlp_backend: str = 'nltk') -> QueryPipeline:
+    """
+    Get the process-wide pipeline for a language and backend, creating it on first use
+    
+    Args:
+        language: Language code ('en', 'es', etc.)
+        nlp_backend: NLP backend ('nltk' or 'spacy')
+        
+    Returns:
+        The shared QueryPipeline
+    """
+    key = (language, nlp_backend)
+    pipeline = _pipelines.get(key)
+    if pipeline is None:
+        with _pipelines_lock:
+            pipeline = _pipelines.get(key)
+            if pipeline is None:
+                pipeline = _pipelines[key] = QueryPipeline(language, nlp_backend)
+    return pipeline
+
+
+def clear_query_pipelines():
+    """Drop the shared pipelines, for example after installing NLTK data or spaCy models"""
+    with _pipelines_lock:
+        _pipelines.clear()
+
+
+def _analyze_nltk_tokens(pipeline: QueryPipeline, tokens: List[str],
+                         tagged: Optional[List[Tuple[str, str]]] = None,
+                         debug: bool = False) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+    """
+    POS tag, lemmatize and stem tokens with NLTK
+    
+    Args:
+        pipeline: Pipeline providing the lemmatizer and stemmer
+        tokens: Tokens to analyze
+        tagged: Tokens already POS tagged (by a batch tagger), if any
+        debug: Enable debug output
+        
+    Returns:
+        Tuple of ((token, stemmed lemma) pairs, token -> POS tag)
+    """
+    lemmas = []
+    pos_tags = {}
+    try:
+        if tagged is None:
+            tagged = nltk.pos_tag(tokens)
+        for token, pos_tag in tagged:
+            lemma = pipeline.lemmatize(token, pos_tag)
+            lemmas.append((token.lower(), pipeline.stem(lemma)))
+            pos_tags[token.lower()] = pos_tag
+        if debug:
+            logger.info(f"POS Tagging Results (NLTK): {pos_tags}")
+    except Exception as pos_error:
+        # Fallback if POS tagging fails completely
+        logger.warning(f"NLTK POS tagging failed: {pos_error}. Using basic token processing.")
+        for token in tokens:
+            lemma = token.lower()
+            lemmas.append((token.lower(), pipeline.stem(lemma)))
+            pos_tags[token.lower()] = 'NN'  # Default to noun
+        if debug:
+            logger.info(f"Using fallback token processing for: {tokens}")
+    return lemmas, pos_tags
+
+
+def _analyze_spacy_doc(pipeline: QueryPipeline, doc) -> Tuple[List[Tuple[str, str]], Dict[str, str]]:
+    """
+    Collect the stemmed lemmas and POS tags of a spaCy doc
+    
+    Returns:
+        Tuple of ((token, stemmed lemma) pairs, token -> POS tag)
+    """
+    lemmas = []
+    pos_tags = {}
+    for token in doc:
+        lemma = token.lemma_.lower()
+        lemmas.append((token.text.lower(), pipeline.stem(lemma)))
+        pos_tags[token.text.lower()] = token.pos_
+    return lemmas, pos_tags
+
+
+def _expand_terms(pipeline: QueryPipeline, lemmas: List[Tuple[str, str]], pos_tags: Dict[str, str],
+                  pos_to_expand: List[str], max_synonyms: int) -> str:
+    """Join tokens, their lemmas and the synonyms of expandable ones, without duplicates"""
+    expanded_query_set = set()
+    expanded_query = []
+    
+    for original, lemma in lemmas:
+        if original not in expanded_query_set:
+            expanded_query.append(original)
+            expanded_query_set.add(original)
+        if lemma not in expanded_query_set:
+            expanded_query.append(lemma)
+            expanded_query_set.add(lemma)
+        if pos_tags.get(original) in pos_to_expand:
+            synonyms = pipeline.synonyms(lemma, pos_tags[original], max_synonyms)
+            for synonym in synonyms:
+                if synonym not in expanded_query_set:
+                    expanded_query.append(synonym)
+                    expanded_query_set.add(synonym)
+    
+    # Convert to array, remove duplicates, and join back to string
+    return remove_duplicate_words(" ".join(expanded_query))
+
+
+def _extract_keywords(pipeline: QueryPipeline, text: str) -> List[str]:
+    """Extract key terms for keyword search (at most 20)"""
+    try:
+        tokens = pipeline.tokenize(text)
+        stop_words = pipeline.stop_words
+        keywords = [word.lower() for word in tokens if word.lower() not in stop_words and len(word) > 2]
+    except Exception as e:
+        logger.warning(f"Error extracting keywords: {e}")
+        keywords = []
+    return keywords[:20]  # Limit to top 20 keywords
+
+
 def preprocess_query(query: str, language: str = 'en', pos_to_expand: Optional[List[str]] = None, 
                     max_synonyms: int = 5, debug: bool = False, vector: bool = False, 
                     vectorize_query_param: bool = False, nlp_backend: str = None, 
-                    query_nlp_backend: str = 'nltk') -> Dict[str, Any]:
+                    query_nlp_backend: str = 'nltk', model_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Advanced query preprocessing with language detection, POS tagging, synonym expansion, and vectorization
     
@@ -214,6 +440,7 @@ def preprocess_query(query: str, language: str = 'en', pos_to_expand: Optional[L
         vectorize_query_param: If True, just vectorize without other processing
         nlp_backend: DEPRECATED - use query_nlp_backend instead
         query_nlp_backend: NLP backend for query processing ('nltk' for fast, 'spacy' for better quality)
+        model_name: Embedding model used for vectorization (should match the index's embedding_model)
         
     Returns:
         Dict containing processed query, language, POS tags, and optionally vector
@@ -227,7 +454,7 @@ def preprocess_query(query: str, language: str = 'en', pos_to_expand: Optional[L
     
     if vectorize_query_param:
         # Vectorize the query directly
-        vectorized_query = vectorize_query(query)
+        vectorized_query = vectorize_query(query, model_name)
         if vectorized_query is not None:
             return {
                 'input': query,
@@ -245,111 +472,33 @@ def preprocess_query(query: str, language: str = 'en', pos_to_expand: Optional[L
         if debug:
             logger.info(f"Detected language: {language}")
     
-    # Load spaCy model based on the language and backend choice
-    nlp = None
+    # Get the shared pipeline for the language and backend
+    if query_nlp_backend not in ('spacy', 'nltk'):
+        logger.warning(f"Unknown query NLP backend '{query_nlp_backend}', using NLTK")
+        query_nlp_backend = 'nltk'
+    pipeline = get_query_pipeline(language, query_nlp_backend)
+    nlp = pipeline.nlp
     if query_nlp_backend == 'spacy':
-        nlp = load_spacy_model(language)
         if nlp is None and debug:
             logger.info("spaCy backend requested but not available, falling back to NLTK")
-    elif query_nlp_backend == 'nltk':
-        if debug:
-            logger.info("Using NLTK backend for query processing")
-    else:
-        logger.warning(f"Unknown query NLP backend '{query_nlp_backend}', using NLTK")
-        query_nlp_backend = 'nltk'
+    elif debug:
+        logger.info("Using NLTK backend for query processing")
     
     # Tokenization and stop word removal
-    try:
-        tokens = nltk.word_tokenize(query)
-    except LookupError as e:
-        # If tokenization fails, try to download punkt resources
-        logger.warning(f"NLTK tokenization failed: {e}")
-        try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('punkt_tab', quiet=True)
-            tokens = nltk.word_tokenize(query)
-        except Exception as fallback_error:
-            # If all else fails, use simple split as fallback
-            logger.warning(f"NLTK tokenization fallback failed: {fallback_error}. Using simple word splitting.")
-            tokens = query.split()
-    
-    nltk_language = stopwords_language_map.get(language, 'english')
-    
-    try:
-        stop_words = set(nltk.corpus.stopwords.words(nltk_language))
-    except LookupError:
-        try:
-            nltk.download('stopwords', quiet=True)
-            stop_words = set(nltk.corpus.stopwords.words(nltk_language))
-        except:
-            logger.warning(f"Could not load stopwords for language '{nltk_language}', using English")
-            stop_words = set(nltk.corpus.stopwords.words('english'))
-    
-    tokens = [word for word in tokens if word.lower() not in stop_words]
+    tokens = pipeline.remove_stopwords(pipeline.tokenize(query))
 
     # Lemmatization and POS Tagging using spaCy or NLTK
-    lemmatizer = nltk.WordNetLemmatizer()
-    stemmer = PorterStemmer()
-    lemmas = []
-    pos_tags = {}
-
     if nlp and query_nlp_backend == 'spacy':
         # Use spaCy for better POS tagging
-        doc = nlp(" ".join(tokens))
-        for token in doc:
-            lemma = token.lemma_.lower()
-            stemmed = stemmer.stem(lemma)
-            lemmas.append((token.text.lower(), stemmed))
-            pos_tags[token.text.lower()] = token.pos_
+        lemmas, pos_tags = _analyze_spacy_doc(pipeline, nlp(" ".join(tokens)))
         if debug:
             logger.info(f"POS Tagging Results (spaCy): {pos_tags}")
     else:
         # Use NLTK (default or fallback)
-        try:
-            nltk_pos_tags = nltk.pos_tag(tokens)
-            for token, pos_tag in nltk_pos_tags:
-                try:
-                    lemma = lemmatizer.lemmatize(token, get_wordnet_pos(pos_tag)).lower()
-                except Exception:
-                    # Fallback if lemmatization fails
-                    lemma = token.lower()
-                stemmed = stemmer.stem(lemma)
-                lemmas.append((token.lower(), stemmed))
-                pos_tags[token.lower()] = pos_tag
-            if debug:
-                logger.info(f"POS Tagging Results (NLTK): {pos_tags}")
-        except Exception as pos_error:
-            # Fallback if POS tagging fails completely
-            logger.warning(f"NLTK POS tagging failed: {pos_error}. Using basic token processing.")
-            for token in tokens:
-                lemma = token.lower()
-                stemmed = stemmer.stem(lemma)
-                lemmas.append((token.lower(), stemmed))
-                pos_tags[token.lower()] = 'NN'  # Default to noun
-            if debug:
-                logger.info(f"Using fallback token processing for: {tokens}")
-
-    # Expanding query with synonyms
-    expanded_query_set = set()
-    expanded_query = []
-    
-    for original, lemma in lemmas:
-        if original not in expanded_query_set:
-            expanded_query.append(original)
-            expanded_query_set.add(original)
-        if lemma not in expanded_query_set:
-            expanded_query.append(lemma)
-            expanded_query_set.add(lemma)
-        if pos_tags.get(original) in pos_to_expand:
-            synonyms = get_synonyms(lemma, pos_tags[original], max_synonyms)
-            for synonym in synonyms:
-                if synonym not in expanded_query_set:
-                    expanded_query.append(synonym)
-                    expanded_query_set.add(synonym)
-    
-    # Convert to array, remove duplicates, and join back to string
-    final_query_str = " ".join(expanded_query)
-    final_query_str = remove_duplicate_words(final_query_str)
+        lemmas, pos_tags = _analyze_nltk_tokens(pipeline, tokens, debug=debug)
+
+    # Expanding query with synonyms, then removing duplicates
+    final_query_str = _expand_terms(pipeline, lemmas, pos_tags, pos_to_expand, max_synonyms)
 
     if debug:
         logger.info(f"Expanded Query: {final_query_str}")
@@ -365,7 +514,7 @@ def preprocess_query(query: str, language: str = 'en', pos_to_expand: Optional[L
     
     # Vectorize query if requested
     if vector:
-        vectorized_query = vectorize_query(final_query_str)
+        vectorized_query = vectorize_query(final_query_str, model_name)
         if vectorized_query is not None:
             formatted_output['vector'] = vectorized_query.tolist()
         else:
@@ -404,24 +553,92 @@ def preprocess_document_content(content: str, language: str = 'en', nlp_backend:
     )
     
     # Extract key terms for keyword search
-    try:
-        tokens = nltk.word_tokenize(processed['input'])
-        nltk_language = stopwords_language_map.get(language, 'english')
-        
-        try:
-            stop_words = set(nltk.corpus.stopwords.words(nltk_language))
-        except:
-            stop_words = set(nltk.corpus.stopwords.words('english'))
-            
-        keywords = [word.lower() for word in tokens if word.lower() not in stop_words and len(word) > 2]
-        
-    except Exception as e:
-        logger.warning(f"Error extracting keywords: {e}")
-        keywords = []
+    pipeline = get_query_pipeline(processed.get('language', language),
+                                  'spacy' if index_nlp_backend == 'spacy' else 'nltk')
     
     return {
         'enhanced_text': processed['input'],
-        'keywords': keywords[:20],  # Limit to top 20 keywords
+        'keywords': _extract_keywords(pipeline, processed['input']),
         'language': processed.get('language', language),
         'pos_analysis': processed.get('POS', {})
-    } 
\ No newline at end of file
+    }
+
+
+# Defaults of the bulk document preprocessing
+DEFAULT_PREPROCESS_BATCH_SIZE = 64
+
+# spaCy components preprocessing doesn't use (it needs tokens, POS tags and lemmas)
+_UNUSED_SPACY_COMPONENTS = ('parser', 'ner', 'senter', 'entity_linker', 'entity_ruler',
+                            'textcat', 'textcat_multilabel', 'spancat')
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def preprocess_documents(contents: Iterable[str], language: str = 'en', index_nlp_backend: str = 'nltk',
+                         batch_size: int = DEFAULT_PREPROCESS_BATCH_SIZE,
+                         n_process: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Preprocess many documents in batches
+    
+    Produces the same results as preprocess_document_content for each
+    document, in order, as a stream. With the spaCy backend, documents go
+    through nlp.pipe with the components preprocessing doesn't use disabled;
+    with NLTK, each batch is POS tagged with one pos_tag_sents call.
+    
+    Args:
+        contents: Documents to process
+        language: Language code of the documents ('auto' detects it per document)
+        index_nlp_backend: NLP backend ('nltk' or 'spacy')
+        batch_size: Documents per tagging batch
+        n_process: spaCy worker processes (spaCy backend only)
+        
+    Yields:
+        Dict containing enhanced text and extracted keywords of each document
+    """
+    if language == 'auto':
+        # Each document may be in another language
+        for content in contents:
+            yield preprocess_document_content(content, language=language, index_nlp_backend=index_nlp_backend)
+        return
+    
+    backend = 'spacy' if index_nlp_backend == 'spacy' else 'nltk'
+    pipeline = get_query_pipeline(language, backend)
+    batch_size = max(1, batch_size)
+    pos_to_expand = ['NOUN', 'VERB']  # Less aggressive for documents, as in preprocess_document_content
+    
+    def result(lemmas, pos_tags):
+        enhanced = _expand_terms(pipeline, lemmas, pos_tags, pos_to_expand, max_synonyms=2)
+        return {
+            'enhanced_text': enhanced,
+            'keywords': _extract_keywords(pipeline, enhanced),
+            'language': language,
+            'pos_analysis': pos_tags
+        }
+    
+    token_lists = (pipeline.remove_stopwords(pipeline.tokenize(content)) for content in contents)
+    
+    nlp = pipeline.nlp
+    if nlp is not None:
+        disable = [name for name in getattr(nlp, 'pipe_names', []) if name in _UNUSED_SPACY_COMPONENTS]
+        docs = nlp.pipe((" ".join(tokens) for tokens in token_lists),
+                        batch_size=batch_size, n_process=max(1, n_process), disable=disable)
+        for doc in docs:
+            yield result(*_analyze_spacy_doc(pipeline, doc))
+        return
+    
+    for batch in _batches(token_lists, batch_size):
+        try:
+            tagged_batch = nltk.pos_tag_sents(batch)
+        except Exception as e:
+            # Tag each document on its own, with the per-document fallback
+            logger.warning(f"NLTK batch POS tagging failed: {e}")
+            tagged_batch = [None] * len(batch)
+        for tokens, tagged in zip(batch, tagged_batch):
+            yield result(*_analyze_nltk_tokens(pipeline, tokens, tagged)) 
\ No newline at end of file
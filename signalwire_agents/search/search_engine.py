@@ -7,28 +7,57 @@ Licensed under the MIT License.
 See LICENSE file in the project root for full license information.
 """
 
-import sqlite3
+import os
 import json
 import logging
-from typing import List, Dict, Any, Optional, Union
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Union, Tuple
 
 try:
     import numpy as np
-    from sklearn.metrics.pairwise import cosine_similarity
     NDArray = np.ndarray
 except ImportError:
     np = None
-    cosine_similarity = None
     NDArray = Any  # Fallback type for when numpy is not available
 
+from .embedding_models import DEFAULT_MODEL_NAME
+from .ann_index import IVFIndex
+from .connection_pool import SQLiteConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Tag combinations whose embedding matrix rows are kept in memory per engine
+TAG_FILTER_CACHE_SIZE = 128
+
+
+def embedding_sidecar_paths(index_path: str) -> Tuple[str, str, str]:
+    """
+    Get the paths of an index's embedding sidecar files
+    
+    Returns:
+        Tuple of (chunk ids, embedding matrix, identity of the index file
+        and build they were written for)
+    """
+    return f"{index_path}.ids.npy", f"{index_path}.vectors.npy", f"{index_path}.sidecar.json"
+
+
+def remove_embedding_sidecar(index_path: str):
+    """Remove an index's embedding sidecar, so it is rewritten from the index on next use"""
+    for path in embedding_sidecar_paths(index_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+
 class SearchEngine:
     """Hybrid search engine for vector and keyword search"""
     
     def __init__(self, backend: str = 'sqlite', index_path: Optional[str] = None, 
                  connection_string: Optional[str] = None, collection_name: Optional[str] = None,
-                 model=None):
+                 model=None, use_mmap: bool = False, use_ann: bool = True,
+                 ann_nprobe: Optional[int] = None, immutable: bool = False,
+                 vector_weight: float = 0.7, keyword_weight: float = 0.3,
+                 pool_size: Optional[int] = None, ef_search: Optional[int] = None):
         """
         Initialize search engine
         
@@ -38,14 +67,54 @@ class SearchEngine:
             connection_string: PostgreSQL connection string (for pgvector backend)
             collection_name: Collection name (for pgvector backend)
             model: Optional sentence transformer model
+            use_mmap: Memory-map embeddings from a .npy sidecar next to the index
+                      (written on first load) instead of holding a private copy,
+                      so several processes share one copy in the page cache
+                      (for sqlite backend)
+            use_ann: Use the index's approximate nearest neighbour index when
+                     it has one; exact search is used otherwise (for sqlite backend)
+            ann_nprobe: IVF lists probed per query. Higher is more accurate and
+                        slower (default: value stored in the index)
+            immutable: Open the index with SQLite's immutable flag, skipping
+                       locking; only safe if the file is never modified in
+                       place while served (for sqlite backend)
+            vector_weight: Weight of the vector similarity in the hybrid score
+            keyword_weight: Weight of the keyword score in the hybrid score
+            pool_size: Maximum pooled connections, i.e. concurrent queries
+                       (for pgvector backend; default: SIGNALWIRE_SEARCH_PG_POOL_SIZE or 10)
+            ef_search: HNSW candidate list size per query for collections with
+                       an HNSW index (for pgvector backend; default: 40)
         """
         self.backend = backend
         self.model = model
+        self.use_mmap = use_mmap
+        self.vector_weight = vector_weight
+        self.keyword_weight = keyword_weight
+        
+        # Embedding matrix (sqlite backend), loaded lazily on first vector search
+        self._embedding_ids = None
+        self._embedding_matrix = None
+        self._embedding_lock = threading.Lock()
+        # Signature of the index file the config and cached structures were loaded from
+        self._index_signature = None
+        self.use_ann = use_ann
+        self.ann_nprobe = ann_nprobe
+        self._ann_index = None
+        self._ann_loaded = False
+        
+        # Tag pre-filtering (sqlite backend): whether the index has the
+        # chunk_tags table, and the matrix rows of recently used tag sets
+        self._has_chunk_tags = None
+        self._tag_rows_cache: "OrderedDict[Tuple[str, ...], NDArray]" = OrderedDict()
+        self._tag_lock = threading.Lock()
         
         if backend == 'sqlite':
             if not index_path:
                 raise ValueError("index_path is required for sqlite backend")
             self.index_path = index_path
+            # Read-only connections are kept per thread and reused across queries
+            self._pool = SQLiteConnectionPool(index_path, immutable=immutable)
+            self._index_signature = self._pool.file_signature()
             self.config = self._load_config()
             self.embedding_dim = int(self.config.get('embedding_dimensions', 768))
             self._backend = None  # SQLite uses direct connection
@@ -53,21 +122,28 @@ class SearchEngine:
             if not connection_string or not collection_name:
                 raise ValueError("connection_string and collection_name are required for pgvector backend")
             from .pgvector_backend import PgVectorSearchBackend
-            self._backend = PgVectorSearchBackend(connection_string, collection_name)
+            self._backend = PgVectorSearchBackend(connection_string, collection_name,
+                                                  pool_size=pool_size, ef_search=ef_search,
+                                                  vector_weight=vector_weight,
+                                                  keyword_weight=keyword_weight)
             self.config = self._backend.config
             self.embedding_dim = int(self.config.get('embedding_dimensions', 768))
         else:
             raise ValueError(f"Invalid backend '{backend}'. Must be 'sqlite' or 'pgvector'")
+        
+        # Embedding model the index was built with; queries must be encoded with the same model
+        self.model_name = (self.config.get('embedding_model') or self.config.get('model_name')
+                           or DEFAULT_MODEL_NAME)
     
     def _load_config(self) -> Dict[str, str]:
         """Load index configuration"""
         try:
-            conn = sqlite3.connect(self.index_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT key, value FROM config")
-            config = dict(cursor.fetchall())
-            conn.close()
-            return config
+            cursor = self._pool.connection().cursor()
+            try:
+                cursor.execute("SELECT key, value FROM config")
+                return dict(cursor.fetchall())
+            finally:
+                cursor.close()
         except Exception as e:
             logger.error(f"Error loading config from {self.index_path}: {e}")
             return {}
@@ -83,7 +159,10 @@ class SearchEngine:
             enhanced_text: Processed query text for keyword search
             count: Number of results to return
             distance_threshold: Minimum similarity score
-            tags: Filter by tags
+            tags: Only return chunks with at least one of these tags. Indexes
+                  with a chunk_tags table restrict both the vector and the
+                  keyword search to those chunks before ranking; older indexes
+                  filter the ranked results instead
             
         Returns:
             List of search results with scores and metadata
@@ -94,29 +173,39 @@ class SearchEngine:
             return self._backend.search(query_vector, enhanced_text, count, distance_threshold, tags)
         
         # Original SQLite implementation
-        if not np or not cosine_similarity:
-            logger.warning("NumPy or scikit-learn not available. Using keyword search only.")
+        self._check_index_version()
+        
+        if np is None:
+            logger.warning("NumPy not available. Using keyword search only.")
             return self._keyword_search_only(enhanced_text, count, tags)
         
         # Convert query vector to numpy array
         try:
-            query_array = np.array(query_vector).reshape(1, -1)
+            query_array = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+            if query_array.size == 0:
+                return self._keyword_search_only(enhanced_text, count, tags)
         except Exception as e:
             logger.error(f"Error converting query vector: {e}")
             return self._keyword_search_only(enhanced_text, count, tags)
         
-        # Vector search
-        vector_results = self._vector_search(query_array, count * 2)
-        
-        # Keyword search
-        keyword_results = self._keyword_search(enhanced_text, count * 2)
-        
-        # Merge and rank results
-        merged_results = self._merge_results(vector_results, keyword_results)
-        
-        # Filter by tags if specified
-        if tags:
-            merged_results = self._filter_by_tags(merged_results, tags)
+        if tags and self._supports_tag_prefilter():
+            # Only chunks with the tags are scored in the first place
+            vector_results = self._vector_search(query_array, count * 2, tags)
+            keyword_results = self._keyword_search(enhanced_text, count * 2, tags)
+            merged_results = self._merge_results(vector_results, keyword_results)
+        else:
+            # Vector search
+            vector_results = self._vector_search(query_array, count * 2)
+            
+            # Keyword search
+            keyword_results = self._keyword_search(enhanced_text, count * 2)
+            
+            # Merge and rank results
+            merged_results = self._merge_results(vector_results, keyword_results)
+            
+            # Filter by tags if specified
+            if tags:
+                merged_results = self._filter_by_tags(merged_results, tags)
         
         # Filter by distance threshold
         filtered_results = [
@@ -126,9 +215,41 @@ class SearchEngine:
         
         return filtered_results[:count]
     
+    def _check_index_version(self):
+        """
+        Drop everything loaded from the index file if the file changed since
+        
+        A rebuild or `sw-search --update` replaces the file under a running
+        engine. The embedding matrix, ANN index and tag rows are reloaded from
+        the new file on next use, so they never refer to chunk ids that are gone.
+        """
+        signature = self._pool.file_signature()
+        if signature == self._index_signature:
+            return
+        
+        with self._embedding_lock:
+            if signature == self._index_signature:
+                return
+            logger.info(f"Index file {self.index_path} changed, reloading embeddings and config")
+            self._embedding_ids = None
+            self._embedding_matrix = None
+            self._ann_index = None
+            self._ann_loaded = False
+            self._has_chunk_tags = None
+            with self._tag_lock:
+                self._tag_rows_cache.clear()
+            self.config = self._load_config()
+            self.embedding_dim = int(self.config.get('embedding_dimensions', self.embedding_dim))
+            self.model_name = (self.config.get('embedding_model') or self.config.get('model_name')
+                               or self.model_name)
+            self._index_signature = signature
+    
     def _keyword_search_only(self, enhanced_text: str, count: int, 
                            tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Fallback to keyword search only when vector search is unavailable"""
+        if tags and self._supports_tag_prefilter():
+            return self._keyword_search(enhanced_text, count, tags)[:count]
+        
         keyword_results = self._keyword_search(enhanced_text, count)
         
         if tags:
@@ -136,82 +257,356 @@ class SearchEngine:
         
         return keyword_results[:count]
     
-    def _vector_search(self, query_vector: Union[NDArray, Any], count: int) -> List[Dict[str, Any]]:
-        """Perform vector similarity search"""
-        if not np or not cosine_similarity:
-            return []
+    def _supports_tag_prefilter(self) -> bool:
+        """Check whether the index has the chunk_tags table used to pre-filter by tag"""
+        if self._has_chunk_tags is None:
+            try:
+                cursor = self._pool.connection().cursor()
+                try:
+                    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chunk_tags'")
+                    self._has_chunk_tags = cursor.fetchone() is not None
+                finally:
+                    cursor.close()
+            except Exception as e:
+                logger.error(f"Error checking for chunk_tags table: {e}")
+                return False
+            if not self._has_chunk_tags:
+                logger.info(f"{self.index_path} has no chunk_tags table; tags are filtered after ranking. "
+                            f"Rebuild or update the index to filter by tag before ranking")
+        return self._has_chunk_tags
+    
+    def _tag_filter_sql(self, column: str, tags: Optional[List[str]]) -> Tuple[str, List[str]]:
+        """
+        Get the SQL condition restricting a chunk id column to chunks with any of the tags
+        
+        Args:
+            column: Chunk id column to restrict
+            tags: Required tags, or None for no restriction
             
+        Returns:
+            Tuple of (condition to AND into the WHERE clause, or '', parameters)
+        """
+        if not tags:
+            return '', []
+        tags = list(dict.fromkeys(tags))
+        placeholders = ','.join('?' * len(tags))
+        return f" AND {column} IN (SELECT chunk_id FROM chunk_tags WHERE tag IN ({placeholders}))", tags
+    
+    def _tag_rows(self, tags: List[str]) -> NDArray:
+        """
+        Get the embedding matrix rows of the chunks with any of the tags
+        
+        Rows are looked up in the chunk_tags table once per tag combination
+        and kept in memory next to the embedding matrix.
+        
+        Args:
+            tags: Required tags
+            
+        Returns:
+            Sorted array of row positions into the embedding matrix
+        """
+        key = tuple(sorted(set(tags)))
+        with self._tag_lock:
+            rows = self._tag_rows_cache.get(key)
+            if rows is not None:
+                self._tag_rows_cache.move_to_end(key)
+                return rows
+        
+        ids, _ = self._load_embeddings()
+        cursor = self._pool.connection().cursor()
         try:
-            conn = sqlite3.connect(self.index_path)
-            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT DISTINCT chunk_id FROM chunk_tags
+                WHERE tag IN ({','.join('?' * len(key))})
+                ORDER BY chunk_id
+            ''', key)
+            chunk_ids = np.fromiter((row[0] for row in cursor), dtype=np.int64)
+        finally:
+            cursor.close()
+        
+        # Matrix rows are in chunk id order; chunks without an embedding have no row
+        positions = np.searchsorted(ids, chunk_ids)
+        in_range = positions < len(ids)
+        positions, chunk_ids = positions[in_range], chunk_ids[in_range]
+        rows = positions[ids[positions] == chunk_ids]
+        
+        with self._tag_lock:
+            if ids is not self._embedding_ids:
+                # The index was reloaded meanwhile; don't cache rows of the old matrix
+                return rows
+            self._tag_rows_cache[key] = rows
+            while len(self._tag_rows_cache) > TAG_FILTER_CACHE_SIZE:
+                self._tag_rows_cache.popitem(last=False)
+        return rows
+    
+    def _load_embeddings(self) -> Tuple[Optional[NDArray], Optional[NDArray]]:
+        """
+        Load all chunk embeddings into a contiguous, L2-normalized float32 matrix
+        
+        The matrix is loaded once and reused for every query, so a vector search
+        is a single matrix-vector product instead of a scan over the database.
+        
+        Returns:
+            Tuple of (chunk ids, embedding matrix), or (None, None) on failure
+        """
+        if self._embedding_matrix is not None:
+            return self._embedding_ids, self._embedding_matrix
+        
+        with self._embedding_lock:
+            if self._embedding_matrix is not None:
+                return self._embedding_ids, self._embedding_matrix
             
-            # Get all embeddings (for small datasets, this is fine)
-            # For large datasets, we'd use FAISS or similar
+            ids, matrix = None, None
+            if self.use_mmap:
+                ids, matrix = self._load_embedding_sidecar()
+            
+            if matrix is None:
+                ids, matrix = self._read_embeddings()
+                if self.use_mmap:
+                    self._write_embedding_sidecar(ids, matrix)
+                    sidecar_ids, sidecar_matrix = self._load_embedding_sidecar()
+                    if sidecar_matrix is not None:
+                        ids, matrix = sidecar_ids, sidecar_matrix
+            
+            self._embedding_ids = ids
+            self._embedding_matrix = matrix
+            return ids, matrix
+    
+    def _read_embeddings(self) -> Tuple[NDArray, NDArray]:
+        """Read and normalize embeddings from the chunks table"""
+        cursor = self._pool.connection().cursor()
+        try:
             cursor.execute('''
-                SELECT id, content, embedding, filename, section, tags, metadata
+                SELECT id, embedding
                 FROM chunks
                 WHERE embedding IS NOT NULL AND embedding != ''
+                ORDER BY id
             ''')
             
-            results = []
-            for row in cursor.fetchall():
-                chunk_id, content, embedding_blob, filename, section, tags_json, metadata_json = row
-                
-                if not embedding_blob:
+            ids = []
+            blobs = []
+            dim = None
+            for chunk_id, embedding_blob in cursor:
+                if not embedding_blob or len(embedding_blob) % 4:
                     continue
-                
-                try:
-                    # Convert embedding back to numpy array
-                    embedding = np.frombuffer(embedding_blob, dtype=np.float32).reshape(1, -1)
-                    
-                    # Calculate similarity
-                    similarity = cosine_similarity(query_vector, embedding)[0][0]
-                    
-                    results.append({
-                        'id': chunk_id,
-                        'content': content,
-                        'score': float(similarity),
-                        'metadata': {
-                            'filename': filename,
-                            'section': section,
-                            'tags': json.loads(tags_json) if tags_json else [],
-                            'metadata': json.loads(metadata_json) if metadata_json else {}
-                        },
-                        'search_type': 'vector'
-                    })
-                except Exception as e:
-                    logger.warning(f"Error processing embedding for chunk {chunk_id}: {e}")
+                if dim is None:
+                    dim = len(embedding_blob) // 4
+                if len(embedding_blob) != dim * 4:
+                    logger.warning(f"Skipping chunk {chunk_id}: embedding dimension mismatch")
                     continue
+                ids.append(chunk_id)
+                blobs.append(embedding_blob)
+        finally:
+            cursor.close()
+        
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty((0, self.embedding_dim), dtype=np.float32)
+        
+        matrix = np.frombuffer(b''.join(blobs), dtype=np.float32).reshape(len(ids), dim).copy()
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # Zero embeddings (failed chunks) stay zero and score 0 against any query
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        
+        return np.asarray(ids, dtype=np.int64), np.ascontiguousarray(matrix)
+    
+    def _load_ann_index(self) -> Optional[IVFIndex]:
+        """Load the index's ANN structure, if it has one"""
+        if self._ann_loaded:
+            return self._ann_index
+        
+        ids, matrix = self._load_embeddings()
+        with self._embedding_lock:
+            if not self._ann_loaded and ids is self._embedding_ids:
+                if ids is not None and self.config.get('ann_index'):
+                    self._ann_index = IVFIndex.load(self._pool.connection(), ids, self.config)
+                self._ann_loaded = True
+        return self._ann_index
+    
+    def _embedding_sidecar_paths(self) -> Tuple[str, str, str]:
+        """Get the paths of the embedding sidecar files"""
+        return embedding_sidecar_paths(self.index_path)
+    
+    def _sidecar_identity(self, rows: int) -> Dict[str, Any]:
+        """Identify the index file and build a sidecar of the given size belongs to"""
+        return {
+            'index': list(self._index_signature or ()),
+            'build_id': self.config.get('build_id'),
+            'rows': int(rows)
+        }
+    
+    def _load_embedding_sidecar(self) -> Tuple[Optional[NDArray], Optional[NDArray]]:
+        """
+        Memory-map the embedding sidecar if it was written for the current index
+        
+        The sidecar records the signature of the index file and the build id
+        it was written from, rather than relying on file mtimes, which copies
+        and restores (cp -p, rsync -a, tar) preserve.
+        """
+        if self._index_signature is None:
+            return None, None
+        ids_path, vectors_path, identity_path = self._embedding_sidecar_paths()
+        try:
+            with open(identity_path) as f:
+                identity = json.load(f)
+            ids = np.load(ids_path)
+            matrix = np.load(vectors_path, mmap_mode='r')
+            if matrix.ndim != 2 or len(ids) != matrix.shape[0]:
+                return None, None
+            if identity != self._sidecar_identity(len(ids)):
+                return None, None
+            return ids, matrix
+        except (OSError, ValueError):
+            return None, None
+    
+    def _write_embedding_sidecar(self, ids: NDArray, matrix: NDArray):
+        """Write the normalized embedding matrix next to the index for mmap loading"""
+        ids_path, vectors_path, identity_path = self._embedding_sidecar_paths()
+        try:
+            # The identity goes first and is written last, so a sidecar being
+            # rewritten is never taken for the current one
+            if os.path.exists(identity_path):
+                os.remove(identity_path)
+            # Write to temporary files first so readers never see a partial sidecar
+            for path, array in ((ids_path, ids), (vectors_path, matrix)):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, array)
+                os.replace(tmp_path, path)
+            tmp_path = f"{identity_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._sidecar_identity(len(ids)), f)
+            os.replace(tmp_path, identity_path)
+        except OSError as e:
+            logger.warning(f"Could not write embedding sidecar for {self.index_path}: {e}")
+    
+    def _vector_search(self, query_vector: Union[NDArray, Any], count: int,
+                       tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Perform vector similarity search, optionally only over chunks with any of the tags"""
+        if np is None:
+            return []
             
-            conn.close()
+        try:
+            ids, matrix = self._load_embeddings()
+            if matrix is None or len(ids) == 0 or count <= 0:
+                return []
             
-            # Sort by similarity score
-            results.sort(key=lambda x: x['score'], reverse=True)
-            return results[:count]
+            allowed = self._tag_rows(tags) if tags else None
+            if allowed is not None and len(allowed) == 0:
+                return []
+            
+            query = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+            if query.shape[0] != matrix.shape[1]:
+                logger.error(
+                    f"Query vector dimension {query.shape[0]} does not match "
+                    f"index embedding dimension {matrix.shape[1]}"
+                )
+                return []
+            
+            query_norm = np.linalg.norm(query)
+            if query_norm == 0:
+                return []
+            
+            query = query / query_norm
+            
+            # Restrict scoring to the probed IVF lists when the index has them
+            ann = self._load_ann_index() if self.use_ann else None
+            if ann is not None:
+                rows = ann.candidates(query, self.ann_nprobe)
+                if allowed is not None:
+                    # Score only the tagged candidates when there are more tagged
+                    # chunks than candidates, unless the probed lists hold too few
+                    # of them to fill the results; then score every tagged chunk
+                    tagged = rows[np.isin(rows, allowed)] if len(allowed) > len(rows) else allowed
+                    rows = tagged if len(tagged) >= count else allowed
+                scores = matrix[rows] @ query
+            elif allowed is not None:
+                rows = allowed
+                scores = matrix[rows] @ query
+            else:
+                rows = None
+                # Cosine similarity against every chunk in one pass
+                scores = matrix @ query
+            
+            # Top-k without sorting the whole score vector
+            if count < len(scores):
+                top = np.argpartition(-scores, count - 1)[:count]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind='stable')]
+            
+            top_rows = rows[top] if rows is not None else top
+            top_scores = {int(ids[row]): float(score) for row, score in zip(top_rows, scores[top])}
+            rows = self._fetch_chunks(list(top_scores.keys()))
+            
+            results = []
+            for chunk_id, score in top_scores.items():
+                row = rows.get(chunk_id)
+                if row is None:
+                    continue
+                content, filename, section, tags_json, metadata_json = row
+                results.append({
+                    'id': chunk_id,
+                    'content': content,
+                    'score': score,
+                    'metadata': {
+                        'filename': filename,
+                        'section': section,
+                        'tags': json.loads(tags_json) if tags_json else [],
+                        'metadata': json.loads(metadata_json) if metadata_json else {}
+                    },
+                    'search_type': 'vector'
+                })
+            
+            return results
             
         except Exception as e:
             logger.error(f"Error in vector search: {e}")
             return []
     
-    def _keyword_search(self, enhanced_text: str, count: int) -> List[Dict[str, Any]]:
-        """Perform full-text search"""
+    def _fetch_chunks(self, chunk_ids: List[int]) -> Dict[int, Tuple]:
+        """Fetch content and metadata for the given chunk ids"""
+        if not chunk_ids:
+            return {}
+        
+        # Pad the id list to a power of two so only a handful of distinct
+        # statements exist and each stays in the connection's statement cache
+        size = 8
+        while size < len(chunk_ids):
+            size *= 2
+        params = list(chunk_ids) + [-1] * (size - len(chunk_ids))
+        
+        cursor = self._pool.connection().cursor()
+        try:
+            cursor.execute(f'''
+                SELECT id, content, filename, section, tags, metadata
+                FROM chunks
+                WHERE id IN ({','.join('?' * size)})
+            ''', params)
+            return {row[0]: row[1:] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+    
+    def _keyword_search(self, enhanced_text: str, count: int,
+                        tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Perform full-text search, optionally only over chunks with any of the tags"""
         try:
-            conn = sqlite3.connect(self.index_path)
-            cursor = conn.cursor()
+            cursor = self._pool.connection().cursor()
             
             # Escape FTS5 special characters
             escaped_text = self._escape_fts_query(enhanced_text)
+            tag_condition, tag_params = self._tag_filter_sql('c.id', tags)
             
             # FTS5 search
-            cursor.execute('''
+            cursor.execute(f'''
                 SELECT c.id, c.content, c.filename, c.section, c.tags, c.metadata,
                        chunks_fts.rank
                 FROM chunks_fts
                 JOIN chunks c ON chunks_fts.rowid = c.id
-                WHERE chunks_fts MATCH ?
+                WHERE chunks_fts MATCH ?{tag_condition}
                 ORDER BY chunks_fts.rank
                 LIMIT ?
-            ''', (escaped_text, count))
+            ''', [escaped_text] + tag_params + [count])
             
             results = []
             for row in cursor.fetchall():
@@ -234,13 +629,13 @@ class SearchEngine:
                     'search_type': 'keyword'
                 })
             
-            conn.close()
+            cursor.close()
             return results
             
         except Exception as e:
             logger.error(f"Error in keyword search: {e}")
             # Fallback to simple LIKE search
-            return self._fallback_search(enhanced_text, count)
+            return self._fallback_search(enhanced_text, count, tags)
     
     def _escape_fts_query(self, query: str) -> str:
         """Escape special characters for FTS5 queries"""
@@ -253,11 +648,11 @@ class SearchEngine:
         
         return escaped
     
-    def _fallback_search(self, enhanced_text: str, count: int) -> List[Dict[str, Any]]:
+    def _fallback_search(self, enhanced_text: str, count: int,
+                         tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Fallback search using LIKE when FTS fails"""
         try:
-            conn = sqlite3.connect(self.index_path)
-            cursor = conn.cursor()
+            cursor = self._pool.connection().cursor()
             
             # Simple LIKE search
             search_terms = enhanced_text.lower().split()
@@ -271,12 +666,14 @@ class SearchEngine:
             if not like_conditions:
                 return []
             
+            tag_condition, tag_params = self._tag_filter_sql('id', tags)
             query = f'''
                 SELECT id, content, filename, section, tags, metadata
                 FROM chunks
-                WHERE {" OR ".join(like_conditions)}
+                WHERE ({" OR ".join(like_conditions)}){tag_condition}
                 LIMIT ?
             '''
+            params.extend(tag_params)
             params.append(count)
             
             cursor.execute(query, params)
@@ -302,7 +699,7 @@ class SearchEngine:
                     'search_type': 'fallback'
                 })
             
-            conn.close()
+            cursor.close()
             
             # Sort by score
             results.sort(key=lambda x: x['score'], reverse=True)
@@ -335,8 +732,8 @@ class SearchEngine:
                 combined[chunk_id]['keyword_score'] = result['score']
         
         # Calculate combined score (weighted average)
-        vector_weight = 0.7
-        keyword_weight = 0.3
+        vector_weight = self.vector_weight
+        keyword_weight = self.keyword_weight
         
         for chunk_id, result in combined.items():
             vector_score = result.get('vector_score', 0.0)
@@ -370,8 +767,7 @@ class SearchEngine:
             return self._backend.get_stats()
         
         # Original SQLite implementation
-        conn = sqlite3.connect(self.index_path)
-        cursor = conn.cursor()
+        cursor = self._pool.connection().cursor()
         
         try:
             # Get total chunks
@@ -417,4 +813,62 @@ class SearchEngine:
             }
             
         finally:
-            conn.close() 
\ No newline at end of file
+            cursor.close()
+    
+    def index_version(self) -> Optional[Tuple]:
+        """
+        Identify the current version of the index, for invalidating cached results
+
+        Returns:
+            (inode, size, mtime_ns) of the index file, or the file count and
+            latest indexing time of a pgvector collection; either changes
+            whenever the index is rebuilt or updated. None if no version can
+            be determined, in which case results shouldn't be cached
+        """
+        if self.backend == 'pgvector':
+            return self._backend.index_version()
+        return self._pool.file_signature()
+
+    def vector_count(self) -> int:
+        """
+        Get the number of chunk embeddings vector search scores
+        
+        Returns:
+            Number of embeddings in the index, or 0 for pgvector or when
+            they can't be loaded
+        """
+        if self.backend == 'pgvector' or np is None:
+            return 0
+        ids, _ = self._load_embeddings()
+        return 0 if ids is None else len(ids)
+
+    def embedding_matrix(self) -> Tuple[Optional[NDArray], Optional[NDArray]]:
+        """
+        Get the L2-normalized embedding matrix vector search scores against
+        
+        Returns:
+            Tuple of (chunk ids, embedding matrix), or (None, None) for
+            pgvector or when they can't be loaded
+        """
+        if self.backend == 'pgvector' or np is None:
+            return None, None
+        return self._load_embeddings()
+
+    def ann_structure(self) -> Optional[IVFIndex]:
+        """
+        Get the index's approximate nearest neighbour structure
+        
+        Returns:
+            IVFIndex over the rows of embedding_matrix(), or None for pgvector
+            or when the index has no usable ANN index
+        """
+        if self.backend == 'pgvector' or np is None:
+            return None
+        return self._load_ann_index()
+    
+    def close(self):
+        """Release database connections"""
+        if self.backend == 'pgvector':
+            self._backend.close()
+        else:
+            self._pool.close() 
\ No newline at end of file
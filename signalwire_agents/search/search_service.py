@@ -7,7 +7,10 @@ Licensed under the MIT License.
 See LICENSE file in the project root for full license information.
 """
 
+import os
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 
 try:
@@ -31,12 +34,18 @@ try:
 except ImportError:
     SentenceTransformer = None
 
-from .query_processor import preprocess_query
+from .query_cache import cached_preprocess_query, get_result_cache, result_cache_key, cache_stats
+from .query_processor import get_query_pipeline
+from .embedding_models import get_model_registry, get_embedding_batcher, warm_up_models
 from .search_engine import SearchEngine
 from signalwire_agents.core.security_config import SecurityConfig
 from signalwire_agents.core.config_loader import ConfigLoader
 from signalwire_agents.core.logging_config import get_logger
 
+# Defaults for request handling; searches run on a thread pool, off the event loop
+DEFAULT_MAX_CONCURRENT_REQUESTS = 64
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
 logger = get_logger("search_service")
 
 # Pydantic models for API
@@ -88,7 +97,30 @@ class SearchService:
                  basic_auth: Optional[Tuple[str, str]] = None,
                  config_file: Optional[str] = None,
                  backend: str = 'sqlite',
-                 connection_string: Optional[str] = None):
+                 connection_string: Optional[str] = None,
+                 max_workers: Optional[int] = None,
+                 max_concurrent_requests: Optional[int] = None,
+                 request_timeout: Optional[float] = None,
+                 batch_encode: Optional[bool] = None):
+        """
+        Initialize the search service
+        
+        Args:
+            port: Port to listen on
+            indexes: Mapping of index name to .swsearch path (or pgvector collection)
+            basic_auth: Optional (username, password) tuple
+            config_file: Optional config file path
+            backend: Storage backend ('sqlite' or 'pgvector')
+            connection_string: PostgreSQL connection string (for pgvector backend)
+            max_workers: Threads running query preprocessing, encoding and
+                         search (default: CPU count)
+            max_concurrent_requests: Searches in progress at once; further
+                                     requests wait for a slot (default: 64)
+            request_timeout: Seconds before a search fails with 504, including
+                             time waiting for a slot (default: 30, 0 for no limit)
+            batch_encode: Encode concurrent queries' embeddings together in one
+                          model call (default: True)
+        """
         # Load configuration first
         self._load_config(config_file)
         
@@ -96,6 +128,19 @@ class SearchService:
         self.port = port
         self.backend = backend
         self.connection_string = connection_string
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if max_concurrent_requests is not None:
+            self.max_concurrent_requests = max_concurrent_requests
+        if request_timeout is not None:
+            self.request_timeout = request_timeout
+        if batch_encode is not None:
+            self.batch_encode = batch_encode
+        
+        self._executor = ThreadPoolExecutor(max_workers=max(1, self.max_workers),
+                                            thread_name_prefix='search')
+        # Created on first request, inside the event loop that serves it
+        self._request_slots = None
         
         if indexes is not None:
             self.indexes = indexes
@@ -126,6 +171,10 @@ class SearchService:
         self.indexes = {}
         self.backend = 'sqlite'
         self.connection_string = None
+        self.max_workers = os.cpu_count() or 4
+        self.max_concurrent_requests = DEFAULT_MAX_CONCURRENT_REQUESTS
+        self.request_timeout = DEFAULT_REQUEST_TIMEOUT
+        self.batch_encode = True
         
         # Find config file
         if not config_file:
@@ -155,6 +204,18 @@ class SearchService:
             
             if 'indexes' in service_config and isinstance(service_config['indexes'], dict):
                 self.indexes = service_config['indexes']
+            
+            if 'max_workers' in service_config:
+                self.max_workers = int(service_config['max_workers'])
+            
+            if 'max_concurrent_requests' in service_config:
+                self.max_concurrent_requests = int(service_config['max_concurrent_requests'])
+            
+            if 'request_timeout' in service_config:
+                self.request_timeout = float(service_config['request_timeout'])
+            
+            if 'batch_encode' in service_config:
+                self.batch_encode = bool(service_config['batch_encode'])
     
     def _setup_security(self):
         """Setup security middleware and authentication"""
@@ -242,7 +303,8 @@ class SearchService:
                 "indexes": list(self.indexes.keys()),
                 "ssl_enabled": self.security.ssl_enabled,
                 "auth_required": bool(security),
-                "connection_string": self.connection_string if self.backend == 'pgvector' else None
+                "connection_string": self.connection_string if self.backend == 'pgvector' else None,
+                "cache": cache_stats()
             }
         
         @self.app.post("/reload_index")
@@ -264,13 +326,18 @@ class SearchService:
                         connection_string=self.connection_string,
                         collection_name=index_path
                     )
+                    # Collections have no file version to invalidate cached results by
+                    get_result_cache().clear()
                     return {"status": "reloaded", "index": index_name, "backend": "pgvector"}
                 except Exception as e:
                     raise HTTPException(status_code=500, detail=f"Failed to load pgvector collection: {e}")
             else:
                 # SQLite backend
                 self.indexes[index_name] = index_path
-                self.search_engines[index_name] = SearchEngine(index_path, self.model)
+                engine = SearchEngine(backend='sqlite', index_path=index_path)
+                if SentenceTransformer:
+                    warm_up_models([engine.model_name])
+                self.search_engines[index_name] = engine
                 return {"status": "reloaded", "index": index_name, "backend": "sqlite"}
     
     def _load_resources(self):
@@ -291,23 +358,26 @@ class SearchService:
                     logger.error(f"Error loading pgvector collection {collection_name}: {e}")
         else:
             # SQLite backend - original behavior
-            # Load model (shared across all indexes)
-            if self.indexes and SentenceTransformer:
-                # Get model name from first index
-                sample_index = next(iter(self.indexes.values()))
-                model_name = self._get_model_name(sample_index)
-                try:
-                    self.model = SentenceTransformer(model_name)
-                except Exception as e:
-                    logger.warning(f"Could not load sentence transformer model: {e}")
-                    self.model = None
-            
             # Load search engines for each index
             for index_name, index_path in self.indexes.items():
                 try:
-                    self.search_engines[index_name] = SearchEngine(index_path, self.model)
+                    self.search_engines[index_name] = SearchEngine(backend='sqlite', index_path=index_path)
                 except Exception as e:
                     logger.error(f"Error loading search engine for {index_name}: {e}")
+            
+            # Warm up the embedding models used by the indexes so the first
+            # query doesn't pay the model load. Models are shared process-wide.
+            if self.search_engines and SentenceTransformer:
+                loaded = warm_up_models(engine.model_name for engine in self.search_engines.values())
+                if loaded:
+                    self.model = get_model_registry().get_model(loaded[0])
+        
+        # Load the query NLP resources (stopwords, WordNet, ...) up front too
+        if self.search_engines:
+            try:
+                get_query_pipeline('en', 'nltk')
+            except Exception as e:
+                logger.warning(f"Failed to load query NLP resources: {e}")
     
     def _get_model_name(self, index_path: str) -> str:
         """Get embedding model name from index config"""
@@ -338,13 +408,106 @@ class SearchService:
                 raise ValueError(f"Index '{request.index_name}' not found")
         
         search_engine = self.search_engines[request.index_name]
+        language = request.language or 'auto'
+        
+        # Identical searches against an unchanged index are served from the cache
+        result_cache = get_result_cache()
+        cache_key = result_cache_key(request.index_name, request.query, request.count,
+                                     request.tags, request.distance, language)
+        if search_engine.backend == 'pgvector':
+            # Derived from a query on the collection, so kept off the event loop
+            index_version = await asyncio.get_running_loop().run_in_executor(
+                self._executor, search_engine.index_version)
+        else:
+            index_version = search_engine.index_version()
+        cached = None
+        if index_version is not None:
+            cached = result_cache.get(cache_key, version=index_version)
+        if cached is not None:
+            results, enhanced = cached
+        else:
+            try:
+                results, enhanced, succeeded = await asyncio.wait_for(
+                    self._run_search_in_executor(search_engine, request, language),
+                    timeout=self.request_timeout or None
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Search in '{request.index_name}' timed out after {self.request_timeout}s")
+                if HTTPException:
+                    raise HTTPException(status_code=504, detail="Search timed out")
+                raise TimeoutError("Search timed out")
+            if succeeded and index_version is not None:
+                result_cache.put(cache_key, (results, enhanced), version=index_version)
+        
+        # Format response
+        search_results = [
+            SearchResult(
+                content=result['content'],
+                score=result['score'],
+                metadata=result['metadata']
+            )
+            for result in results
+        ]
+        
+        return SearchResponse(
+            results=search_results,
+            query_analysis={
+                'original_query': request.query,
+                'enhanced_query': enhanced['enhanced_text'],
+                'detected_language': enhanced.get('language'),
+                'pos_analysis': enhanced.get('POS')
+            }
+        )
+    
+    async def _run_search_in_executor(self, search_engine: SearchEngine, request: SearchRequest,
+                                      language: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any], bool]:
+        """
+        Run a search on the thread pool once a request slot is free
+        
+        The slot is held until the search's thread finishes, even if the
+        request times out first, so timed out searches still count against
+        max_concurrent_requests.
+        """
+        if self._request_slots is None:
+            self._request_slots = asyncio.Semaphore(max(1, self.max_concurrent_requests))
+        slots = self._request_slots
+        await slots.acquire()
+        loop = asyncio.get_running_loop()
+        
+        def release(_):
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                # The event loop is closed; nothing waits for a slot anymore
+                pass
+        
+        try:
+            future = self._executor.submit(self._run_search, search_engine, request, language)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+    
+    def _run_search(self, search_engine: SearchEngine, request: SearchRequest,
+                    language: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any], bool]:
+        """
+        Preprocess and run a search
+
+        Returns:
+            Tuple of (results, enhanced query, succeeded); degraded results
+            after an error are not worth caching
+        """
+        succeeded = True
         
         # Enhance query
         try:
-            enhanced = preprocess_query(
+            encoder = get_embedding_batcher(search_engine.model_name) if self.batch_encode else None
+            enhanced = cached_preprocess_query(
                 request.query,
-                language=request.language or 'auto',
-                vector=True
+                language=language,
+                model_name=search_engine.model_name,
+                encode=encoder.encode if encoder else None
             )
         except Exception as e:
             logger.error(f"Error preprocessing query: {e}")
@@ -353,6 +516,10 @@ class SearchService:
                 'vector': [],
                 'language': 'en'
             }
+            succeeded = False
+        # A query that couldn't be encoded only gets keyword results
+        if not enhanced.get('vector'):
+            succeeded = False
         
         # Perform search
         try:
@@ -366,26 +533,9 @@ class SearchService:
         except Exception as e:
             logger.error(f"Error performing search: {e}")
             results = []
+            succeeded = False
         
-        # Format response
-        search_results = [
-            SearchResult(
-                content=result['content'],
-                score=result['score'],
-                metadata=result['metadata']
-            )
-            for result in results
-        ]
-        
-        return SearchResponse(
-            results=search_results,
-            query_analysis={
-                'original_query': request.query,
-                'enhanced_query': enhanced['enhanced_text'],
-                'detected_language': enhanced.get('language'),
-                'pos_analysis': enhanced.get('POS')
-            }
-        )
+        return results, enhanced, succeeded
     
     def search_direct(self, query: str, index_name: str = "default", count: int = 3, 
                      distance: float = 0.0, tags: Optional[List[str]] = None, 
@@ -401,7 +551,6 @@ class SearchService:
         )
         
         # Use asyncio to run the async method
-        import asyncio
         try:
             loop = asyncio.get_event_loop()
         except RuntimeError:
@@ -487,5 +636,10 @@ class SearchService:
             raise RuntimeError("uvicorn not available. Cannot start HTTP service.")
     
     def stop(self):
-        """Stop the service (placeholder for cleanup)"""
-        pass 
\ No newline at end of file
+        """Stop the service, releasing worker threads and index connections"""
+        self._executor.shutdown(wait=False)
+        for engine in self.search_engines.values():
+            try:
+                engine.close()
+            except Exception as e:
+                logger.warning(f"Error closing search engine: {e}") 
\ No newline at end of file
@@ -350,6 +350,17 @@ class NativeVectorSearchSkill(SkillBase):
                 except Exception as e:
                     self.logger.error(f"Failed to load search index {self.index_file}: {e}")
                     self.search_available = False
+            
+            # Load the index's embedding model and the query NLP resources now
+            # rather than on the first call
+            if self.search_engine:
+                from signalwire_agents.search.embedding_models import warm_up_models
+                warm_up_models([self.search_engine.model_name])
+                try:
+                    from signalwire_agents.search.query_processor import get_query_pipeline
+                    get_query_pipeline('en', self.query_nlp_backend)
+                except Exception as e:
+                    self.logger.warning(f"Failed to load query NLP resources: {e}")
         
         return True
         
@@ -449,16 +460,38 @@ class NativeVectorSearchSkill(SkillBase):
                 # For remote searches, let the server handle query preprocessing
                 results = self._search_remote(query, None, count)
             else:
-                # For local searches, preprocess the query locally
-                from signalwire_agents.search.query_processor import preprocess_query
-                enhanced = preprocess_query(query, language='en', vector=True, query_nlp_backend=self.query_nlp_backend)
-                results = self.search_engine.search(
-                    query_vector=enhanced.get('vector', []),
-                    enhanced_text=enhanced['enhanced_text'],
-                    count=count,
-                    distance_threshold=self.distance_threshold,
-                    tags=self.tags
+                # For local searches, preprocess the query locally; repeated
+                # queries against an unchanged index are served from the cache
+                from signalwire_agents.search.query_cache import (
+                    cached_preprocess_query, get_result_cache, result_cache_key
                 )
+                result_cache = get_result_cache()
+                cache_key = result_cache_key(
+                    (self.backend, self.index_file or self.collection_name), query, count,
+                    self.tags, self.distance_threshold, 'en', self.query_nlp_backend
+                )
+                # Without an index version, changes to the index couldn't be noticed
+                index_version = self.search_engine.index_version()
+                results = None
+                if index_version is not None:
+                    results = result_cache.get(cache_key, version=index_version)
+                if results is None:
+                    enhanced = cached_preprocess_query(
+                        query,
+                        language='en',
+                        query_nlp_backend=self.query_nlp_backend,
+                        model_name=self.search_engine.model_name
+                    )
+                    results = self.search_engine.search(
+                        query_vector=enhanced.get('vector', []),
+                        enhanced_text=enhanced['enhanced_text'],
+                        count=count,
+                        distance_threshold=self.distance_threshold,
+                        tags=self.tags
+                    )
+                    # Keyword-only results of a query that couldn't be encoded aren't cached
+                    if index_version is not None and enhanced.get('vector'):
+                        result_cache.put(cache_key, results, version=index_version)
             
             if not results:
                 no_results_msg = self.no_results_message.format(query=query)
@@ -14,9 +14,22 @@ Schema utilities for SWML validation and verb extraction
 """
 
 import os
+import sys
 import json
+import marshal
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Callable
+
+try:
+    from jsonschema import Draft7Validator
+    from jsonschema.validators import validator_for
+except ImportError:
+    # Without jsonschema only required properties are checked
+    Draft7Validator = None
+    validator_for = None
 
 try:
     import structlog
@@ -47,27 +60,119 @@ except ImportError:
 # Create a logger
 logger = structlog.get_logger("schema_utils")
 
+# Optional path of a marshal cache of the parsed schema, to skip JSON parsing at startup
+SCHEMA_CACHE_ENV_VAR = 'SIGNALWIRE_SCHEMA_CACHE'
+
+# How verb configs and SWAIG function arguments are checked against their schemas:
+#   off    - skip JSON Schema validation (fast path; only required properties are checked)
+#   warn   - validate and log violations, but accept them (default)
+#   strict - reject verbs and function calls that fail validation
+SCHEMA_VALIDATION_ENV_VAR = 'SWML_SCHEMA_VALIDATION'
+VALIDATION_MODES = ('off', 'warn', 'strict')
+DEFAULT_VALIDATION_MODE = 'warn'
+
+# Verb configs whose validation outcome is remembered per SchemaUtils, so a
+# config rendered again (such as on every call) is validated and logged once
+VERB_RESULT_CACHE_SIZE = 256
+
+# Parsed schemas, verb definitions and compiled verb validators shared by every
+# SchemaUtils in the process, keyed by the schema file's identity. The schema
+# and verb definitions are read-only once published.
+_shared_schemas: Dict[Tuple[str, int, int], Tuple[Dict[str, Any], Mapping[str, Dict[str, Any]], Dict[str, Callable]]] = {}
+_shared_schemas_lock = threading.Lock()
+
+
+def clear_schema_cache() -> None:
+    """Drop the process-wide parsed schemas, so the next SchemaUtils reloads from disk"""
+    with _shared_schemas_lock:
+        _shared_schemas.clear()
+
+
+def get_validation_mode(mode: Optional[str] = None) -> str:
+    """
+    Resolve the schema validation mode
+    
+    Args:
+        mode: Explicit mode, or None to use the SWML_SCHEMA_VALIDATION environment variable
+        
+    Returns:
+        One of VALIDATION_MODES
+    """
+    if mode is None:
+        mode = os.environ.get(SCHEMA_VALIDATION_ENV_VAR, DEFAULT_VALIDATION_MODE)
+    mode = mode.strip().lower()
+    if mode not in VALIDATION_MODES:
+        logger.warning("unknown_schema_validation_mode", mode=mode, using=DEFAULT_VALIDATION_MODE)
+        return DEFAULT_VALIDATION_MODE
+    return mode
+
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Any], List[str]]:
+    """
+    Compile a JSON Schema into a reusable validation function
+    
+    Compiling is the expensive part of validation, so the returned function
+    should be kept and reused for every instance checked against the schema.
+    Without jsonschema installed only the schema's top-level required
+    properties are checked.
+    
+    Args:
+        schema: JSON Schema to validate against
+        
+    Returns:
+        Function taking an instance and returning a list of error messages (empty if valid)
+    """
+    if validator_for is None:
+        required = list(schema.get("required", []))
+        
+        def validate_required(instance: Any) -> List[str]:
+            if not isinstance(instance, dict):
+                return [f"{instance!r} is not of type 'object'"]
+            return [f"'{prop}' is a required property" for prop in required if prop not in instance]
+        return validate_required
+    
+    validator = validator_for(schema, default=Draft7Validator)(schema)
+    
+    def validate(instance: Any) -> List[str]:
+        # is_valid stops at the first failure, so valid instances are checked quickly
+        if validator.is_valid(instance):
+            return []
+        errors = []
+        for error in sorted(validator.iter_errors(instance), key=lambda e: [str(part) for part in e.absolute_path]):
+            path = "/".join(str(part) for part in error.absolute_path)
+            errors.append(f"{path}: {error.message}" if path else error.message)
+        return errors
+    return validate
+
+
 class SchemaUtils:
     """
     Utility class for loading and working with SWML schemas
     """
     
-    def __init__(self, schema_path: Optional[str] = None):
+    # Defaults for instances created without __init__
+    _verb_validators: Optional[Dict[str, Callable]] = None
+    _verb_results: Optional[OrderedDict] = None
+    _verb_results_lock = threading.Lock()
+    validation_mode = DEFAULT_VALIDATION_MODE
+    
+    def __init__(self, schema_path: Optional[str] = None, validation_mode: Optional[str] = None):
         """
         Initialize the schema utilities
         
         Args:
             schema_path: Path to the schema file
+            validation_mode: "off", "warn" or "strict" (default: SWML_SCHEMA_VALIDATION or "warn")
         """
         self.log = logger.bind(component="schema_utils")
+        self.validation_mode = get_validation_mode(validation_mode)
         
         self.schema_path = schema_path
         if not self.schema_path:
             self.schema_path = self._get_default_schema_path()
             self.log.debug("using_default_schema_path", path=self.schema_path)
         
-        self.schema = self.load_schema()
-        self.verbs = self._extract_verb_definitions()
+        self.schema, self.verbs, self._verb_validators = self._load_shared_schema()
         self.log.debug("schema_initialized", verb_count=len(self.verbs))
         if self.verbs:
             self.log.debug("first_verbs_extracted", verbs=list(self.verbs.keys())[:5])
@@ -132,6 +237,106 @@ class SchemaUtils:
         self.log.warning("schema_not_found_in_any_location")
         return None
         
+    def _schema_file_key(self) -> Optional[Tuple[str, int, int]]:
+        """
+        Identify the schema file's current contents
+        
+        Returns:
+            (real path, modification time, size) or None if the file doesn't exist
+        """
+        if not self.schema_path:
+            return None
+        try:
+            stat = os.stat(self.schema_path)
+        except OSError:
+            return None
+        return (os.path.realpath(self.schema_path), stat.st_mtime_ns, stat.st_size)
+    
+    def _load_shared_schema(self) -> Tuple[Dict[str, Any], Mapping[str, Dict[str, Any]], Dict[str, Callable]]:
+        """
+        Get the parsed schema, verb definitions and verb validators, shared process-wide
+        
+        The schema file is parsed once per process (and per change to the
+        file); every later SchemaUtils for the same file reuses the result,
+        including the verb validators compiled so far. The shared schema must
+        be treated as read-only.
+        
+        Returns:
+            (schema, verbs, verb validators) tuple
+        """
+        key = self._schema_file_key()
+        if key is None:
+            # Nothing to share; load_schema logs why there is no schema
+            self.schema = self.load_schema()
+            return self.schema, self._extract_verb_definitions(), {}
+        
+        with _shared_schemas_lock:
+            shared = _shared_schemas.get(key)
+        if shared is not None:
+            self.log.debug("using_shared_schema", path=self.schema_path)
+            return shared
+        
+        self.schema = self._load_schema_cache_file(key)
+        if self.schema is None:
+            self.schema = self.load_schema()
+            if self.schema:
+                self._write_schema_cache_file(key, self.schema)
+        shared = (self.schema, MappingProxyType(self._extract_verb_definitions()), {})
+        
+        with _shared_schemas_lock:
+            # Another thread may have published the same schema first
+            return _shared_schemas.setdefault(key, shared)
+    
+    def _load_schema_cache_file(self, key: Tuple[str, int, int]) -> Optional[Dict[str, Any]]:
+        """
+        Load the parsed schema from the marshal cache file, if configured and current
+        
+        Args:
+            key: Identity of the schema file the cache must have been made from
+            
+        Returns:
+            The schema, or None if there is no usable cache
+        """
+        cache_path = os.environ.get(SCHEMA_CACHE_ENV_VAR)
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, "rb") as f:
+                cached = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            self.log.warning("schema_cache_load_error", path=cache_path, error=str(e))
+            return None
+        if not isinstance(cached, dict) or cached.get("key") != list(key) or \
+                cached.get("python") != list(sys.version_info[:2]):
+            self.log.debug("schema_cache_stale", path=cache_path)
+            return None
+        self.log.debug("schema_loaded_from_cache", path=cache_path)
+        return cached.get("schema")
+    
+    def _write_schema_cache_file(self, key: Tuple[str, int, int], schema: Dict[str, Any]) -> None:
+        """
+        Write the parsed schema to the marshal cache file, if configured
+        
+        Args:
+            key: Identity of the schema file the schema was parsed from
+            schema: Parsed schema
+        """
+        cache_path = os.environ.get(SCHEMA_CACHE_ENV_VAR)
+        if not cache_path:
+            return
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                marshal.dump({"key": list(key), "python": list(sys.version_info[:2]), "schema": schema}, f)
+            os.replace(tmp_path, cache_path)
+            self.log.debug("schema_cache_written", path=cache_path)
+        except (OSError, ValueError) as e:
+            self.log.warning("schema_cache_write_error", path=cache_path, error=str(e))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
     def load_schema(self) -> Dict[str, Any]:
         """
         Load the JSON schema from the specified path
@@ -245,6 +450,12 @@ class SchemaUtils:
         """
         Validate a verb configuration against the schema
         
+        Unknown verbs and missing required properties are always rejected.
+        Other schema violations are rejected in strict mode, logged in warn
+        mode and not checked at all in off mode. The outcome of the last
+        VERB_RESULT_CACHE_SIZE distinct configs is remembered, so the same
+        config is only validated (and its violations logged) once.
+        
         Args:
             verb_name: The name of the verb (e.g., "ai", "answer", etc.)
             verb_config: The configuration for the verb
@@ -252,7 +463,6 @@ class SchemaUtils:
         Returns:
             (is_valid, error_messages) tuple
         """
-        # Simple validation for now - can be enhanced with more complete JSON Schema validation
         errors = []
         
         # Check if the verb exists in the schema
@@ -267,9 +477,61 @@ class SchemaUtils:
         for prop in required_props:
             if prop not in verb_config:
                 errors.append(f"Missing required property '{prop}' for verb '{verb_name}'")
-                
-        # Return validation result
-        return len(errors) == 0, errors
+        if errors or self.validation_mode == "off":
+            return len(errors) == 0, errors
+        
+        try:
+            key = (verb_name, json.dumps(verb_config, sort_keys=True, default=str))
+        except (TypeError, ValueError):
+            key = None
+        if key is not None:
+            with self._verb_results_lock:
+                if self._verb_results is None:
+                    self._verb_results = OrderedDict()
+                schema_errors = self._verb_results.get(key)
+                if schema_errors is not None:
+                    self._verb_results.move_to_end(key)
+        if key is None or schema_errors is None:
+            # Full JSON Schema validation against the verb's compiled validator
+            schema_errors = self.get_verb_validator(verb_name)({verb_name: verb_config})
+            if schema_errors and self.validation_mode != "strict":
+                self.log.warning("verb_schema_violation", verb=verb_name, errors=schema_errors)
+            if key is not None:
+                with self._verb_results_lock:
+                    self._verb_results[key] = schema_errors
+                    while len(self._verb_results) > VERB_RESULT_CACHE_SIZE:
+                        self._verb_results.popitem(last=False)
+        
+        if schema_errors and self.validation_mode == "strict":
+            return False, list(schema_errors)
+        return True, []
+    
+    def get_verb_validator(self, verb_name: str) -> Callable[[Any], List[str]]:
+        """
+        Get the compiled validator for a verb, compiling it on first use
+        
+        The validator checks a {verb_name: config} mapping. Validators are
+        compiled once per verb definition and shared by every SchemaUtils
+        using the same schema file.
+        
+        Args:
+            verb_name: The name of the verb (e.g., "ai", "answer", etc.)
+            
+        Returns:
+            Function taking the verb mapping and returning a list of error messages
+        """
+        if self._verb_validators is None:
+            self._verb_validators = {}
+        validator = self._verb_validators.get(verb_name)
+        if validator is None:
+            definition = dict(self.verbs[verb_name]["definition"])
+            # Keep references to shared definitions resolvable from the verb's schema
+            schema = getattr(self, "schema", None) or {}
+            for key in ("$schema", "$defs", "definitions"):
+                if key in schema and key not in definition:
+                    definition[key] = schema[key]
+            validator = self._verb_validators.setdefault(verb_name, compile_validator(definition))
+        return validator
     
     def get_all_verb_names(self) -> List[str]:
         """
@@ -99,6 +99,7 @@ def mock_agent(mock_env_vars):
         # Mock the session manager to avoid initialization issues
         agent._session_manager = Mock()
         agent._session_manager.create_tool_token.return_value = "test-token"
+        agent._session_manager.create_tool_tokens.side_effect = lambda names, call_id: {name: "test-token" for name in names}
         agent._session_manager.validate_tool_token.return_value = True
         
         return agent
@@ -174,6 +175,7 @@ def mock_session_manager():
     """Mock session manager for testing"""
     session_manager = Mock()
     session_manager.create_tool_token.return_value = "test-token-123"
+    session_manager.create_tool_tokens.side_effect = lambda names, call_id: {name: "test-token-123" for name in names}
     session_manager.validate_tool_token.return_value = True
     return session_manager
 
@@ -15,10 +15,14 @@ import pytest
 import json
 import uuid
 import os
+import time
+import asyncio
+import threading
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from typing import Dict, Any, List, Optional
 
 from signalwire_agents.core.agent_base import AgentBase
+from signalwire_agents.core.swaig_function import SWAIGFunction
 
 
 
@@ -711,4 +715,415 @@ class TestAgentBaseDeclarativePrompts:
             agent.log = Mock()
             
             # Should not call prompt_add_section when POM is disabled
-            mock_add_section.assert_not_called() 
\ No newline at end of file
+            mock_add_section.assert_not_called() 
+
+
+class TestAgentBaseAsyncToolCalls:
+    """Test tool calls made through the web server"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.agent = AgentBase("test_agent", suppress_logs=True)
+        self.agent.log = Mock()
+    
+    def teardown_method(self):
+        self.agent._tool_executor.shutdown()
+    
+    def _gather(self, *coroutines):
+        async def gather():
+            return await asyncio.gather(*coroutines)
+        return asyncio.run(gather())
+    
+    def test_async_handler_awaited(self):
+        """Test coroutine handlers are awaited on the event loop"""
+        async def handler(args, raw_data):
+            await asyncio.sleep(0)
+            return f"Hello {args['name']}"
+        
+        self.agent.define_tool("greet", "Greet", {}, handler)
+        
+        result, = self._gather(self.agent.on_function_call_async("greet", {"name": "Ada"}, {}))
+        assert result == "Hello Ada"
+        # Also callable synchronously (CGI, Lambda)
+        assert self.agent.on_function_call("greet", {"name": "Ada"}, {}) == "Hello Ada"
+    
+    def test_sync_handlers_run_concurrently(self):
+        """Test blocking handlers run on the thread pool rather than the event loop"""
+        def handler(args, raw_data):
+            time.sleep(0.2)
+            return "done"
+        
+        self.agent.define_tool("slow", "Slow", {}, handler)
+        
+        start = time.monotonic()
+        results = self._gather(*[self.agent.on_function_call_async("slow", {}, {}) for _ in range(4)])
+        elapsed = time.monotonic() - start
+        
+        assert results == ["done"] * 4
+        assert elapsed < 0.6
+    
+    def test_max_concurrency(self):
+        """Test calls of a tool beyond its concurrency limit wait"""
+        def handler(args, raw_data):
+            time.sleep(0.1)
+            return "done"
+        
+        self.agent.define_tool("limited", "Limited", {}, handler, max_concurrency=1)
+        
+        start = time.monotonic()
+        self._gather(*[self.agent.on_function_call_async("limited", {}, {}) for _ in range(3)])
+        
+        assert time.monotonic() - start >= 0.3
+    
+    def test_copy_redefining_tool_uses_new_concurrency_limit(self):
+        """Test an ephemeral copy redefining a tool with a different concurrency limit gets that limit"""
+        def handler(args, raw_data):
+            time.sleep(0.1)
+            return "done"
+        
+        self.agent.define_tool("limited", "Limited", {}, handler, max_concurrency=1)
+        self._gather(self.agent.on_function_call_async("limited", {}, {}))
+        
+        ephemeral = self.agent._create_ephemeral_copy()
+        ephemeral._tool_registry.remove_function("limited")
+        ephemeral.define_tool("limited", "Limited", {}, handler, max_concurrency=3)
+        assert ephemeral._tool_executor is self.agent._tool_executor
+        
+        start = time.monotonic()
+        self._gather(*[ephemeral.on_function_call_async("limited", {}, {}) for _ in range(3)])
+        
+        assert time.monotonic() - start < 0.3
+    
+    def test_timeout(self):
+        """Test a call exceeding the tool's timeout returns an error response"""
+        async def handler(args, raw_data):
+            await asyncio.sleep(1)
+            return "late"
+        
+        self.agent.define_tool("stuck", "Stuck", {}, handler, timeout=0.05)
+        
+        result, = self._gather(self.agent.on_function_call_async("stuck", {}, {}))
+        assert result == {"response": "Error executing function 'stuck': timed out"}
+    
+    def test_sync_handler_sees_request_proxy_url(self):
+        """Test sync handlers build URLs with the proxy URL of the request being handled"""
+        self.agent.define_tool("callback_url", "Callback URL", {},
+                               lambda args, raw_data: self.agent.get_full_url())
+        request = Mock()
+        request.headers = {"X-Forwarded-Host": "pub.example.com", "X-Forwarded-Proto": "https"}
+        
+        async def call():
+            with self.agent._request_url_scope(request):
+                return await self.agent.on_function_call_async("callback_url", {}, {})
+        
+        result, = self._gather(call())
+        assert result.startswith("https://pub.example.com")
+    
+    def test_timed_out_call_keeps_concurrency_slot(self):
+        """Test a sync call that timed out holds its slot until its thread finishes"""
+        release = threading.Event()
+        started = []
+        
+        def handler(args, raw_data):
+            started.append(threading.get_ident())
+            release.wait(5)
+            return "done"
+        
+        self.agent.define_tool("hung", "Hung", {}, handler, max_concurrency=1, timeout=0.05)
+        
+        async def calls():
+            first = await self.agent.on_function_call_async("hung", {}, {})
+            # The first call's thread still runs, so this one waits and times out too
+            second = await self.agent.on_function_call_async("hung", {}, {})
+            release.set()
+            await asyncio.sleep(0.1)
+            return first, second
+        
+        first, second = self._gather(calls())[0]
+        assert first == second == {"response": "Error executing function 'hung': timed out"}
+        assert len(started) == 1
+    
+    def test_overridden_on_function_call(self):
+        """Test agents overriding on_function_call still have it called"""
+        self.agent.define_tool("tool", "Tool", {}, lambda args, raw_data: "handler")
+        self.agent.on_function_call = Mock(return_value="override")
+        
+        result, = self._gather(self.agent.on_function_call_async("tool", {}, {}))
+        assert result == "override"
+        self.agent.on_function_call.assert_called_once_with("tool", {}, {})
+    
+    def test_unknown_function(self):
+        """Test unknown functions return the not-found response"""
+        result, = self._gather(self.agent.on_function_call_async("missing", {}, {}))
+        assert result == {"response": "Function 'missing' not found"}
+
+
+class TestAgentBaseToolArgValidation:
+    """Test SWAIG function arguments are validated against their parameters"""
+    
+    PARAMETERS = {"days": {"type": "integer", "description": "Number of days"}}
+    
+    def _agent(self, mode):
+        agent = AgentBase("test_agent", suppress_logs=True, schema_validation=mode)
+        agent.log = Mock()
+        handler = Mock(return_value="ok")
+        agent.define_tool("forecast", "Forecast", self.PARAMETERS, handler, required=["days"])
+        return agent, handler
+    
+    def test_strict_rejects_before_handler(self):
+        """Test strict mode returns an error response without calling the handler"""
+        agent, handler = self._agent("strict")
+        
+        result = agent.on_function_call("forecast", {"days": "three"}, {})
+        
+        assert result == {"response": "Invalid arguments for function 'forecast': days: 'three' is not of type 'integer'"}
+        handler.assert_not_called()
+        assert agent.on_function_call("forecast", {"days": 3}, {}) == "ok"
+    
+    def test_strict_async_handler(self):
+        """Test strict mode also applies to coroutine handlers called from the web server"""
+        agent = AgentBase("test_agent", suppress_logs=True, schema_validation="strict")
+        calls = []
+        
+        async def handler(args, raw_data):
+            calls.append(args)
+            return "ok"
+        
+        agent.define_tool("forecast", "Forecast", self.PARAMETERS, handler, required=["days"])
+        result = asyncio.run(agent.on_function_call_async("forecast", {}, {}))
+        
+        assert result == {"response": "Invalid arguments for function 'forecast': 'days' is a required property"}
+        assert calls == []
+    
+    def test_warn_calls_handler(self):
+        """Test warn mode logs invalid arguments and still calls the handler"""
+        agent, handler = self._agent("warn")
+        
+        assert agent.on_function_call("forecast", {"days": "three"}, {}) == "ok"
+        agent.log.warning.assert_called_once()
+    
+    def test_off_skips_validation(self):
+        """Test off mode doesn't validate arguments"""
+        agent, handler = self._agent("off")
+        
+        with patch.object(SWAIGFunction, 'get_arg_errors') as mock_errors:
+            assert agent.on_function_call("forecast", {"days": "three"}, {}) == "ok"
+        mock_errors.assert_not_called()
+    
+    def test_strict_keeps_ai_verb_on_handler_check(self):
+        """Test the ai verb is checked by its handler, not dropped by strict schema validation"""
+        agent, handler = self._agent("strict")
+        
+        with patch.object(agent.schema_utils, 'validate_verb', wraps=agent.schema_utils.validate_verb) as mock_validate:
+            document = json.loads(agent._build_swml("call-1"))
+        
+        assert any("ai" in verb for verb in document["sections"]["main"])
+        assert "ai" not in [call[0][0] for call in mock_validate.call_args_list]
+
+
+class TestAgentBaseEphemeralCopy:
+    """Test copy-on-write ephemeral copies used by dynamic configuration"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.agent = AgentBase("test_agent", suppress_logs=True)
+        self.agent.add_hint("base hint")
+        self.agent.set_params({"temperature": 0.5})
+        self.agent.set_global_data({"tier": "basic"})
+        self.agent.prompt_add_section("Role", "You are helpful")
+    
+    def test_unmodified_config_is_shared(self):
+        """Test configuration the copy doesn't change isn't copied"""
+        ephemeral = self.agent._create_ephemeral_copy()
+        
+        assert ephemeral._hints is self.agent._hints
+        assert ephemeral._params is self.agent._params
+        assert ephemeral.pom is self.agent.pom
+    
+    def test_modifications_stay_in_copy(self):
+        """Test changes to a copy don't reach the base agent"""
+        ephemeral = self.agent._create_ephemeral_copy()
+        ephemeral.add_hint("caller hint")
+        ephemeral.set_param("temperature", 0.9)
+        ephemeral.update_global_data({"tier": "gold"})
+        ephemeral.prompt_add_section("Caller", "VIP caller")
+        
+        assert ephemeral._hints == ["base hint", "caller hint"]
+        assert self.agent._hints == ["base hint"]
+        assert self.agent._params == {"temperature": 0.5}
+        assert self.agent._global_data == {"tier": "basic"}
+        assert ephemeral._params["temperature"] == 0.9
+        assert len(ephemeral.pom.to_dict()) == 2
+        assert len(self.agent.pom.to_dict()) == 1
+        # Unmodified configuration is still shared
+        assert ephemeral._languages is self.agent._languages
+    
+    def test_copy_only_made_once(self):
+        """Test repeated changes reuse the copy's own container"""
+        ephemeral = self.agent._create_ephemeral_copy()
+        ephemeral.add_hint("one")
+        hints = ephemeral._hints
+        ephemeral.add_hint("two")
+        
+        assert ephemeral._hints is hints
+        assert ephemeral._hints == ["base hint", "one", "two"]
+    
+    def test_prompt_text_carried_over(self):
+        """Test raw prompt text is available in the copy"""
+        agent = AgentBase("text_agent", use_pom=False, suppress_logs=True)
+        agent.set_prompt_text("Base prompt")
+        agent.set_post_prompt("Summarize")
+        
+        ephemeral = agent._create_ephemeral_copy()
+        assert ephemeral.get_prompt() == "Base prompt"
+        assert ephemeral.get_post_prompt() == "Summarize"
+    
+    def test_skills_shared_not_reloaded(self):
+        """Test loaded skills are shared and loading them again succeeds"""
+        self.agent.add_skill("datetime")
+        skill = self.agent.skill_manager.loaded_skills["datetime"]
+        
+        ephemeral = self.agent._create_ephemeral_copy()
+        assert ephemeral.skill_manager is not self.agent.skill_manager
+        assert ephemeral.skill_manager.loaded_skills["datetime"] is skill
+        
+        ephemeral.add_skill("datetime")
+        assert ephemeral.skill_manager.loaded_skills["datetime"] is skill
+    
+    def test_removing_inherited_skill_keeps_base_skill(self):
+        """Test a copy removing a shared skill doesn't clean it up for the base agent"""
+        self.agent.add_skill("datetime")
+        skill = self.agent.skill_manager.loaded_skills["datetime"]
+        
+        ephemeral = self.agent._create_ephemeral_copy()
+        with patch.object(skill, 'cleanup') as cleanup:
+            ephemeral.remove_skill("datetime")
+        
+        cleanup.assert_not_called()
+        assert "datetime" not in ephemeral.skill_manager.loaded_skills
+        assert self.agent.skill_manager.loaded_skills["datetime"] is skill
+    
+    def test_regular_agent_unaffected(self):
+        """Test _writable returns the agent's own container"""
+        hints = self.agent._hints
+        assert self.agent._writable('_hints') is hints
+
+
+class TestAgentBaseSwmlCache:
+    """Test the cached SWML skeleton used by static agents"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.agent = AgentBase("test_agent", suppress_logs=True)
+        self.agent.prompt_add_section("Role", "You are helpful")
+        self.agent.set_post_prompt("Summarize the call")
+        self.agent.define_tool("lookup", "Look up", {}, lambda args, raw_data: "ok")
+    
+    def _ai(self, swml):
+        return json.loads(swml)["sections"]["main"][-1]["ai"]
+    
+    def test_tokens_bound_to_each_call(self):
+        """Test each render carries tokens for its own call ID"""
+        first = self._ai(self.agent._render_swml("call-1"))
+        second = self._ai(self.agent._render_swml("call-2"))
+        
+        for ai, call_id in ((first, "call-1"), (second, "call-2")):
+            url = ai["SWAIG"]["functions"][0]["web_hook_url"]
+            token = url.split("__token=")[1]
+            assert self.agent.validate_tool_token("lookup", token, call_id)
+            post_prompt_token = ai["post_prompt_url"].split("__token=")[1]
+            assert self.agent._session_manager.validate_token(call_id, "post_prompt", post_prompt_token)
+        assert "swmltoken" not in json.dumps(second)
+    
+    def test_matches_full_render(self):
+        """Test the cached render matches a full render apart from tokens"""
+        self.agent._render_swml("call-1")
+        cached = self._ai(self.agent._render_swml("call-2"))
+        full = self._ai(self.agent._build_swml("call-2"))
+        
+        for ai in (cached, full):
+            for function in ai["SWAIG"]["functions"]:
+                function["web_hook_url"] = function["web_hook_url"].split("?")[0]
+            ai["post_prompt_url"] = ai["post_prompt_url"].split("?")[0]
+        assert cached == full
+    
+    def test_skeleton_reused(self):
+        """Test the document is only built once while the configuration is unchanged"""
+        with patch.object(self.agent, '_build_swml', wraps=self.agent._build_swml) as build:
+            self.agent._render_swml("call-1")
+            self.agent._render_swml("call-2")
+        assert build.call_count == 1
+    
+    def test_configuration_change_invalidates(self):
+        """Test configuration changes show up in the next render"""
+        self.agent._render_swml("call-1")
+        
+        self.agent.add_hint("SignalWire")
+        self.agent.set_global_data({"tier": "gold"})
+        self.agent.define_tool("other", "Other", {}, lambda args, raw_data: "ok")
+        ai = self._ai(self.agent._render_swml("call-2"))
+        
+        assert ai["hints"] == ["SignalWire"]
+        assert ai["global_data"] == {"tier": "gold"}
+        assert [f["function"] for f in ai["SWAIG"]["functions"]] == ["lookup", "other"]
+    
+    def test_overridden_prompt_not_cached(self):
+        """Test agents computing their prompt per call are rendered in full"""
+        class ClockAgent(AgentBase):
+            def get_prompt(self):
+                return f"It is {time.monotonic()}"
+        
+        agent = ClockAgent("clock", suppress_logs=True)
+        assert agent._render_swml("call-1") != agent._render_swml("call-1")
+
+
+class TestAgentBaseConcurrentRendering:
+    """Test renders for concurrent requests don't share state"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.agent = AgentBase("test_agent", suppress_logs=True)
+        self.agent.define_tool("lookup", "Look up", {}, lambda args, raw_data: "ok")
+    
+    def _function_url(self, swml):
+        ai = json.loads(swml)["sections"]["main"][-1]["ai"]
+        return ai["SWAIG"]["functions"][0]["web_hook_url"]
+    
+    def test_threaded_full_renders(self):
+        """Test full renders on many threads each get their own document"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        def render(i):
+            return f"call-{i}", self.agent._build_swml(f"call-{i}")
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(render, range(64)))
+        
+        for call_id, swml in results:
+            document = json.loads(swml)
+            assert [list(verb) for verb in document["sections"]["main"]] == [["answer"], ["ai"]]
+            token = self._function_url(swml).split("__token=")[1]
+            assert self.agent.validate_tool_token("lookup", token, call_id)
+    
+    def test_proxy_url_scoped_to_request(self):
+        """Test each request's proxy URL is only used for that request"""
+        def request(host):
+            mock_request = Mock()
+            mock_request.headers = {"X-Forwarded-Host": host, "X-Forwarded-Proto": "https"}
+            return mock_request
+        
+        async def render(host):
+            with self.agent._request_url_scope(request(host)):
+                await asyncio.sleep(0.01)
+                return self.agent._render_swml("call-1")
+        
+        async def gather():
+            return await asyncio.gather(render("one.example.com"), render("two.example.com"))
+        
+        first, second = asyncio.run(gather())
+        assert self._function_url(first).startswith("https://")
+        assert "one.example.com/swaig/" in self._function_url(first)
+        assert "two.example.com/swaig/" in self._function_url(second)
+        # Nothing is left behind on the agent
+        assert self.agent._proxy_url_base is None
+        assert "example.com" not in self._function_url(self.agent._render_swml("call-1"))
@@ -23,6 +23,7 @@ from signalwire_agents.core.logging_config import (
     get_execution_mode, 
     configure_logging,
     StructuredLoggerWrapper,
+    lazy,
     _logging_configured
 )
 
@@ -146,6 +147,35 @@ class TestStructuredLoggerWrapper:
         
         wrapper.warn("warning message")
         mock_logger.warning.assert_called_with("warning message")
+    
+    def test_disabled_level_not_formatted(self):
+        """Test messages for disabled levels are neither formatted nor logged"""
+        mock_logger = Mock()
+        mock_logger.isEnabledFor.return_value = False
+        wrapper = StructuredLoggerWrapper(mock_logger).bind(agent="test")
+        
+        with patch.object(StructuredLoggerWrapper, '_format_structured_message') as mock_format:
+            wrapper.debug("debug message", data={"key": "value"})
+        
+        mock_logger.isEnabledFor.assert_called_with(logging.DEBUG)
+        mock_logger.debug.assert_not_called()
+        mock_format.assert_not_called()
+    
+    def test_lazy_values(self):
+        """Test lazy values are only computed when the message is logged"""
+        logger = logging.getLogger("test_lazy_values")
+        logger.setLevel(logging.INFO)
+        wrapper = StructuredLoggerWrapper(logger)
+        serialize = Mock(return_value='{"key": "value"}')
+        
+        with patch.object(logger, 'info') as mock_info:
+            wrapper.debug("request_body", body=lazy(serialize, {"key": "value"}))
+            serialize.assert_not_called()
+            
+            wrapper.info("request_body", body=lazy(serialize, {"key": "value"}))
+        
+        serialize.assert_called_once_with({"key": "value"})
+        mock_info.assert_called_once_with('request_body (body={"key": "value"})')
 
 
 class TestConfigureLogging:
@@ -0,0 +1,190 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for the pre-fork multi-process server
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import subprocess
+import textwrap
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from signalwire_agents.core.agent_base import AgentBase
+from signalwire_agents.core.prefork_server import (
+    resolve_workers,
+    resolve_worker_shutdown_timeout,
+    DEFAULT_WORKER_SHUTDOWN_TIMEOUT
+)
+
+
+class TestResolveWorkers:
+    """Test worker count resolution"""
+
+    def test_default_single_process(self):
+        """Test a single process is used by default"""
+        with patch.dict(os.environ, {}, clear=True):
+            assert resolve_workers() == 1
+
+    def test_precedence(self):
+        """Test explicit value, then config file, then environment"""
+        with patch.dict(os.environ, {'SWML_WORKERS': '3'}):
+            assert resolve_workers() == 3
+            assert resolve_workers(None, {'workers': 2}) == 2
+            assert resolve_workers(4, {'workers': 2}) == 4
+
+    def test_invalid_values(self):
+        """Test invalid counts fall back to a single process"""
+        with patch.dict(os.environ, {'SWML_WORKERS': 'many'}):
+            assert resolve_workers() == 1
+        assert resolve_workers(0) == 1
+
+    def test_shutdown_timeout(self):
+        """Test the worker shutdown timeout resolution"""
+        with patch.dict(os.environ, {}, clear=True):
+            assert resolve_worker_shutdown_timeout() == DEFAULT_WORKER_SHUTDOWN_TIMEOUT
+        with patch.dict(os.environ, {'SWML_WORKER_SHUTDOWN_TIMEOUT': '5'}):
+            assert resolve_worker_shutdown_timeout() == 5.0
+            assert resolve_worker_shutdown_timeout({'worker_shutdown_timeout': 10}) == 10.0
+
+
+class TestAgentWorkerConfig:
+    """Test agents pick up the multi-process settings"""
+
+    def test_workers_from_config_file(self, tmp_path):
+        """Test the worker count and session secret from the config file"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({
+            "service": {"workers": 4, "session_secret": "shared-secret"}
+        }))
+
+        agent = AgentBase("test", config_file=str(config_file), suppress_logs=True)
+
+        assert agent._workers == 4
+        assert agent._session_manager.secret_key == "shared-secret"
+
+    def test_session_secret_shared_between_processes(self):
+        """Test a token minted with SWML_SESSION_SECRET validates in another agent instance"""
+        with patch.dict(os.environ, {'SWML_SESSION_SECRET': 'shared-secret'}):
+            minting = AgentBase("test", suppress_logs=True)
+            validating = AgentBase("test", suppress_logs=True)
+
+        token = minting._session_manager.create_tool_token("get_order", "call-1")
+        assert validating._session_manager.validate_tool_token("get_order", token, "call-1")
+
+    def test_serve_uses_prefork_server(self):
+        """Test serve() starts worker processes when more than one is configured"""
+        agent = AgentBase("test", suppress_logs=True)
+
+        with patch('signalwire_agents.core.mixins.web_mixin.PreforkServer') as server, \
+             patch('uvicorn.run') as run:
+            agent.serve(host="127.0.0.1", port=3000, workers=2)
+
+        run.assert_not_called()
+        args, kwargs = server.call_args
+        assert args[1:] == ("127.0.0.1", 3000, 2)
+        server.return_value.run.assert_called_once()
+    
+    def test_reload_keeps_explicit_worker_count(self):
+        """Test a SIGHUP reload keeps the worker count passed to serve()"""
+        with patch('signalwire_agents.core.mixins.web_mixin.PreforkServer') as server, \
+             patch('uvicorn.run') as run, \
+             patch.dict(os.environ, {'SWML_WORKERS': '2'}):
+            agent = AgentBase("test", suppress_logs=True)
+            agent.serve(host="127.0.0.1", port=3000, workers=3)
+            on_reload = server.call_args.kwargs['on_reload']
+            assert on_reload() == 3
+            
+            agent.serve(host="127.0.0.1", port=3000)
+            on_reload = server.call_args.kwargs['on_reload']
+            assert on_reload() == 2
+        
+        run.assert_not_called()
+
+
+WORKER_SCRIPT = textwrap.dedent("""
+    import os
+    import sys
+    from fastapi import FastAPI
+    from signalwire_agents import AgentBase
+
+    agent = AgentBase("prefork", route="/agent", suppress_logs=True)
+    app = FastAPI()
+
+    @app.get("/pid")
+    def pid():
+        return {"pid": os.getpid(), "secret": agent._session_manager.secret_key}
+
+    app.include_router(agent.as_router(), prefix="/agent")
+
+    from signalwire_agents.core.prefork_server import PreforkServer
+    PreforkServer(app, "127.0.0.1", int(sys.argv[1]), 2, shutdown_timeout=2, log_level="error").run()
+""")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _worker_info(port, attempts=50):
+    """Collect the pids and secrets of the workers answering requests"""
+    pids, secrets = set(), set()
+    for _ in range(attempts):
+        try:
+            # New connection per request so the kernel spreads them over workers
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/pid", timeout=2) as response:
+                data = json.loads(response.read())
+            pids.add(data["pid"])
+            secrets.add(data["secret"])
+        except OSError:
+            time.sleep(0.1)
+    return pids, secrets
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork workers need os.fork")
+class TestPreforkServerProcesses:
+    """Test the server with real worker processes"""
+
+    def test_workers_reload_and_stop(self, tmp_path):
+        """Test workers share the secret, are replaced on SIGHUP and stop on SIGTERM"""
+        script = tmp_path / "server.py"
+        script.write_text(WORKER_SCRIPT)
+        port = _free_port()
+        env = dict(os.environ, PYTHONPATH=os.getcwd(), SIGNALWIRE_LOG_MODE="off")
+        process = subprocess.Popen([sys.executable, str(script), str(port)], env=env)
+        try:
+            pids, secrets = _worker_info(port)
+            assert pids and process.pid not in pids
+            assert len(secrets) == 1
+
+            process.send_signal(signal.SIGHUP)
+            deadline = time.monotonic() + 10
+            new_pids = set()
+            while time.monotonic() < deadline and (not new_pids or new_pids & pids):
+                time.sleep(0.2)
+                new_pids, new_secrets = _worker_info(port, attempts=10)
+            assert new_pids and not new_pids & pids
+            assert new_secrets == secrets
+
+            process.send_signal(signal.SIGTERM)
+            assert process.wait(timeout=15) == 0
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
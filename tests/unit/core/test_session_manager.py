@@ -19,7 +19,7 @@ import base64
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 
-from signalwire_agents.core.security.session_manager import SessionManager
+from signalwire_agents.core.security.session_manager import SessionManager, TOKEN_VERSION
 
 
 class TestSessionManager:
@@ -69,13 +69,15 @@ class TestSessionManager:
         assert isinstance(token, str)
         assert len(token) > 0
         
-        # Should be base64 encoded
+        # Should be URL-safe base64 of the binary layout, without padding
         try:
-            decoded = base64.urlsafe_b64decode(token.encode()).decode()
-            assert "call_123" in decoded
-            assert "test_function" in decoded
+            decoded = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            assert decoded[0] == TOKEN_VERSION
+            assert b"call_123" in decoded
+            assert b"test_function" in decoded
         except Exception:
             pytest.fail("Token should be valid base64")
+        assert "=" not in token
     
     def test_create_tool_token_alias(self):
         """Test create_tool_token alias"""
@@ -165,6 +167,61 @@ class TestSessionManager:
         assert manager.validate_token("", "test_function", token) is True
         assert manager.validate_token(None, "test_function", token) is True
     
+    def test_generate_tokens_batch(self):
+        """Test minting the tokens of all of a call's functions at once"""
+        manager = SessionManager()
+        functions = [f"function_{i}" for i in range(50)]
+        
+        tokens = manager.generate_tokens(functions, "call_123")
+        
+        assert list(tokens) == functions
+        assert len(set(tokens.values())) == len(functions)  # Distinct nonces
+        for func, token in tokens.items():
+            assert manager.validate_token("call_123", func, token) is True
+            assert manager.validate_token("call_123", "function_x", token) is False
+        assert manager.create_tool_tokens(functions[:2], "call_123").keys() == {"function_0", "function_1"}
+    
+    def test_validate_legacy_token(self):
+        """Test tokens in the previous text format stay valid until they expire"""
+        secret = "legacy_secret_key_that_is_long_enough"
+        manager = SessionManager(secret_key=secret)
+        
+        def legacy_token(call_id, function_name, expiry):
+            message = f"{call_id}:{function_name}:{expiry}:abcd1234"
+            signature = hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()[:16]
+            return base64.urlsafe_b64encode(f"{call_id}.{function_name}.{expiry}.abcd1234.{signature}".encode()).decode()
+        
+        token = legacy_token("call_123", "test_function", int(time.time()) + 60)
+        assert manager.validate_token("call_123", "test_function", token) is True
+        assert manager.validate_token("call_123", "other_function", token) is False
+        assert manager.debug_token(token)["components"]["call_id"] == "call_123"
+        
+        expired = legacy_token("call_123", "test_function", int(time.time()) - 60)
+        assert manager.validate_token("call_123", "test_function", expired) is False
+    
+    def test_validate_tampered_token(self):
+        """Test changing any signed field invalidates the token"""
+        manager = SessionManager()
+        token = manager.generate_token("test_function", "call_123")
+        data = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        
+        for i in range(1, len(data)):
+            tampered = data.copy()
+            tampered[i] ^= 0x01
+            tampered_token = base64.urlsafe_b64encode(bytes(tampered)).decode().rstrip("=")
+            assert manager.validate_token("", "test_function", tampered_token) is False
+    
+    def test_secret_key_change(self):
+        """Test changing the secret key re-keys the cached HMAC"""
+        manager = SessionManager(secret_key="secret1" + "x" * 24)
+        token = manager.generate_token("test_function", "call_123")
+        
+        manager.secret_key = "secret2" + "x" * 24
+        
+        assert manager.validate_token("call_123", "test_function", token) is False
+        assert manager.validate_token("call_123", "test_function",
+                                      manager.generate_token("test_function", "call_123")) is True
+    
     def test_validate_tool_token_alias(self):
         """Test validate_tool_token alias"""
         manager = SessionManager()
@@ -416,12 +473,12 @@ class TestSessionManagerIntegration:
             token = manager.generate_token(f"func_{i}", f"call_{i}")
             tokens.append(token)
         
-        # All tokens should be valid base64
-        for token in tokens:
+        # All tokens should be valid base64 of the binary layout
+        for i, token in enumerate(tokens):
             try:
-                decoded = base64.urlsafe_b64decode(token.encode()).decode()
-                parts = decoded.split('.')
-                assert len(parts) == 5  # call_id.function.expiry.nonce.signature
+                decoded = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+                # version, expiry, nonce, lengths, call_id, function, signature
+                assert len(decoded) == 13 + len(f"call_{i}") + len(f"func_{i}") + 16
             except Exception:
                 pytest.fail(f"Token {token} should have valid structure")
         
@@ -149,6 +149,38 @@ class TestSWAIGFunctionExecution:
         
         result = func("arg1", param="value")
         assert result == {"args": ("arg1",), "kwargs": {"param": "value"}}
+    
+    def test_execute_async_handler(self):
+        """Test coroutine handlers are awaited when executed synchronously"""
+        async def test_handler(args, raw_data):
+            return f"Hello {args['name']}"
+        
+        func = SWAIGFunction(
+            name="async_function",
+            handler=test_handler,
+            description="Async function"
+        )
+        
+        assert func.is_async is True
+        assert func.execute({"name": "Ada"}) == {"response": "Hello Ada"}
+    
+    def test_execution_limits_not_serialized(self):
+        """Test timeout and concurrency settings stay out of the SWAIG definition"""
+        func = SWAIGFunction(
+            name="limited_function",
+            handler=lambda args, raw_data: "ok",
+            description="Limited function",
+            timeout=5,
+            max_concurrency=2
+        )
+        
+        swaig_dict = func.to_swaig("https://example.com")
+        
+        assert func.timeout == 5
+        assert func.max_concurrency == 2
+        assert func.is_async is False
+        assert "timeout" not in swaig_dict
+        assert "max_concurrency" not in swaig_dict
 
 
 class TestSWAIGFunctionSerialization:
@@ -252,9 +284,45 @@ class TestSWAIGFunctionValidation:
             parameters={"param1": {"type": "string"}}
         )
         
-        # Currently returns True (validation not implemented)
         assert func.validate_args({"param1": "value"}) is True
+        # Extra arguments are allowed
         assert func.validate_args({"invalid": "value"}) is True
+        assert func.validate_args({"param1": 42}) is False
+    
+    def test_get_arg_errors(self):
+        """Test argument errors report required and mistyped parameters"""
+        func = SWAIGFunction(
+            name="test_function",
+            handler=lambda args, raw_data: None,
+            description="Test function",
+            parameters={
+                "city": {"type": "string"},
+                "unit": {"type": "string", "enum": ["celsius", "fahrenheit"]}
+            },
+            required=["city"]
+        )
+        
+        assert func.get_arg_errors({"city": "Paris", "unit": "celsius"}) == []
+        assert func.get_arg_errors({"unit": "kelvin"}) == [
+            "'city' is a required property",
+            "unit: 'kelvin' is not one of ['celsius', 'fahrenheit']"
+        ]
+    
+    def test_validator_compiled_once(self):
+        """Test the parameter schema is compiled once and reused"""
+        func = SWAIGFunction(
+            name="test_function",
+            handler=lambda args, raw_data: None,
+            description="Test function",
+            parameters={"param1": {"type": "string"}}
+        )
+        
+        with patch('signalwire_agents.core.swaig_function.compile_validator',
+                   return_value=lambda args: []) as mock_compile:
+            func.validate_args({"param1": "a"})
+            func.validate_args({"param1": "b"})
+        
+        mock_compile.assert_called_once_with({"type": "object", "properties": {"param1": {"type": "string"}}})
     
     def test_function_name_validation(self):
         """Test function name validation"""
@@ -105,6 +105,20 @@ class TestSWMLServiceVerbMethods:
         # Should return boolean
         assert isinstance(result, bool)
 
+    def test_verb_methods_shared_by_instances(self):
+        """Test verb methods are created once, on the class, from the shared schema"""
+        first = SWMLService(name="first")
+        second = SWMLService(name="second")
+        
+        assert second.schema_utils.verbs is first.schema_utils.verbs
+        assert "play" in SWMLService.__dict__
+        assert "play" not in second.__dict__
+        assert second.play.__func__ is first.play.__func__
+        
+        second.play(url="test.mp3")
+        assert second.get_document()["sections"]["main"] == [{"play": {"url": "test.mp3"}}]
+        assert first.get_document()["sections"]["main"] == []
+
 
 class TestSWMLServiceDocumentManagement:
     """Test SWML document management"""
@@ -150,6 +164,21 @@ class TestSWMLServiceDocumentManagement:
         
         # Should return boolean
         assert isinstance(result, bool)
+    
+    def test_new_document_independent(self):
+        """Test new documents don't share state with the current document or each other"""
+        service = SWMLService(name="test_service")
+        service.add_verb("answer", {})
+        
+        first = service.new_document()
+        second = service.new_document()
+        assert first.add_verb("hangup", {})
+        assert first.add_verb_to_section("other", "hangup", {})
+        
+        assert first.to_dict()["sections"] == {"main": [{"hangup": {}}], "other": [{"hangup": {}}]}
+        assert second.to_dict()["sections"] == {"main": []}
+        assert service.get_document()["sections"] == {"main": [{"answer": {}}]}
+        assert json.loads(first.render()) == first.to_dict()
 
 
 class TestSWMLServiceUtilityMethods:
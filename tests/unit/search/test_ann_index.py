@@ -0,0 +1,214 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for the approximate nearest neighbour index
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pytest
+
+from signalwire_agents.search.ann_index import (
+    train_ivf,
+    build_ann_index,
+    drop_ann_index,
+    benchmark_recall,
+    default_nlist,
+    default_nprobe
+)
+from signalwire_agents.search.search_engine import SearchEngine
+
+
+def _create_index(path, vectors):
+    """Create a minimal .swsearch database holding the given embeddings"""
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE config (key TEXT PRIMARY KEY, value TEXT)')
+    cursor.execute('''
+        CREATE TABLE chunks (
+            id INTEGER PRIMARY KEY,
+            content TEXT,
+            embedding BLOB,
+            filename TEXT,
+            section TEXT,
+            tags TEXT,
+            metadata TEXT
+        )
+    ''')
+    cursor.executemany(
+        'INSERT INTO chunks (content, embedding, filename, section, tags, metadata) VALUES (?, ?, ?, ?, ?, ?)',
+        [(f'chunk {i}', v.astype(np.float32).tobytes(), 'doc.md', None, '[]', '{}')
+         for i, v in enumerate(vectors)]
+    )
+    conn.commit()
+    return conn
+
+
+def _clustered_vectors(n=400, dim=16, clusters=8, seed=0):
+    """Generate vectors grouped around random cluster centres"""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return (centres[labels] + 0.1 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+class TestTrainIVF:
+    """Test IVF training"""
+
+    def test_assignments_cover_all_vectors(self):
+        """Test every vector is assigned to a valid list"""
+        vectors = _clustered_vectors()
+        trained = train_ivf(vectors, nlist=8)
+
+        assert trained['centroids'].shape == (8, 16)
+        assert len(trained['assignments']) == len(vectors)
+        assert trained['assignments'].min() >= 0
+        assert trained['assignments'].max() < 8
+        np.testing.assert_allclose(np.linalg.norm(trained['centroids'], axis=1), 1.0, rtol=1e-5)
+
+    def test_deterministic(self):
+        """Test the same input always produces the same index"""
+        vectors = _clustered_vectors()
+        first = train_ivf(vectors, nlist=8)
+        second = train_ivf(vectors, nlist=8)
+        np.testing.assert_array_equal(first['assignments'], second['assignments'])
+
+    def test_nlist_capped_by_vector_count(self):
+        """Test nlist never exceeds the number of vectors"""
+        trained = train_ivf(_clustered_vectors(n=5), nlist=50)
+        assert trained['centroids'].shape[0] == 5
+
+    def test_defaults(self):
+        """Test default list and probe counts"""
+        assert default_nlist(10000) == 100
+        assert default_nprobe(100) == 10
+        assert default_nprobe(3) == 1
+
+
+class TestAnnSearch:
+    """Test SearchEngine with an ANN index"""
+
+    def setup_method(self):
+        self.tmp_file = tempfile.NamedTemporaryFile(suffix='.swsearch', delete=False)
+        self.db_path = self.tmp_file.name
+        self.tmp_file.close()
+        self.vectors = _clustered_vectors()
+        conn = _create_index(self.db_path, self.vectors)
+        self.info = build_ann_index(conn, 'ivf', nlist=8, nprobe=2)
+        conn.commit()
+        conn.close()
+
+    def teardown_method(self):
+        os.unlink(self.db_path)
+
+    def test_build_stores_config(self):
+        """Test the ANN index is recorded in the config table"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        assert self.info == {'type': 'ivf', 'nlist': 8, 'nprobe': 2, 'vectors': 400}
+        assert engine.config['ann_index'] == 'ivf'
+        assert engine.config['ann_nlist'] == '8'
+        assert engine.config['ann_nprobe'] == '2'
+
+    def test_ann_matches_exact_for_clustered_data(self):
+        """Test ANN search returns the exact top result on well-clustered data"""
+        ann_engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        exact_engine = SearchEngine(backend='sqlite', index_path=self.db_path, use_ann=False)
+
+        for query in self.vectors[:20]:
+            ann = ann_engine._vector_search(query, count=5)
+            exact = exact_engine._vector_search(query, count=5)
+            assert ann[0]['id'] == exact[0]['id']
+            assert ann[0]['score'] == pytest.approx(exact[0]['score'])
+
+        assert ann_engine._load_ann_index() is not None
+        assert exact_engine._ann_index is None
+
+    def test_nprobe_all_lists_is_exact(self):
+        """Test probing every list gives the exact result"""
+        ann_engine = SearchEngine(backend='sqlite', index_path=self.db_path, ann_nprobe=8)
+        exact_engine = SearchEngine(backend='sqlite', index_path=self.db_path, use_ann=False)
+        query = np.random.default_rng(1).normal(size=16)
+
+        ann = [r['id'] for r in ann_engine._vector_search(query, count=10)]
+        exact = [r['id'] for r in exact_engine._vector_search(query, count=10)]
+        assert ann == exact
+
+    def test_unassigned_chunks_are_searched(self):
+        """Test chunks added after the ANN index was built are still found"""
+        conn = sqlite3.connect(self.db_path)
+        new_vector = np.ones(16, dtype=np.float32) * 100
+        conn.execute(
+            'INSERT INTO chunks (content, embedding, filename, tags, metadata) VALUES (?, ?, ?, ?, ?)',
+            ('new chunk', new_vector.tobytes(), 'new.md', '[]', '{}')
+        )
+        conn.commit()
+        conn.close()
+
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path, ann_nprobe=1)
+        results = engine._vector_search(new_vector, count=1)
+        assert results[0]['content'] == 'new chunk'
+
+    def test_fallback_without_ann_index(self):
+        """Test exact search is used when the ANN index is dropped"""
+        conn = sqlite3.connect(self.db_path)
+        drop_ann_index(conn)
+        conn.commit()
+        conn.close()
+
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        results = engine._vector_search(self.vectors[0], count=3)
+        assert engine._load_ann_index() is None
+        assert results[0]['id'] == 1
+
+    def test_build_skips_invalid_first_embedding(self):
+        """Test a malformed first embedding doesn't set the index dimension"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            'INSERT INTO chunks (id, content, embedding, filename, tags, metadata) VALUES (0, ?, ?, ?, ?, ?)',
+            ('broken', b'\x00' * 7, 'bad.md', '[]', '{}')
+        )
+        info = build_ann_index(conn, 'ivf', nlist=8)
+        centroid = conn.execute('SELECT centroid FROM ann_centroids LIMIT 1').fetchone()[0]
+        conn.commit()
+        conn.close()
+
+        assert info['vectors'] == len(self.vectors)
+        assert len(centroid) == 16 * 4
+
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        ids, matrix = engine.embedding_matrix()
+        assert matrix.shape == (len(self.vectors), 16)
+        assert engine.ann_structure().nlist == 8
+
+    def test_benchmark_recall(self):
+        """Test recall benchmark reports exact baseline and improving recall"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        results = benchmark_recall(engine, k=5, nprobe_values=[1, 8], num_queries=20)
+
+        assert engine.vector_count() == len(self.vectors)
+        assert results[0]['nprobe'] == 'exact'
+        assert results[0]['recall'] == 1.0
+        assert [r['nprobe'] for r in results[1:]] == [1, 8]
+        assert results[2]['recall'] == pytest.approx(1.0)
+        assert results[1]['scanned'] < results[2]['scanned']
+
+    def test_benchmark_requires_ann_index(self):
+        """Test benchmarking an index without ANN structures fails clearly"""
+        conn = sqlite3.connect(self.db_path)
+        drop_ann_index(conn)
+        conn.commit()
+        conn.close()
+
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        with pytest.raises(ValueError, match="no ANN index"):
+            benchmark_recall(engine)
@@ -0,0 +1,130 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for the read-only SQLite connection pool
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+
+import pytest
+
+from signalwire_agents.search.connection_pool import SQLiteConnectionPool
+
+
+def _create_db(path, value):
+    """Create a small database holding one value"""
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE config (key TEXT PRIMARY KEY, value TEXT)')
+    conn.execute("INSERT INTO config VALUES ('name', ?)", (value,))
+    conn.commit()
+    conn.close()
+
+
+class TestSQLiteConnectionPool:
+    """Test SQLiteConnectionPool behaviour"""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'index.swsearch')
+        _create_db(self.db_path, 'first')
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_connection_reused_within_thread(self):
+        """Test the same thread always gets the same connection"""
+        pool = SQLiteConnectionPool(self.db_path)
+        assert pool.connection() is pool.connection()
+        assert len(pool) == 1
+        pool.close()
+
+    def test_connection_per_thread(self):
+        """Test each thread gets its own connection"""
+        pool = SQLiteConnectionPool(self.db_path)
+        connections = []
+
+        def worker():
+            conn = pool.connection()
+            conn.execute('SELECT value FROM config').fetchall()
+            connections.append(conn)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(c) for c in connections}) == 3
+        assert len(pool) == 3
+        pool.close()
+        assert len(pool) == 0
+
+    def test_connections_are_read_only(self):
+        """Test writes through a pooled connection fail"""
+        pool = SQLiteConnectionPool(self.db_path)
+        with pytest.raises(sqlite3.OperationalError):
+            pool.connection().execute("INSERT INTO config VALUES ('other', 'x')")
+        pool.close()
+
+    def test_pragmas_applied(self):
+        """Test page cache pragmas are set on new connections"""
+        pool = SQLiteConnectionPool(self.db_path, cache_size_kb=1024)
+        assert pool.connection().execute('PRAGMA cache_size').fetchone()[0] == -1024
+        pool.close()
+
+    def test_missing_index_not_created(self):
+        """Test opening a missing index fails instead of creating it"""
+        missing = os.path.join(self.temp_dir.name, 'missing.swsearch')
+        pool = SQLiteConnectionPool(missing)
+        with pytest.raises(sqlite3.OperationalError):
+            pool.connection()
+        assert not os.path.exists(missing)
+
+    def test_reopens_after_file_replaced(self):
+        """Test connections are reopened when the index file is replaced"""
+        pool = SQLiteConnectionPool(self.db_path, immutable=True)
+        first = pool.connection()
+        assert first.execute('SELECT value FROM config').fetchone()[0] == 'first'
+
+        new_path = self.db_path + '.partial'
+        _create_db(new_path, 'second')
+        os.replace(new_path, self.db_path)
+
+        second = pool.connection()
+        assert second is not first
+        assert second.execute('SELECT value FROM config').fetchone()[0] == 'second'
+        assert len(pool) == 1
+        pool.close()
+
+    def test_connections_of_exited_threads_closed(self):
+        """Test connections of threads that exited are closed instead of accumulating"""
+        pool = SQLiteConnectionPool(self.db_path)
+        connections = []
+
+        def worker():
+            connections.append(pool.connection())
+
+        for _ in range(5):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert len(pool) == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[0].execute('SELECT 1')
+
+        pool.connection()
+        assert len(pool) == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[-1].execute('SELECT 1')
+        pool.close()
@@ -14,6 +14,7 @@ Unit tests for search document processor module
 import pytest
 import tempfile
 import os
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from pathlib import Path
 
@@ -656,6 +657,85 @@ class TestDocumentProcessorUtilities:
         assert overlap == []
 
 
+class TestDocumentProcessorSemanticChunking:
+    """Test semantic chunking"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        # Two topics: sentences 0-1 point one way, sentences 2-4 another
+        self.vectors = {
+            "Cats purr.": [1.0, 0.0],
+            "Cats nap.": [0.9, 0.1],
+            "Taxes rise.": [0.0, 1.0],
+            "Taxes fall.": [0.1, 0.9],
+            "Taxes vary.": [0.0, 2.0],
+        }
+        self.model = Mock()
+        self.model.encode.side_effect = lambda sentences, **kwargs: np.array(
+            [self.vectors[s] for s in sentences], dtype=np.float32
+        )
+        self.content = "Cats purr. Cats nap. Taxes rise. Taxes fall. Taxes vary"
+    
+    @patch('signalwire_agents.search.document_processor.sent_tokenize', None)
+    def test_splits_where_similarity_drops(self):
+        """Test chunks split at low adjacent similarity with one encode call"""
+        processor = DocumentProcessor(chunking_strategy='semantic', model_loader=lambda: self.model)
+        
+        chunks = processor.create_chunks(self.content, "test.txt", "txt")
+        
+        assert [c['content'] for c in chunks] == ["Cats purr. Cats nap.", "Taxes rise. Taxes fall. Taxes vary."]
+        assert self.model.encode.call_count == 1
+    
+    @patch('signalwire_agents.search.document_processor.sent_tokenize', None)
+    def test_chunk_embeddings_pool_sentence_embeddings(self):
+        """Test each chunk carries the normalized mean of its normalized sentence embeddings"""
+        processor = DocumentProcessor(chunking_strategy='semantic', model_loader=lambda: self.model)
+        
+        chunks = processor.create_chunks(self.content, "test.txt", "txt")
+        
+        sentences = ["Taxes rise.", "Taxes fall.", "Taxes vary."]
+        vectors = np.array([self.vectors[s] for s in sentences], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        expected = vectors.mean(axis=0)
+        expected /= np.linalg.norm(expected)
+        pooled = np.frombuffer(chunks[1]['embedding'], dtype=np.float32)
+        assert np.allclose(pooled, expected)
+    
+    @patch('signalwire_agents.search.document_processor.sent_tokenize', None)
+    def test_pooling_disabled(self):
+        """Test chunks have no embedding when pooling is disabled"""
+        processor = DocumentProcessor(chunking_strategy='semantic', model_loader=lambda: self.model,
+                                      pool_sentence_embeddings=False)
+        
+        chunks = processor.create_chunks(self.content, "test.txt", "txt")
+        
+        assert len(chunks) == 2
+        assert all('embedding' not in c for c in chunks)
+    
+    @patch('signalwire_agents.search.document_processor.sent_tokenize', None)
+    def test_uses_shared_model_registry(self):
+        """Test the model comes from the shared registry without a loader"""
+        processor = DocumentProcessor(chunking_strategy='semantic', model_name='custom-model')
+        
+        with patch('signalwire_agents.search.document_processor.get_embedding_model',
+                   return_value=self.model) as mock_get_model:
+            processor.create_chunks(self.content, "test.txt", "txt")
+        
+        mock_get_model.assert_called_once_with('custom-model')
+    
+    @patch('signalwire_agents.search.document_processor.sent_tokenize', None)
+    def test_missing_model_falls_back_to_sentences(self):
+        """Test sentence chunking is used when sentence-transformers is missing"""
+        def missing():
+            raise ImportError("No module named 'sentence_transformers'")
+        processor = DocumentProcessor(chunking_strategy='semantic', model_loader=missing)
+        
+        with patch.object(processor, '_chunk_by_sentences', return_value=[]) as mock_sentences:
+            processor.create_chunks(self.content, "test.txt", "txt")
+        
+        mock_sentences.assert_called_once()
+
+
 class TestDocumentProcessorEdgeCases:
     """Test edge cases and error handling"""
     
@@ -0,0 +1,110 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for the shared embedding model registry
+"""
+
+import threading
+import pytest
+from unittest.mock import Mock, patch
+
+from signalwire_agents.search.embedding_models import (
+    EmbeddingModelRegistry,
+    DEFAULT_MODEL_NAME
+)
+
+
+class TestEmbeddingModelRegistry:
+    """Test EmbeddingModelRegistry caching behaviour"""
+
+    def test_model_loaded_once(self):
+        """Test repeated lookups reuse the same model instance"""
+        registry = EmbeddingModelRegistry(max_models=2)
+        with patch.object(registry, '_load', side_effect=lambda name: Mock(name=name)) as mock_load:
+            first = registry.get_model('model-a')
+            second = registry.get_model('model-a')
+
+        assert first is second
+        mock_load.assert_called_once_with('model-a')
+
+    def test_default_model_name(self):
+        """Test None resolves to the default model"""
+        registry = EmbeddingModelRegistry()
+        with patch.object(registry, '_load', return_value=Mock()) as mock_load:
+            registry.get_model(None)
+
+        mock_load.assert_called_once_with(DEFAULT_MODEL_NAME)
+        assert registry.is_loaded(DEFAULT_MODEL_NAME)
+
+    def test_lru_eviction(self):
+        """Test least recently used model is evicted past the bound"""
+        registry = EmbeddingModelRegistry(max_models=2)
+        with patch.object(registry, '_load', side_effect=lambda name: Mock()):
+            registry.get_model('model-a')
+            registry.get_model('model-b')
+            registry.get_model('model-a')  # model-b is now least recently used
+            registry.get_model('model-c')
+
+        assert registry.loaded_models() == ['model-a', 'model-c']
+
+    def test_max_models_from_env(self, monkeypatch):
+        """Test bound is read from the environment"""
+        monkeypatch.setenv('SIGNALWIRE_SEARCH_MAX_MODELS', '5')
+        assert EmbeddingModelRegistry().max_models == 5
+
+        monkeypatch.setenv('SIGNALWIRE_SEARCH_MAX_MODELS', 'invalid')
+        assert EmbeddingModelRegistry().max_models == 2
+
+    def test_concurrent_loads_share_model(self):
+        """Test concurrent first lookups only load the model once"""
+        registry = EmbeddingModelRegistry()
+        gate = threading.Event()
+
+        def slow_load(name):
+            gate.wait(1)
+            return Mock()
+
+        results = []
+        with patch.object(registry, '_load', side_effect=slow_load) as mock_load:
+            threads = [
+                threading.Thread(target=lambda: results.append(registry.get_model('model-a')))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            gate.set()
+            for t in threads:
+                t.join()
+
+        assert mock_load.call_count == 1
+        assert all(r is results[0] for r in results)
+
+    def test_warm_up_skips_failures(self):
+        """Test warm-up loads each model once and reports failures"""
+        registry = EmbeddingModelRegistry(max_models=3)
+
+        def load(name):
+            if name == 'broken':
+                raise OSError("not found")
+            return Mock()
+
+        with patch.object(registry, '_load', side_effect=load) as mock_load:
+            loaded = registry.warm_up(['model-a', 'broken', 'model-a', None])
+
+        assert loaded == ['model-a', DEFAULT_MODEL_NAME]
+        assert mock_load.call_count == 3
+
+    def test_clear(self):
+        """Test clearing drops resident models"""
+        registry = EmbeddingModelRegistry()
+        with patch.object(registry, '_load', return_value=Mock()):
+            registry.get_model('model-a')
+        registry.clear()
+        assert registry.loaded_models() == []
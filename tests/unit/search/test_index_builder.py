@@ -15,7 +15,9 @@ import pytest
 import tempfile
 import os
 import sqlite3
+import numpy as np
 import json
+import hashlib
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from pathlib import Path
 
@@ -296,7 +298,7 @@ class TestIndexBuilderFileProcessing:
     def test_process_file_unicode_error(self, mock_read_text):
         """Test file processing with unicode error"""
         mock_read_text.side_effect = UnicodeDecodeError("utf-8", b"", 0, 1, "invalid")
-        file_path = Path("test.bin")
+        file_path = Path("/home/user/test.bin")
         source_dir = "/home/user"
         
         result = self.builder._process_file(file_path, source_dir)
@@ -305,14 +307,27 @@ class TestIndexBuilderFileProcessing:
     
     @patch('pathlib.Path.read_text')
     def test_process_file_general_error(self, mock_read_text):
-        """Test file processing with general error"""
-        mock_read_text.side_effect = Exception("File error")
-        file_path = Path("test.txt")
-        source_dir = "/home/user"
+        """Test read errors are reported instead of giving an empty file"""
+        mock_read_text.side_effect = OSError("File error")
+        file_path = Path("/home/user/test.txt")
         
-        result = self.builder._process_file(file_path, source_dir)
+        with pytest.raises(OSError):
+            self.builder._process_file(file_path, "/home/user")
         
-        assert result == []
+        chunks, error = self.builder._process_source_file(file_path, [Path("/home/user")])
+        assert chunks == []
+        assert error == "File error"
+    
+    def test_process_file_extraction_error(self):
+        """Test failed document extraction is reported as an error"""
+        file_path = Path("/home/user/report.pdf")
+        extracted = '{"error": "pdfplumber not installed"}'
+        
+        with patch.object(self.builder.doc_processor, '_extract_text_from_file', return_value=extracted):
+            chunks, error = self.builder._process_source_file(file_path, [Path("/home/user")])
+        
+        assert chunks == []
+        assert error == "Text extraction failed: pdfplumber not installed"
 
     def test_process_file_with_string_tags(self):
         """Test file processing with string tags instead of list"""
@@ -520,17 +535,17 @@ class TestIndexBuilderBuildMethods:
         if self.temp_db and os.path.exists(self.temp_db):
             os.remove(self.temp_db)
     
-    @patch('signalwire_agents.search.index_builder.preprocess_document_content')
+    @patch('signalwire_agents.search.index_builder.preprocess_documents')
     def test_build_index_from_sources_success(self, mock_preprocess):
         """Test successful index building from sources"""
         with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
             self.temp_db = f.name
         
         # Mock preprocessing
-        mock_preprocess.return_value = {
+        mock_preprocess.side_effect = lambda contents, **kwargs: ({
             "enhanced_text": "enhanced content",
             "keywords": ["test", "content"]
-        }
+        } for content in contents)
         
         # Mock file discovery
         mock_files = [Path("test1.txt"), Path("test2.txt")]
@@ -543,14 +558,11 @@ class TestIndexBuilderBuildMethods:
         
         # Mock model
         mock_model = Mock()
-        mock_embedding = Mock()
-        mock_embedding.tobytes.return_value = b"fake_embedding"
-        mock_model.encode.return_value = mock_embedding
+        mock_model.encode.return_value = np.ones((2, 3), dtype=np.float32)
         
         with patch.object(self.builder, '_discover_files_from_sources', return_value=mock_files), \
              patch.object(self.builder, '_process_file', side_effect=[mock_chunks[:1], mock_chunks[1:]]), \
-             patch.object(self.builder, '_load_model'), \
-             patch.object(self.builder, '_create_database') as mock_create_db:
+             patch.object(self.builder, '_load_model'):
             
             self.builder.model = mock_model
             
@@ -559,9 +571,198 @@ class TestIndexBuilderBuildMethods:
             
             self.builder.build_index_from_sources(sources, self.temp_db, file_types)
             
-            # Verify methods were called
-            mock_create_db.assert_called_once()
-            assert mock_model.encode.call_count == 2
+            # Both chunks are encoded in a single batch
+            assert mock_model.encode.call_count == 1
+            conn = sqlite3.connect(self.temp_db)
+            embeddings = [row[0] for row in conn.execute('SELECT embedding FROM chunks')]
+            conn.close()
+            assert embeddings == [np.ones(3, dtype=np.float32).tobytes()] * 2
+            assert not os.path.exists(self.temp_db + '.partial')
+    
+    @patch('signalwire_agents.search.index_builder.preprocess_documents')
+    def test_embed_chunks_batches_by_length(self, mock_preprocess):
+        """Test chunks are encoded in length-sorted batches"""
+        mock_preprocess.side_effect = lambda contents, **kwargs: ({
+            "enhanced_text": content, "keywords": []
+        } for content in contents)
+        builder = IndexBuilder(batch_size=2)
+        builder.model = Mock()
+        builder.model.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[float(len(t))] for t in texts], dtype=np.float32
+        )
+        
+        chunks = [{"content": "x" * n} for n in (5, 1, 4, 2, 3)]
+        builder._embed_chunks(chunks)
+        
+        batches = [call[0][0] for call in builder.model.encode.call_args_list]
+        assert batches == [["x", "xx"], ["xxx", "xxxx"], ["xxxxx"]]
+        # Embeddings are mapped back to their original chunks
+        for chunk in chunks:
+            assert np.frombuffer(chunk['embedding'], dtype=np.float32)[0] == len(chunk['content'])
+    
+    @patch('signalwire_agents.search.index_builder.preprocess_documents')
+    def test_embed_chunks_keeps_pooled_embeddings(self, mock_preprocess):
+        """Test chunks that already have an embedding are not encoded again"""
+        mock_preprocess.side_effect = lambda contents, **kwargs: ({
+            "enhanced_text": content, "keywords": []
+        } for content in contents)
+        builder = IndexBuilder()
+        builder.model = Mock()
+        builder.model.encode.side_effect = RuntimeError("encoding failed")
+        pooled = np.full(4, 0.5, dtype=np.float32).tobytes()
+        
+        chunks = [{"content": "pooled", "embedding": pooled}, {"content": "failed"}]
+        builder._embed_chunks(chunks)
+        
+        encoded = [call[0][0] for call in builder.model.encode.call_args_list]
+        assert encoded == [["failed"], "failed"]
+        assert chunks[0]['embedding'] == pooled
+        # The zero fallback takes its dimension from the pooled embedding
+        assert chunks[1]['embedding'] == np.zeros(4, dtype=np.float32).tobytes()
+    
+    @patch('signalwire_agents.search.index_builder.SentenceTransformer')
+    def test_semantic_chunking_shares_builder_model(self, mock_transformer):
+        """Test semantic chunking uses the builder's model, loaded once"""
+        mock_transformer.return_value.encode.side_effect = lambda texts, **kwargs: np.array(
+            [[1.0, 0.0]] * len(texts), dtype=np.float32
+        )
+        builder = IndexBuilder(chunking_strategy='semantic')
+        
+        with patch('signalwire_agents.search.document_processor.sent_tokenize', None):
+            chunks = builder.doc_processor.create_chunks("One. Two. Three", "doc.txt", "txt")
+        builder._load_model()
+        
+        mock_transformer.assert_called_once_with('sentence-transformers/all-mpnet-base-v2')
+        assert builder.doc_processor.model_name == builder.model_name
+        assert len(chunks) == 1
+        assert np.frombuffer(chunks[0]['embedding'], dtype=np.float32).tolist() == [1.0, 0.0]
+    
+    @patch('signalwire_agents.search.index_builder.preprocess_documents')
+    def test_embed_chunks_batch_error_retries_individually(self, mock_preprocess):
+        """Test a failing batch falls back to per-chunk encoding"""
+        mock_preprocess.side_effect = lambda contents, **kwargs: ({
+            "enhanced_text": content, "keywords": []
+        } for content in contents)
+        builder = IndexBuilder(batch_size=4)
+        builder.model = Mock()
+        
+        def encode(texts, **kwargs):
+            if isinstance(texts, list):
+                raise RuntimeError("batch failed")
+            if texts == "bad":
+                raise RuntimeError("chunk failed")
+            return np.ones(3, dtype=np.float32)
+        
+        builder.model.encode.side_effect = encode
+        chunks = [{"content": "good"}, {"content": "bad"}]
+        builder._embed_chunks(chunks)
+        
+        assert chunks[0]['embedding'] == np.ones(3, dtype=np.float32).tobytes()
+        # Failed chunk gets a zero embedding of the same dimension
+        assert chunks[1]['embedding'] == np.zeros(3, dtype=np.float32).tobytes()
+    
+    def test_preprocess_chunks_in_bulk_per_language(self):
+        """Test chunks are preprocessed in one bulk call per language"""
+        builder = IndexBuilder(nlp_batch_size=16, nlp_processes=2)
+        chunks = [{"content": "one"}, {"content": "dos", "language": "es"}, {"content": "three"}]
+        
+        with patch('signalwire_agents.search.index_builder.preprocess_documents',
+                   side_effect=lambda contents, **kw: ({"enhanced_text": c.upper(), "keywords": [kw['language']]}
+                                                       for c in contents)) as mock_bulk:
+            builder._preprocess_chunks(chunks)
+        
+        assert [call[1]['language'] for call in mock_bulk.call_args_list] == ['en', 'es']
+        assert mock_bulk.call_args[1]['batch_size'] == 16
+        assert mock_bulk.call_args[1]['n_process'] == 2
+        assert [c['processed_content'] for c in chunks] == ["ONE", "DOS", "THREE"]
+        assert [c['keywords'] for c in chunks] == [['en'], ['es'], ['en']]
+    
+    def test_preprocess_chunks_bulk_failure_falls_back(self):
+        """Test a failing bulk call falls back to preprocessing each chunk"""
+        builder = IndexBuilder()
+        chunks = [{"content": "one"}, {"content": "two"}]
+        
+        def failing(contents, **kwargs):
+            yield {"enhanced_text": "ONE", "keywords": []}
+            raise RuntimeError("tagger failed")
+        
+        with patch('signalwire_agents.search.index_builder.preprocess_documents', side_effect=failing), \
+             patch('signalwire_agents.search.index_builder.preprocess_document_content',
+                   side_effect=lambda content, **kw: {"enhanced_text": content, "keywords": []}) as mock_single:
+            builder._preprocess_chunks(chunks)
+        
+        assert [c['processed_content'] for c in chunks] == ["ONE", "two"]
+        mock_single.assert_called_once()
+    
+    def test_workers_default_to_cpu_count(self):
+        """Test workers=0 uses every CPU"""
+        with patch('signalwire_agents.search.index_builder.os.cpu_count', return_value=6):
+            assert IndexBuilder(workers=0).workers == 6
+        assert IndexBuilder().workers == 1
+    
+    @patch('signalwire_agents.search.index_builder.preprocess_documents')
+    def test_parallel_processing_matches_serial(self, mock_preprocess):
+        """Test worker processes produce the same chunks, in the same order, as a serial run"""
+        mock_preprocess.side_effect = lambda contents, **kwargs: ({
+            "enhanced_text": content.upper(), "keywords": []
+        } for content in contents)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files = []
+            for i in range(6):
+                path = Path(temp_dir) / f"doc{i}.txt"
+                path.write_text(f"First paragraph of {i}.\n\nSecond paragraph of {i}.")
+                files.append(path)
+            sources = [Path(temp_dir)]
+            
+            serial_builder = IndexBuilder(chunking_strategy='paragraph')
+            serial = []
+            for path in files:
+                file_chunks, error = serial_builder._process_source_file(path, sources, ['t'], preprocess=True)
+                serial.extend(file_chunks)
+            
+            parallel = []
+            for path, file_chunks, error in IndexBuilder(chunking_strategy='paragraph', workers=3) \
+                    ._iter_processed_files(files, sources, ['t']):
+                parallel.extend(file_chunks)
+        
+        assert len(serial) == 12
+        assert parallel == serial
+        assert parallel[0]['processed_content'] == parallel[0]['content'].upper()
+    
+    def test_process_source_file_isolates_errors(self):
+        """Test a failing file is reported without raising"""
+        with patch.object(self.builder, '_process_file', side_effect=ValueError("bad file")):
+            chunks, error = self.builder._process_source_file(Path("bad.txt"), [Path(".")])
+        
+        assert chunks == []
+        assert error == "bad file"
+    
+    def test_broken_pool_falls_back_to_serial(self):
+        """Test remaining files are processed in-process if the worker pool dies"""
+        from concurrent.futures.process import BrokenProcessPool
+        
+        builder = IndexBuilder(workers=2)
+        files = [Path("a.txt"), Path("b.txt"), Path("c.txt")]
+        
+        def submit(fn, file_path, *args):
+            future = Mock()
+            if file_path.stem == "a":
+                future.result.return_value = ([{"content": "a"}], None)
+            else:
+                future.result.side_effect = BrokenProcessPool("worker died")
+            return future
+        
+        mock_executor = MagicMock()
+        mock_executor.__enter__.return_value.submit.side_effect = submit
+        
+        with patch('signalwire_agents.search.index_builder.ProcessPoolExecutor', return_value=mock_executor), \
+             patch.object(builder, '_process_source_file',
+                          side_effect=lambda path, *args, **kwargs: ([{"content": path.stem}], None)) as mock_process:
+            results = list(builder._iter_processed_files(files, [Path(".")]))
+        
+        assert [path for path, file_chunks, error in results] == files
+        assert [c['content'] for path, file_chunks, error in results for c in file_chunks] == ["a", "b", "c"]
+        assert mock_process.call_count == 2
     
     def test_build_index_from_sources_no_files(self):
         """Test index building with no files found"""
@@ -618,10 +819,10 @@ class TestIndexBuilderBuildMethods:
         with patch.object(self.builder, '_discover_files_from_sources', return_value=mock_files), \
              patch.object(self.builder, '_process_file', return_value=mock_chunks), \
              patch.object(self.builder, '_load_model'), \
-             patch.object(self.builder, '_create_database') as mock_create_db, \
-             patch('signalwire_agents.search.index_builder.preprocess_document_content') as mock_preprocess:
+             patch('signalwire_agents.search.index_builder.preprocess_documents') as mock_preprocess:
             
-            mock_preprocess.return_value = {"enhanced_text": "enhanced", "keywords": []}
+            mock_preprocess.side_effect = lambda contents, **kwargs: (
+                {"enhanced_text": "enhanced", "keywords": []} for content in contents)
             self.builder.model = mock_model
             
             sources = [Path("/home/user/docs")]
@@ -631,7 +832,10 @@ class TestIndexBuilderBuildMethods:
             self.builder.build_index_from_sources(sources, self.temp_db, file_types)
             
             # Database should still be created with fallback embedding
-            mock_create_db.assert_called_once()
+            conn = sqlite3.connect(self.temp_db)
+            embeddings = [row[0] for row in conn.execute('SELECT embedding FROM chunks')]
+            conn.close()
+            assert embeddings == [b"zero_embedding"]
     
     def test_build_index_legacy_method(self):
         """Test legacy build_index method"""
@@ -648,6 +852,269 @@ class TestIndexBuilderBuildMethods:
             mock_build.assert_called_once_with([Path(source_dir)], self.temp_db, file_types, None, None, None)
 
 
+class TestIndexBuilderIncrementalUpdate:
+    """Test incremental index updates"""
+    
+    def setup_method(self):
+        """Set up a source directory and index path"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name) / "docs"
+        self.source.mkdir()
+        self.index_file = str(Path(self.temp_dir.name) / "docs.swsearch")
+        for name in ("a", "b", "c"):
+            (self.source / f"{name}.txt").write_text(f"Content of {name}.\n\nMore about {name}.")
+    
+    def teardown_method(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+    
+    def _build(self, update=False, tags=None, fail=None, **kwargs):
+        """Run a build with preprocessing and embeddings mocked out, failing the named file"""
+        builder = IndexBuilder(chunking_strategy='paragraph', **kwargs)
+        builder.model = Mock()
+        builder.model.encode.side_effect = lambda texts, **kw: np.ones((len(texts), 3), dtype=np.float32)
+        original = builder._process_file
+        
+        def process_file(file_path, *args):
+            if file_path.name == fail:
+                raise OSError("read error")
+            return original(file_path, *args)
+        
+        with patch('signalwire_agents.search.index_builder.preprocess_documents',
+                   side_effect=lambda contents, **kw: ({"enhanced_text": content, "keywords": []} for content in contents)), \
+             patch.object(builder, '_process_file', side_effect=process_file) as mock_process:
+            builder.build_index_from_sources([self.source], self.index_file, ["txt"], tags=tags, update=update)
+        return sorted(Path(call[0][0]).name for call in mock_process.call_args_list)
+    
+    def _chunks_by_file(self):
+        """Get chunk contents grouped by filename"""
+        conn = sqlite3.connect(self.index_file)
+        rows = conn.execute('SELECT filename, content FROM chunks ORDER BY id').fetchall()
+        files = dict(conn.execute('SELECT filename, content_hash FROM files').fetchall())
+        conn.close()
+        chunks = {}
+        for filename, content in rows:
+            chunks.setdefault(filename, []).append(content)
+        return chunks, files
+    
+    def test_full_build_records_files(self):
+        """Test a full build stores a record per source file"""
+        assert self._build() == ["a.txt", "b.txt", "c.txt"]
+        chunks, files = self._chunks_by_file()
+        
+        assert set(files) == {"a.txt", "b.txt", "c.txt"}
+        assert files["a.txt"] == hashlib.sha256((self.source / "a.txt").read_bytes()).hexdigest()
+        assert len(chunks["a.txt"]) == 2
+    
+    def test_failed_file_retried_by_update(self):
+        """Test a file that failed in a full build gets no record and is retried by the next update"""
+        assert self._build(fail="b.txt") == ["a.txt", "b.txt", "c.txt"]
+        chunks, files = self._chunks_by_file()
+        assert set(chunks) == set(files) == {"a.txt", "c.txt"}
+        
+        assert self._build(update=True) == ["b.txt"]
+        chunks, files = self._chunks_by_file()
+        assert set(chunks) == set(files) == {"a.txt", "b.txt", "c.txt"}
+    
+    def test_update_keeps_chunk_tags_in_sync(self):
+        """Test the chunk_tags table follows chunks replaced and removed by an update"""
+        self._build(tags=['docs'])
+        (self.source / "b.txt").write_text("Rewritten b.")
+        (self.source / "c.txt").unlink()
+        self._build(update=True, tags=['docs'])
+        
+        conn = sqlite3.connect(self.index_file)
+        chunk_ids = [row[0] for row in conn.execute('SELECT id FROM chunks ORDER BY id')]
+        tagged = [row[0] for row in conn.execute("SELECT chunk_id FROM chunk_tags WHERE tag = 'docs' ORDER BY chunk_id")]
+        conn.close()
+        assert tagged == chunk_ids
+    
+    def test_update_keeps_fts_in_sync_without_rebuild(self):
+        """Test an update only touches the full-text entries of replaced chunks"""
+        self._build()
+        (self.source / "b.txt").write_text("Rewritten b.")
+        (self.source / "c.txt").unlink()
+        with patch.object(IndexBuilder, '_rebuild_chunk_tags') as mock_rebuild:
+            self._build(update=True)
+        mock_rebuild.assert_not_called()
+
+        conn = sqlite3.connect(self.index_file)
+        rewritten = conn.execute("SELECT id FROM chunks WHERE filename = 'b.txt'").fetchall()
+        assert conn.execute("SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH 'Rewritten'").fetchall() == rewritten
+        assert conn.execute("SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH 'about'").fetchall() == \
+            conn.execute("SELECT id FROM chunks WHERE filename = 'a.txt' AND content LIKE 'More%'").fetchall()
+        conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('integrity-check')")
+        conn.close()
+
+    def test_update_assigns_new_chunks_to_existing_ann_lists(self):
+        """Test an update adds new chunks to the trained IVF lists instead of retraining"""
+        self._build(ann_index='ivf')
+        conn = sqlite3.connect(self.index_file)
+        centroids = conn.execute('SELECT centroid FROM ann_centroids ORDER BY list_id').fetchall()
+        conn.close()
+
+        (self.source / "b.txt").write_text("Rewritten b.")
+        with patch('signalwire_agents.search.index_builder.build_ann_index') as mock_build:
+            self._build(update=True)
+        mock_build.assert_not_called()
+
+        conn = sqlite3.connect(self.index_file)
+        assert conn.execute('SELECT centroid FROM ann_centroids ORDER BY list_id').fetchall() == centroids
+        chunk_ids = conn.execute('SELECT id FROM chunks ORDER BY id').fetchall()
+        assert conn.execute('SELECT chunk_id FROM ann_assignments ORDER BY chunk_id').fetchall() == chunk_ids
+        conn.close()
+
+    def test_update_removes_embedding_sidecar(self):
+        """Test an update drops the embedding sidecar and gives the index a new build id"""
+        self._build()
+        conn = sqlite3.connect(self.index_file)
+        build_id = conn.execute("SELECT value FROM config WHERE key = 'build_id'").fetchone()[0]
+        conn.close()
+        sidecar = [self.index_file + suffix for suffix in ('.ids.npy', '.vectors.npy', '.sidecar.json')]
+        for path in sidecar:
+            Path(path).write_bytes(b'stale')
+        
+        (self.source / "b.txt").write_text("Rewritten b.")
+        self._build(update=True)
+        
+        assert not any(os.path.exists(path) for path in sidecar)
+        conn = sqlite3.connect(self.index_file)
+        assert conn.execute("SELECT value FROM config WHERE key = 'build_id'").fetchone()[0] != build_id
+        conn.close()
+    
+    def test_update_only_processes_changes(self):
+        """Test update re-processes changed and new files and drops removed ones"""
+        self._build()
+        (self.source / "b.txt").write_text("Rewritten b.")
+        (self.source / "c.txt").unlink()
+        (self.source / "d.txt").write_text("Brand new d.")
+        
+        assert self._build(update=True) == ["b.txt", "d.txt"]
+        chunks, files = self._chunks_by_file()
+        
+        assert set(chunks) == {"a.txt", "b.txt", "d.txt"}
+        assert chunks["b.txt"] == ["Rewritten b."]
+        assert len(chunks["a.txt"]) == 2
+        assert set(files) == {"a.txt", "b.txt", "d.txt"}
+    
+    def test_update_skips_touched_but_identical_files(self):
+        """Test a file whose mtime changed but content didn't is not re-processed"""
+        self._build()
+        path = self.source / "a.txt"
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 100))
+        
+        assert self._build(update=True) == []
+        conn = sqlite3.connect(self.index_file)
+        mtime = conn.execute("SELECT mtime FROM files WHERE filename = 'a.txt'").fetchone()[0]
+        conn.close()
+        assert mtime == path.stat().st_mtime
+    
+    def test_update_with_no_changes(self, capsys):
+        """Test update of an up to date index leaves it untouched"""
+        self._build()
+        mtime = os.path.getmtime(self.index_file)
+        
+        assert self._build(update=True) == []
+        assert "Index is up to date" in capsys.readouterr().out
+        assert os.path.getmtime(self.index_file) == mtime
+    
+    def test_update_with_changed_settings_rebuilds(self):
+        """Test update falls back to a full build when build settings differ"""
+        self._build()
+        assert self._build(update=True, chunk_size=99) == ["a.txt", "b.txt", "c.txt"]
+    
+    def test_update_without_index_builds(self):
+        """Test update of a missing index does a full build"""
+        assert self._build(update=True) == ["a.txt", "b.txt", "c.txt"]
+        chunks, files = self._chunks_by_file()
+        assert set(files) == {"a.txt", "b.txt", "c.txt"}
+
+
+class TestIndexBuilderStreaming:
+    """Test streaming index construction"""
+    
+    def setup_method(self):
+        """Set up a source directory and index path"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source = Path(self.temp_dir.name) / "docs"
+        self.source.mkdir()
+        self.index_file = str(Path(self.temp_dir.name) / "docs.swsearch")
+        for name in ("a", "b", "c"):
+            (self.source / f"{name}.txt").write_text(f"Content of {name}.\n\nMore about {name}.")
+    
+    def teardown_method(self):
+        """Clean up test fixtures"""
+        self.temp_dir.cleanup()
+    
+    def _builder(self, **kwargs):
+        """Create a builder with embeddings mocked out"""
+        builder = IndexBuilder(chunking_strategy='paragraph', **kwargs)
+        builder.model = Mock()
+        builder.model.encode.side_effect = lambda texts, **kw: np.ones((len(texts), 3), dtype=np.float32)
+        return builder
+    
+    @patch('signalwire_agents.search.index_builder.preprocess_documents',
+           side_effect=lambda contents, **kw: ({"enhanced_text": content, "keywords": []} for content in contents))
+    def test_chunks_written_in_batches(self, mock_preprocess):
+        """Test chunks are embedded and committed per write batch"""
+        builder = self._builder(write_batch_size=2)
+        with patch.object(builder, '_write_chunks', wraps=builder._write_chunks) as mock_write:
+            builder.build_index_from_sources([self.source], self.index_file, ["txt"])
+        
+        batches = [len(call[0][1]) for call in mock_write.call_args_list]
+        assert batches == [2, 2, 2, 0]
+        assert builder.model.encode.call_count == 3
+        
+        conn = sqlite3.connect(self.index_file)
+        assert conn.execute('SELECT COUNT(*) FROM chunks').fetchone()[0] == 6
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'delete'
+        # Full-text index is populated at the end of the build
+        matches = conn.execute("SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH 'about'").fetchall()
+        assert len(matches) == 3
+        conn.close()
+        assert not os.path.exists(self.index_file + '.partial')
+    
+    @patch('signalwire_agents.search.index_builder.preprocess_documents',
+           side_effect=lambda contents, **kw: ({"enhanced_text": content, "keywords": []} for content in contents))
+    def test_resume_interrupted_build(self, mock_preprocess):
+        """Test an interrupted build resumes from its last checkpoint"""
+        builder = self._builder(write_batch_size=2)
+        original = builder._process_file
+        processed = []
+        
+        def interrupt_on_third(file_path, *args):
+            if len(processed) == 2:
+                raise KeyboardInterrupt()
+            processed.append(file_path.name)
+            return original(file_path, *args)
+        
+        with patch.object(builder, '_process_file', side_effect=interrupt_on_third):
+            with pytest.raises(KeyboardInterrupt):
+                builder.build_index_from_sources([self.source], self.index_file, ["txt"])
+        
+        assert not os.path.exists(self.index_file)
+        assert os.path.exists(self.index_file + '.partial')
+        
+        builder = self._builder(write_batch_size=2)
+        with patch.object(builder, '_process_file', wraps=builder._process_file) as mock_process:
+            builder.build_index_from_sources([self.source], self.index_file, ["txt"], resume=True)
+        
+        remaining = [Path(call[0][0]).name for call in mock_process.call_args_list]
+        assert len(remaining) == 1 and remaining[0] not in processed
+        conn = sqlite3.connect(self.index_file)
+        filenames = [row[0] for row in conn.execute('SELECT filename FROM chunks ORDER BY id')]
+        conn.close()
+        assert filenames == [name for name in processed + remaining for _ in range(2)]
+    
+    def test_empty_build_leaves_no_files(self):
+        """Test a build that produces no chunks doesn't leave a partial index behind"""
+        builder = self._builder()
+        with patch.object(builder, '_process_file', return_value=[]):
+            builder.build_index_from_sources([self.source], self.index_file, ["txt"])
+        
+        assert os.listdir(self.temp_dir.name) == ["docs"]
+
+
 class TestIndexBuilderEdgeCases:
     """Test edge cases and error handling"""
     
@@ -0,0 +1,354 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for the pgvector backend, against an in-process stand-in for
+psycopg2 that records the SQL it is given
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from signalwire_agents.search import pgvector_backend
+from signalwire_agents.search.pgvector_backend import (
+    PgConnectionPool,
+    PgVectorBackend,
+    PgVectorSearchBackend
+)
+
+
+class FakeCursor:
+    """Cursor answering queries from the connection's scripted responses"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        self._rows = []
+        for fragment, rows in self.conn.responses.items():
+            if fragment in sql:
+                self._rows = list(rows)
+                break
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    """Connection recording executed SQL"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.executed = []
+        self.closed = 0
+        self.rollbacks = 0
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeServer:
+    """Stand-in for psycopg2.connect, answering with scripted responses"""
+
+    def __init__(self):
+        self.responses = {}
+        self.opened = []
+
+    def connect(self, dsn):
+        conn = FakeConnection(self.responses)
+        self.opened.append(conn)
+        return conn
+
+
+@pytest.fixture
+def fake_psycopg2():
+    """Patch the backend module to use the psycopg2 stand-in"""
+    server = FakeServer()
+    psycopg2 = Mock()
+    psycopg2.connect.side_effect = server.connect
+    server.register_vector = Mock()
+    with patch.object(pgvector_backend, 'psycopg2', psycopg2), \
+         patch.object(pgvector_backend, 'register_vector', server.register_vector), \
+         patch.object(pgvector_backend, 'PGVECTOR_AVAILABLE', True):
+        yield server
+
+
+def _collection_responses(has_tsvector=True, has_hnsw=False, rows=()):
+    """Scripted responses for a collection's config, table inspection and search"""
+    return {
+        'FROM collection_config': [('docs', 'model', 3, 'sentence', ['en'], None, {})],
+        'information_schema.columns': [(1,)] if has_tsvector else [],
+        'pg_indexes': [(1,)] if has_hnsw else [],
+        'WITH vector_hits': list(rows),
+    }
+
+
+def _search_backend(server, responses, **kwargs):
+    """Create a search backend whose connections answer with the given responses"""
+    server.responses.clear()
+    server.responses.update(responses)
+    server.opened.clear()
+    return PgVectorSearchBackend("postgresql://test", "docs", **kwargs)
+
+
+class TestPgConnectionPool:
+    """Test the thread-safe connection pool"""
+
+    def test_reuses_connections_and_registers_vector_once(self, fake_psycopg2):
+        """Test connections are reused, rolled back on return and registered once"""
+        pool = PgConnectionPool("postgresql://test", max_connections=2)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        assert first is second
+        assert first.rollbacks == 2
+        fake_psycopg2.register_vector.assert_called_once_with(first)
+
+    def test_keeps_concurrent_connections_open(self, fake_psycopg2):
+        """Test connections opened for concurrent queries stay open for reuse"""
+        pool = PgConnectionPool("postgresql://test", max_connections=3)
+
+        with pool.connection() as first, pool.connection() as second, pool.connection() as third:
+            pass
+        for _ in range(5):
+            with pool.connection() as a, pool.connection() as b, pool.connection() as c:
+                assert {a, b, c} == {first, second, third}
+
+        assert len(fake_psycopg2.opened) == 3
+        assert fake_psycopg2.register_vector.call_count == 3
+        assert not any(conn.closed for conn in fake_psycopg2.opened)
+
+    def test_waits_for_a_free_connection(self, fake_psycopg2):
+        """Test a caller waits instead of failing when every connection is in use"""
+        pool = PgConnectionPool("postgresql://test", max_connections=1)
+        borrowed = []
+
+        def borrow():
+            with pool.connection() as conn:
+                borrowed.append(conn)
+
+        with pool.connection() as conn:
+            thread = threading.Thread(target=borrow)
+            thread.start()
+            time.sleep(0.1)
+            assert borrowed == []
+
+        thread.join(timeout=5)
+        assert borrowed == [conn]
+
+    def test_discards_closed_connections(self, fake_psycopg2):
+        """Test a connection that died during use is not handed out again"""
+        pool = PgConnectionPool("postgresql://test", max_connections=1)
+
+        with pytest.raises(RuntimeError):
+            with pool.connection() as conn:
+                conn.closed = 2
+                raise RuntimeError("server closed the connection")
+
+        with pool.connection() as replacement:
+            assert replacement is not conn
+        assert fake_psycopg2.register_vector.call_count == 2
+
+    def test_close(self, fake_psycopg2):
+        """Test closing the pool closes idle connections and ones returned later"""
+        pool = PgConnectionPool("postgresql://test", max_connections=2)
+
+        with pool.connection() as borrowed:
+            with pool.connection() as idle:
+                pass
+            pool.close()
+            assert idle.closed
+            assert not borrowed.closed
+        assert borrowed.closed
+
+    def test_pool_size_from_environment(self, fake_psycopg2):
+        """Test the default pool size can be set in the environment"""
+        with patch.dict('os.environ', {'SIGNALWIRE_SEARCH_PG_POOL_SIZE': '4'}):
+            assert PgConnectionPool("postgresql://test").max_connections == 4
+        with patch.dict('os.environ', {'SIGNALWIRE_SEARCH_PG_POOL_SIZE': 'many'}):
+            assert PgConnectionPool("postgresql://test").max_connections == 10
+
+
+class TestPgVectorBackendSchema:
+    """Test collection schema creation"""
+
+    def _executed(self, responses=None, **kwargs):
+        conn = FakeConnection(responses or {})
+        with patch.object(pgvector_backend, 'psycopg2') as psycopg2, \
+             patch.object(pgvector_backend, 'register_vector'), \
+             patch.object(pgvector_backend, 'PGVECTOR_AVAILABLE', True):
+            psycopg2.connect.return_value = conn
+            self.vector_index = PgVectorBackend("postgresql://test").create_schema("docs", 3, **kwargs)
+        return ' '.join(' '.join(sql.split()) for sql, params in conn.executed)
+
+    def test_stored_tsvector_with_gin_index(self):
+        """Test the schema has a generated tsvector column with a GIN index"""
+        sql = self._executed()
+
+        assert ("ADD COLUMN IF NOT EXISTS content_tsv tsvector GENERATED ALWAYS AS "
+                "(to_tsvector('english', content)) STORED") in sql
+        assert "ON chunks_docs USING gin (content_tsv)" in sql
+        assert "USING ivfflat (embedding vector_cosine_ops)" in sql
+
+    def test_hnsw_index(self):
+        """Test the HNSW option replaces the ivfflat index"""
+        sql = self._executed(vector_index='hnsw', hnsw_m=32, hnsw_ef_construction=128)
+
+        assert "DROP INDEX IF EXISTS idx_chunks_docs_embedding " in sql + " "
+        assert ("USING hnsw (embedding vector_cosine_ops) WITH (m = 32, ef_construction = 128)") in sql
+        assert "USING ivfflat" not in sql
+
+    def test_existing_index_type_kept(self):
+        """Test an existing HNSW collection keeps its index unless another type is requested"""
+        hnsw = {'pg_indexes': [("CREATE INDEX idx_chunks_docs_embedding_hnsw ON public.chunks_docs "
+                                "USING hnsw (embedding vector_cosine_ops)",)]}
+        
+        sql = self._executed(hnsw)
+        assert self.vector_index == 'hnsw'
+        assert "USING ivfflat (embedding" not in sql
+        assert "DROP INDEX IF EXISTS idx_chunks_docs_embedding_hnsw" not in sql
+        
+        sql = self._executed(hnsw, vector_index='ivfflat')
+        assert self.vector_index == 'ivfflat'
+        assert "DROP INDEX IF EXISTS idx_chunks_docs_embedding_hnsw" in sql
+        
+        self._executed()
+        assert self.vector_index == 'ivfflat'
+    
+    def test_invalid_vector_index(self):
+        """Test unknown index types are rejected"""
+        with patch.object(pgvector_backend, 'psycopg2'), \
+             patch.object(pgvector_backend, 'register_vector'), \
+             patch.object(pgvector_backend, 'PGVECTOR_AVAILABLE', True):
+            with pytest.raises(ValueError, match="Invalid vector_index"):
+                PgVectorBackend("postgresql://test").create_schema("docs", 3, vector_index='flat')
+
+
+class TestPgVectorSearchBackend:
+    """Test hybrid search"""
+
+    ROWS = [
+        (7, 'Both', 'a.md', 'intro', ['api'], {'chunk_index': 0}, 0.9, 0.5, 0.78, True),
+        (8, 'Keyword only', 'b.md', None, [], {}, 0, 0.4, 0.12, False),
+        # A vector hit with a negative cosine similarity is still a vector hit
+        (9, 'Dissimilar', 'c.md', None, [], {}, -0.2, 0, -0.12, True),
+    ]
+
+    def _search_sql(self, server):
+        conn = server.opened[0]
+        return [(sql, params) for sql, params in conn.executed
+                if 'WITH vector_hits' in sql or 'SET LOCAL' in sql]
+
+    def test_single_statement_hybrid_search(self, fake_psycopg2):
+        """Test vector and keyword scoring run as one statement over the stored tsvector"""
+        backend = _search_backend(fake_psycopg2, _collection_responses(rows=self.ROWS),
+                                  vector_weight=0.6, keyword_weight=0.4)
+
+        results = backend.search([0.1, 0.2, 0.3], "api keys", count=2, distance_threshold=0.1, tags=['api'])
+
+        statements = self._search_sql(fake_psycopg2)
+        assert len(statements) == 1
+        sql, params = statements[0]
+        assert "content_tsv @@ plainto_tsquery('english', %(text)s)" in sql
+        assert "to_tsvector('english', content)" not in sql
+        assert sql.count("tags ?| %(tags)s") == 2
+        assert "v.id IS NOT NULL AS from_vector" in sql
+        assert params['vector_weight'] == 0.6 and params['keyword_weight'] == 0.4
+        assert params['candidates'] == 4 and params['count'] == 2 and params['threshold'] == 0.1
+
+        assert [r['id'] for r in results] == [7, 8, 9]
+        assert results[0]['score'] == pytest.approx(0.78)
+        assert results[0]['metadata']['tags'] == ['api']
+        assert results[0]['metadata']['chunk_index'] == 0
+        assert results[0]['metadata']['search_scores'] == {'vector': 0.9, 'keyword': 0.5, 'combined': 0.78}
+        assert [r['search_type'] for r in results] == ['vector', 'keyword', 'vector']
+
+    def test_collection_without_tsvector_column(self, fake_psycopg2):
+        """Test older collections compute the tsvector in the query"""
+        backend = _search_backend(fake_psycopg2, _collection_responses(has_tsvector=False))
+
+        backend.search([0.1, 0.2, 0.3], "api", count=1)
+
+        sql, params = self._search_sql(fake_psycopg2)[0]
+        assert "to_tsvector('english', content) @@ plainto_tsquery" in sql
+        assert "tags ?|" not in sql
+
+    def test_hnsw_ef_search(self, fake_psycopg2):
+        """Test ef_search is set per query for HNSW collections, covering the candidates"""
+        backend = _search_backend(fake_psycopg2, _collection_responses(has_hnsw=True), ef_search=100)
+        backend.search([0.1, 0.2, 0.3], "api", count=5)
+        backend.search([0.1, 0.2, 0.3], "api", count=80)
+
+        settings = [params for sql, params in self._search_sql(fake_psycopg2) if 'SET LOCAL' in sql]
+        assert settings == [(100,), (160,)]
+
+        ivfflat = _search_backend(fake_psycopg2, _collection_responses())
+        ivfflat.search([0.1, 0.2, 0.3], "api", count=5)
+        assert not [sql for sql, params in self._search_sql(fake_psycopg2) if 'SET LOCAL' in sql]
+
+    def test_search_engine_passes_options(self, fake_psycopg2):
+        """Test SearchEngine hands the pool, ef_search and weight options to the backend"""
+        from signalwire_agents.search.search_engine import SearchEngine
+
+        with patch.object(pgvector_backend, 'PgConnectionPool') as mock_pool:
+            mock_pool.return_value.connection.return_value.__enter__.return_value = FakeConnection(
+                _collection_responses())
+            engine = SearchEngine(backend='pgvector', connection_string="postgresql://test",
+                                  collection_name="docs", pool_size=3, ef_search=64,
+                                  vector_weight=0.5, keyword_weight=0.5)
+
+        mock_pool.assert_called_once_with("postgresql://test", max_connections=3)
+        assert engine._backend.ef_search == 64
+        assert engine._backend.vector_weight == 0.5
+        assert engine.model_name == 'model'
+
+    def test_index_version_tracks_file_records(self, fake_psycopg2):
+        """Test the collection version follows its file records"""
+        responses = _collection_responses()
+        backend = _search_backend(fake_psycopg2, responses)
+
+        responses['MAX(indexed_at)'] = [(2, '2025-01-01 10:00:00')]
+        fake_psycopg2.responses.update(responses)
+        before = backend.index_version()
+        fake_psycopg2.responses['MAX(indexed_at)'] = [(2, '2025-01-01 10:05:00')]
+
+        assert before == (2, '2025-01-01 10:00:00')
+        assert backend.index_version() != before
+
+        fake_psycopg2.responses['MAX(indexed_at)'] = [(0, None)]
+        assert backend.index_version() is None
+        del fake_psycopg2.responses['MAX(indexed_at)']
+        assert backend.index_version() is None
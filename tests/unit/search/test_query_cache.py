@@ -0,0 +1,183 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for the query and result caches
+"""
+
+import os
+import sqlite3
+import tempfile
+from unittest.mock import Mock, patch
+
+import pytest
+
+from signalwire_agents.search.query_cache import (
+    QueryCache,
+    cached_preprocess_query,
+    get_preprocess_cache,
+    normalize_query,
+    result_cache_key
+)
+from signalwire_agents.search.search_engine import SearchEngine
+
+
+class TestQueryCache:
+    """Test the LRU cache"""
+
+    def test_hit_and_miss_counters(self):
+        """Test lookups are counted"""
+        cache = QueryCache(max_size=10, ttl=0)
+        assert cache.get('a') is None
+        cache.put('a', [1, 2])
+        assert cache.get('a') == [1, 2]
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['size'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the entry used longest ago is dropped first"""
+        cache = QueryCache(max_size=2, ttl=0)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+
+    def test_entries_expire(self):
+        """Test entries older than the TTL are misses"""
+        cache = QueryCache(max_size=10, ttl=5)
+        with patch('signalwire_agents.search.query_cache.time.monotonic', return_value=100.0):
+            cache.put('a', 1)
+        with patch('signalwire_agents.search.query_cache.time.monotonic', return_value=104.0):
+            assert cache.get('a') == 1
+        with patch('signalwire_agents.search.query_cache.time.monotonic', return_value=106.0):
+            assert cache.get('a') is None
+        assert cache.stats()['size'] == 0
+
+    def test_version_mismatch_invalidates(self):
+        """Test an entry stored for another index version is dropped"""
+        cache = QueryCache(max_size=10, ttl=0)
+        cache.put('a', 1, version=(1, 100, 5))
+        assert cache.get('a', version=(1, 200, 6)) is None
+        assert cache.get('a', version=(1, 100, 5)) is None
+
+    def test_values_are_copied(self):
+        """Test callers can't modify cached values"""
+        cache = QueryCache(max_size=10, ttl=0)
+        value = [{'content': 'x'}]
+        cache.put('a', value)
+        value[0]['content'] = 'changed'
+        cache.get('a')[0]['content'] = 'changed again'
+        assert cache.get('a') == [{'content': 'x'}]
+
+    def test_size_zero_disables(self):
+        """Test a cache of size 0 stores nothing"""
+        cache = QueryCache(max_size=0)
+        cache.put('a', 1)
+        assert cache.get('a') is None
+
+    def test_bounds_from_environment(self):
+        """Test size and TTL default to the environment settings"""
+        with patch.dict(os.environ, {'SIGNALWIRE_SEARCH_CACHE_SIZE': '7',
+                                     'SIGNALWIRE_SEARCH_CACHE_TTL': '30'}):
+            cache = QueryCache()
+        assert cache.max_size == 7
+        assert cache.ttl == 30.0
+
+
+class TestCacheKeys:
+    """Test cache key construction"""
+
+    def test_whitespace_is_normalized(self):
+        """Test queries differing only in whitespace share a key"""
+        assert normalize_query('  how do   I\tstart ') == 'how do I start'
+        assert result_cache_key('docs', 'a  b', 3) == result_cache_key('docs', ' a b', 3)
+
+    def test_search_parameters_are_part_of_key(self):
+        """Test count, tags and threshold distinguish keys"""
+        base = result_cache_key('docs', 'query', 3, ['a'], 0.2)
+        assert base != result_cache_key('docs', 'query', 5, ['a'], 0.2)
+        assert base != result_cache_key('docs', 'query', 3, ['b'], 0.2)
+        assert base != result_cache_key('docs', 'query', 3, ['a'], 0.5)
+        assert base != result_cache_key('other', 'query', 3, ['a'], 0.2)
+
+
+class TestCachedPreprocessQuery:
+    """Test preprocessing through the cache"""
+
+    def setup_method(self):
+        get_preprocess_cache().clear()
+
+    def test_repeated_query_preprocessed_once(self):
+        """Test the same query is only preprocessed once"""
+        enhanced = {'enhanced_text': 'start agent', 'vector': [0.1, 0.2], 'language': 'en'}
+        with patch('signalwire_agents.search.query_cache.preprocess_query',
+                   return_value=enhanced) as mock_preprocess:
+            first = cached_preprocess_query('start agent', model_name='model-a')
+            second = cached_preprocess_query('start  agent', model_name='model-a')
+
+        assert first == second == enhanced
+        mock_preprocess.assert_called_once()
+
+    def test_model_is_part_of_key(self):
+        """Test queries for different embedding models are preprocessed separately"""
+        with patch('signalwire_agents.search.query_cache.preprocess_query',
+                   return_value={'enhanced_text': 'q', 'vector': []}) as mock_preprocess:
+            cached_preprocess_query('q', model_name='model-a')
+            cached_preprocess_query('q', model_name='model-b')
+        assert mock_preprocess.call_count == 2
+
+    def test_failed_encoding_not_cached(self):
+        """Test a query that couldn't be encoded is preprocessed again next time"""
+        with patch('signalwire_agents.search.query_cache.preprocess_query',
+                   side_effect=lambda *args, **kwargs: {'enhanced_text': 'q', 'vector': None}) as mock_preprocess:
+            cached_preprocess_query('q', model_name='model-a')
+            cached_preprocess_query('q', model_name='model-a')
+        assert mock_preprocess.call_count == 2
+
+        encode = Mock(side_effect=ImportError)
+        with patch('signalwire_agents.search.query_cache.preprocess_query',
+                   side_effect=lambda *args, **kwargs: {'enhanced_text': 'q'}):
+            assert cached_preprocess_query('q', model_name='model-a', encode=encode)['vector'] is None
+            cached_preprocess_query('q', model_name='model-a', encode=encode)
+        assert encode.call_count == 2
+
+
+class TestIndexVersion:
+    """Test SearchEngine.index_version"""
+
+    def test_version_changes_when_index_rewritten(self):
+        """Test rewriting the index file changes its version"""
+        tmp_file = tempfile.NamedTemporaryFile(suffix='.swsearch', delete=False)
+        tmp_file.close()
+        try:
+            conn = sqlite3.connect(tmp_file.name)
+            conn.execute('CREATE TABLE config (key TEXT PRIMARY KEY, value TEXT)')
+            conn.commit()
+            engine = SearchEngine(backend='sqlite', index_path=tmp_file.name)
+            before = engine.index_version()
+
+            conn.execute("INSERT INTO config VALUES ('embedding_dimensions', '768')")
+            conn.commit()
+            conn.close()
+            os.utime(tmp_file.name, ns=(0, 0))
+
+            assert before is not None
+            assert engine.index_version() != before
+            engine.close()
+        finally:
+            os.unlink(tmp_file.name)
@@ -24,10 +24,22 @@ from signalwire_agents.search.query_processor import (
     get_synonyms,
     remove_duplicate_words,
     preprocess_query,
-    preprocess_document_content
+    preprocess_document_content,
+    preprocess_documents,
+    QueryPipeline,
+    get_query_pipeline,
+    clear_query_pipelines
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_pipelines():
+    """Create pipelines under each test's patches"""
+    clear_query_pipelines()
+    yield
+    clear_query_pipelines()
+
+
 class TestLanguageDetection:
     """Test language detection functionality"""
     
@@ -135,39 +147,34 @@ class TestSpacyModelLoading:
 class TestQueryVectorization:
     """Test query vectorization functionality"""
     
-    def test_vectorize_query_success(self):
+    @patch('signalwire_agents.search.query_processor.get_embedding_model')
+    def test_vectorize_query_success(self, mock_get_model):
         """Test successful query vectorization"""
-        with patch('builtins.__import__') as mock_import:
-            mock_transformers = Mock()
-            mock_model = Mock()
-            mock_embedding = [0.1, 0.2, 0.3]
-            mock_model.encode.return_value = mock_embedding
-            mock_transformers.SentenceTransformer.return_value = mock_model
-            
-            def import_side_effect(name, *args, **kwargs):
-                if name == 'sentence_transformers':
-                    return mock_transformers
-                elif name == 'numpy':
-                    return Mock()
-                else:
-                    return Mock()
-            
-            mock_import.side_effect = import_side_effect
-            
-            result = vectorize_query("test query")
-            
-            mock_transformers.SentenceTransformer.assert_called_once_with('sentence-transformers/all-mpnet-base-v2')
-            mock_model.encode.assert_called_once_with("test query", show_progress_bar=False)
-            assert result == mock_embedding
+        mock_model = Mock()
+        mock_embedding = [0.1, 0.2, 0.3]
+        mock_model.encode.return_value = mock_embedding
+        mock_get_model.return_value = mock_model
+        
+        result = vectorize_query("test query")
+        
+        mock_get_model.assert_called_once_with(None)
+        mock_model.encode.assert_called_once_with("test query", show_progress_bar=False)
+        assert result == mock_embedding
+    
+    @patch('signalwire_agents.search.query_processor.get_embedding_model')
+    def test_vectorize_query_with_model_name(self, mock_get_model):
+        """Test query vectorization uses the requested model"""
+        vectorize_query("test query", model_name='custom/model')
+        mock_get_model.assert_called_once_with('custom/model')
     
-    def test_vectorize_query_import_error(self):
+    @patch('signalwire_agents.search.query_processor.get_embedding_model', side_effect=ImportError())
+    def test_vectorize_query_import_error(self, mock_get_model):
         """Test query vectorization when sentence-transformers not available"""
-        with patch('builtins.__import__', side_effect=ImportError()):
-            with patch('signalwire_agents.search.query_processor.logger') as mock_logger:
-                result = vectorize_query("test query")
-                
-                assert result is None
-                mock_logger.error.assert_called_once()
+        with patch('signalwire_agents.search.query_processor.logger') as mock_logger:
+            result = vectorize_query("test query")
+            
+            assert result is None
+            mock_logger.error.assert_called_once()
 
 
 class TestNLTKResources:
@@ -355,7 +362,7 @@ class TestQueryPreprocessing:
         
         assert 'vector' in result
         assert result['vector'] == [0.1, 0.2, 0.3]
-        mock_vectorize.assert_called_once_with("test query")
+        mock_vectorize.assert_called_once_with("test query", None)
     
     def test_preprocess_query_auto_language_detection(self):
         """Test query preprocessing with automatic language detection"""
@@ -408,6 +415,54 @@ class TestQueryPreprocessing:
         assert 'glad' in enhanced_text
 
 
+class TestQueryPipeline:
+    """Test the shared preprocessing pipelines"""
+    
+    def test_pipeline_shared_per_language_and_backend(self):
+        """Test one pipeline is created per (language, backend)"""
+        with patch('signalwire_agents.search.query_processor._load_stopwords', return_value={'the'}) as mock_stopwords:
+            pipeline = get_query_pipeline('en', 'nltk')
+            
+            assert get_query_pipeline('en', 'nltk') is pipeline
+            assert get_query_pipeline('es', 'nltk') is not pipeline
+            assert mock_stopwords.call_count == 2
+            
+            clear_query_pipelines()
+            assert get_query_pipeline('en', 'nltk') is not pipeline
+    
+    @patch('signalwire_agents.search.query_processor.load_spacy_model')
+    def test_spacy_model_loaded_once(self, mock_load_spacy):
+        """Test the spaCy model is loaded once per pipeline, not per query"""
+        mock_load_spacy.return_value = None
+        
+        for query in ("first query", "second query", "third query"):
+            preprocess_query(query, query_nlp_backend='spacy')
+        
+        mock_load_spacy.assert_called_once_with('en')
+    
+    @patch('signalwire_agents.search.query_processor.get_synonyms')
+    def test_synonyms_memoized(self, mock_get_synonyms):
+        """Test synonym lookups are memoized"""
+        mock_get_synonyms.return_value = ['happy', 'joyful']
+        pipeline = QueryPipeline('en', 'nltk')
+        
+        assert pipeline.synonyms('glad', 'NOUN', 5) == ('happy', 'joyful')
+        assert pipeline.synonyms('glad', 'NOUN', 5) == ('happy', 'joyful')
+        
+        mock_get_synonyms.assert_called_once_with('glad', 'NOUN', 5)
+        assert pipeline.cache_info()['synonyms']['hits'] == 1
+    
+    def test_lookup_caches_bounded(self):
+        """Test the lookup caches are bounded"""
+        pipeline = QueryPipeline('en', 'nltk', cache_size=2)
+        
+        for word in ("running", "jumped", "walking"):
+            pipeline.stem(word)
+        
+        assert pipeline.cache_info()['stem']['currsize'] == 2
+        assert pipeline.stem("running") == "run"
+
+
 class TestDocumentPreprocessing:
     """Test document content preprocessing"""
     
@@ -464,6 +519,54 @@ class TestDocumentPreprocessing:
         assert 'keywords' in result
 
 
+class TestBulkDocumentPreprocessing:
+    """Test batched document preprocessing"""
+    
+    def test_matches_single_document_preprocessing(self):
+        """Test bulk results equal preprocess_document_content's, in order"""
+        contents = ["Configure call forwarding", "Billing options for calls", "", "Reset the password"]
+        
+        bulk = list(preprocess_documents(contents, batch_size=3))
+        
+        assert bulk == [preprocess_document_content(content) for content in contents]
+    
+    @patch('signalwire_agents.search.query_processor.nltk.pos_tag_sents')
+    def test_nltk_tags_each_batch_once(self, mock_tag_sents):
+        """Test the NLTK path tags a batch of documents in one call"""
+        mock_tag_sents.side_effect = lambda sents: [[(token, 'NN') for token in sent] for sent in sents]
+        
+        results = list(preprocess_documents(["alpha beta", "gamma", "delta"], batch_size=2))
+        
+        assert mock_tag_sents.call_count == 2
+        assert [r['pos_analysis'] for r in results] == [
+            {'alpha': 'NN', 'beta': 'NN'}, {'gamma': 'NN'}, {'delta': 'NN'}
+        ]
+    
+    @patch('signalwire_agents.search.query_processor.load_spacy_model')
+    def test_spacy_uses_nlp_pipe(self, mock_load_spacy):
+        """Test the spaCy path streams documents through nlp.pipe with unused components disabled"""
+        def make_doc(text):
+            tokens = []
+            for word in text.split():
+                token = Mock(text=word, lemma_=word, pos_='NOUN')
+                tokens.append(token)
+            return tokens
+        
+        mock_nlp = Mock()
+        mock_nlp.pipe_names = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner']
+        mock_nlp.pipe.side_effect = lambda texts, **kwargs: (make_doc(text) for text in texts)
+        mock_load_spacy.return_value = mock_nlp
+        
+        results = list(preprocess_documents(["alpha beta", "gamma"], index_nlp_backend='spacy',
+                                            batch_size=8, n_process=2))
+        
+        mock_nlp.pipe.assert_called_once()
+        kwargs = mock_nlp.pipe.call_args[1]
+        assert kwargs == {'batch_size': 8, 'n_process': 2, 'disable': ['parser', 'ner']}
+        mock_nlp.assert_not_called()  # No per-document calls
+        assert [r['pos_analysis'] for r in results] == [{'alpha': 'NOUN', 'beta': 'NOUN'}, {'gamma': 'NOUN'}]
+
+
 class TestErrorHandling:
     """Test error handling in query processor"""
     
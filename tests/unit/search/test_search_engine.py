@@ -16,10 +16,11 @@ import sqlite3
 import json
 import tempfile
 import os
+import shutil
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
-from signalwire_agents.search.search_engine import SearchEngine
+from signalwire_agents.search.search_engine import SearchEngine, remove_embedding_sidecar
 
 
 class TestSearchEngineInit:
@@ -133,52 +134,117 @@ class TestSearchEngineVectorSearch:
         """Clean up test database"""
         os.unlink(self.db_path)
     
-    @patch('signalwire_agents.search.search_engine.np')
-    @patch('signalwire_agents.search.search_engine.cosine_similarity')
-    def test_vector_search_success(self, mock_cosine_sim, mock_np):
+    def test_vector_search_success(self):
         """Test successful vector search"""
-        # Mock numpy and cosine similarity
-        query_array = Mock()
-        query_array.reshape.return_value = [[0.1, 0.2, 0.3]]
-        mock_np.array.return_value = query_array
-        
-        # Mock frombuffer to return proper arrays
-        embedding1 = Mock()
-        embedding1.reshape.return_value = [[0.1, 0.2, 0.3]]
-        embedding2 = Mock()
-        embedding2.reshape.return_value = [[0.4, 0.5, 0.6]]
-        
-        mock_np.frombuffer.side_effect = [embedding1, embedding2]
-        mock_cosine_sim.side_effect = [
-            [[0.95]],  # High similarity for first chunk
-            [[0.75]]   # Lower similarity for second chunk
-        ]
-        
-        engine = SearchEngine(self.db_path)
-        results = engine._vector_search([[0.1, 0.2, 0.3]], count=2)
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        results = engine._vector_search([0.1, 0.2, 0.3], count=2)
         
         assert len(results) == 2
-        assert results[0]['score'] == 0.95
+        assert results[0]['score'] == pytest.approx(1.0)
         assert results[0]['content'] == 'Test content 1'
         assert results[0]['search_type'] == 'vector'
-        assert results[1]['score'] == 0.75
+        assert results[0]['metadata']['tags'] == ['tag1']
+        assert results[1]['score'] == pytest.approx(0.9746, abs=1e-4)
         assert results[1]['content'] == 'Test content 2'
     
+    def test_vector_search_top_k(self):
+        """Test only the requested number of best matches is returned"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        results = engine._vector_search([0.4, 0.5, 0.6], count=1)
+        
+        assert len(results) == 1
+        assert results[0]['content'] == 'Test content 2'
+    
+    def test_vector_search_loads_embeddings_once(self):
+        """Test the embedding matrix is cached between queries"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        with patch.object(engine, '_read_embeddings', wraps=engine._read_embeddings) as mock_read:
+            engine._vector_search([0.1, 0.2, 0.3], count=2)
+            engine._vector_search([0.4, 0.5, 0.6], count=2)
+        
+        mock_read.assert_called_once()
+        ids, matrix = engine._load_embeddings()
+        assert matrix.dtype.name == 'float32'
+        assert matrix.flags['C_CONTIGUOUS']
+        assert list(ids) == [1, 2]
+    
+    def test_vector_search_dimension_mismatch(self):
+        """Test query vectors of the wrong dimension return no results"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        assert engine._vector_search([0.1, 0.2], count=2) == []
+    
+    def test_vector_search_mmap_sidecar(self):
+        """Test embeddings are memory-mapped from a sidecar file"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path, use_mmap=True)
+        results = engine._vector_search([0.1, 0.2, 0.3], count=2)
+        ids_path, vectors_path, identity_path = engine._embedding_sidecar_paths()
+        
+        try:
+            assert os.path.exists(ids_path)
+            assert os.path.exists(vectors_path)
+            assert results[0]['content'] == 'Test content 1'
+            
+            # A second engine reuses the sidecar instead of reading the database
+            other = SearchEngine(backend='sqlite', index_path=self.db_path, use_mmap=True)
+            with patch.object(other, '_read_embeddings') as mock_read:
+                other_results = other._vector_search([0.1, 0.2, 0.3], count=2)
+            mock_read.assert_not_called()
+            assert [r['id'] for r in other_results] == [r['id'] for r in results]
+        finally:
+            remove_embedding_sidecar(self.db_path)
+    
+    def test_sidecar_of_other_index_file_ignored(self):
+        """Test a sidecar isn't used for an index restored with its original mtime"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path, use_mmap=True)
+        engine._vector_search([0.1, 0.2, 0.3], count=2)
+        
+        try:
+            # Restore a copy of the index with preserved timestamps, like cp -p
+            copy_path = self.db_path + '.copy'
+            shutil.copy2(self.db_path, copy_path)
+            os.replace(copy_path, self.db_path)
+            
+            other = SearchEngine(backend='sqlite', index_path=self.db_path, use_mmap=True)
+            with patch.object(other, '_read_embeddings', wraps=other._read_embeddings) as mock_read:
+                other._vector_search([0.1, 0.2, 0.3], count=2)
+            mock_read.assert_called_once()
+        finally:
+            remove_embedding_sidecar(self.db_path)
+    
+    def test_queries_reuse_pooled_connection(self):
+        """Test repeated queries share one read-only connection"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        conn = engine._pool.connection()
+        
+        engine._vector_search([1.0, 0.0, 0.0], count=2)
+        engine._fetch_chunks([1, 2, 3])
+        engine.get_stats()
+        
+        assert engine._pool.connection() is conn
+        assert len(engine._pool) == 1
+        engine.close()
+        assert len(engine._pool) == 0
+    
+    def test_fetch_chunks_any_count(self):
+        """Test chunk lookups return exactly the requested ids that exist"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        assert set(engine._fetch_chunks([2])) == {2}
+        assert set(engine._fetch_chunks([1, 2, 3])) == {1, 2}
+        assert engine._fetch_chunks([]) == {}
+    
     @patch('signalwire_agents.search.search_engine.np', None)
-    @patch('signalwire_agents.search.search_engine.cosine_similarity', None)
     def test_vector_search_no_numpy(self):
         """Test vector search when numpy is not available"""
-        engine = SearchEngine(self.db_path)
-        results = engine._vector_search([[0.1, 0.2, 0.3]], count=2)
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        results = engine._vector_search([0.1, 0.2, 0.3], count=2)
         
         assert results == []
     
-    @patch('signalwire_agents.search.search_engine.np')
-    @patch('signalwire_agents.search.search_engine.cosine_similarity')
-    def test_vector_search_database_error(self, mock_cosine_sim, mock_np):
+    def test_vector_search_database_error(self):
         """Test vector search with database error"""
-        engine = SearchEngine('/nonexistent/path.db')
-        results = engine._vector_search([[0.1, 0.2, 0.3]], count=2)
+        engine = SearchEngine(backend='sqlite', index_path='/nonexistent/path.db')
+        results = engine._vector_search([0.1, 0.2, 0.3], count=2)
         
         assert results == []
 
@@ -584,4 +650,157 @@ class TestSearchEngineEdgeCases:
         
         engine._keyword_search.assert_called_once_with('test', 2)
         engine._filter_by_tags.assert_called_once()
-        assert len(results) == 1 
\ No newline at end of file
+        assert len(results) == 1 
+
+class TestSearchEngineTagPrefilter:
+    """Test tag-restricted searches on indexes with a chunk_tags table"""
+    
+    def setup_method(self):
+        """Build an index where one tenant's chunks outnumber and outscore another's"""
+        import numpy as np
+        from signalwire_agents.search.index_builder import IndexBuilder
+        
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, 'tenants.swsearch')
+        
+        chunks = []
+        for i in range(20):
+            chunks.append({
+                'content': f'Billing guide {i}', 'processed_content': f'billing guide {i}',
+                'filename': 'a.md', 'section': str(i), 'tags': ['tenant-a'],
+                'embedding': np.array([1.0, 0.01 * i, 0.0], dtype=np.float32).tobytes()
+            })
+        for i in range(2):
+            chunks.append({
+                'content': f'Billing notes {i}', 'processed_content': f'billing notes {i}',
+                'filename': 'b.md', 'section': str(i), 'tags': ['tenant-b', 'shared'],
+                'embedding': np.array([0.5, 1.0, float(i)], dtype=np.float32).tobytes()
+            })
+        
+        self.builder = IndexBuilder()
+        self.builder._create_database(self.db_path, chunks, ['en'], [], ['md'])
+    
+    def teardown_method(self):
+        """Clean up the index"""
+        self.tmp_dir.cleanup()
+    
+    def test_index_has_normalized_tags(self):
+        """Test the builder writes one chunk_tags row per chunk and tag"""
+        conn = sqlite3.connect(self.db_path)
+        counts = dict(conn.execute('SELECT tag, COUNT(*) FROM chunk_tags GROUP BY tag'))
+        conn.close()
+        
+        assert counts == {'tenant-a': 20, 'tenant-b': 2, 'shared': 2}
+    
+    def test_search_returns_requested_count_for_rare_tag(self):
+        """Test a rare tag still fills the result count"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        results = engine.search([1.0, 0.0, 0.0], 'billing', count=2, tags=['tenant-b'])
+        
+        assert len(results) == 2
+        assert all(r['metadata']['tags'] == ['tenant-b', 'shared'] for r in results)
+        assert all(r['metadata']['search_scores']['vector'] > 0 for r in results)
+        assert all(r['metadata']['search_scores']['keyword'] > 0 for r in results)
+    
+    def test_search_matches_any_tag(self):
+        """Test chunks with any of the requested tags are searched"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        results = engine.search([1.0, 0.0, 0.0], 'billing', count=30, tags=['shared', 'tenant-a'])
+        
+        assert len(results) == 22
+        assert engine.search([1.0, 0.0, 0.0], 'billing', count=5, tags=['missing']) == []
+    
+    def test_tag_rows_are_cached(self):
+        """Test tag lookups hit the database once per tag combination"""
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        rows = engine._tag_rows(['shared', 'tenant-b'])
+        with patch.object(engine._pool, 'connection', side_effect=AssertionError("not cached")):
+            assert engine._tag_rows(['tenant-b', 'shared']) is rows
+        assert list(rows) == [20, 21]
+    
+    def test_prefilter_with_ann_index(self):
+        """Test tag filtering also applies to approximate nearest neighbour search"""
+        from signalwire_agents.search.ann_index import build_ann_index
+        
+        conn = sqlite3.connect(self.db_path)
+        build_ann_index(conn, 'ivf', nlist=2, nprobe=1)
+        conn.commit()
+        conn.close()
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        results = engine._vector_search([1.0, 0.0, 0.0], count=5, tags=['tenant-b'])
+        
+        assert engine._load_ann_index() is not None
+        assert [r['content'] for r in results] == ['Billing notes 0', 'Billing notes 1']
+    
+    def test_prefilter_with_tagged_chunks_outside_probed_lists(self):
+        """Test a tag search fills the results when the probed IVF lists hold no tagged chunks"""
+        import numpy as np
+        from signalwire_agents.search.ann_index import build_ann_index
+        
+        chunks = [{
+            'content': f'Tenant {tenant} doc {i}', 'processed_content': f'doc {i}',
+            'filename': f'{tenant}.md', 'section': str(i), 'tags': [f'tenant-{tenant}'],
+            'embedding': np.array(vector, dtype=np.float32).tobytes()
+        } for tenant, vector, n in (('a', [1.0, 0.0, 0.0], 5), ('b', [0.0, 1.0, 0.0], 10)) for i in range(n)]
+        self.builder._remove_database(self.db_path)
+        self.builder._create_database(self.db_path, chunks, ['en'], [], ['md'])
+        conn = sqlite3.connect(self.db_path)
+        build_ann_index(conn, 'ivf', nlist=2, nprobe=1)
+        conn.commit()
+        conn.close()
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        candidates = engine._load_ann_index().candidates(query, 1)
+        assert len(engine._tag_rows(['tenant-b'])) > len(candidates)
+        
+        results = engine._vector_search(query, count=3, tags=['tenant-b'])
+        
+        assert len(results) == 3
+        assert all(r['metadata']['tags'] == ['tenant-b'] for r in results)
+    
+    def test_index_without_chunk_tags_filters_after_ranking(self):
+        """Test older indexes fall back to filtering the ranked results"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('DROP TABLE chunk_tags')
+        conn.commit()
+        conn.close()
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        
+        results = engine.search([1.0, 0.0, 0.0], 'billing', count=2, tags=['tenant-b'])
+        
+        # The top candidates all belong to the other tenant
+        assert results == []
+    
+    def test_rebuilt_index_is_reloaded(self):
+        """Test a live engine picks up a rebuilt index instead of scoring the old chunk ids"""
+        import numpy as np
+        from signalwire_agents.search.ann_index import build_ann_index
+        
+        engine = SearchEngine(backend='sqlite', index_path=self.db_path)
+        assert len(engine.search([1.0, 0.0, 0.0], 'billing', count=3, tags=['tenant-b'])) == 2
+        assert engine._load_ann_index() is None
+        
+        chunks = [{
+            'content': f'Refund policy {i}', 'processed_content': f'refund policy {i}',
+            'filename': 'c.md', 'section': str(i), 'tags': ['tenant-c'] if i else ['tenant-b'],
+            'embedding': np.array([0.0, 0.0, 1.0 + i], dtype=np.float32).tobytes()
+        } for i in range(3)]
+        self.builder._remove_database(self.db_path)
+        self.builder._create_database(self.db_path, chunks, ['en'], [], ['md'])
+        conn = sqlite3.connect(self.db_path)
+        build_ann_index(conn, 'ivf', nlist=1, nprobe=1)
+        conn.commit()
+        conn.close()
+        
+        results = engine.search([0.0, 0.0, 1.0], 'refund', count=5)
+        
+        assert sorted(r['content'] for r in results) == ['Refund policy 0', 'Refund policy 1', 'Refund policy 2']
+        assert [r['content'] for r in engine.search([0.0, 0.0, 1.0], 'refund', count=5, tags=['tenant-b'])] == [
+            'Refund policy 0']
+        assert engine.config.get('ann_index') == 'ivf'
+        assert engine._load_ann_index() is not None
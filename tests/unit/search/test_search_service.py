@@ -0,0 +1,232 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for search service request handling
+"""
+
+import time
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+
+from signalwire_agents.search.embedding_models import EmbeddingBatcher
+from signalwire_agents.search.query_cache import get_result_cache
+from signalwire_agents.search.search_service import SearchService, SearchRequest
+
+
+class _RecordingModel:
+    """Model stub recording the size of each encode call"""
+
+    def __init__(self, first_call_gate=None):
+        self.batch_sizes = []
+        self.first_call_gate = first_call_gate
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False):
+        if self.first_call_gate is not None and not self.batch_sizes:
+            self.first_call_gate.wait(5)
+        self.batch_sizes.append(len(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+class TestEmbeddingBatcher:
+    """Test batching of concurrent encodes"""
+
+    def test_single_encode(self):
+        """Test a lone text is encoded right away"""
+        model = _RecordingModel()
+        registry = Mock(get_model=Mock(return_value=model))
+        batcher = EmbeddingBatcher('model', registry=registry)
+
+        embedding = batcher.encode('hello', timeout=2)
+        assert embedding.tolist() == [5.0, 1.0]
+        assert model.batch_sizes == [1]
+
+    def test_concurrent_encodes_are_batched(self):
+        """Test texts queued while a batch is encoding share the next model call"""
+        gate = threading.Event()
+        model = _RecordingModel(first_call_gate=gate)
+        registry = Mock(get_model=Mock(return_value=model))
+        batcher = EmbeddingBatcher('model', registry=registry)
+        results = {}
+
+        def encode(text):
+            results[text] = batcher.encode(text, timeout=5).tolist()
+
+        def wait_for(condition):
+            deadline = time.monotonic() + 5
+            while not condition() and time.monotonic() < deadline:
+                time.sleep(0.001)
+
+        first = threading.Thread(target=encode, args=('a',))
+        first.start()
+        # The first text is being encoded (and held there) before the others arrive
+        wait_for(lambda: batcher._queue.qsize() == 0 and batcher._thread is not None)
+        time.sleep(0.05)
+        others = [threading.Thread(target=encode, args=('b' * n,)) for n in range(2, 6)]
+        for thread in others:
+            thread.start()
+        wait_for(lambda: batcher._queue.qsize() == 4)
+        gate.set()
+        for thread in [first] + others:
+            thread.join(5)
+
+        assert model.batch_sizes == [1, 4]
+        assert results['bbbb'] == [4.0, 1.0]
+
+    def test_errors_reach_every_caller(self):
+        """Test a failed model call raises in the waiting caller"""
+        registry = Mock(get_model=Mock(side_effect=ImportError("no model")))
+        batcher = EmbeddingBatcher('model', registry=registry)
+        with pytest.raises(ImportError):
+            batcher.encode('hello', timeout=2)
+
+
+class TestSearchServiceRequests:
+    """Test searches run off the event loop with limits"""
+
+    def setup_method(self):
+        get_result_cache().clear()
+
+    def _service(self, search_delay, **kwargs):
+        service = SearchService(indexes={}, batch_encode=False, **kwargs)
+        engine = Mock()
+        engine.model_name = 'model'
+
+        def search(**search_kwargs):
+            time.sleep(search_delay)
+            return [{'content': 'text', 'score': 0.9, 'metadata': {'filename': 'doc.md'}}]
+
+        engine.search.side_effect = search
+        service.search_engines['docs'] = engine
+        return service
+
+    def _run(self, *coroutines):
+        async def gather():
+            return await asyncio.gather(*coroutines, return_exceptions=True)
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(gather())
+        finally:
+            loop.close()
+
+    @patch('signalwire_agents.search.search_service.cached_preprocess_query',
+           return_value={'enhanced_text': 'q', 'vector': [0.1], 'language': 'en'})
+    def test_searches_run_concurrently(self, mock_preprocess):
+        """Test a slow search doesn't hold up other requests"""
+        service = self._service(search_delay=0.2, max_workers=4)
+        start = time.monotonic()
+        responses = self._run(*[
+            service._handle_search(SearchRequest(query=f"query {i}", index_name='docs'))
+            for i in range(4)
+        ])
+        elapsed = time.monotonic() - start
+        service.stop()
+
+        assert all(len(response.results) == 1 for response in responses)
+        assert elapsed < 0.6
+
+    @patch('signalwire_agents.search.search_service.cached_preprocess_query',
+           return_value={'enhanced_text': 'q', 'vector': [0.1], 'language': 'en'})
+    def test_concurrency_limit(self, mock_preprocess):
+        """Test requests beyond the limit wait for a slot"""
+        service = self._service(search_delay=0.1, max_workers=4, max_concurrent_requests=1)
+        start = time.monotonic()
+        self._run(*[
+            service._handle_search(SearchRequest(query=f"query {i}", index_name='docs'))
+            for i in range(3)
+        ])
+        elapsed = time.monotonic() - start
+        service.stop()
+
+        assert elapsed >= 0.3
+
+    @patch('signalwire_agents.search.search_service.cached_preprocess_query',
+           return_value={'enhanced_text': 'q', 'vector': [0.1], 'language': 'en'})
+    def test_timeout(self, mock_preprocess):
+        """Test a search exceeding the timeout fails with 504"""
+        service = self._service(search_delay=0.5, request_timeout=0.05)
+        response, = self._run(service._handle_search(SearchRequest(query="slow", index_name='docs')))
+        service.stop()
+
+        assert isinstance(response, HTTPException)
+        assert response.status_code == 504
+
+    @patch('signalwire_agents.search.search_service.cached_preprocess_query',
+           return_value={'enhanced_text': 'q', 'vector': [0.1], 'language': 'en'})
+    def test_timed_out_search_keeps_its_slot(self, mock_preprocess):
+        """Test a timed out search holds its request slot until its thread finishes"""
+        service = self._service(search_delay=0.3, max_workers=4, max_concurrent_requests=1,
+                                request_timeout=0.05)
+
+        async def requests():
+            first = await asyncio.gather(
+                service._handle_search(SearchRequest(query="slow", index_name='docs')),
+                return_exceptions=True)
+            # The first search still runs, so this one can't start before timing out
+            second = await asyncio.gather(
+                service._handle_search(SearchRequest(query="next", index_name='docs')),
+                return_exceptions=True)
+            await asyncio.sleep(0.4)
+            return first + second
+
+        first, second = self._run(requests())[0]
+        service.stop()
+
+        assert first.status_code == second.status_code == 504
+        assert service.search_engines['docs'].search.call_count == 1
+
+    @patch('signalwire_agents.search.search_service.cached_preprocess_query',
+           return_value={'enhanced_text': 'q', 'vector': None, 'language': 'en'})
+    def test_keyword_only_results_not_cached(self, mock_preprocess):
+        """Test results for a query that couldn't be encoded aren't cached"""
+        service = self._service(search_delay=0)
+        self._run(*[
+            service._handle_search(SearchRequest(query="query", index_name='docs'))
+            for _ in range(2)
+        ])
+        service.stop()
+
+        assert service.search_engines['docs'].search.call_count == 2
+
+    @patch('signalwire_agents.search.search_service.cached_preprocess_query',
+           return_value={'enhanced_text': 'q', 'vector': [0.1], 'language': 'en'})
+    def test_unversioned_index_not_cached(self, mock_preprocess):
+        """Test results aren't cached when the index has no version to invalidate them by"""
+        service = self._service(search_delay=0)
+        engine = service.search_engines['docs']
+        engine.backend = 'pgvector'
+        engine.index_version.return_value = None
+        self._run(*[
+            service._handle_search(SearchRequest(query="query", index_name='docs'))
+            for _ in range(2)
+        ])
+        service.stop()
+
+        assert engine.search.call_count == 2
+
+    def test_settings_from_config_file(self, tmp_path):
+        """Test request handling settings are read from the service config"""
+        config_file = tmp_path / "search.json"
+        config_file.write_text('{"service": {"max_workers": 3, "max_concurrent_requests": 5, '
+                               '"request_timeout": 2.5, "batch_encode": false}}')
+        service = SearchService(indexes={}, config_file=str(config_file))
+        service.stop()
+
+        assert service.max_workers == 3
+        assert service.max_concurrent_requests == 5
+        assert service.request_timeout == 2.5
+        assert service.batch_encode is False
@@ -0,0 +1,149 @@
+"""
+Copyright (c) 2025 SignalWire
+
+This file is part of the SignalWire AI Agents SDK.
+
+Licensed under the MIT License.
+See LICENSE file in the project root for full license information.
+"""
+
+"""
+Unit tests for AgentServer request routing
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from signalwire_agents.agent_server import AgentServer
+from signalwire_agents.core.agent_base import AgentBase
+
+
+class TestAgentServerRouteTable:
+    """Test the route dispatch table"""
+
+    def _server(self, routes):
+        server = AgentServer()
+        for route in routes:
+            server.agents[route] = Mock(name=route)
+        server._rebuild_route_table()
+        return server
+
+    def _match(self, server, path):
+        return [(agent, sub_path) for agent, handlers, sub_path in server._match_routes(path)]
+
+    def test_match_sub_paths(self):
+        """Test paths resolve to their agent and sub-path"""
+        server = self._server(["/sales", "/support"])
+        sales = server.agents["/sales"]
+
+        assert self._match(server, "sales") == [(sales, "")]
+        assert self._match(server, "/sales/") == [(sales, "")]
+        assert self._match(server, "sales/swaig") == [(sales, "swaig")]
+        assert self._match(server, "sales/swaig/get_order/") == [(sales, "swaig/get_order")]
+        assert self._match(server, "salesforce/swaig") == []
+        assert self._match(server, "") == []
+
+    def test_nested_routes_longest_first(self):
+        """Test nested routes are tried from the longest"""
+        server = self._server(["/api", "/api/v2"])
+
+        assert self._match(server, "api/v2/swaig") == [
+            (server.agents["/api/v2"], "swaig"),
+            (server.agents["/api"], "v2/swaig"),
+        ]
+
+    def test_root_agent(self):
+        """Test an agent at the server root only handles the root"""
+        server = self._server([""])
+
+        assert self._match(server, "/") == [(server.agents[""], "")]
+        assert self._match(server, "swaig") == []
+
+    def test_dispatch_independent_of_agent_count(self):
+        """Test dispatch looks up the path instead of scanning the agents"""
+        server = self._server([f"/tenant{i}" for i in range(1000)])
+        server.agents = {}  # Scanning the agents would now find nothing
+
+        agent, handlers, sub_path = next(server._match_routes("tenant999/swaig"))
+        assert sub_path == "swaig"
+        assert set(handlers) == {"", "debug", "swaig", "post_prompt", "check_for_input"}
+
+    def test_register_and_unregister_rebuild_table(self):
+        """Test registering and unregistering agents updates the table"""
+        server = AgentServer()
+        agent = AgentBase("sales", suppress_logs=True)
+
+        server.register(agent, "/sales")
+        assert [a for a, _, _ in server._match_routes("sales")] == [agent]
+
+        server.unregister("/sales")
+        assert list(server._match_routes("sales")) == []
+
+
+class TestAgentServerServerless:
+    """Test serverless requests are routed through the table"""
+
+    def setup_method(self):
+        self.server = AgentServer()
+        self.agent = AgentBase("sales", suppress_logs=True)
+        self.agent.define_tool("get_order", "Get an order", {}, lambda args, raw_data: "shipped")
+        self.server.register(self.agent, "/sales")
+
+    def test_lambda_root(self):
+        """Test a Lambda request for an agent's route returns its SWML"""
+        response = self.server._handle_lambda_request({"path": "/sales"}, None)
+
+        assert response["statusCode"] == 200
+        assert "sections" in json.loads(response["body"])
+
+    def test_lambda_function_call(self):
+        """Test a Lambda SWAIG request calls the function"""
+        event = {"path": "/sales/swaig/get_order", "body": json.dumps({"argument": {"parsed": [{}]}})}
+        response = self.server._handle_lambda_request(event, None)
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == {"response": "shipped"}
+
+    def test_lambda_not_found(self):
+        """Test a Lambda request for an unknown route returns 404"""
+        response = self.server._handle_lambda_request({"path": "/support/swaig"}, None)
+
+        assert response["statusCode"] == 404
+
+    def test_cgi_function_call(self, monkeypatch, capsys):
+        """Test a CGI SWAIG request calls the function"""
+        monkeypatch.setenv("PATH_INFO", "/sales/swaig/get_order")
+        monkeypatch.delenv("CONTENT_LENGTH", raising=False)
+
+        response = self.server._handle_cgi_request()
+
+        assert response.startswith("Status: 200 OK")
+        assert response.endswith(json.dumps({"response": "shipped"}))
+
+
+class TestAgentServerWorkers:
+    """Test the multi-process server settings"""
+
+    def test_workers_from_config_file(self, tmp_path):
+        """Test the worker count is read from the config file"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"service": {"workers": 3, "worker_shutdown_timeout": 5}}))
+
+        server = AgentServer(config_file=str(config_file))
+
+        assert server.workers == 3
+        assert server.worker_shutdown_timeout == 5.0
+
+    def test_reload_rereads_config_file(self, tmp_path):
+        """Test a reload picks up a changed worker count unless set explicitly"""
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"service": {"workers": 2}}))
+        server = AgentServer(config_file=str(config_file))
+        explicit = AgentServer(workers=4, config_file=str(config_file))
+
+        config_file.write_text(json.dumps({"service": {"workers": 6}}))
+
+        assert server._reload_workers() == 6
+        assert explicit._reload_workers() == 4
@@ -429,6 +429,105 @@ class TestVerbValidation:
         
         assert is_valid is True
         assert errors == []
+    
+    def test_validate_verb_schema_violation_strict(self):
+        """Test strict mode rejects configs violating the schema"""
+        self.utils.validation_mode = "strict"
+        
+        is_valid, errors = self.utils.validate_verb("ai", {"prompt": "You are helpful", "temperature": "hot"})
+        
+        assert is_valid is False
+        assert errors == ["ai/temperature: 'hot' is not of type 'number'"]
+    
+    def test_validate_verb_schema_violation_warn(self):
+        """Test warn mode accepts configs violating the schema"""
+        self.utils.validation_mode = "warn"
+        self.utils.log = Mock()
+        
+        is_valid, errors = self.utils.validate_verb("ai", {"prompt": "You are helpful", "temperature": "hot"})
+        
+        assert is_valid is True
+        assert errors == []
+        self.utils.log.warning.assert_called_once()
+    
+    def test_validate_verb_schema_violation_off(self):
+        """Test off mode skips schema validation but still checks required properties"""
+        self.utils.validation_mode = "off"
+        
+        with patch.object(SchemaUtils, 'get_verb_validator') as mock_validator:
+            assert self.utils.validate_verb("ai", {"prompt": "hi", "temperature": "hot"}) == (True, [])
+            assert self.utils.validate_verb("ai", {})[0] is False
+        mock_validator.assert_not_called()
+    
+    def test_verb_validator_compiled_once(self):
+        """Test the verb validator is compiled on first use and reused"""
+        with patch('signalwire_agents.utils.schema_utils.compile_validator',
+                   return_value=lambda instance: []) as mock_compile:
+            self.utils.validate_verb("ai", {"prompt": "one"})
+            self.utils.validate_verb("ai", {"prompt": "two"})
+        
+        mock_compile.assert_called_once()
+    
+    def test_repeated_config_validated_once(self):
+        """Test a config rendered again reuses its validation outcome and isn't logged again"""
+        self.utils.validation_mode = "warn"
+        self.utils.log = Mock()
+        validator = Mock(return_value=["ai/temperature: 'hot' is not of type 'number'"])
+        
+        with patch.object(SchemaUtils, 'get_verb_validator', return_value=validator):
+            for _ in range(3):
+                assert self.utils.validate_verb("ai", {"prompt": "hi", "temperature": "hot"}) == (True, [])
+            self.utils.validation_mode = "strict"
+            is_valid, errors = self.utils.validate_verb("ai", {"temperature": "hot", "prompt": "hi"})
+        
+        assert is_valid is False
+        assert errors == ["ai/temperature: 'hot' is not of type 'number'"]
+        validator.assert_called_once()
+        self.utils.log.warning.assert_called_once()
+
+
+class TestCompiledValidators:
+    """Test compiled JSON Schema validators"""
+    
+    def test_compile_validator(self):
+        """Test a compiled validator reports errors with their location"""
+        from signalwire_agents.utils.schema_utils import compile_validator
+        validate = compile_validator({
+            "type": "object",
+            "properties": {
+                "city": {"type": "string"},
+                "days": {"type": "integer", "minimum": 1}
+            },
+            "required": ["city"]
+        })
+        
+        assert validate({"city": "Paris", "days": 3}) == []
+        assert validate({"days": 0}) == ["'city' is a required property",
+                                         "days: 0 is less than the minimum of 1"]
+    
+    def test_compile_validator_without_jsonschema(self):
+        """Test only required properties are checked without jsonschema"""
+        from signalwire_agents.utils.schema_utils import compile_validator
+        with patch('signalwire_agents.utils.schema_utils.validator_for', None):
+            validate = compile_validator({
+                "type": "object",
+                "properties": {"days": {"type": "integer"}},
+                "required": ["city"]
+            })
+        
+        assert validate({"city": "Paris", "days": "three"}) == []
+        assert validate({"days": 3}) == ["'city' is a required property"]
+    
+    def test_get_validation_mode(self, monkeypatch):
+        """Test the validation mode comes from the argument, then the environment"""
+        from signalwire_agents.utils.schema_utils import get_validation_mode, SCHEMA_VALIDATION_ENV_VAR
+        monkeypatch.delenv(SCHEMA_VALIDATION_ENV_VAR, raising=False)
+        assert get_validation_mode() == "warn"
+        
+        monkeypatch.setenv(SCHEMA_VALIDATION_ENV_VAR, "Strict")
+        assert get_validation_mode() == "strict"
+        assert get_validation_mode("off") == "off"
+        assert get_validation_mode("bogus") == "warn"
 
 
 class TestCodeGeneration:
@@ -674,4 +773,81 @@ class TestSchemaUtilsIntegration:
             assert utils.get_verb_parameters("ai") == {}
             
             is_valid, errors = utils.validate_verb("ai", {})
-            assert is_valid is False 
\ No newline at end of file
+            assert is_valid is False 
+
+class TestSharedSchema:
+    """Test the process-wide shared schema"""
+    
+    SCHEMA = {
+        "$defs": {
+            "SWMLMethod": {"anyOf": [{"$ref": "#/$defs/Answer"}]},
+            "Answer": {
+                "type": "object",
+                "properties": {"answer": {"type": "object", "properties": {}}}
+            }
+        }
+    }
+    
+    def setup_method(self):
+        from signalwire_agents.utils.schema_utils import clear_schema_cache
+        clear_schema_cache()
+    
+    def _write_schema(self, tmp_path):
+        schema_path = tmp_path / "schema.json"
+        schema_path.write_text(json.dumps(self.SCHEMA))
+        return str(schema_path)
+    
+    def test_schema_parsed_once_per_file(self, tmp_path):
+        """Test instances for the same schema file share the parsed schema"""
+        schema_path = self._write_schema(tmp_path)
+        first = SchemaUtils(schema_path)
+        with patch.object(SchemaUtils, 'load_schema') as mock_load:
+            second = SchemaUtils(schema_path)
+        
+        mock_load.assert_not_called()
+        assert second.schema is first.schema
+        assert second.verbs is first.verbs
+        assert second.get_all_verb_names() == ["answer"]
+        with pytest.raises(TypeError):
+            second.verbs["play"] = {}
+    
+    def test_clear_schema_cache(self, tmp_path):
+        """Test clearing the cache makes the next instance reparse the file"""
+        from signalwire_agents.utils.schema_utils import clear_schema_cache
+        schema_path = self._write_schema(tmp_path)
+        first = SchemaUtils(schema_path)
+        clear_schema_cache()
+        second = SchemaUtils(schema_path)
+        
+        assert second.schema is not first.schema
+        assert second.schema == first.schema
+    
+    def test_schema_cache_file(self, tmp_path, monkeypatch):
+        """Test the parsed schema round-trips through the cache file"""
+        from signalwire_agents.utils.schema_utils import clear_schema_cache, SCHEMA_CACHE_ENV_VAR
+        schema_path = self._write_schema(tmp_path)
+        cache_path = tmp_path / "schema.cache"
+        monkeypatch.setenv(SCHEMA_CACHE_ENV_VAR, str(cache_path))
+        
+        first = SchemaUtils(schema_path)
+        assert cache_path.exists()
+        
+        clear_schema_cache()
+        with patch.object(SchemaUtils, 'load_schema') as mock_load:
+            second = SchemaUtils(schema_path)
+        
+        mock_load.assert_not_called()
+        assert second.schema == first.schema
+        assert second.get_all_verb_names() == ["answer"]
+    
+    def test_stale_schema_cache_file_ignored(self, tmp_path, monkeypatch):
+        """Test a cache file made from a different schema file is not used"""
+        from signalwire_agents.utils.schema_utils import SCHEMA_CACHE_ENV_VAR
+        schema_path = self._write_schema(tmp_path)
+        cache_path = tmp_path / "schema.cache"
+        cache_path.write_bytes(b"not a marshal file")
+        monkeypatch.setenv(SCHEMA_CACHE_ENV_VAR, str(cache_path))
+        
+        utils = SchemaUtils(schema_path)
+        
+        assert utils.get_all_verb_names() == ["answer"]